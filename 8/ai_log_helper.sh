@@ -6,6 +6,9 @@ set -e
 
 LOG_DIR="${AI_LOG_DIR:-./logs/ai_conversations}"
 LOG_FORMAT="${AI_LOG_FORMAT:-both}"
+LOG_SINK="${AI_LOG_SINK:-jsonl}"
+# ai_conversation_logger.py lives next to this script; it reads back every sink
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 # Colors for output
 GREEN='\033[0;32m'
@@ -15,6 +18,20 @@ BLUE='\033[0;34m'
 NC='\033[0m' # No Color
 
 # Functions
+# Python (stdin) with ai_conversation_logger importable and LOG_DIR in the environment
+logged_py() {
+    LOG_DIR="$LOG_DIR" SCRIPT_DIR="$SCRIPT_DIR" python3 - "$@"
+}
+
+count_logs() {
+    logged_py << 'PY'
+import os, sys
+sys.path.insert(0, os.environ['SCRIPT_DIR'])
+from ai_conversation_logger import iter_logged_conversations
+print(sum(1 for _ in iter_logged_conversations(os.environ['LOG_DIR'])))
+PY
+}
+
 print_header() {
     echo -e "${BLUE}========================================${NC}"
     echo -e "${BLUE}  AI Conversation Logging Helper${NC}"
@@ -29,9 +46,10 @@ show_status() {
         echo -e "${GREEN}✅ Logging Status: ENABLED${NC}"
         echo -e "   Log Directory: ${LOG_DIR}"
         echo -e "   Log Format: ${LOG_FORMAT}"
+        echo -e "   Log Sink: ${LOG_SINK}"
 
         if [ -d "$LOG_DIR" ]; then
-            local count=$(find "$LOG_DIR" -type f -name "*.json" 2>/dev/null | wc -l)
+            local count=$(count_logs)
             echo -e "   Total Logs: ${count}"
 
             if [ $count -gt 0 ]; then
@@ -64,6 +82,7 @@ enable_logging() {
     echo -e "${YELLOW}export AI_LOG_ENABLED=true${NC}"
     echo -e "${YELLOW}export AI_LOG_DIR=\"$LOG_DIR\"${NC}"
     echo -e "${YELLOW}export AI_LOG_FORMAT=\"$LOG_FORMAT\"${NC}"
+    echo -e "${YELLOW}export AI_LOG_SINK=\"$LOG_SINK\"${NC}"
     echo ""
     echo "Or run: source <(./ai_log_helper.sh env)"
 }
@@ -86,6 +105,7 @@ show_env() {
     echo "export AI_LOG_ENABLED=true"
     echo "export AI_LOG_DIR=\"$LOG_DIR\""
     echo "export AI_LOG_FORMAT=\"$LOG_FORMAT\""
+    echo "export AI_LOG_SINK=\"$LOG_SINK\""
 }
 
 list_logs() {
@@ -96,28 +116,32 @@ list_logs() {
         exit 1
     fi
 
-    local count=$(find "$LOG_DIR" -type f -name "*.json" 2>/dev/null | wc -l)
+    local count=$(count_logs)
 
     if [ $count -eq 0 ]; then
         echo -e "${YELLOW}No logs found in: $LOG_DIR${NC}"
         exit 0
     fi
 
-    echo -e "${GREEN}Found $count log files${NC}"
+    echo -e "${GREEN}Found $count logged conversations${NC}"
     echo ""
 
-    # List by provider
-    echo -e "${BLUE}Logs by Provider:${NC}"
-    for provider in claude-cli codex-heuristic claude openai cursor; do
-        local provider_count=$(find "$LOG_DIR" -type f -name "*${provider}*.json" 2>/dev/null | wc -l)
-        if [ $provider_count -gt 0 ]; then
-            echo "  $provider: $provider_count logs"
-        fi
-    done
+    logged_py << 'PY'
+import os, sys
+from collections import Counter
+sys.path.insert(0, os.environ['SCRIPT_DIR'])
+from ai_conversation_logger import iter_logged_conversations
 
-    echo ""
-    echo -e "${BLUE}Recent Logs (10 most recent):${NC}"
-    ls -lth "$LOG_DIR" | grep "\.json$" | head -10
+records = list(iter_logged_conversations(os.environ['LOG_DIR']))
+print("\033[0;34mLogs by Provider:\033[0m")
+for provider, n in Counter(r.get('provider', 'unknown') for r in records).most_common():
+    print(f"  {provider}: {n} logs")
+print("")
+print("\033[0;34mRecent Logs (10 most recent):\033[0m")
+for r in sorted(records, key=lambda r: r.get('timestamp', ''), reverse=True)[:10]:
+    flag = "  ERROR" if r.get('error') else ""
+    print(f"  {r.get('timestamp', '')[:19]}  {r.get('provider', 'unknown'):<16} {r['conversation_id'][:12]}{flag}")
+PY
 }
 
 view_log() {
@@ -129,12 +153,41 @@ view_log() {
         exit 1
     fi
 
-    # Find matching files
-    local matches=$(find "$LOG_DIR" -type f -name "*${search_term}*" 2>/dev/null)
+    # Per-conversation files (files sink) first
+    local matches=$(find "$LOG_DIR" -type f -name "*${search_term}*.json" 2>/dev/null)
 
     if [ -z "$matches" ]; then
-        echo -e "${RED}❌ No logs found matching: $search_term${NC}"
-        exit 1
+        # JSONL segments / sqlite rows: match an id prefix, the provider or the timestamp
+        logged_py "$search_term" << 'PY'
+import os, sys
+sys.path.insert(0, os.environ['SCRIPT_DIR'])
+from ai_conversation_logger import format_text_log, iter_logged_conversations
+
+term = sys.argv[1]
+
+def compact(stamp):
+    return stamp.replace('-', '').replace(':', '').replace('T', '_')
+
+def matches(r):
+    stamp = r.get('timestamp', '')
+    return (r['conversation_id'].startswith(term) or term in r.get('provider', '')
+            or term in stamp or compact(term) in compact(stamp))
+
+found = sorted((r for r in iter_logged_conversations(os.environ['LOG_DIR']) if matches(r)),
+               key=lambda r: r.get('timestamp', ''))
+if not found:
+    print(f"\033[0;31m❌ No logs found matching: {term}\033[0m")
+    sys.exit(1)
+if len(found) > 1:
+    print(f"\033[1;33mFound {len(found)} matching logs:\033[0m")
+    for n, r in enumerate(found, 1):
+        print(f"  {n:>4}  {r.get('timestamp', '')[:19]}  {r.get('provider', 'unknown'):<16} {r['conversation_id'][:12]}")
+    print("")
+    print("Please be more specific (e.g. a conversation id prefix)")
+    sys.exit(0)
+print(format_text_log(found[0]))
+PY
+        return
     fi
 
     local count=$(echo "$matches" | wc -l)
@@ -179,15 +232,17 @@ summary() {
     echo -e "${BLUE}Running summary analysis...${NC}"
     echo ""
 
-    # Use Python to analyze logs
-    python3 << EOF
+    # Use Python to analyze logs (whichever sink wrote them)
+    logged_py << 'EOF'
 import json
-import glob
-from pathlib import Path
+import os
+import sys
 from collections import defaultdict
 
-log_dir = Path('$LOG_DIR')
-logs = list(log_dir.glob('*.json'))
+sys.path.insert(0, os.environ['SCRIPT_DIR'])
+from ai_conversation_logger import iter_logged_conversations
+
+logs = list(iter_logged_conversations(os.environ['LOG_DIR']))
 
 if not logs:
     print("No logs found")
@@ -202,23 +257,18 @@ by_error = 0
 scores = []
 certainties = []
 
-for log_file in logs:
+for data in logs:
+    by_provider[data.get('provider', 'unknown')] += 1
+
+    if data.get('error'):
+        by_error += 1
+
     try:
-        with open(log_file) as f:
-            data = json.load(f)
-            by_provider[data['provider']] += 1
-
-            if data.get('error'):
-                by_error += 1
-
-            try:
-                response = json.loads(data['response'])
-                if 'score' in response:
-                    scores.append(response['score'])
-                if 'certainty' in response:
-                    certainties.append(response['certainty'])
-            except:
-                pass
+        response = json.loads(data['response'])
+        if 'score' in response:
+            scores.append(response['score'])
+        if 'certainty' in response:
+            certainties.append(response['certainty'])
     except:
         pass
 
@@ -290,8 +340,9 @@ test_logging() {
     export AI_LOG_ENABLED=true
     export AI_LOG_DIR="$LOG_DIR"
     export AI_LOG_FORMAT="$LOG_FORMAT"
+    export AI_LOG_SINK="$LOG_SINK"
 
-    python3 ai_conversation_logger.py
+    python3 "$SCRIPT_DIR/ai_conversation_logger.py"
 }
 
 show_usage() {
@@ -317,12 +368,14 @@ show_usage() {
     echo "  $0 list"
     echo "  $0 view claude-cli"
     echo "  $0 view 20250128_143025"
+    echo "  $0 view 3f2a9c1b            # conversation id prefix"
     echo "  $0 summary"
     echo ""
     echo "Environment Variables:"
     echo "  AI_LOG_ENABLED  - Enable/disable logging (true/false)"
     echo "  AI_LOG_DIR      - Log directory (default: ./logs/ai_conversations)"
     echo "  AI_LOG_FORMAT   - Log format (json, text, both)"
+    echo "  AI_LOG_SINK     - Where records go (jsonl, sqlite, files; default: jsonl)"
 }
 
 # Main
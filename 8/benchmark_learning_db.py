@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Learning DB query-path benchmark
+
+Builds a synthetic learning DB that grows one simulated day at a time (runs,
+picks, price_eval rows) and times harvest_price_feedback,
+generate_self_assessment and build_verdict_summary after each month. With the
+indexes and harvest watermark in learning_db the timings should stay flat as
+the tables grow.
+
+Usage:
+    python3 benchmark_learning_db.py [--days 365] [--runs-per-day 4] [--picks 25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import learning_db
+
+
+def _add_day(db_path: str, day: datetime, runs_per_day: int, picks: int, rng: random.Random) -> None:
+    con = sqlite3.connect(db_path)
+    try:
+        cur = con.cursor()
+        for r in range(runs_per_day):
+            ts = (day + timedelta(hours=3 * r)).isoformat(timespec="seconds")
+            cur.execute(
+                "INSERT INTO runs (ts, agg_file, path, top_n, notes) VALUES (?, ?, ?, ?, ?)",
+                (ts, "synthetic.txt", "synthetic.txt", picks, "bench"),
+            )
+            run_id = cur.lastrowid
+            for rank in range(1, picks + 1):
+                ticker = f"SYN{rng.randint(1, 800):04d}"
+                adj = rng.random()
+                cur.execute(
+                    """
+                    INSERT INTO picks (run_id, rank, ticker, adj_score, combined_score, articles, title, source, reason, amt_cr, dups, has_word, event_type)
+                    VALUES (?, ?, ?, ?, ?, 1, 'title', 'source', 'reason', 0.0, 1, 1, 'General')
+                    """,
+                    (run_id, rank, ticker, adj, adj),
+                )
+                cur.execute(
+                    "INSERT OR IGNORE INTO ticker_stats (ticker, appearances, last_seen) VALUES (?, 1, ?)",
+                    (ticker, ts),
+                )
+                r1, r3, r5 = (rng.uniform(-4, 6) for _ in range(3))
+                cur.execute(
+                    """
+                    INSERT OR REPLACE INTO price_eval (run_id, ticker, event_ts, event_type, title, source, ret_1d, ret_3d, ret_5d, consistent, fake)
+                    VALUES (?, ?, ?, 'General', 'title', 'source', ?, ?, ?, ?, ?)
+                    """,
+                    (run_id, ticker, ts, r1, r3, r5, int(r3 >= 2 and r5 >= 2), int(r1 >= 2 and r5 <= 0.5)),
+                )
+        con.commit()
+    finally:
+        con.close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark learning_db query paths on a synthetic DB")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--runs-per-day", type=int, default=4)
+    ap.add_argument("--picks", type=int, default=25)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "learning.db")
+        learning_db.ensure_db(db_path)
+        start = datetime.utcnow() - timedelta(days=args.days)
+        print(f"{'day':>5} {'price_eval':>11} {'harvest_ms':>11} {'assess_ms':>10} {'verdict_ms':>11}")
+        for d in range(args.days):
+            _add_day(db_path, start + timedelta(days=d), args.runs_per_day, args.picks, rng)
+            t0 = time.perf_counter()
+            learning_db.harvest_price_feedback(db_path, min_hours=24)
+            t1 = time.perf_counter()
+            if (d + 1) % 30 and d + 1 != args.days:
+                continue
+            sa = learning_db.generate_self_assessment(db_path, 10)
+            t2 = time.perf_counter()
+            learning_db.build_verdict_summary(db_path, sa.get("latest_run_id", 1), learning_report={"self_assessment": sa})
+            t3 = time.perf_counter()
+            con = sqlite3.connect(db_path)
+            n_eval = con.execute("SELECT COUNT(*) FROM price_eval").fetchone()[0]
+            con.close()
+            print(f"{d + 1:>5} {n_eval:>11} {(t1 - t0) * 1000:>11.1f} {(t2 - t1) * 1000:>10.1f} {(t3 - t2) * 1000:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Shared-memory OHLCV benchmark
+
+Times a per-ticker CPU workload over synthetic OHLCV frames at 1, 2, 4 and 8
+workers, two ways:
+  pickled  - a fresh ProcessPoolExecutor per batch, one (ticker, DataFrame)
+             task per ticker (the previous batch_analyze_with_process_pool path)
+  shared   - SharedOHLCV block + map_shared on the warm pool
+Each configuration runs --repeats batches so the warm pool's reuse shows up.
+Speed-up is bounded by the machine's core count (printed first).
+
+Usage:
+    python3 benchmark_shared_ohlcv.py [--tickers 2000] [--bars 300] [--repeats 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from shared_ohlcv import SharedOHLCV, map_shared, shutdown_pool
+
+
+def synthetic_frames(n: int, bars: int, seed: int = 11) -> dict:
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end="2025-06-30", periods=bars)
+    frames = {}
+    for i in range(n):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+        frames[f"SYN{i:04d}.NS"] = pd.DataFrame({
+            "Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+            "Volume": rng.lognormal(12, 0.5, bars),
+        }, index=idx)
+    return frames
+
+
+def workload(ticker: str, df: pd.DataFrame, extra=None) -> float:
+    """Rolling statistics comparable to the per-ticker scoring step."""
+    close = df["Close"]
+    sma = close.rolling(20).mean()
+    std = close.rolling(20).std()
+    ema = close.ewm(span=50, adjust=False).mean()
+    vol = df["Volume"] / df["Volume"].rolling(50, min_periods=20).mean()
+    score = ((close - sma) / std).iloc[-1] + (close / ema).iloc[-1] + vol.iloc[-1]
+    return float(score)
+
+
+def _pickled_task(pair):
+    return workload(pair[0], pair[1])
+
+
+def run_pickled(frames: dict, workers: int) -> float:
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(_pickled_task, frames.items()))
+    return time.perf_counter() - t0
+
+
+def run_shared(frames: dict, workers: int) -> float:
+    t0 = time.perf_counter()
+    with SharedOHLCV(frames) as shared:
+        map_shared(workload, shared, max_workers=workers)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=2000)
+    ap.add_argument("--bars", type=int, default=300)
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--workers", default="1,2,4,8")
+    args = ap.parse_args()
+
+    frames = synthetic_frames(args.tickers, args.bars)
+    print(f"CPUs: {os.cpu_count()}  tickers: {args.tickers}  bars: {args.bars}")
+
+    t0 = time.perf_counter()
+    for t, df in frames.items():
+        workload(t, df)
+    serial = time.perf_counter() - t0
+    print(f"serial in-process: {serial:.2f}s")
+
+    print(f"{'workers':>7} {'pickled_s':>10} {'shared_first_s':>15} {'shared_warm_s':>14} {'speedup':>8}")
+    for w in [int(x) for x in args.workers.split(",")]:
+        pickled = min(run_pickled(frames, w) for _ in range(args.repeats))
+        first = run_shared(frames, w)
+        warm = min(run_shared(frames, w) for _ in range(max(1, args.repeats - 1)))
+        print(f"{w:>7} {pickled:>10.2f} {first:>15.2f} {warm:>14.2f} {serial / warm:>8.2f}")
+    shutdown_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
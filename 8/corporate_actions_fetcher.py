@@ -37,28 +37,14 @@ import random
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from threading import Lock
+
+from rate_limiter import get_bucket
 
 # Cache directory
 CACHE_DIR = Path('.scraper_cache')
 CACHE_DIR.mkdir(exist_ok=True)
 CACHE_TTL = 21600  # 6 hours (corporate actions don't change frequently)
 
-# Rate limiter
-class RateLimiter:
-    def __init__(self, min_interval: float = 2.0):
-        self.min_interval = min_interval
-        self.last_request_time = {}
-        self.lock = Lock()
-
-    def wait(self, key: str = 'default'):
-        with self.lock:
-            elapsed = time.time() - self.last_request_time.get(key, 0)
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed + random.uniform(0, 0.5))
-            self.last_request_time[key] = time.time()
-
-_rate_limiter = RateLimiter(min_interval=2.0)
 
 # User agents for rotation
 USER_AGENTS = [
@@ -127,14 +113,15 @@ def _scrape_nse_corporate_actions(ticker: str) -> Dict:
 
     try:
         # Get homepage first to set cookies
-        _rate_limiter.wait('nseindia.com')
+        get_bucket('nse').acquire()
         session.get('https://www.nseindia.com', timeout=10)
         time.sleep(1)  # Wait for cookies
 
         # Get corporate actions
         url = f"https://www.nseindia.com/api/corporates-corporateActions?index=equities&symbol={ticker}"
-        _rate_limiter.wait('nseindia.com')
+        get_bucket('nse').acquire()
         response = session.get(url, timeout=10)
+        get_bucket('nse').report(response.status_code, response.headers.get('Retry-After'))
 
         if response.status_code == 200:
             data = response.json()
@@ -1,25 +1,599 @@
 #!/usr/bin/env python3
 """
-Enhanced Backtester - Stub Module
-Minimal implementation to suppress import warnings.
-Full backtesting features can be added here if needed.
+Enhanced Backtester - vectorized multi-ticker strategy simulation
+
+Simulates the screener's signal / stop / target logic (generate_trading_signals:
+RSI < 30, BB position < 20, volume > 1.5x its 50-day average, stop 1.5 ATR,
+target 3 ATR) over every bar of every ticker at once:
+
+  * OHLCV comes from the local cache (ohlcv_cache) and is aligned into a
+    (bars x tickers) panel; indicators are computed column-wise on the panel.
+  * Every signal bar becomes a candidate trade (entry next open). Exits are
+    resolved for all candidates together on a (signals x max_hold) window of
+    highs/lows/RSI; overlapping candidates on the same ticker are dropped by
+    chaining each trade to the next signal after its exit.
+  * Portfolio returns split capital into `max_positions` equal slots.
+
+Walk-forward (anchored) and rolling-window validation re-use the same panel and
+indicators; only the simulated bar range changes.
+
+Usage:
+    from enhanced_backtester import EnhancedBacktester, BacktestParameters
+    bt = EnhancedBacktester()
+    res = bt.backtest(["TCS.NS", "INFY.NS"], "2018-01-01", "2024-12-31")
+
+    python3 enhanced_backtester.py --symbols TCS INFY --start 2018-01-01 --end 2024-12-31
+    python3 enhanced_backtester.py --synthetic 500 --years 10     # speed check
 """
 
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import time
+from dataclasses import asdict, dataclass, field, fields, replace
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicator_panel import average_true_range, bb_position, ema, volume_ratio, wilder_rsi
+
+TRADING_DAYS = 252
+# Bars loaded before the requested start so indicators are warmed up
+WARMUP_DAYS = 120
+DEFAULT_VALIDATION_YEARS = 3
+
+EXIT_STOP, EXIT_TARGET, EXIT_RSI, EXIT_TIME = 0, 1, 2, 3
+EXIT_REASONS = {EXIT_STOP: "STOP_LOSS", EXIT_TARGET: "TAKE_PROFIT", EXIT_RSI: "RSI_EXIT", EXIT_TIME: "TIME_EXIT"}
+
+
+@dataclass
 class BacktestParameters:
-    """Placeholder for backtesting parameters."""
-    def __init__(self, **kwargs):
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+    """Strategy parameters; defaults reproduce generate_trading_signals."""
+    rsi_lower: float = 30.0          # entry: RSI below
+    rsi_upper: float = 70.0          # exit: RSI above (at close)
+    bb_lower: float = 20.0           # entry: BB position (0-100) below
+    volume_threshold: float = 1.5    # entry: Volume > x * 50-day average
+    ema_short: int = 20
+    ema_long: int = 50
+    trend_filter: bool = False       # entry also requires EMA short > EMA long
+    stop_atr_mult: float = 1.5
+    target_atr_mult: float = 3.0
+    stop_loss_pct: float = 8.0       # widest stop allowed, % below entry
+    take_profit_pct: float = 15.0    # farthest target allowed, % above entry
+    max_hold_days: int = 20
+    max_positions: int = 10
+    cost_bps: float = 10.0           # per side
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "BacktestParameters":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (d or {}).items() if k in names})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class BacktestResults:
+    total_return: float = 0.0
+    annualized_return: float = 0.0
+    max_drawdown: float = 0.0        # positive fraction
+    sharpe_ratio: float = 0.0
+    win_rate: float = 0.0
+    total_trades: int = 0
+    avg_trade_return: float = 0.0
+    volatility: float = 0.0
+    profit_factor: float = 0.0
+    exposure: float = 0.0            # average fraction of slots in use
+    signals: int = 0                 # candidate signals before de-overlap
+    start_date: str = ""
+    end_date: str = ""
+    parameters: Optional[BacktestParameters] = None
+    window: Dict[str, str] = field(default_factory=dict)
+    trades: Optional[pd.DataFrame] = field(default=None, repr=False)
+    equity: Optional[pd.Series] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {k: getattr(self, k) for k in (
+            "total_return", "annualized_return", "max_drawdown", "sharpe_ratio", "win_rate",
+            "total_trades", "avg_trade_return", "volatility", "profit_factor", "exposure",
+            "signals", "start_date", "end_date",
+        )}
+        out["parameters"] = self.parameters.to_dict() if self.parameters else None
+        if self.window:
+            out["window"] = dict(self.window)
+        return out
+
+
+# -----------------------------------------------------------------------------
+# Panel + indicators
+# -----------------------------------------------------------------------------
+
+@dataclass
+class PricePanel:
+    """Aligned daily bars, arrays shaped (bars, tickers)."""
+    dates: pd.DatetimeIndex
+    symbols: List[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "PricePanel":
+        symbols = [s for s, df in frames.items() if df is not None and len(df)]
+        if not symbols:
+            return cls(pd.DatetimeIndex([]), [], *(np.empty((0, 0)) for _ in range(5)))
+        cols = {}
+        for name in ("Open", "High", "Low", "Close", "Volume"):
+            cols[name] = pd.concat(
+                {s: frames[s][name] if name in frames[s] else frames[s]["Close"] for s in symbols}, axis=1
+            ).sort_index()
+        close = cols["Close"].ffill()
+        # Missing O/H/L on a bar: flat bar at the (carried) close
+        o = cols["Open"].where(cols["Open"].notna(), close)
+        h = cols["High"].where(cols["High"].notna(), close)
+        lo = cols["Low"].where(cols["Low"].notna(), close)
+        v = cols["Volume"].fillna(0.0)
+        as_arr = lambda df: np.ascontiguousarray(df.to_numpy(dtype="float64"))
+        return cls(pd.DatetimeIndex(close.index), symbols, as_arr(o), as_arr(h), as_arr(lo), as_arr(close), as_arr(v))
+
+    def index_of(self, date: Any, side: str = "left") -> int:
+        return int(self.dates.searchsorted(pd.Timestamp(date), side=side))
+
+
+class PanelIndicators:
+    """Screener indicators (rsi14, bollinger_band_position, average_true_range)
+    computed column-wise on a PricePanel; EMAs are computed per span on demand."""
+
+    def __init__(self, panel: PricePanel):
+        self.panel = panel
+        valid = ~np.isnan(panel.close)
+        # Indicators need this many bars of history per ticker before they are trusted
+        self.ready = np.cumsum(valid, axis=0) >= 50
+        self.rsi = wilder_rsi(panel.close)
+        self.bb_pos = bb_position(panel.close)
+        self.atr = average_true_range(panel.high, panel.low, panel.close)
+        self.vol_ratio = volume_ratio(panel.volume)
+        self._ema: Dict[int, np.ndarray] = {}
+
+    def ema(self, span: int) -> np.ndarray:
+        out = self._ema.get(span)
+        if out is None:
+            out = ema(self.panel.close, span)
+            self._ema[span] = out
+        return out
+
+    def signal_mask(self, p: BacktestParameters) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            sig = (
+                self.ready
+                & (self.rsi < p.rsi_lower)
+                & (self.bb_pos < p.bb_lower)
+                & (self.vol_ratio > p.volume_threshold)
+            )
+            if p.trend_filter:
+                sig &= self.ema(int(p.ema_short)) > self.ema(int(p.ema_long))
+        return sig
+
+
+# -----------------------------------------------------------------------------
+# Simulation
+# -----------------------------------------------------------------------------
+
+def _chain_non_overlapping(cols: np.ndarray, entry: np.ndarray, exit_: np.ndarray, n_bars: int) -> np.ndarray:
+    """Indices of candidates kept when each ticker holds one position at a time."""
+    order = np.lexsort((entry, cols))
+    c, e, x = cols[order], entry[order], exit_[order]
+    keys = c.astype(np.int64) * n_bars + e
+    nxt = np.searchsorted(keys, c.astype(np.int64) * n_bars + x, side="right")
+    keep = np.zeros(len(order), dtype=bool)
+    _, starts = np.unique(c, return_index=True)
+    for k in starts:
+        col = c[k]
+        while k < len(order) and c[k] == col:
+            keep[k] = True
+            k = nxt[k]
+    return order[keep]
+
+
+def simulate(
+    panel: PricePanel,
+    ind: PanelIndicators,
+    params: BacktestParameters,
+    start_idx: int = 0,
+    end_idx: Optional[int] = None,
+) -> BacktestResults:
+    """Backtest params on bars [start_idx, end_idx) of the panel."""
+    n_bars, _ = panel.close.shape
+    end_idx = n_bars if end_idx is None else min(end_idx, n_bars)
+    start_idx = max(0, start_idx)
+    res = BacktestResults(parameters=params)
+    if end_idx - start_idx < 2:
+        return res
+    res.start_date = panel.dates[start_idx].date().isoformat()
+    res.end_date = panel.dates[end_idx - 1].date().isoformat()
+
+    sig = ind.signal_mask(params)
+    # Entry is the next bar's open, which must still be inside the window
+    rows, cols = np.nonzero(sig[start_idx:end_idx - 1])
+    rows = rows + start_idx
+    entry_bar = rows + 1
+    entry_px = panel.open[entry_bar, cols]
+    atr = ind.atr[rows, cols]
+    ok = np.isfinite(entry_px) & (entry_px > 0) & (atr > 0)
+    rows, cols, entry_bar, entry_px, atr = rows[ok], cols[ok], entry_bar[ok], entry_px[ok], atr[ok]
+    res.signals = int(len(rows))
+
+    trades = pd.DataFrame(columns=["ticker", "signal_date", "entry_date", "exit_date", "entry", "exit", "return", "reason", "bars"])
+    port = np.zeros(end_idx - start_idx)
+    n_open = np.zeros(end_idx - start_idx)
+    if len(rows):
+        stop = np.maximum(entry_px - params.stop_atr_mult * atr, entry_px * (1 - params.stop_loss_pct / 100.0))
+        target = np.minimum(entry_px + params.target_atr_mult * atr, entry_px * (1 + params.take_profit_pct / 100.0))
+
+        hold = max(1, int(params.max_hold_days))
+        last_k = np.minimum(hold - 1, end_idx - 1 - entry_bar)
+        offs = np.arange(hold)
+        bars = np.minimum(entry_bar[:, None] + offs, end_idx - 1)
+        in_win = offs[None, :] <= last_k[:, None]
+        cc = cols[:, None]
+        with np.errstate(invalid="ignore"):
+            stop_hit = (panel.low[bars, cc] <= stop[:, None]) & in_win
+            tgt_hit = (panel.high[bars, cc] >= target[:, None]) & in_win
+            rsi_hit = (ind.rsi[bars, cc] > params.rsi_upper) & in_win
+        event = stop_hit | tgt_hit | rsi_hit
+        k = np.where(event.any(axis=1), event.argmax(axis=1), last_k)
+        r = np.arange(len(k))
+        exit_bar = entry_bar + k
+        o_x, c_x = panel.open[exit_bar, cols], panel.close[exit_bar, cols]
+        # Stop checked first when both levels fall inside one bar (conservative)
+        reason = np.select([stop_hit[r, k], tgt_hit[r, k], rsi_hit[r, k]], [EXIT_STOP, EXIT_TARGET, EXIT_RSI], EXIT_TIME)
+        exit_px = np.select(
+            [reason == EXIT_STOP, reason == EXIT_TARGET],
+            [np.minimum(o_x, stop), np.maximum(o_x, target)],
+            c_x,
+        )
+
+        keep = _chain_non_overlapping(cols, entry_bar, exit_bar, n_bars)
+        keep.sort()
+        cost = params.cost_bps / 1e4
+        t_ret = exit_px[keep] / entry_px[keep] - 1 - 2 * cost
+
+        # Daily mark-to-market of every kept trade (one position per ticker, so no collisions)
+        kk = k[keep]
+        lengths = kk + 1
+        total = int(lengths.sum())
+        first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        step = np.arange(total) - first
+        d_rows = np.repeat(entry_bar[keep], lengths) + step
+        d_cols = np.repeat(cols[keep], lengths)
+        is_first = step == 0
+        is_last = step == np.repeat(kk, lengths)
+        prev = np.where(is_first, np.repeat(entry_px[keep], lengths), panel.close[np.maximum(d_rows - 1, 0), d_cols])
+        cur = np.where(is_last, np.repeat(exit_px[keep], lengths), panel.close[d_rows, d_cols])
+        d_ret = cur / prev - 1 - cost * is_first - cost * is_last
+        local = d_rows - start_idx
+        port = np.bincount(local, weights=d_ret, minlength=len(port))
+        n_open = np.bincount(local, minlength=len(port)).astype(float)
+
+        trades = pd.DataFrame({
+            "ticker": [panel.symbols[c] for c in cols[keep]],
+            "signal_date": panel.dates[rows[keep]],
+            "entry_date": panel.dates[entry_bar[keep]],
+            "exit_date": panel.dates[exit_bar[keep]],
+            "entry": entry_px[keep],
+            "exit": exit_px[keep],
+            "return": t_ret,
+            "reason": [EXIT_REASONS[int(x)] for x in reason[keep]],
+            "bars": lengths,
+        })
+
+    slots = max(1, int(params.max_positions))
+    daily = port / np.maximum(slots, n_open)
+    equity = np.cumprod(1 + daily)
+    res.equity = pd.Series(equity, index=panel.dates[start_idx:end_idx])
+    res.trades = trades
+    res.total_trades = int(len(trades))
+    res.total_return = float(equity[-1] - 1)
+    n = len(daily)
+    res.annualized_return = float(equity[-1] ** (TRADING_DAYS / n) - 1) if equity[-1] > 0 else -1.0
+    sd = float(daily.std(ddof=1)) if n > 1 else 0.0
+    res.volatility = sd * math.sqrt(TRADING_DAYS)
+    res.sharpe_ratio = float(daily.mean() / sd * math.sqrt(TRADING_DAYS)) if sd > 0 else 0.0
+    res.max_drawdown = float(-(equity / np.maximum.accumulate(equity) - 1).min())
+    res.exposure = float(np.minimum(n_open, slots).mean() / slots)
+    if res.total_trades:
+        rets = trades["return"].to_numpy()
+        res.win_rate = float((rets > 0).mean())
+        res.avg_trade_return = float(rets.mean())
+        losses = -rets[rets < 0].sum()
+        res.profit_factor = float(rets[rets > 0].sum() / losses) if losses > 0 else float("inf")
+    return res
+
+
+# -----------------------------------------------------------------------------
+# Validation windows
+# -----------------------------------------------------------------------------
+
+def validation_windows(
+    dates: pd.DatetimeIndex,
+    start: Any,
+    train_months: int,
+    test_months: int,
+    anchored: bool = False,
+) -> List[Tuple[int, int, int]]:
+    """(train_start, test_start, test_end) bar indices; test windows tile the
+    range in test_months steps. anchored=True keeps the train start fixed
+    (walk-forward), otherwise the train window rolls."""
+    out: List[Tuple[int, int, int]] = []
+    if len(dates) == 0:
+        return out
+    first = max(pd.Timestamp(start), dates[0])
+    last = dates[-1]
+    t0 = first
+    while True:
+        train_start = first if anchored else t0
+        test_start = t0 + pd.DateOffset(months=train_months)
+        test_end = test_start + pd.DateOffset(months=test_months)
+        if test_end > last + pd.Timedelta(days=1):
+            break
+        out.append((int(dates.searchsorted(train_start)), int(dates.searchsorted(test_start)), int(dates.searchsorted(test_end))))
+        t0 = t0 + pd.DateOffset(months=test_months)
+    return out
+
+
+DEFAULT_GRID: Dict[str, List[Any]] = {
+    "rsi_lower": [25, 30, 35],
+    "bb_lower": [10, 20, 30],
+    "volume_threshold": [1.2, 1.5, 2.0],
+    "stop_atr_mult": [1.0, 1.5, 2.0],
+    "target_atr_mult": [2.0, 3.0, 4.0],
+}
+
+
+def _score(res: BacktestResults, min_trades: int) -> float:
+    return res.sharpe_ratio if res.total_trades >= min_trades else float("-inf")
+
+
+# -----------------------------------------------------------------------------
+# Backtester
+# -----------------------------------------------------------------------------
+
+def _to_symbol(s: str) -> str:
+    s = (s or "").strip().upper()
+    return s if ("." in s or s.startswith("^")) else f"{s}.NS"
+
 
 class EnhancedBacktester:
-    """Placeholder for enhanced backtesting functionality."""
-    def __init__(self, parameters=None):
+    """Cache-backed, vectorized backtester used by the screener's --backtest,
+    --optimize and --validate flags."""
+
+    def __init__(self, parameters: Optional[BacktestParameters] = None, cache=None, offline: bool = False):
         self.parameters = parameters or BacktestParameters()
-    
-    def run(self, *args, **kwargs):
-        """Placeholder run method."""
-        print("⚠️  Enhanced backtesting not fully implemented")
-        return {}
-
-# Module is available but features are minimal
-__version__ = "0.1.0-stub"
+        self.cache = cache
+        self.offline = offline
+        self._panel: Optional[PricePanel] = None
+        self._ind: Optional[PanelIndicators] = None
+        self._panel_key: Optional[Tuple] = None
+        self.last_optimization: Optional[pd.DataFrame] = None
+
+    # ----------------------------------------------------------------- data
+    def set_panel(self, panel: PricePanel) -> None:
+        """Use pre-built bars (tests, benchmarks, recorded data)."""
+        self._panel, self._ind = panel, PanelIndicators(panel)
+        self._panel_key = ("explicit", id(panel))
+
+    def load(self, symbols: Sequence[str], start_date: Any, end_date: Any = None) -> Tuple[PricePanel, PanelIndicators]:
+        syms = tuple(dict.fromkeys(_to_symbol(s) for s in symbols if s))
+        start = pd.Timestamp(start_date) - timedelta(days=WARMUP_DAYS)
+        if self._panel is not None and self._panel_key is not None:
+            if self._panel_key[0] == "explicit":
+                return self._panel, self._ind
+            if self._panel_key[0] == syms and self._panel_key[1] <= start:
+                return self._panel, self._ind
+        if self.cache is None:
+            from ohlcv_cache import get_ohlcv_cache
+            self.cache = get_ohlcv_cache()
+        lookback = (datetime.now() - start.to_pydatetime()).days + 1
+        frames = self.cache.get_many(list(syms), lookback_days=lookback, offline=self.offline)
+        panel = PricePanel.from_frames(frames)
+        self._panel, self._ind, self._panel_key = panel, PanelIndicators(panel), (syms, start)
+        return panel, self._ind
+
+    def _range(self, panel: PricePanel, start_date: Any, end_date: Any) -> Tuple[int, int]:
+        s = panel.index_of(start_date) if start_date else 0
+        e = panel.index_of(end_date, side="right") if end_date else len(panel.dates)
+        return s, e
+
+    # ------------------------------------------------------------- backtest
+    def backtest(
+        self,
+        symbols: Sequence[str],
+        start_date: Any,
+        end_date: Any = None,
+        parameters: Optional[BacktestParameters] = None,
+    ) -> BacktestResults:
+        panel, ind = self.load(symbols, start_date, end_date)
+        s, e = self._range(panel, start_date, end_date)
+        return simulate(panel, ind, parameters or self.parameters, s, e)
+
+    async def run_backtest(self, symbols, start_date, end_date, parameters=None) -> BacktestResults:
+        return self.backtest(symbols, start_date, end_date, parameters)
+
+    def run(self, symbols=None, start_date=None, end_date=None, parameters=None, **kwargs) -> BacktestResults:
+        if not symbols:
+            print("⚠️  No symbols given for backtest")
+            return BacktestResults()
+        start_date = start_date or (datetime.now() - timedelta(days=365 * DEFAULT_VALIDATION_YEARS)).strftime("%Y-%m-%d")
+        return self.backtest(symbols, start_date, end_date, parameters)
+
+    # ------------------------------------------------------------- optimize
+    def _grid(self, base: BacktestParameters, grid: Optional[Dict[str, Iterable[Any]]]) -> List[BacktestParameters]:
+        grid = grid or DEFAULT_GRID
+        keys = list(grid)
+        return [replace(base, **dict(zip(keys, combo))) for combo in itertools.product(*(list(grid[k]) for k in keys))]
+
+    def _optimize_range(self, panel, ind, s, e, candidates, min_trades) -> List[Tuple[BacktestParameters, BacktestResults]]:
+        scored = [(p, simulate(panel, ind, p, s, e)) for p in candidates]
+        scored.sort(key=lambda pr: _score(pr[1], min_trades), reverse=True)
+        return scored
+
+    def optimize(
+        self,
+        symbols: Sequence[str],
+        start_date: Any,
+        end_date: Any = None,
+        grid: Optional[Dict[str, Iterable[Any]]] = None,
+        min_trades: int = 10,
+        method: str = "grid",
+        n_trials: int = 500,
+        workers: Optional[int] = None,
+        oos_fraction: float = 0.3,
+    ) -> BacktestParameters:
+        """Parallel sweep (parameter_optimizer) ranked by in-sample sharpe over the
+        first part of the range; the ranked table, with out-of-sample metrics for
+        the held-out tail, is kept in last_optimization."""
+        from parameter_optimizer import ParameterSweep, best_parameters
+        panel, ind = self.load(symbols, start_date, end_date)
+        s, e = self._range(panel, start_date, end_date)
+        sweep = ParameterSweep(panel, ind, base=self.parameters, workers=workers, min_trades=min_trades)
+        self.last_optimization = sweep.run(
+            space=grid or DEFAULT_GRID, method=method, n_trials=n_trials, start_idx=s, end_idx=e, oos_fraction=oos_fraction,
+        )
+        return best_parameters(self.last_optimization, self.parameters)
+
+    async def optimize_parameters(self, symbols, start_date, end_date, **kwargs) -> BacktestParameters:
+        return self.optimize(symbols, start_date, end_date, **kwargs)
+
+    # ------------------------------------------------------------- validate
+    def validate(
+        self,
+        symbols: Sequence[str],
+        train_months: int = 12,
+        test_months: int = 3,
+        parameters: Optional[BacktestParameters] = None,
+        start_date: Any = None,
+        end_date: Any = None,
+        anchored: bool = False,
+        reoptimize: bool = False,
+        grid: Optional[Dict[str, Iterable[Any]]] = None,
+        min_trades: int = 10,
+    ) -> List[BacktestResults]:
+        """Out-of-sample results per test window.
+
+        With reoptimize=True the grid is searched on each train window and the
+        winner is scored on the following test window (walk-forward); otherwise
+        the given parameters are scored on every test window.
+        """
+        end = pd.Timestamp(end_date) if end_date else pd.Timestamp(datetime.now().date())
+        start = pd.Timestamp(start_date) if start_date else end - pd.DateOffset(years=DEFAULT_VALIDATION_YEARS)
+        panel, ind = self.load(symbols, start, end)
+        e_idx = panel.index_of(end, side="right")
+        windows = validation_windows(panel.dates[:e_idx], start, train_months, test_months, anchored=anchored)
+        base = parameters or self.parameters
+        candidates = self._grid(base, grid) if reoptimize else None
+        out: List[BacktestResults] = []
+        for tr_s, te_s, te_e in windows:
+            params = base
+            if candidates:
+                ranked = self._optimize_range(panel, ind, tr_s, te_s, candidates, min_trades)
+                params = ranked[0][0] if ranked else base
+            res = simulate(panel, ind, params, te_s, te_e)
+            res.window = {
+                "train_start": panel.dates[tr_s].date().isoformat(),
+                "test_start": panel.dates[te_s].date().isoformat(),
+                "test_end": panel.dates[te_e - 1].date().isoformat(),
+            }
+            out.append(res)
+        return out
+
+    async def rolling_window_validation(self, symbols, train_months=12, test_months=3, parameters=None, **kwargs) -> List[BacktestResults]:
+        return self.validate(symbols, train_months, test_months, parameters, **kwargs)
+
+    async def walk_forward_validation(self, symbols, train_months=12, test_months=3, parameters=None, **kwargs) -> List[BacktestResults]:
+        kwargs.setdefault("anchored", True)
+        kwargs.setdefault("reoptimize", True)
+        return self.validate(symbols, train_months, test_months, parameters, **kwargs)
+
+
+# -----------------------------------------------------------------------------
+# CLI
+# -----------------------------------------------------------------------------
+
+def synthetic_panel(n_symbols: int, years: int, seed: int = 7) -> PricePanel:
+    """Random-walk OHLCV panel for speed checks."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=int(years * TRADING_DAYS))
+    t, n = len(dates), n_symbols
+    rets = rng.normal(0.0003, 0.02, size=(t, n))
+    close = 100 * np.exp(np.cumsum(rets, axis=0))
+    open_ = close * np.exp(rng.normal(0, 0.005, size=(t, n)))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, size=(t, n))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, size=(t, n))))
+    volume = rng.lognormal(12, 0.6, size=(t, n))
+    return PricePanel(dates, [f"SYN{i:04d}.NS" for i in range(n)], open_, high, low, close, volume)
+
+
+def _print_results(res: BacktestResults) -> None:
+    print(f"   Period: {res.start_date} to {res.end_date}")
+    print(f"   Total Return: {res.total_return:.2%}   Annualized: {res.annualized_return:.2%}")
+    print(f"   Max Drawdown: {res.max_drawdown:.2%}   Sharpe: {res.sharpe_ratio:.2f}   Vol: {res.volatility:.2%}")
+    print(f"   Trades: {res.total_trades} (signals {res.signals})   Win Rate: {res.win_rate:.2%}   Avg Trade: {res.avg_trade_return:.2%}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Vectorized backtest of the screener signal strategy")
+    ap.add_argument("--symbols", nargs="*", default=[])
+    ap.add_argument("--start", default=None)
+    ap.add_argument("--end", default=None)
+    ap.add_argument("--offline", action="store_true", help="Use cached bars only")
+    ap.add_argument("--validate", action="store_true", help="Rolling-window validation")
+    ap.add_argument("--walk-forward", action="store_true", help="Anchored walk-forward with re-optimization")
+    ap.add_argument("--train-months", type=int, default=12)
+    ap.add_argument("--test-months", type=int, default=3)
+    ap.add_argument("--synthetic", type=int, default=0, help="Backtest N synthetic tickers instead (speed check)")
+    ap.add_argument("--years", type=int, default=10)
+    args = ap.parse_args()
+
+    bt = EnhancedBacktester(offline=args.offline)
+    if args.synthetic:
+        t0 = time.perf_counter()
+        bt.set_panel(synthetic_panel(args.synthetic, args.years))
+        t1 = time.perf_counter()
+        res = bt.backtest([], bt._panel.dates[0])
+        t2 = time.perf_counter()
+        print(f"📊 Synthetic {args.synthetic} tickers x {len(bt._panel.dates)} bars: "
+              f"indicators {t1 - t0:.2f}s, backtest {t2 - t1:.2f}s")
+        _print_results(res)
+        symbols, start = [], bt._panel.dates[0]
+    else:
+        if not args.symbols:
+            ap.error("--symbols or --synthetic is required")
+        symbols = args.symbols
+        start = args.start or (datetime.now() - timedelta(days=365 * DEFAULT_VALIDATION_YEARS)).strftime("%Y-%m-%d")
+        t0 = time.perf_counter()
+        res = bt.backtest(symbols, start, args.end)
+        print(f"📈 Backtest ({time.perf_counter() - t0:.2f}s)")
+        _print_results(res)
+
+    if args.validate or args.walk_forward:
+        t0 = time.perf_counter()
+        results = bt.validate(
+            symbols, args.train_months, args.test_months, start_date=start, end_date=args.end,
+            anchored=args.walk_forward, reoptimize=args.walk_forward,
+        )
+        print(f"\n🔄 {'Walk-forward' if args.walk_forward else 'Rolling'} validation: {len(results)} windows ({time.perf_counter() - t0:.2f}s)")
+        for r in results:
+            print(f"   {r.window['test_start']}..{r.window['test_end']}: ret {r.total_return:+.2%} "
+                  f"sharpe {r.sharpe_ratio:.2f} trades {r.total_trades}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
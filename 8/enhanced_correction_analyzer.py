@@ -21,7 +21,7 @@ Usage:
 import logging
 import pandas as pd
 import numpy as np
-import yfinance as yf
+import yf_gateway as yf
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Tuple
 import os
@@ -62,8 +62,12 @@ class FrontierAIOrchestrator:
         
         return headlines[:10]  # Max 10 headlines
     
-    def process_ticker(self, ticker: str, row: pd.Series) -> dict:
-        """Process a single ticker through full pipeline."""
+    def process_ticker(self, ticker: str, row: pd.Series, quant=None, news_headlines=None, news=None) -> dict:
+        """Process a single ticker through full pipeline.
+
+        quant, news_headlines and news (NewsMetrics) may be precomputed by
+        run(); whatever is missing is computed here.
+        """
         result = {
             'ticker': ticker,
             'marketcap_cr': row.get('marketcap_cr', 0),
@@ -71,8 +75,9 @@ class FrontierAIOrchestrator:
         }
         
         # Step 1: Compute quant features
-        engine = QuantFeatureEngine(use_demo=self.demo)
-        quant = engine.compute_features(ticker)
+        if quant is None:
+            engine = QuantFeatureEngine(use_demo=self.demo)
+            quant = engine.compute_features(ticker)
         
         if quant is None:
             logger.warning(f"Failed to compute features for {ticker}")
@@ -95,9 +100,10 @@ class FrontierAIOrchestrator:
         })
         
         # Step 2: Score news
-        scorer = LLMNewsScorer()
-        news_headlines = self.load_news_for_ticker(ticker)
-        news = scorer.score_news(news_headlines, ticker)
+        if news_headlines is None:
+            news_headlines = self.load_news_for_ticker(ticker)
+        if news is None:
+            news = LLMNewsScorer().score_news(news_headlines, ticker)
         
         result.update({
             'catalyst_type': news.catalyst_type,
@@ -150,12 +156,21 @@ class FrontierAIOrchestrator:
         
         logger.info(f"Processing {len(top25)} tickers...")
         results = []
+
+        # All quant features in one panel load; missing tickers retry one by one
+        tickers = top25['ticker'].tolist()
+        engine = QuantFeatureEngine(use_demo=self.demo)
+        quants = engine.compute_features_many(tickers)
+
+        # Every ticker's headlines scored in one scan of the news scorer
+        headlines = {t: self.load_news_for_ticker(t) for t in tickers}
+        news = dict(zip(tickers, LLMNewsScorer().score_news_batch([headlines[t] for t in tickers])))
         
         for idx, row in top25.iterrows():
             ticker = row['ticker']
             logger.info(f"[{idx+1}/{len(top25)}] Processing {ticker}...")
             
-            result = self.process_ticker(ticker, row)
+            result = self.process_ticker(ticker, row, quants.get(ticker), headlines[ticker], news[ticker])
             if result:
                 results.append(result)
         
@@ -5,6 +5,12 @@ HFT-Inspired swing-trading signal generation with LLM-based news scoring.
 
 Features: 20+ quant metrics, news parsing, risk management, gate filters.
 Formula: Alpha = 25×MOM20 + 15×MOM60 + 10×RVOL + 10×SqueezeBO + 10×PBZ + 20×NewsScore + 5×TrendBonus
+
+Panel mode: QuantFeatureEngine.fetch_panel() loads many tickers at once from a
+shared SQLite bar cache (one yf.download for the stale ones),
+compute_panel_features() computes every feature across tickers in one
+vectorized pass, and AlphaCalculator.compute_alpha_panel() /
+RiskManager.compute_levels_panel() evaluate the resulting frame directly.
 """
 
 import pandas as pd
@@ -14,13 +20,23 @@ from datetime import datetime, timedelta
 import warnings
 import json
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import logging
 from pathlib import Path
 import os
+import sqlite3
+import threading
+import time
+
+from rate_limiter import get_bucket
 
 ALLOW_OFFLINE_OHLCV_CACHE = os.getenv('ALLOW_OFFLINE_OHLCV_CACHE', '0').strip() == '1'
+QUANT_PANEL_DB = os.getenv('QUANT_PANEL_DB', os.path.join('offline_ohlcv_cache', 'ohlcv_panel.db'))
+QUANT_PANEL_TTL_MINUTES = float(os.getenv('QUANT_PANEL_TTL_MINUTES', '30'))
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+MIN_BARS = 60
 
 warnings.filterwarnings('ignore')
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -48,6 +64,8 @@ class QuantFeatures:
     setup_earnings_gap_high_rvol: bool
     setup_base_breakout_squeeze: bool
     setup_pullback_20ema: bool
+    volume_z20: float = 0.0
+    trend_strength: float = 0.0
     
     def to_dict(self) -> Dict:
         return self.__dict__
@@ -66,6 +84,127 @@ class NewsMetrics:
     def to_dict(self) -> Dict:
         return self.__dict__
 
+class OHLCVPanelCache:
+    """Daily bars of many tickers in one SQLite table, shared across runs and processes."""
+
+    def __init__(self, db_path: str = QUANT_PANEL_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        con = sqlite3.connect(db_path, timeout=30)
+        try:
+            con.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS bars (
+                    ticker TEXT,
+                    date TEXT,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
+                    PRIMARY KEY (ticker, date)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS fetched (
+                    ticker TEXT PRIMARY KEY,
+                    fetched_at REAL
+                );
+                """
+            )
+            con.commit()
+        finally:
+            con.close()
+
+    def fresh(self, tickers: List[str], ttl_minutes: float) -> set:
+        oldest = time.time() - ttl_minutes * 60
+        con = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            out = set()
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                q = ','.join('?' * len(chunk))
+                out.update(t for t, in con.execute(
+                    f"SELECT ticker FROM fetched WHERE fetched_at>=? AND ticker IN ({q})", [oldest, *chunk]))
+            return out
+        finally:
+            con.close()
+
+    def load(self, tickers: List[str], since: datetime) -> pd.DataFrame:
+        """Long frame: Date, ticker, Open, High, Low, Close, Volume"""
+        frames = []
+        con = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                q = ','.join('?' * len(chunk))
+                frames.append(pd.read_sql_query(
+                    f"SELECT date AS Date, ticker, open AS Open, high AS High, low AS Low, close AS Close, "
+                    f"volume AS Volume FROM bars WHERE date>=? AND ticker IN ({q})",
+                    con, params=[since.strftime('%Y-%m-%d'), *chunk]))
+        finally:
+            con.close()
+        long = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Date', 'ticker'] + PANEL_FIELDS)
+        long['Date'] = pd.to_datetime(long['Date'])
+        return long
+
+    def put(self, long: pd.DataFrame) -> None:
+        """Replace the cached bars of every ticker in `long` and mark them fetched now."""
+        tickers = sorted(set(long['ticker']))
+        rows = list(zip(long['ticker'], long['Date'].dt.strftime('%Y-%m-%d'),
+                        *(long[f].astype(float) for f in PANEL_FIELDS)))
+        now = time.time()
+        with self._lock:
+            con = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                con.executemany("DELETE FROM bars WHERE ticker=?", [(t,) for t in tickers])
+                con.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                con.executemany("INSERT OR REPLACE INTO fetched (ticker, fetched_at) VALUES (?, ?)",
+                                [(t, now) for t in tickers])
+                con.commit()
+            finally:
+                con.close()
+
+
+def _frames_to_long(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    parts = []
+    for ticker, df in frames.items():
+        if df is None or df.empty:
+            continue
+        part = df[[f for f in PANEL_FIELDS if f in df.columns]].copy()
+        part.index = pd.to_datetime(part.index).normalize()
+        part = part.rename_axis('Date').reset_index()
+        part['ticker'] = ticker
+        parts.append(part)
+    if not parts:
+        return pd.DataFrame(columns=['Date', 'ticker'] + PANEL_FIELDS)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _long_to_panel(long: pd.DataFrame, min_bars: int = MIN_BARS) -> Dict[str, pd.DataFrame]:
+    """field -> (date x ticker) frame; tickers with fewer than min_bars closes are dropped.
+
+    A ticker missing a bar inside its own date range (halt, late listing on a
+    holiday calendar) carries its prices forward with zero volume there, so
+    rolling windows are not broken by the shared calendar.
+    """
+    if long.empty:
+        return {f: pd.DataFrame() for f in PANEL_FIELDS}
+    long = long.drop_duplicates(subset=['Date', 'ticker'], keep='last')
+    panel = {f: long.pivot(index='Date', columns='ticker', values=f).sort_index().astype(float) for f in PANEL_FIELDS}
+    keep = panel['Close'].columns[panel['Close'].count() >= min_bars]
+    gaps = panel['Close'].isna() & panel['Close'].ffill().notna() & panel['Close'].bfill().notna()
+    for f in ('Open', 'High', 'Low'):
+        panel[f] = panel[f].fillna(panel['Close'].ffill(limit_area='inside').where(gaps))
+    panel['Close'] = panel['Close'].ffill(limit_area='inside')
+    panel['Volume'] = panel['Volume'].mask(gaps, 0.0)
+    return {f: frame[keep] for f, frame in panel.items()}
+
+
+def _at_last_bar(frame: pd.DataFrame, positions: np.ndarray) -> np.ndarray:
+    """Value of each column at its ticker's last bar (row position per column)."""
+    return frame.to_numpy()[positions, np.arange(frame.shape[1])]
+
+
 class QuantFeatureEngine:
     """Compute 20+ HFT-style quant features."""
     
@@ -356,6 +495,12 @@ class QuantFeatureEngine:
             _, signal = self.compute_macd(df)
             macd_signal = signal.iloc[-1]
 
+            # Volume z-score and trend strength (distance from SMA50 in ATRs)
+            vol_mean = df['Volume'].rolling(20).mean().iloc[-1]
+            vol_std = df['Volume'].rolling(20).std().iloc[-1]
+            volume_z20 = (current['Volume'] - vol_mean) / vol_std
+            trend_strength = (close - sma50) / atr20
+
             # Expert setups thresholds from config
             setups_cfg = (self.config.get('setups') or {})
             egap_cfg = setups_cfg.get('earnings_gap_rvol', {})
@@ -392,11 +537,240 @@ class QuantFeatureEngine:
                 setup_earnings_gap_high_rvol=setup_earnings_gap_high_rvol,
                 setup_base_breakout_squeeze=setup_base_breakout_squeeze,
                 setup_pullback_20ema=setup_pullback_20ema,
+                volume_z20=float(volume_z20),
+                trend_strength=float(trend_strength),
             )
         except Exception as e:
             logger.error(f"Error computing features for {ticker}: {e}")
             return None
 
+    def _panel_cache(self) -> OHLCVPanelCache:
+        if getattr(self, '_panel', None) is None:
+            self._panel = OHLCVPanelCache()
+        return self._panel
+
+    def _download_many(self, tickers: List[str], start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """One yf.download for all tickers; returns the long frame of those with data."""
+        bucket = get_bucket('yahoo')
+        bucket.acquire()
+        try:
+            data = yf.download(tickers, start=start_date, end=end_date, progress=False, timeout=10,
+                               group_by='column', threads=True)
+        except Exception as e:
+            bucket.report_error(e)
+            logger.warning(f"Batch download of {len(tickers)} tickers failed ({type(e).__name__})")
+            return _frames_to_long({})
+        if data is None or data.empty:
+            return _frames_to_long({})
+        bucket.reward()
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([data.columns, tickers[:1]])
+        frames = {}
+        for ticker in tickers:
+            cols = {f: data[(f, ticker)] for f in PANEL_FIELDS if (f, ticker) in data.columns}
+            if 'Close' in cols:
+                frames[ticker] = pd.DataFrame(cols, index=data.index).dropna(subset=['Close'])
+        return _frames_to_long(frames)
+
+    def fetch_panel(self, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """OHLCV for many tickers as field -> (date x ticker) frames.
+
+        Tickers fetched within QUANT_PANEL_TTL_MINUTES come from the shared
+        panel cache; the rest are downloaded in one call and written back.
+        With ALLOW_OFFLINE_OHLCV_CACHE, tickers whose download failed fall
+        back to stale panel rows, then to the per-ticker CSVs.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return _long_to_panel(_frames_to_long({}))
+        if self.use_demo:
+            return _long_to_panel(_frames_to_long({t: self._generate_demo_data(t) for t in tickers}))
+
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=self.lookback_days)
+        cache = self._panel_cache()
+        fresh = cache.fresh(tickers, QUANT_PANEL_TTL_MINUTES)
+        missing = [t for t in tickers if t not in fresh]
+        failed: List[str] = []
+        if missing:
+            downloaded = self._download_many(missing, start_date, end_date)
+            got = set(downloaded['ticker']) if not downloaded.empty else set()
+            if got:
+                cache.put(downloaded)
+            failed = [t for t in missing if t not in got]
+
+        usable = [t for t in tickers if t not in failed or self.allow_offline_cache]
+        long = cache.load(usable, start_date)
+        if failed and self.allow_offline_cache:
+            have = set(long['ticker'])
+            csv_frames = {t: self._load_offline_data(t) for t in failed if t not in have}
+            long = pd.concat([long, _frames_to_long(csv_frames)], ignore_index=True)
+        return _long_to_panel(long)
+
+    def compute_panel_features(self, panel: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """All QuantFeatures fields for every ticker in the panel (one row per ticker).
+
+        Same formulas as compute_features, evaluated column-wise on the
+        (date x ticker) frames and read off at each ticker's last bar.
+        """
+        close, high, low = panel['Close'], panel['High'], panel['Low']
+        open_, volume = panel['Open'], panel['Volume']
+        if close.empty:
+            return pd.DataFrame(columns=[f for f in QuantFeatures.__dataclass_fields__ if f != 'ticker'])
+
+        prev_close = close.shift(1)
+        true_range = np.fmax(high - low, np.fmax((high - prev_close).abs(), (low - prev_close).abs()))
+        atr20 = true_range.rolling(20).mean()
+
+        def momentum(period: int) -> pd.DataFrame:
+            roc = (close - close.shift(period)) / close.shift(period) * 100
+            return np.tanh(roc / 20) * 50 + 50
+
+        vol_mean = volume.rolling(20).mean()
+        vol_std = volume.rolling(20).std()
+        sma20 = close.rolling(20).mean()
+        std20 = close.rolling(20).std()
+        bb_upper, bb_lower = sma20 + 2 * std20, sma20 - 2 * std20
+        squeeze = (bb_upper < sma20 + 1.5 * atr20) & (bb_lower > sma20 - 1.5 * atr20)
+        breakout = pd.DataFrame(np.where(close > high.rolling(20).max().shift(1), 1, 0), index=close.index, columns=close.columns)
+        breakout = breakout.mask(close < low.rolling(20).min().shift(1), -1)
+        pbz = (50 + 50 * (close - sma20) / (bb_upper - bb_lower)).clip(0, 100)
+        sma50 = close.rolling(50).mean()
+        sma200 = close.rolling(200).mean()
+        delta = close.diff()
+        rsi = 100 - (100 / (1 + delta.where(delta > 0, 0).rolling(14).mean() / (-delta.where(delta < 0, 0)).rolling(14).mean()))
+        macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+        ema20 = close.ewm(span=20).mean()
+        gap_pct = (open_ - prev_close) / prev_close
+
+        last = close.index.get_indexer(close.apply(pd.Series.last_valid_index))
+        at = lambda frame: _at_last_bar(frame, last)
+        last_close = at(close)
+        feats = pd.DataFrame({
+            'close': last_close,
+            'atr20': at(atr20),
+            'momentum_3': at(momentum(3)),
+            'momentum_20': at(momentum(20)),
+            'momentum_60': at(momentum(60)),
+            'rvol': at(volume / vol_mean),
+            'squeeze': at(squeeze).astype(bool),
+            'squeeze_bb_width': at(bb_upper - bb_lower),
+            'breakout': at(breakout).astype(int),
+            'pbz': at(pbz),
+            'trend_sma50': last_close > at(sma50),
+            'trend_sma200': last_close > at(sma200),
+            'rsi_14': at(rsi),
+            'macd_signal': at(macd.ewm(span=9).mean()),
+            'ema20': at(ema20),
+            'volume_z20': at((volume - vol_mean) / vol_std),
+            'trend_strength': at((close - sma50) / atr20),
+        }, index=close.columns)
+
+        # Expert setups thresholds from config
+        setups_cfg = (self.config.get('setups') or {})
+        egap_cfg = setups_cfg.get('earnings_gap_rvol', {})
+        gap_thr = float(egap_cfg.get('gap_up_threshold_pct', 2.0)) / 100.0
+        rvol_thr = float(egap_cfg.get('rvol_threshold', 1.8))
+        ema_tol = float(setups_cfg.get('pullback_20ema', {}).get('tolerance_pct', 1.5)) / 100.0
+
+        gap = np.nan_to_num(at(gap_pct), nan=0.0)
+        feats['setup_earnings_gap_high_rvol'] = (gap >= gap_thr) & (feats['rvol'] >= rvol_thr)
+        feats['setup_base_breakout_squeeze'] = feats['squeeze'] & (feats['breakout'] > 0)
+        near_ema = (feats['close'] - feats['ema20']).abs() / feats['ema20'].clip(lower=1e-6) <= ema_tol
+        feats['setup_pullback_20ema'] = feats['trend_sma50'] & near_ema
+        return feats
+
+    @staticmethod
+    def features_from_panel(features: pd.DataFrame) -> Dict[str, QuantFeatures]:
+        """QuantFeatures objects from compute_panel_features rows."""
+        out = {}
+        for ticker, row in zip(features.index, features.to_dict('records')):
+            row['breakout'] = int(row['breakout'])
+            for flag in ('squeeze', 'trend_sma50', 'trend_sma200', 'setup_earnings_gap_high_rvol',
+                         'setup_base_breakout_squeeze', 'setup_pullback_20ema'):
+                row[flag] = bool(row[flag])
+            out[ticker] = QuantFeatures(ticker=ticker, **row)
+        return out
+
+    def compute_features_many(self, tickers: List[str]) -> Dict[str, QuantFeatures]:
+        """compute_features for many tickers via one panel load and one vectorized pass."""
+        return self.features_from_panel(self.compute_panel_features(self.fetch_panel(tickers)))
+
+class NewsTermAutomaton:
+    """Literal term lists compiled into one trie-shaped regex, scanned once per batch.
+
+    Each family is (terms, bounded): the terms in the priority order of the
+    alternation or word list it replaces. count() reproduces re.findall /
+    str.count per family (leftmost, non-overlapping, first listed term wins at
+    a position), with \\b on both ends for bounded families.
+    """
+
+    _WORD = re.compile(r'\w')
+
+    def __init__(self, families: Dict[object, Tuple[List[str], bool]]):
+        self.families = families
+        terms = sorted({t for ts, _ in families.values() for t in ts})
+        # Lookahead: every position, longest term starting there
+        self.pattern = re.compile('(?=(' + self._trie_regex(terms) + '))')
+        # Every term matching at a position is a prefix of the longest one
+        self._plans: Dict[str, List[Tuple[object, List[str], bool]]] = {}
+        for longest in terms:
+            plan = []
+            for name, (ts, bounded) in families.items():
+                cands = [t for t in ts if longest.startswith(t)]
+                if cands:
+                    plan.append((name, cands if bounded else cands[:1], bounded))
+            self._plans[longest] = plan
+
+    @staticmethod
+    def _trie_regex(terms: List[str]) -> str:
+        trie: Dict = {}
+        for t in terms:
+            node = trie
+            for ch in t:
+                node = node.setdefault(ch, {})
+            node[''] = {}
+
+        def build(node: Dict) -> str:
+            alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+            if not alts:
+                return ''
+            body = alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+            return f'(?:{body})?' if '' in node else body
+
+        return build(trie)
+
+    def count(self, text: str, starts: List[int]) -> Dict[int, Dict[object, int]]:
+        """Family counts per segment index (only segments and families with matches).
+
+        Segments start at `starts` and never share a match.
+        """
+        counts: Dict[int, Dict[object, int]] = {}
+        cursor = dict.fromkeys(self.families, 0)
+        word = self._WORD.match
+        n = len(text)
+        for m in self.pattern.finditer(text):
+            p = m.start()
+            seg = None
+            for name, cands, bounded in self._plans[m.group(1)]:
+                if p < cursor[name]:
+                    continue
+                if bounded:
+                    # Terms are words: \b means no word character just outside them
+                    if p > 0 and word(text, p - 1):
+                        continue
+                    term = next((t for t in cands if p + len(t) == n or not word(text, p + len(t))), None)
+                    if term is None:
+                        continue
+                else:
+                    term = cands[0]
+                if seg is None:
+                    seg = counts.setdefault(bisect_right(starts, p) - 1, {})
+                seg[name] = seg.get(name, 0) + 1
+                cursor[name] = p + len(term)
+        return counts
+
+
 class LLMNewsScorer:
     """Extract catalysts from news and score sentiment/certainty."""
     
@@ -418,17 +792,52 @@ class LLMNewsScorer:
         'negative': ['fall', 'drop', 'crash', 'decline', 'miss', 'loss', 'weak', 'down', 'down', 'struggle', 'risk'],
         'neutral': ['announce', 'report', 'file', 'update', 'begin', 'plan']
     }
+
+    ACTION_WORDS = ['announced', 'approved', 'signed', 'launched', 'completed', 'reported', 'filed', 'declared',
+                    'awarded', 'acquired']
+    SPECULATION_WORDS = ['may', 'might', 'could', 'possibly', 'potentially', 'expects', 'plans', 'considering',
+                         'exploring']
+    AMOUNT_WORDS = ['crore', 'million', 'billion', 'lakh']
+
+    DEAL_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+        r'₹\s*([0-9,]+(?:\.[0-9]+)?)\s*(?:cr|crore)',
+        r'\$\s*([0-9,]+(?:\.[0-9]+)?)\s*(?:mn|million)',
+        r'€\s*([0-9,]+(?:\.[0-9]+)?)\s*(?:mn|million)',
+        r'([0-9,]+(?:\.[0-9]+)?)\s*(?:cr|crore)',
+    )]
+
+    # Certainty markers that are patterns rather than term lists
+    CERTAINTY_PATTERNS = {
+        'numbers': re.compile(r'\d{1,4}[,\d]*(?:\.\d+)?'),
+        'percentages': re.compile(r'\d+(?:\.\d+)?%'),
+        'amounts': re.compile(r'[₹$€]\s*\d+'),
+        'dates': re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}'),
+        'quarters': re.compile(r'\bq[1-4]\b|\bfirst quarter\b|\bsecond quarter\b|\bthird quarter\b|\bfourth quarter\b'),
+        'years': re.compile(r'\b20\d{2}\b|\bfy\d{2}\b'),
+    }
+
+    _automaton: Optional[NewsTermAutomaton] = None
+
+    @classmethod
+    def _compiled(cls) -> NewsTermAutomaton:
+        """Catalyst, sentiment, action/speculation and amount terms in one automaton (built once)."""
+        if cls._automaton is None:
+            families: Dict[object, Tuple[List[str], bool]] = {
+                ('catalyst', cat): (pat.strip('()').split('|'), False) for cat, pat in cls.CATALYST_TYPES.items()
+            }
+            for polarity in ('positive', 'negative'):
+                for i, w in enumerate(cls.SENTIMENT_WORDS[polarity]):
+                    families[(polarity, i)] = ([w], False)
+            families['action'] = (cls.ACTION_WORDS, True)
+            families['speculation'] = (cls.SPECULATION_WORDS, True)
+            families['amount_words'] = (cls.AMOUNT_WORDS, False)
+            cls._automaton = NewsTermAutomaton(families)
+        return cls._automaton
     
     def parse_deal_value(self, text: str) -> float:
         """Extract deal value in crores."""
-        patterns = [
-            r'₹\s*([0-9,]+(?:\.[0-9]+)?)\s*(?:cr|crore)',
-            r'\$\s*([0-9,]+(?:\.[0-9]+)?)\s*(?:mn|million)',
-            r'€\s*([0-9,]+(?:\.[0-9]+)?)\s*(?:mn|million)',
-            r'([0-9,]+(?:\.[0-9]+)?)\s*(?:cr|crore)',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in self.DEAL_PATTERNS:
+            match = pattern.search(text)
             if match and match.group(1):  # Check group exists and is not empty
                 try:
                     val = float(match.group(1).replace(',', ''))
@@ -444,82 +853,77 @@ class LLMNewsScorer:
     
     def score_news(self, headlines: List[str], ticker: str = '') -> NewsMetrics:
         """Score news headlines for catalysts, sentiment, and certainty."""
-        if not headlines:
-            return NewsMetrics('none', 0, 0, 'neutral', 0, 'no_news', '')
-        
-        combined_text = ' '.join(headlines).lower()
-        
-        # Detect catalysts
-        catalyst_counts = {cat: len(re.findall(pat, combined_text)) for cat, pat in self.CATALYST_TYPES.items()}
-        primary_catalyst = max(catalyst_counts.items(), key=lambda x: x[1])
-        
-        # Sentiment
-        pos_count = sum(combined_text.count(w) for w in self.SENTIMENT_WORDS['positive'])
-        neg_count = sum(combined_text.count(w) for w in self.SENTIMENT_WORDS['negative'])
-        sentiment = 'positive' if pos_count > neg_count else ('negative' if neg_count > pos_count else 'neutral')
-        
-        # Deal value
-        deal_value = self.parse_deal_value(combined_text)
-        
-        # IMPROVED CERTAINTY CALCULATION
-        certainty_score = 0
-        
-        # 1. Base score (20 points) - Has news at all
-        certainty_score += 20
-        
-        # 2. Specificity (up to 25 points) - Numbers, percentages, amounts
-        numbers = len(re.findall(r'\d{1,4}[,\d]*(?:\.\d+)?', combined_text))
-        percentages = len(re.findall(r'\d+(?:\.\d+)?%', combined_text))
-        amounts = len(re.findall(r'[₹$€]\s*\d+', combined_text))
-        specificity_score = min(25, numbers * 2 + percentages * 3 + amounts * 5)
-        certainty_score += specificity_score
-        
-        # 3. Temporal markers (up to 15 points) - Dates, quarters, years
-        dates = len(re.findall(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}', combined_text))
-        quarters = len(re.findall(r'\bq[1-4]\b|\bfirst quarter\b|\bsecond quarter\b|\bthird quarter\b|\bfourth quarter\b', combined_text))
-        years = len(re.findall(r'\b20\d{2}\b|\bfy\d{2}\b', combined_text))
-        temporal_score = min(15, dates * 5 + quarters * 3 + years * 2)
-        certainty_score += temporal_score
-        
-        # 4. Action verbs (up to 15 points) - Confirmed actions vs speculation
-        confirmed_actions = len(re.findall(r'\b(?:announced|approved|signed|launched|completed|reported|filed|declared|awarded|acquired)\b', combined_text))
-        speculation_words = len(re.findall(r'\b(?:may|might|could|possibly|potentially|expects|plans|considering|exploring)\b', combined_text))
-        action_score = min(15, confirmed_actions * 3 - speculation_words * 2)
-        action_score = max(0, action_score)  # Don't go negative
-        certainty_score += action_score
-        
-        # 5. Catalyst strength (up to 15 points) - Multiple mentions = stronger
-        catalyst_strength = primary_catalyst[1]
-        catalyst_score = min(15, catalyst_strength * 5)
-        certainty_score += catalyst_score
-        
-        # 6. Deal/financial specificity (up to 10 points) - Real numbers vs vague
-        if deal_value > 0:
-            certainty_score += 10  # Has actual deal value
-        elif any(word in combined_text for word in ['crore', 'million', 'billion', 'lakh']):
-            certainty_score += 5   # Mentions amounts but not parsed
-        
-        # Normalize to 0-100
-        certainty = min(100, certainty_score)
-        
-        # Penalty for test/dummy data
-        if 'full article fetch test' in combined_text:
-            certainty = max(20, certainty - 40)  # Reduce by 40 for test data
-        
-        # Source quality (weighted by headline count and content quality)
-        source_quality = 'premium' if len(headlines) > 5 else 'standard'
-        
-        headline_text = headlines[0] if headlines else ''
-        
-        return NewsMetrics(
-            catalyst_type=primary_catalyst[0],
-            catalyst_count=primary_catalyst[1],
-            deal_value_cr=deal_value,
-            sentiment=sentiment,
-            certainty=int(certainty),
-            source_quality=source_quality,
-            headline_text=headline_text
-        )
+        return self.score_news_batch([headlines])[0]
+
+    def score_news_batch(self, batch: List[List[str]]) -> List[NewsMetrics]:
+        """score_news for many headline lists with one scan of all their text.
+
+        The lowercased texts are joined with NUL separators (no term or
+        pattern can match across one) and scanned once by the term automaton
+        and once per certainty pattern; matches are assigned back to their
+        text by offset.
+        """
+        # \x01 behaves like \x00 for every pattern here, so inputs keep their scores
+        texts = [' '.join(h).lower().replace('\x00', '\x01') if h else '' for h in batch]
+        starts, pos = [], 0
+        for text in texts:
+            starts.append(pos)
+            pos += len(text) + 1
+        joined = '\x00'.join(texts)
+
+        terms = self._compiled().count(joined, starts)
+        starts_arr = np.asarray(starts)
+        marks = {}
+        for name, pattern in self.CERTAINTY_PATTERNS.items():
+            hits = np.fromiter((m.start() for m in pattern.finditer(joined)), dtype=np.int64)
+            marks[name] = np.bincount(np.searchsorted(starts_arr, hits, side='right') - 1, minlength=len(texts)).tolist()
+
+        first_catalyst = next(iter(self.CATALYST_TYPES))
+        positive = [('positive', j) for j in range(len(self.SENTIMENT_WORDS['positive']))]
+        negative = [('negative', j) for j in range(len(self.SENTIMENT_WORDS['negative']))]
+        results = []
+        for i, (headlines, text) in enumerate(zip(batch, texts)):
+            if not headlines:
+                results.append(NewsMetrics('none', 0, 0, 'neutral', 0, 'no_news', ''))
+                continue
+            counts = terms.get(i, {})
+            primary_catalyst = (first_catalyst, 0)
+            pos_count = neg_count = 0
+            if counts:
+                catalyst_counts = {cat: counts.get(('catalyst', cat), 0) for cat in self.CATALYST_TYPES}
+                primary_catalyst = max(catalyst_counts.items(), key=lambda x: x[1])
+                pos_count = sum(counts.get(k, 0) for k in positive)
+                neg_count = sum(counts.get(k, 0) for k in negative)
+            sentiment = 'positive' if pos_count > neg_count else ('negative' if neg_count > pos_count else 'neutral')
+
+            # Every deal pattern needs a digit, which the numbers pattern would have counted
+            deal_value = self.parse_deal_value(text) if marks['numbers'][i] else 0.0
+
+            # Same certainty components as the pattern-by-pattern scorer (see test_news_scorer_batch)
+            specificity_score = min(25, marks['numbers'][i] * 2 + marks['percentages'][i] * 3 + marks['amounts'][i] * 5)
+            temporal_score = min(15, marks['dates'][i] * 5 + marks['quarters'][i] * 3 + marks['years'][i] * 2)
+            action_score = max(0, min(15, counts.get('action', 0) * 3 - counts.get('speculation', 0) * 2))
+            catalyst_score = min(15, primary_catalyst[1] * 5)
+            certainty_score = 20 + specificity_score + temporal_score + action_score + catalyst_score
+            if deal_value > 0:
+                certainty_score += 10
+            elif counts.get('amount_words'):
+                certainty_score += 5
+
+            certainty = min(100, certainty_score)
+            if 'full article fetch test' in text:
+                certainty = max(20, certainty - 40)
+
+            results.append(NewsMetrics(
+                catalyst_type=primary_catalyst[0],
+                catalyst_count=primary_catalyst[1],
+                deal_value_cr=deal_value,
+                sentiment=sentiment,
+                certainty=int(certainty),
+                source_quality='premium' if len(headlines) > 5 else 'standard',
+                headline_text=headlines[0],
+            ))
+        return results
 
 class AlphaCalculator:
     """Compute final alpha score and gate filters."""
@@ -689,6 +1093,74 @@ class AlphaCalculator:
         
         return alpha_final, metrics
 
+    def compute_alpha_panel(self, features: pd.DataFrame,
+                            news: Union[NewsMetrics, Dict[str, NewsMetrics], None] = None) -> pd.DataFrame:
+        """compute_alpha for every row of QuantFeatureEngine.compute_panel_features.
+
+        `news` is one NewsMetrics for all tickers or a per-ticker dict; tickers
+        without news get a neutral 'none' catalyst. Returns the metrics columns
+        of compute_alpha (alpha, gate_flags, final_pick, ...) per ticker.
+        """
+        neutral = NewsMetrics('none', 0, 0.0, 'neutral', 50, 'unknown', '')
+        if isinstance(news, NewsMetrics) or news is None:
+            news_score = np.full(len(features), self.compute_news_score(news or neutral))
+        else:
+            news_score = np.array([self.compute_news_score(news.get(t, neutral)) for t in features.index], dtype=float)
+
+        mom20_norm = np.clip(features['momentum_20'].to_numpy(dtype=float), 0, 100)
+        mom60_norm = np.clip(features['momentum_60'].to_numpy(dtype=float), 0, 100)
+        rvol = features['rvol'].to_numpy(dtype=float)
+        rvol_norm = np.clip(rvol / 3 * 100, 0, 100)
+        squeeze = features['squeeze'].to_numpy(dtype=bool)
+        breakout = features['breakout'].to_numpy(dtype=int)
+        pbz = features['pbz'].to_numpy(dtype=float)
+        squeeze_bo = np.minimum(50 * squeeze + 30 * (breakout > 0) + 20 * (pbz > 60), 100).astype(float)
+        sma50 = features['trend_sma50'].to_numpy(dtype=bool)
+        sma200 = features['trend_sma200'].to_numpy(dtype=bool)
+        trend_bonus = np.where(sma50 & sma200, 20, np.where(sma50, 10, 0)).astype(float)
+
+        setups = [('setup_earnings_gap_high_rvol', 'earnings_gap_rvol', 12, 'egap_rvol'),
+                  ('setup_base_breakout_squeeze', 'base_breakout_squeeze', 10, 'bo_squeeze'),
+                  ('setup_pullback_20ema', 'pullback_20ema', 8, 'pb_ema20')]
+        setup_bonus = np.zeros(len(features))
+        for column, key, default, _ in setups:
+            setup_bonus += features[column].to_numpy(dtype=bool) * self.setup_bonuses.get(key, default)
+        trend_bonus = np.minimum(30, trend_bonus + setup_bonus)
+
+        alpha = (mom20_norm * self.weights['mom20'] +
+                 mom60_norm * self.weights['mom60'] +
+                 rvol_norm * self.weights['rvol'] +
+                 squeeze_bo * self.weights['squeeze_bo'] +
+                 pbz * self.weights['pbz'] +
+                 news_score * self.weights['news'] +
+                 trend_bonus * self.weights['trend_bonus']) / 95
+        alpha_final = np.clip(50 + 50 * np.tanh(alpha / 50 - 1), 0, 100)
+
+        gates = pd.DataFrame({
+            'alpha_pass': alpha_final >= self.gate_thresholds['alpha'],
+            'rvol_pass': rvol >= self.gate_thresholds['rvol'],
+            'trend_pass': sma50,
+            'volatility_pass': squeeze | (breakout > 0),
+        }, index=features.index)
+        gates['all_pass'] = gates.all(axis=1)
+        setup_flags = [','.join(flag for (column, _, _, flag) in setups if row[column])
+                       for row in features[[c for c, _, _, _ in setups]].to_dict('records')]
+
+        return pd.DataFrame({
+            'mom20_norm': mom20_norm,
+            'mom60_norm': mom60_norm,
+            'rvol_norm': rvol_norm,
+            'squeeze_bo': squeeze_bo,
+            'pbz_norm': pbz,
+            'news_score': news_score,
+            'trend_bonus': trend_bonus,
+            'alpha': alpha_final,
+            'gate_flags': ['|'.join(f"{k.replace('_pass', '')}:{v}" for k, v in row.items())
+                           for row in gates.to_dict('records')],
+            'setup_flags': setup_flags,
+            'final_pick': gates['all_pass'].to_numpy(),
+        }, index=features.index)
+
 class RiskManager:
     """ATR-based position sizing and stop/target levels."""
     
@@ -711,6 +1183,22 @@ class RiskManager:
             'trail_update': entry_price  # Current highest close
         }
 
+    @staticmethod
+    def compute_levels_panel(features: pd.DataFrame) -> pd.DataFrame:
+        """compute_levels for every ticker row (entry = last close)."""
+        entry = features['close'].astype(float)
+        atr20 = features['atr20'].astype(float)
+        return pd.DataFrame({
+            'entry': entry,
+            'stop': np.maximum(entry - 1.5 * atr20, entry * 0.95),
+            'tp1': entry + 1.5 * atr20,
+            'tp2': entry + 3.0 * atr20,
+            'tp1_sell_pct': 50,
+            'tp2_sell_pct': 25,
+            'trail_stop': entry - 2.5 * atr20,
+            'trail_update': entry,
+        }, index=features.index)
+
 def main():
     """Example usage."""
     logger.info("Frontier-AI Quant Alpha Core loaded successfully")
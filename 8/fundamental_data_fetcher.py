@@ -1,189 +1,293 @@
-#!/usr/bin/env python3
-"""
-FUNDAMENTAL DATA FETCHER - Comprehensive Financial Analysis
-===========================================================
-Fetches quarterly/annual results, institutional ownership, financial health.
-Uses yfinance for recent data, allows training data for historical context.
-
-Key Features:
-- Quarterly results (Q-o-Q and Y-o-Y growth)
-- Annual results (Y-o-Y comparison)
-- Institutional ownership changes
-- Financial health validation (profitability, net worth)
-- No IP blocking (rate-limited, cached)
-"""
-
-import yfinance as yf
-from datetime import datetime, timedelta
+#!/usr/bin/env python3
+"""
+FUNDAMENTAL DATA FETCHER - Comprehensive Financial Analysis
+===========================================================
+Fetches quarterly/annual results, institutional ownership, financial health.
+Uses yfinance for recent data, allows training data for historical context.
+
+Key Features:
+- Quarterly results (Q-o-Q and Y-o-Y growth)
+- Annual results (Y-o-Y comparison)
+- Institutional ownership changes
+- Financial health validation (profitability, net worth)
+- No IP blocking (shared token bucket, cached per reporting quarter)
+
+Statement sections are fetched concurrently (FETCH_WORKERS threads) through
+the shared yf_gateway, which meters every upstream Yahoo call on the shared
+rate limiter and shares .info / statements between sections. Results are kept in
+an SQLite store (one row per ticker) that stays valid until the company's next
+quarterly results can have been filed, and repeat lookups within a run are
+served from memory.
+
+Usage:
+    fetcher = get_fundamental_fetcher()
+    data = fetcher.fetch_comprehensive_fundamentals('RELIANCE')
+    batch = fetcher.fetch_many(['TCS', 'INFY', 'HDFCBANK'])
+"""
+
+import yf_gateway as yf
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from typing import Dict, Optional, List
 import pandas as pd
-import time
 import json
 import os
+import sqlite3
+import threading
+
+# Per-ticker store (opt-out via env)
+CACHE_DB = 'fundamental_data_cache.db'
+CACHE_DURATION_HOURS = 24          # re-check interval while results are due
+LATE_FILER_RECHECK_DAYS = 7        # re-check interval once the filing deadline has passed
+ALLOW_FUNDAMENTAL_CACHE = os.getenv('ALLOW_FUNDAMENTAL_CACHE', '1').strip() == '1'
+FETCH_WORKERS = 4
+# SEBI LODR: quarterly results within 45 days of quarter end, annual (March quarter) within 60
+RESULTS_FILING_DAYS = 45
+ANNUAL_RESULTS_FILING_DAYS = 60
+
+
+def _quarter_end(d: date) -> date:
+    """Last day of the calendar quarter containing d."""
+    m = ((d.month - 1) // 3 + 1) * 3
+    return date(d.year + (m == 12), (m % 12) + 1, 1) - timedelta(days=1)
+
+
+def results_valid_until(most_recent_quarter: Optional[str], now: Optional[datetime] = None) -> datetime:
+    """Expiry for fundamentals whose latest reported quarter ended on most_recent_quarter.
+
+    No newer results can exist before the following quarter closes; during its
+    filing window the data is re-checked daily, after the deadline weekly.
+    """
+    now = now or datetime.now()
+    try:
+        reported = datetime.strptime(most_recent_quarter, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return now + timedelta(hours=CACHE_DURATION_HOURS)
+    next_end = _quarter_end(_quarter_end(reported) + timedelta(days=1))
+    days = ANNUAL_RESULTS_FILING_DAYS if next_end.month == 3 else RESULTS_FILING_DAYS
+    deadline = next_end + timedelta(days=days)
+    if now.date() <= next_end:
+        return datetime.combine(next_end + timedelta(days=1), datetime.min.time())
+    if now.date() <= deadline:
+        return now + timedelta(hours=CACHE_DURATION_HOURS)
+    return now + timedelta(days=LATE_FILER_RECHECK_DAYS)
+
+
+class FundamentalStore:
+    """SQLite store: ticker -> latest fundamentals with a quarter-aware expiry."""
+
+    def __init__(self, db_path: str = CACHE_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        con = sqlite3.connect(db_path)
+        try:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fundamentals (
+                    ticker TEXT PRIMARY KEY,
+                    fetch_time TEXT,
+                    most_recent_quarter TEXT,
+                    valid_until TEXT,
+                    data TEXT
+                )
+                """
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS idx_fundamentals_valid ON fundamentals(valid_until)")
+            con.commit()
+        finally:
+            con.close()
+
+    def get_many(self, tickers: List[str], now: Optional[datetime] = None) -> Dict[str, Dict]:
+        """Unexpired entries for tickers."""
+        now_iso = (now or datetime.now()).isoformat()
+        out = {}
+        con = sqlite3.connect(self.db_path)
+        try:
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                q = ",".join("?" * len(chunk))
+                for ticker, data in con.execute(
+                        f"SELECT ticker, data FROM fundamentals WHERE valid_until > ? AND ticker IN ({q})",
+                        [now_iso, *chunk]):
+                    try:
+                        out[ticker] = json.loads(data)
+                    except ValueError:
+                        continue
+        finally:
+            con.close()
+        return out
+
+    def put_many(self, results: List[Dict]) -> None:
+        if not results:
+            return
+        rows = []
+        for r in results:
+            mrq = (r.get('quarterly') or {}).get('most_recent_quarter')
+            rows.append((r['ticker'], r['fetch_time'], mrq, results_valid_until(mrq).isoformat(),
+                         json.dumps(r, default=str)))
+        with self._lock:
+            con = sqlite3.connect(self.db_path)
+            try:
+                con.executemany(
+                    "INSERT OR REPLACE INTO fundamentals (ticker, fetch_time, most_recent_quarter, valid_until, data) "
+                    "VALUES (?, ?, ?, ?, ?)", rows)
+                con.commit()
+            finally:
+                con.close()
+
+
+class FundamentalDataFetcher:
+    """
+    Fetches comprehensive fundamental data from yfinance.
+    """
+
+    SECTIONS = ('quarterly', 'annual', 'institutional', 'financial_health')
 
-# Cache to avoid repeated requests (opt-in via env)
-CACHE_FILE = 'fundamental_data_cache.json'
-CACHE_DURATION_HOURS = 24
-ALLOW_FUNDAMENTAL_CACHE = os.getenv('ALLOW_FUNDAMENTAL_CACHE', '0').strip() == '1'
-
-class FundamentalDataFetcher:
-    """
-    Fetches comprehensive fundamental data from yfinance.
-    """
-
-    def __init__(self, use_cache: bool = False):
+    def __init__(self, use_cache: bool = False, max_workers: int = FETCH_WORKERS):
         self.use_cache = bool(use_cache and ALLOW_FUNDAMENTAL_CACHE)
-        self.cache = self._load_cache()
-
-    def _load_cache(self) -> dict:
-        """Load cache from disk."""
-        if not self.use_cache or not os.path.exists(CACHE_FILE):
-            return {}
-
-        try:
-            with open(CACHE_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def _save_cache(self):
-        """Save cache to disk."""
-        if not self.use_cache:
-            return
-
-        try:
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save cache: {e}")
-
-    def _is_cache_valid(self, ticker: str) -> bool:
-        """Check if cached data is still valid."""
-        if not self.use_cache:
-            return False
-        if ticker not in self.cache:
-            return False
-
-        cache_time = self.cache[ticker].get('fetch_time')
-        if not cache_time:
-            return False
-
-        cache_dt = datetime.fromisoformat(cache_time)
-        age_hours = (datetime.now() - cache_dt).total_seconds() / 3600
-
-        return age_hours < CACHE_DURATION_HOURS
-
-    def fetch_comprehensive_fundamentals(self, ticker: str) -> Dict:
-        """
-        Main function: Fetch ALL fundamental data for a ticker.
-
-        Returns comprehensive dictionary with:
-        - Quarterly financials (Q-o-Q, Y-o-Y)
-        - Annual financials (Y-o-Y)
-        - Institutional ownership
-        - Financial health metrics
-        - Validation flags
-        """
-
-        # Check cache first
-        if self._is_cache_valid(ticker):
-            print(f"  Using cached fundamental data for {ticker}")
-            return self.cache[ticker]['data']
-
-        print(f"  Fetching fundamental data for {ticker}...")
-
-        result = {
-            'ticker': ticker,
-            'fetch_time': datetime.now().isoformat(),
-            'quarterly': {},
-            'annual': {},
-            'institutional': {},
-            'financial_health': {},
-            'validation': {},
-            'data_available': False
-        }
-
-        try:
-            ticker_obj = yf.Ticker(f"{ticker}.NS")
-
-            # Fetch all data types
-            result['quarterly'] = self._fetch_quarterly_data(ticker_obj)
-            time.sleep(0.5)  # Rate limiting
-
-            result['annual'] = self._fetch_annual_data(ticker_obj)
-            time.sleep(0.5)
-
-            result['institutional'] = self._fetch_institutional_data(ticker_obj)
-            time.sleep(0.5)
-
-            result['financial_health'] = self._fetch_financial_health(ticker_obj)
-            time.sleep(0.5)
-
-            result['validation'] = self._validate_financial_health(result)
-
-            result['data_available'] = True
-
-            # Cache the result (optional)
-            if self.use_cache:
-                self.cache[ticker] = {
-                    'fetch_time': result['fetch_time'],
-                    'data': result
-                }
-                self._save_cache()
-
-        except Exception as e:
-            print(f"    Warning: Could not fetch fundamental data for {ticker}: {e}")
-            result['error'] = str(e)
-
-        return result
-
-    def _fetch_quarterly_data(self, ticker_obj) -> Dict:
-        """
-        Fetch quarterly financial data and calculate growth rates.
-
-        Returns:
-        - Most recent quarter results
-        - Q-o-Q growth % (vs previous quarter)
-        - Y-o-Y growth % (vs same quarter last year)
-        """
-
-        result = {
-            'data_available': False,
-            'most_recent_quarter': None,
-            'previous_quarter': None,
-            'same_quarter_last_year': None,
-            'revenue_qoq_growth_pct': None,
-            'revenue_yoy_growth_pct': None,
-            'earnings_qoq_growth_pct': None,
-            'earnings_yoy_growth_pct': None,
-            'profit_margin_pct': None,
-            'quarters_available': 0
-        }
-
-        try:
-            # Get quarterly financials
-            quarterly_income = ticker_obj.quarterly_financials
-
-            if quarterly_income is None or quarterly_income.empty:
-                return result
-
-            # Transpose for easier access (dates as rows)
-            quarterly_income = quarterly_income.T
-            quarters_available = len(quarterly_income)
-            result['quarters_available'] = quarters_available
-
-            if quarters_available == 0:
-                return result
-
-            # Get the most recent quarter (index 0)
-            most_recent = quarterly_income.iloc[0]
-            result['most_recent_quarter'] = most_recent.name.strftime('%Y-%m-%d')
-
-            # Extract revenue and earnings
-            revenue_current = self._safe_get(most_recent, ['Total Revenue', 'TotalRevenue'])
-            earnings_current = self._safe_get(most_recent, ['Net Income', 'NetIncome'])
-
-            # Q-o-Q comparison (vs previous quarter)
+        self.max_workers = max(1, max_workers)
+        self.store = FundamentalStore() if self.use_cache else None
+        self._memo: Dict[str, Dict] = {}
+        self._memo_lock = threading.Lock()
+
+    def fetch_comprehensive_fundamentals(self, ticker: str) -> Dict:
+        """
+        Main function: Fetch ALL fundamental data for a ticker.
+
+        Returns comprehensive dictionary with:
+        - Quarterly financials (Q-o-Q, Y-o-Y)
+        - Annual financials (Y-o-Y)
+        - Institutional ownership
+        - Financial health metrics
+        - Validation flags
+        """
+        return self.fetch_many([ticker])[ticker]
+
+    def fetch_many(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Fundamentals for several tickers: memory first, then the store, then
+        one concurrent pass over every (ticker, section) still missing.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with self._memo_lock:
+            out = {t: self._memo[t] for t in tickers if t in self._memo}
+        todo = [t for t in tickers if t not in out]
+
+        if todo and self.store is not None:
+            cached = self.store.get_many(todo)
+            for t in todo:
+                if t in cached:
+                    print(f"  Using cached fundamental data for {t}")
+            out.update(cached)
+            todo = [t for t in todo if t not in cached]
+
+        if todo:
+            fetched = self._fetch_uncached(todo)
+            out.update(fetched)
+            if self.store is not None:
+                self.store.put_many([r for r in fetched.values() if self._cacheable(r)])
+
+        with self._memo_lock:
+            self._memo.update({t: r for t, r in out.items() if self._cacheable(r)})
+        return {t: out[t] for t in tickers}
+
+    def _fetch_uncached(self, tickers: List[str]) -> Dict[str, Dict]:
+        fetchers = {
+            'quarterly': self._fetch_quarterly_data,
+            'annual': self._fetch_annual_data,
+            'institutional': self._fetch_institutional_data,
+            'financial_health': self._fetch_financial_health,
+        }
+        results = {}
+        ticker_objs = {}
+        for ticker in tickers:
+            print(f"  Fetching fundamental data for {ticker}...")
+            results[ticker] = {
+                'ticker': ticker,
+                'fetch_time': datetime.now().isoformat(),
+                'quarterly': {},
+                'annual': {},
+                'institutional': {},
+                'financial_health': {},
+                'validation': {},
+                'data_available': False
+            }
+            try:
+                ticker_objs[ticker] = yf.Ticker(f"{ticker}.NS")
+            except Exception as e:
+                print(f"    Warning: Could not fetch fundamental data for {ticker}: {e}")
+                results[ticker]['error'] = str(e)
+
+        jobs = [(t, s) for t in ticker_objs for s in self.SECTIONS]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs)) or 1) as pool:
+            futures = {job: pool.submit(fetchers[job[1]], ticker_objs[job[0]]) for job in jobs}
+            for (ticker, section), fut in futures.items():
+                try:
+                    results[ticker][section] = fut.result()
+                except Exception as e:
+                    print(f"    Warning: Could not fetch fundamental data for {ticker}: {e}")
+                    results[ticker]['error'] = str(e)
+
+        for ticker in ticker_objs:
+            result = results[ticker]
+            if 'error' not in result:
+                result['validation'] = self._validate_financial_health(result)
+                result['data_available'] = True
+        return results
+
+    @staticmethod
+    def _cacheable(result: Dict) -> bool:
+        """Store only results that carry statement data (failed pulls are retried next time)."""
+        return result.get('data_available') and (
+            result['quarterly'].get('data_available') or result['annual'].get('data_available'))
+
+    def _fetch_quarterly_data(self, ticker_obj) -> Dict:
+        """
+        Fetch quarterly financial data and calculate growth rates.
+
+        Returns:
+        - Most recent quarter results
+        - Q-o-Q growth % (vs previous quarter)
+        - Y-o-Y growth % (vs same quarter last year)
+        """
+
+        result = {
+            'data_available': False,
+            'most_recent_quarter': None,
+            'previous_quarter': None,
+            'same_quarter_last_year': None,
+            'revenue_qoq_growth_pct': None,
+            'revenue_yoy_growth_pct': None,
+            'earnings_qoq_growth_pct': None,
+            'earnings_yoy_growth_pct': None,
+            'profit_margin_pct': None,
+            'quarters_available': 0
+        }
+
+        try:
+            # Get quarterly financials
+            quarterly_income = ticker_obj.quarterly_financials
+
+            if quarterly_income is None or quarterly_income.empty:
+                return result
+
+            # Transpose for easier access (dates as rows)
+            quarterly_income = quarterly_income.T
+            quarters_available = len(quarterly_income)
+            result['quarters_available'] = quarters_available
+
+            if quarters_available == 0:
+                return result
+
+            # Get the most recent quarter (index 0)
+            most_recent = quarterly_income.iloc[0]
+            result['most_recent_quarter'] = most_recent.name.strftime('%Y-%m-%d')
+
+            # Extract revenue and earnings
+            revenue_current = self._safe_get(most_recent, ['Total Revenue', 'TotalRevenue'])
+            earnings_current = self._safe_get(most_recent, ['Net Income', 'NetIncome'])
+
+            # Q-o-Q comparison (vs previous quarter)
             if quarters_available >= 2:
                 previous_quarter = quarterly_income.iloc[1]
                 result['previous_quarter'] = previous_quarter.name.strftime('%Y-%m-%d')
@@ -218,57 +322,57 @@ class FundamentalDataFetcher:
             if (revenue_current is not None and earnings_current is not None
                     and revenue_current != 0):
                 result['profit_margin_pct'] = (earnings_current / revenue_current) * 100
-
-            result['data_available'] = True
-
-        except Exception as e:
-            print(f"    Warning: Quarterly data fetch failed: {e}")
-            result['error'] = str(e)
-
-        return result
-
-    def _fetch_annual_data(self, ticker_obj) -> Dict:
-        """
-        Fetch annual financial data and calculate Y-o-Y growth.
-
-        Returns:
-        - Most recent year results
-        - Y-o-Y growth % (vs previous year)
-        """
-
-        result = {
-            'data_available': False,
-            'most_recent_year': None,
-            'previous_year': None,
-            'revenue_yoy_growth_pct': None,
-            'earnings_yoy_growth_pct': None,
-            'profit_margin_pct': None,
-            'years_available': 0
-        }
-
-        try:
-            # Get annual financials
-            annual_income = ticker_obj.financials
-
-            if annual_income is None or annual_income.empty:
-                return result
-
-            # Transpose for easier access
-            annual_income = annual_income.T
-            years_available = len(annual_income)
-            result['years_available'] = years_available
-
-            if years_available == 0:
-                return result
-
-            # Most recent year
-            most_recent = annual_income.iloc[0]
-            result['most_recent_year'] = most_recent.name.strftime('%Y-%m-%d')
-
-            revenue_current = self._safe_get(most_recent, ['Total Revenue', 'TotalRevenue'])
-            earnings_current = self._safe_get(most_recent, ['Net Income', 'NetIncome'])
-
-            # Y-o-Y comparison
+
+            result['data_available'] = True
+
+        except Exception as e:
+            print(f"    Warning: Quarterly data fetch failed: {e}")
+            result['error'] = str(e)
+
+        return result
+
+    def _fetch_annual_data(self, ticker_obj) -> Dict:
+        """
+        Fetch annual financial data and calculate Y-o-Y growth.
+
+        Returns:
+        - Most recent year results
+        - Y-o-Y growth % (vs previous year)
+        """
+
+        result = {
+            'data_available': False,
+            'most_recent_year': None,
+            'previous_year': None,
+            'revenue_yoy_growth_pct': None,
+            'earnings_yoy_growth_pct': None,
+            'profit_margin_pct': None,
+            'years_available': 0
+        }
+
+        try:
+            # Get annual financials
+            annual_income = ticker_obj.financials
+
+            if annual_income is None or annual_income.empty:
+                return result
+
+            # Transpose for easier access
+            annual_income = annual_income.T
+            years_available = len(annual_income)
+            result['years_available'] = years_available
+
+            if years_available == 0:
+                return result
+
+            # Most recent year
+            most_recent = annual_income.iloc[0]
+            result['most_recent_year'] = most_recent.name.strftime('%Y-%m-%d')
+
+            revenue_current = self._safe_get(most_recent, ['Total Revenue', 'TotalRevenue'])
+            earnings_current = self._safe_get(most_recent, ['Net Income', 'NetIncome'])
+
+            # Y-o-Y comparison
             if years_available >= 2:
                 previous_year = annual_income.iloc[1]
                 result['previous_year'] = previous_year.name.strftime('%Y-%m-%d')
@@ -288,111 +392,111 @@ class FundamentalDataFetcher:
             if (revenue_current is not None and earnings_current is not None
                     and revenue_current != 0):
                 result['profit_margin_pct'] = (earnings_current / revenue_current) * 100
-
-            result['data_available'] = True
-
-        except Exception as e:
-            print(f"    Warning: Annual data fetch failed: {e}")
-            result['error'] = str(e)
-
-        return result
-
-    def _fetch_institutional_data(self, ticker_obj) -> Dict:
-        """
-        Fetch institutional ownership data.
-
-        Returns:
-        - Current institutional ownership %
-        - Change in ownership
-        - Major holders information
-        """
-
-        result = {
-            'data_available': False,
-            'institutional_ownership_pct': None,
-            'institutions_count': None,
-            'top_5_holders_pct': None,
-            'ownership_trend': 'unknown'
-        }
-
-        try:
-            # Get institutional holders
-            institutional_holders = ticker_obj.institutional_holders
-
-            if institutional_holders is not None and not institutional_holders.empty:
-                result['institutions_count'] = len(institutional_holders)
-
-                # Calculate total institutional ownership
-                if 'Shares' in institutional_holders.columns:
-                    total_inst_shares = institutional_holders['Shares'].sum()
-
-                    # Get total shares outstanding
-                    info = ticker_obj.info
-                    shares_outstanding = info.get('sharesOutstanding', 0)
-
-                    if shares_outstanding > 0:
-                        result['institutional_ownership_pct'] = (total_inst_shares / shares_outstanding) * 100
-
-                # Get top 5 holders percentage
-                if 'Holder' in institutional_holders.columns and len(institutional_holders) >= 5:
-                    top_5_shares = institutional_holders.head(5)['Shares'].sum()
-                    shares_outstanding = ticker_obj.info.get('sharesOutstanding', 0)
-                    if shares_outstanding > 0:
-                        result['top_5_holders_pct'] = (top_5_shares / shares_outstanding) * 100
-
-                result['data_available'] = True
-
-            # Try to get major holders (simplified view)
-            major_holders = ticker_obj.major_holders
-            if major_holders is not None and not major_holders.empty:
-                result['major_holders_data'] = True
-
-        except Exception as e:
-            print(f"    Warning: Institutional data fetch failed: {e}")
-            result['error'] = str(e)
-
-        return result
-
-    def _fetch_financial_health(self, ticker_obj) -> Dict:
-        """
-        Fetch financial health indicators.
-
-        Returns:
-        - Profitability metrics
-        - Balance sheet health
-        - Debt metrics
-        - Cash flow health
-        """
-
-        result = {
-            'data_available': False,
-            'is_profitable': None,
-            'net_worth_positive': None,
-            'debt_to_equity': None,
-            'current_ratio': None,
-            'roe_pct': None,
-            'roa_pct': None,
-            'free_cash_flow_positive': None
-        }
-
-        try:
-            info = ticker_obj.info
-
-            # Profitability
-            trailing_eps = info.get('trailingEps')
-            if trailing_eps is not None:
-                result['is_profitable'] = trailing_eps > 0
-
-            # Balance sheet metrics
-            balance_sheet = ticker_obj.balance_sheet
-            if balance_sheet is not None and not balance_sheet.empty:
-                balance_sheet = balance_sheet.T
-                most_recent = balance_sheet.iloc[0]
-
-                # Net worth (Total Assets - Total Liabilities)
-                total_assets = self._safe_get(most_recent, ['Total Assets', 'TotalAssets'])
-                total_liabilities = self._safe_get(most_recent, ['Total Liabilities Net Minority Interest', 'TotalLiabilitiesNetMinorityInterest'])
-
+
+            result['data_available'] = True
+
+        except Exception as e:
+            print(f"    Warning: Annual data fetch failed: {e}")
+            result['error'] = str(e)
+
+        return result
+
+    def _fetch_institutional_data(self, ticker_obj) -> Dict:
+        """
+        Fetch institutional ownership data.
+
+        Returns:
+        - Current institutional ownership %
+        - Change in ownership
+        - Major holders information
+        """
+
+        result = {
+            'data_available': False,
+            'institutional_ownership_pct': None,
+            'institutions_count': None,
+            'top_5_holders_pct': None,
+            'ownership_trend': 'unknown'
+        }
+
+        try:
+            # Get institutional holders
+            institutional_holders = ticker_obj.institutional_holders
+
+            if institutional_holders is not None and not institutional_holders.empty:
+                result['institutions_count'] = len(institutional_holders)
+
+                # Calculate total institutional ownership
+                if 'Shares' in institutional_holders.columns:
+                    total_inst_shares = institutional_holders['Shares'].sum()
+
+                    # Get total shares outstanding
+                    info = ticker_obj.info
+                    shares_outstanding = info.get('sharesOutstanding', 0)
+
+                    if shares_outstanding > 0:
+                        result['institutional_ownership_pct'] = (total_inst_shares / shares_outstanding) * 100
+
+                # Get top 5 holders percentage
+                if 'Holder' in institutional_holders.columns and len(institutional_holders) >= 5:
+                    top_5_shares = institutional_holders.head(5)['Shares'].sum()
+                    shares_outstanding = ticker_obj.info.get('sharesOutstanding', 0)
+                    if shares_outstanding > 0:
+                        result['top_5_holders_pct'] = (top_5_shares / shares_outstanding) * 100
+
+                result['data_available'] = True
+
+            # Try to get major holders (simplified view)
+            major_holders = ticker_obj.major_holders
+            if major_holders is not None and not major_holders.empty:
+                result['major_holders_data'] = True
+
+        except Exception as e:
+            print(f"    Warning: Institutional data fetch failed: {e}")
+            result['error'] = str(e)
+
+        return result
+
+    def _fetch_financial_health(self, ticker_obj) -> Dict:
+        """
+        Fetch financial health indicators.
+
+        Returns:
+        - Profitability metrics
+        - Balance sheet health
+        - Debt metrics
+        - Cash flow health
+        """
+
+        result = {
+            'data_available': False,
+            'is_profitable': None,
+            'net_worth_positive': None,
+            'debt_to_equity': None,
+            'current_ratio': None,
+            'roe_pct': None,
+            'roa_pct': None,
+            'free_cash_flow_positive': None
+        }
+
+        try:
+            info = ticker_obj.info
+
+            # Profitability
+            trailing_eps = info.get('trailingEps')
+            if trailing_eps is not None:
+                result['is_profitable'] = trailing_eps > 0
+
+            # Balance sheet metrics
+            balance_sheet = ticker_obj.balance_sheet
+            if balance_sheet is not None and not balance_sheet.empty:
+                balance_sheet = balance_sheet.T
+                most_recent = balance_sheet.iloc[0]
+
+                # Net worth (Total Assets - Total Liabilities)
+                total_assets = self._safe_get(most_recent, ['Total Assets', 'TotalAssets'])
+                total_liabilities = self._safe_get(most_recent, ['Total Liabilities Net Minority Interest', 'TotalLiabilitiesNetMinorityInterest'])
+
                 if total_assets is not None and total_liabilities is not None:
                     net_worth = total_assets - total_liabilities
                     result['net_worth_positive'] = net_worth > 0
@@ -412,264 +516,277 @@ class FundamentalDataFetcher:
                 if (current_assets is not None and current_liabilities is not None
                         and current_liabilities != 0):
                     result['current_ratio'] = current_assets / current_liabilities
-
-            # ROE and ROA
-            result['roe_pct'] = info.get('returnOnEquity', None)
+
+            # ROE and ROA
+            result['roe_pct'] = info.get('returnOnEquity', None)
             if result['roe_pct'] is not None:
                 result['roe_pct'] *= 100  # Convert to percentage
 
             result['roa_pct'] = info.get('returnOnAssets', None)
             if result['roa_pct'] is not None:
                 result['roa_pct'] *= 100
-
-            # Cash flow
-            cash_flow = ticker_obj.cashflow
-            if cash_flow is not None and not cash_flow.empty:
-                cash_flow = cash_flow.T
-                most_recent_cf = cash_flow.iloc[0]
-
-                free_cash_flow = self._safe_get(most_recent_cf, ['Free Cash Flow', 'FreeCashFlow'])
-                if free_cash_flow is not None:
-                    result['free_cash_flow_positive'] = free_cash_flow > 0
-
-            result['data_available'] = True
-
-        except Exception as e:
-            print(f"    Warning: Financial health fetch failed: {e}")
-            result['error'] = str(e)
-
-        return result
-
-    def _validate_financial_health(self, fundamental_data: Dict) -> Dict:
-        """
-        Validate financial health and return flags.
-
-        Returns validation flags:
-        - Has positive earnings growth
-        - Has positive net worth
-        - Debt is manageable
-        - Overall health status
-        """
-
-        validation = {
-            'quarterly_growth_positive': False,
-            'annual_growth_positive': False,
-            'is_profitable': False,
-            'net_worth_positive': False,
-            'debt_manageable': True,  # Assume true unless proven otherwise
-            'overall_health': 'unknown',
-            'red_flags': [],
-            'green_flags': []
-        }
-
-        # Check quarterly growth
-        quarterly = fundamental_data.get('quarterly', {})
-        if quarterly.get('earnings_yoy_growth_pct') is not None:
-            if quarterly['earnings_yoy_growth_pct'] > 0:
-                validation['quarterly_growth_positive'] = True
-                validation['green_flags'].append(f"Quarterly earnings up {quarterly['earnings_yoy_growth_pct']:.1f}% Y-o-Y")
-            else:
-                validation['red_flags'].append(f"Quarterly earnings down {quarterly['earnings_yoy_growth_pct']:.1f}% Y-o-Y")
-
-        # Check annual growth
-        annual = fundamental_data.get('annual', {})
-        if annual.get('earnings_yoy_growth_pct') is not None:
-            if annual['earnings_yoy_growth_pct'] > 0:
-                validation['annual_growth_positive'] = True
-                validation['green_flags'].append(f"Annual earnings up {annual['earnings_yoy_growth_pct']:.1f}% Y-o-Y")
-            else:
-                validation['red_flags'].append(f"Annual earnings down {annual['earnings_yoy_growth_pct']:.1f}% Y-o-Y")
-
-        # Check profitability
-        health = fundamental_data.get('financial_health', {})
-        if health.get('is_profitable') is True:
-            validation['is_profitable'] = True
-            validation['green_flags'].append("Company is profitable")
-        elif health.get('is_profitable') is False:
-            validation['red_flags'].append("Company is not profitable")
-
-        # Check net worth
-        if health.get('net_worth_positive') is True:
-            validation['net_worth_positive'] = True
-            validation['green_flags'].append("Net worth is positive")
-        elif health.get('net_worth_positive') is False:
-            validation['red_flags'].append("Net worth is negative")
-
-        # Check debt
-        debt_to_equity = health.get('debt_to_equity')
-        if debt_to_equity is not None:
-            if debt_to_equity < 1:
-                validation['green_flags'].append(f"Healthy debt-to-equity ratio: {debt_to_equity:.2f}")
-            elif debt_to_equity > 2:
-                validation['debt_manageable'] = False
-                validation['red_flags'].append(f"High debt-to-equity ratio: {debt_to_equity:.2f}")
-
-        # Overall health assessment
-        if len(validation['red_flags']) == 0:
-            validation['overall_health'] = 'healthy'
-        elif len(validation['red_flags']) >= 3:
-            validation['overall_health'] = 'concerning'
-        else:
-            validation['overall_health'] = 'moderate'
-
-        return validation
-
-    def _safe_get(self, series, keys: List[str]):
-        """Safely get value from series, trying multiple key names."""
-        for key in keys:
-            if key in series.index:
-                value = series[key]
-                if pd.notna(value):
-                    return float(value)
-        return None
-
-    def format_for_ai_prompt(self, fundamental_data: Dict) -> str:
-        """
-        Format fundamental data for AI prompt.
-        Returns human-readable summary string.
-        """
-
-        if not fundamental_data.get('data_available'):
-            return "⚠️ Fundamental data not available for this ticker"
-
-        lines = []
-        lines.append("=" * 80)
-        lines.append("📊 FUNDAMENTAL ANALYSIS DATA (Real-Time from YFinance)")
-        lines.append("=" * 80)
-        lines.append("")
-
-        # Quarterly results
-        quarterly = fundamental_data.get('quarterly', {})
-        if quarterly.get('data_available'):
-            lines.append("📅 QUARTERLY RESULTS:")
-            lines.append(f"  Most Recent Quarter: {quarterly.get('most_recent_quarter', 'N/A')}")
-
-            if quarterly.get('revenue_qoq_growth_pct') is not None:
-                lines.append(f"  Revenue Growth (Q-o-Q): {quarterly['revenue_qoq_growth_pct']:+.2f}%")
-
-            if quarterly.get('revenue_yoy_growth_pct') is not None:
-                lines.append(f"  Revenue Growth (Y-o-Y): {quarterly['revenue_yoy_growth_pct']:+.2f}%")
-
-            if quarterly.get('earnings_qoq_growth_pct') is not None:
-                lines.append(f"  Earnings Growth (Q-o-Q): {quarterly['earnings_qoq_growth_pct']:+.2f}%")
-
-            if quarterly.get('earnings_yoy_growth_pct') is not None:
-                lines.append(f"  Earnings Growth (Y-o-Y): {quarterly['earnings_yoy_growth_pct']:+.2f}%")
-
-            if quarterly.get('profit_margin_pct') is not None:
-                lines.append(f"  Profit Margin: {quarterly['profit_margin_pct']:.2f}%")
-
-            lines.append("")
-
-        # Annual results
-        annual = fundamental_data.get('annual', {})
-        if annual.get('data_available'):
-            lines.append("📈 ANNUAL RESULTS:")
-            lines.append(f"  Most Recent Year: {annual.get('most_recent_year', 'N/A')}")
-
-            if annual.get('revenue_yoy_growth_pct') is not None:
-                lines.append(f"  Revenue Growth (Y-o-Y): {annual['revenue_yoy_growth_pct']:+.2f}%")
-
-            if annual.get('earnings_yoy_growth_pct') is not None:
-                lines.append(f"  Earnings Growth (Y-o-Y): {annual['earnings_yoy_growth_pct']:+.2f}%")
-
-            if annual.get('profit_margin_pct') is not None:
-                lines.append(f"  Profit Margin: {annual['profit_margin_pct']:.2f}%")
-
-            lines.append("")
-
-        # Institutional ownership
-        institutional = fundamental_data.get('institutional', {})
-        if institutional.get('data_available'):
-            lines.append("🏦 INSTITUTIONAL OWNERSHIP:")
-
-            if institutional.get('institutional_ownership_pct') is not None:
-                lines.append(f"  Institutional Ownership: {institutional['institutional_ownership_pct']:.2f}%")
-
-            if institutional.get('institutions_count') is not None:
-                lines.append(f"  Number of Institutions: {institutional['institutions_count']}")
-
-            if institutional.get('top_5_holders_pct') is not None:
-                lines.append(f"  Top 5 Holders: {institutional['top_5_holders_pct']:.2f}%")
-
-            lines.append("")
-
-        # Financial health
-        health = fundamental_data.get('financial_health', {})
-        if health.get('data_available'):
-            lines.append("💊 FINANCIAL HEALTH:")
-
-            if health.get('is_profitable') is not None:
-                status = "✅ Profitable" if health['is_profitable'] else "❌ Not Profitable"
-                lines.append(f"  Profitability: {status}")
-
-            if health.get('net_worth_positive') is not None:
-                status = "✅ Positive" if health['net_worth_positive'] else "❌ Negative"
-                lines.append(f"  Net Worth: {status}")
-
-            if health.get('debt_to_equity') is not None:
-                lines.append(f"  Debt-to-Equity Ratio: {health['debt_to_equity']:.2f}")
-
-            if health.get('current_ratio') is not None:
-                lines.append(f"  Current Ratio: {health['current_ratio']:.2f}")
-
-            if health.get('roe_pct') is not None:
-                lines.append(f"  Return on Equity: {health['roe_pct']:.2f}%")
-
-            if health.get('roa_pct') is not None:
-                lines.append(f"  Return on Assets: {health['roa_pct']:.2f}%")
-
-            lines.append("")
-
-        # Validation summary
-        validation = fundamental_data.get('validation', {})
-        if validation:
-            lines.append("🎯 VALIDATION SUMMARY:")
-            lines.append(f"  Overall Health: {validation.get('overall_health', 'unknown').upper()}")
-
-            if validation.get('green_flags'):
-                lines.append(f"  ✅ Strengths:")
-                for flag in validation['green_flags']:
-                    lines.append(f"     • {flag}")
-
-            if validation.get('red_flags'):
-                lines.append(f"  ⚠️  Concerns:")
-                for flag in validation['red_flags']:
-                    lines.append(f"     • {flag}")
-
-            lines.append("")
-
-        lines.append("=" * 80)
-        lines.append("⚠️  CRITICAL: Use ONLY the data provided above. Do NOT use training data!")
-        lines.append("=" * 80)
-
-        return "\n".join(lines)
-
-
-# ============================================================================
-# TESTING
-# ============================================================================
-
-if __name__ == '__main__':
-    import sys
-
-    # Test with a ticker
-    test_ticker = sys.argv[1] if len(sys.argv) > 1 else 'RELIANCE'
-
-    print(f"\n{'='*80}")
-    print(f"TESTING FUNDAMENTAL DATA FETCHER: {test_ticker}")
-    print(f"{'='*80}\n")
-
-    fetcher = FundamentalDataFetcher()
-    data = fetcher.fetch_comprehensive_fundamentals(test_ticker)
-
-    # Print formatted output
-    formatted = fetcher.format_for_ai_prompt(data)
-    print(formatted)
-
-    # Save raw data
-    output_file = f'fundamental_data_{test_ticker}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
-
-    print(f"\n📄 Raw data saved to: {output_file}")
+
+            # Cash flow
+            cash_flow = ticker_obj.cashflow
+            if cash_flow is not None and not cash_flow.empty:
+                cash_flow = cash_flow.T
+                most_recent_cf = cash_flow.iloc[0]
+
+                free_cash_flow = self._safe_get(most_recent_cf, ['Free Cash Flow', 'FreeCashFlow'])
+                if free_cash_flow is not None:
+                    result['free_cash_flow_positive'] = free_cash_flow > 0
+
+            result['data_available'] = True
+
+        except Exception as e:
+            print(f"    Warning: Financial health fetch failed: {e}")
+            result['error'] = str(e)
+
+        return result
+
+    def _validate_financial_health(self, fundamental_data: Dict) -> Dict:
+        """
+        Validate financial health and return flags.
+
+        Returns validation flags:
+        - Has positive earnings growth
+        - Has positive net worth
+        - Debt is manageable
+        - Overall health status
+        """
+
+        validation = {
+            'quarterly_growth_positive': False,
+            'annual_growth_positive': False,
+            'is_profitable': False,
+            'net_worth_positive': False,
+            'debt_manageable': True,  # Assume true unless proven otherwise
+            'overall_health': 'unknown',
+            'red_flags': [],
+            'green_flags': []
+        }
+
+        # Check quarterly growth
+        quarterly = fundamental_data.get('quarterly', {})
+        if quarterly.get('earnings_yoy_growth_pct') is not None:
+            if quarterly['earnings_yoy_growth_pct'] > 0:
+                validation['quarterly_growth_positive'] = True
+                validation['green_flags'].append(f"Quarterly earnings up {quarterly['earnings_yoy_growth_pct']:.1f}% Y-o-Y")
+            else:
+                validation['red_flags'].append(f"Quarterly earnings down {quarterly['earnings_yoy_growth_pct']:.1f}% Y-o-Y")
+
+        # Check annual growth
+        annual = fundamental_data.get('annual', {})
+        if annual.get('earnings_yoy_growth_pct') is not None:
+            if annual['earnings_yoy_growth_pct'] > 0:
+                validation['annual_growth_positive'] = True
+                validation['green_flags'].append(f"Annual earnings up {annual['earnings_yoy_growth_pct']:.1f}% Y-o-Y")
+            else:
+                validation['red_flags'].append(f"Annual earnings down {annual['earnings_yoy_growth_pct']:.1f}% Y-o-Y")
+
+        # Check profitability
+        health = fundamental_data.get('financial_health', {})
+        if health.get('is_profitable') is True:
+            validation['is_profitable'] = True
+            validation['green_flags'].append("Company is profitable")
+        elif health.get('is_profitable') is False:
+            validation['red_flags'].append("Company is not profitable")
+
+        # Check net worth
+        if health.get('net_worth_positive') is True:
+            validation['net_worth_positive'] = True
+            validation['green_flags'].append("Net worth is positive")
+        elif health.get('net_worth_positive') is False:
+            validation['red_flags'].append("Net worth is negative")
+
+        # Check debt
+        debt_to_equity = health.get('debt_to_equity')
+        if debt_to_equity is not None:
+            if debt_to_equity < 1:
+                validation['green_flags'].append(f"Healthy debt-to-equity ratio: {debt_to_equity:.2f}")
+            elif debt_to_equity > 2:
+                validation['debt_manageable'] = False
+                validation['red_flags'].append(f"High debt-to-equity ratio: {debt_to_equity:.2f}")
+
+        # Overall health assessment
+        if len(validation['red_flags']) == 0:
+            validation['overall_health'] = 'healthy'
+        elif len(validation['red_flags']) >= 3:
+            validation['overall_health'] = 'concerning'
+        else:
+            validation['overall_health'] = 'moderate'
+
+        return validation
+
+    def _safe_get(self, series, keys: List[str]):
+        """Safely get value from series, trying multiple key names."""
+        for key in keys:
+            if key in series.index:
+                value = series[key]
+                if pd.notna(value):
+                    return float(value)
+        return None
+
+    def format_for_ai_prompt(self, fundamental_data: Dict) -> str:
+        """
+        Format fundamental data for AI prompt.
+        Returns human-readable summary string.
+        """
+
+        if not fundamental_data.get('data_available'):
+            return "⚠️ Fundamental data not available for this ticker"
+
+        lines = []
+        lines.append("=" * 80)
+        lines.append("📊 FUNDAMENTAL ANALYSIS DATA (Real-Time from YFinance)")
+        lines.append("=" * 80)
+        lines.append("")
+
+        # Quarterly results
+        quarterly = fundamental_data.get('quarterly', {})
+        if quarterly.get('data_available'):
+            lines.append("📅 QUARTERLY RESULTS:")
+            lines.append(f"  Most Recent Quarter: {quarterly.get('most_recent_quarter', 'N/A')}")
+
+            if quarterly.get('revenue_qoq_growth_pct') is not None:
+                lines.append(f"  Revenue Growth (Q-o-Q): {quarterly['revenue_qoq_growth_pct']:+.2f}%")
+
+            if quarterly.get('revenue_yoy_growth_pct') is not None:
+                lines.append(f"  Revenue Growth (Y-o-Y): {quarterly['revenue_yoy_growth_pct']:+.2f}%")
+
+            if quarterly.get('earnings_qoq_growth_pct') is not None:
+                lines.append(f"  Earnings Growth (Q-o-Q): {quarterly['earnings_qoq_growth_pct']:+.2f}%")
+
+            if quarterly.get('earnings_yoy_growth_pct') is not None:
+                lines.append(f"  Earnings Growth (Y-o-Y): {quarterly['earnings_yoy_growth_pct']:+.2f}%")
+
+            if quarterly.get('profit_margin_pct') is not None:
+                lines.append(f"  Profit Margin: {quarterly['profit_margin_pct']:.2f}%")
+
+            lines.append("")
+
+        # Annual results
+        annual = fundamental_data.get('annual', {})
+        if annual.get('data_available'):
+            lines.append("📈 ANNUAL RESULTS:")
+            lines.append(f"  Most Recent Year: {annual.get('most_recent_year', 'N/A')}")
+
+            if annual.get('revenue_yoy_growth_pct') is not None:
+                lines.append(f"  Revenue Growth (Y-o-Y): {annual['revenue_yoy_growth_pct']:+.2f}%")
+
+            if annual.get('earnings_yoy_growth_pct') is not None:
+                lines.append(f"  Earnings Growth (Y-o-Y): {annual['earnings_yoy_growth_pct']:+.2f}%")
+
+            if annual.get('profit_margin_pct') is not None:
+                lines.append(f"  Profit Margin: {annual['profit_margin_pct']:.2f}%")
+
+            lines.append("")
+
+        # Institutional ownership
+        institutional = fundamental_data.get('institutional', {})
+        if institutional.get('data_available'):
+            lines.append("🏦 INSTITUTIONAL OWNERSHIP:")
+
+            if institutional.get('institutional_ownership_pct') is not None:
+                lines.append(f"  Institutional Ownership: {institutional['institutional_ownership_pct']:.2f}%")
+
+            if institutional.get('institutions_count') is not None:
+                lines.append(f"  Number of Institutions: {institutional['institutions_count']}")
+
+            if institutional.get('top_5_holders_pct') is not None:
+                lines.append(f"  Top 5 Holders: {institutional['top_5_holders_pct']:.2f}%")
+
+            lines.append("")
+
+        # Financial health
+        health = fundamental_data.get('financial_health', {})
+        if health.get('data_available'):
+            lines.append("💊 FINANCIAL HEALTH:")
+
+            if health.get('is_profitable') is not None:
+                status = "✅ Profitable" if health['is_profitable'] else "❌ Not Profitable"
+                lines.append(f"  Profitability: {status}")
+
+            if health.get('net_worth_positive') is not None:
+                status = "✅ Positive" if health['net_worth_positive'] else "❌ Negative"
+                lines.append(f"  Net Worth: {status}")
+
+            if health.get('debt_to_equity') is not None:
+                lines.append(f"  Debt-to-Equity Ratio: {health['debt_to_equity']:.2f}")
+
+            if health.get('current_ratio') is not None:
+                lines.append(f"  Current Ratio: {health['current_ratio']:.2f}")
+
+            if health.get('roe_pct') is not None:
+                lines.append(f"  Return on Equity: {health['roe_pct']:.2f}%")
+
+            if health.get('roa_pct') is not None:
+                lines.append(f"  Return on Assets: {health['roa_pct']:.2f}%")
+
+            lines.append("")
+
+        # Validation summary
+        validation = fundamental_data.get('validation', {})
+        if validation:
+            lines.append("🎯 VALIDATION SUMMARY:")
+            lines.append(f"  Overall Health: {validation.get('overall_health', 'unknown').upper()}")
+
+            if validation.get('green_flags'):
+                lines.append(f"  ✅ Strengths:")
+                for flag in validation['green_flags']:
+                    lines.append(f"     • {flag}")
+
+            if validation.get('red_flags'):
+                lines.append(f"  ⚠️  Concerns:")
+                for flag in validation['red_flags']:
+                    lines.append(f"     • {flag}")
+
+            lines.append("")
+
+        lines.append("=" * 80)
+        lines.append("⚠️  CRITICAL: Use ONLY the data provided above. Do NOT use training data!")
+        lines.append("=" * 80)
+
+        return "\n".join(lines)
+
+
+_SHARED_FETCHER: Optional[FundamentalDataFetcher] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_fundamental_fetcher() -> FundamentalDataFetcher:
+    """Process-wide cached fetcher, so every caller shares the store and in-run memo."""
+    global _SHARED_FETCHER
+    with _SHARED_LOCK:
+        if _SHARED_FETCHER is None:
+            _SHARED_FETCHER = FundamentalDataFetcher(use_cache=True)
+        return _SHARED_FETCHER
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == '__main__':
+    import sys
+
+    # Test with a ticker
+    test_ticker = sys.argv[1] if len(sys.argv) > 1 else 'RELIANCE'
+
+    print(f"\n{'='*80}")
+    print(f"TESTING FUNDAMENTAL DATA FETCHER: {test_ticker}")
+    print(f"{'='*80}\n")
+
+    fetcher = FundamentalDataFetcher()
+    data = fetcher.fetch_comprehensive_fundamentals(test_ticker)
+
+    # Print formatted output
+    formatted = fetcher.format_for_ai_prompt(data)
+    print(formatted)
+
+    # Save raw data
+    output_file = f'fundamental_data_{test_ticker}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    with open(output_file, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+
+    print(f"\n📄 Raw data saved to: {output_file}")
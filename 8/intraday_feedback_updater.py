@@ -8,8 +8,8 @@ Purpose
   a small configuration nudge via update_exit_ai_config.py.
 
 Network usage
-- Uses yfinance (Yahoo) in a polite, low-rate, sequential way (3 symbols)
-  to avoid rate limits or IP blocking.
+- Uses yfinance (Yahoo) through price_eval.intraday_changes: one batched
+  download for the top-3 symbols (.NS, then .BO for any still missing).
 
 Usage examples
   python3 intraday_feedback_updater.py --csv realtime_exit_ai_results_2025-11-02_09-01-39_codex.csv --interval 1m --window 120
@@ -32,6 +32,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional
 
+from price_eval import intraday_changes
+
 
 AI_FEEDBACK_FILE = Path('ai_feedback_simulation.json')
 
@@ -79,50 +81,6 @@ def _read_first3_from_file(path: str) -> List[TopRec]:
     return out
 
 
-def _yf_symbol(sym: str) -> List[str]:
-    # Try NSE then BSE if no suffix
-    if '.' in sym:
-        return [sym]
-    return [f"{sym}.NS", f"{sym}.BO"]
-
-
-def _get_intraday_change_pct(ticker: str, interval: str, window: int) -> Optional[float]:
-    try:
-        import yfinance as yf  # network needed
-    except Exception as e:
-        print(f"❌ yfinance not available: {e}", file=sys.stderr)
-        return None
-
-    # Use 1d period with minute bars; compute change vs today's first bar
-    for s in _yf_symbol(ticker):
-        try:
-            df = yf.download(s, period='1d', interval=interval, progress=False, auto_adjust=False, prepost=False, threads=False)
-            if df is None or df.empty:
-                continue
-            # If window is specified, trim to last N minutes/bars
-            if window and len(df) > window:
-                df = df.tail(window)
-            opens = df['Open']
-            closes = df['Close']
-            if opens.empty or closes.empty:
-                continue
-            # Be robust: iloc may return a 0-dim ndarray or Series in some cases
-            try:
-                first = float(opens.to_numpy()[0])
-                last = float(closes.to_numpy()[-1])
-            except Exception:
-                first = float(opens.iloc[0])
-                last = float(closes.iloc[-1])
-            if first <= 0:
-                continue
-            pct = (last - first) / first * 100.0
-            return pct
-        except Exception as e:
-            # Try next suffix
-            continue
-    return None
-
-
 def _map_exit_action_to_expectation(action: str) -> str:
     # For exit system, IMMEDIATE_EXIT expects negative move; HOLD expects flat/pos
     a = (action or '').upper()
@@ -149,7 +107,7 @@ def main() -> int:
     if args.csv:
         top = _read_top3_from_csv(args.csv)
     elif args.tickers:
-        top = [TopRec(t, 'MONITOR') for t in args.tickers[:3]]
+        top = [TopRec(t.strip().upper(), 'MONITOR') for t in args.tickers[:3]]
     elif args.tickers_file:
         top = _read_first3_from_file(args.tickers_file)
     else:
@@ -162,8 +120,9 @@ def main() -> int:
         return 1
 
     entries = []
+    changes = intraday_changes([rec.ticker for rec in top[:3]], interval=args.interval, window=args.window)
     for rec in top[:3]:
-        pct = _get_intraday_change_pct(rec.ticker, args.interval, args.window)
+        pct = changes.get(rec.ticker)
         if pct is None:
             print(f"⚠️  Could not fetch intraday for {rec.ticker}", file=sys.stderr)
             continue
@@ -1,436 +1,661 @@
-#!/usr/bin/env python3
-"""
-NSE Direct API Data Fetcher
-
-Fetches real-time price data from NSE (National Stock Exchange) Direct API.
-Provides more current prices than yfinance (~0 delay vs ~15 min delay).
-
-Features:
-- Real-time price fetching from NSE
-- Automatic session management
-- Smart caching (5-min TTL during market hours)
-- Fallback to yfinance if NSE fails
-- Market hours detection
-
-Usage:
-    from nse_data_fetcher import NSEDataFetcher
-
-    fetcher = NSEDataFetcher()
-    data = fetcher.get_realtime_price('RELIANCE')
-    print(f"Price: ₹{data['price']}, Source: {data['source']}")
-"""
-
-import requests
-import time
-import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional
-import yfinance as yf
-from threading import Lock
-import os
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-class NSEDataFetcher:
-    """Fetch real-time data from NSE Direct API with yfinance fallback"""
-
-    def __init__(self, cache_ttl: int = 300):
-        """
-        Initialize NSE data fetcher
-
-        Args:
-            cache_ttl: Cache time-to-live in seconds (default: 300 = 5 minutes)
-        """
-        self.cache_ttl = cache_ttl
-        self.session = None
-        self.session_created_at = None
-        self.cache = {}
-        self.cache_lock = Lock()
-
-        # NSE API endpoints
-        self.base_url = "https://www.nseindia.com"
-        self.quote_url = f"{self.base_url}/api/quote-equity"
-
-        # Headers for NSE requests
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-        }
-
-        logger.info("NSEDataFetcher initialized with %ds cache TTL", cache_ttl)
-
-    def _create_session(self) -> requests.Session:
-        """Create a new NSE session with proper cookies"""
-        try:
-            session = requests.Session()
-
-            # Simpler headers that work
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json',
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
-
-            # NSE requires initial page visit to set cookies
-            logger.debug("Creating NSE session...")
-            response = session.get(self.base_url, headers=headers, timeout=10)
-
-            # Critical: Wait for cookies to be set
-            time.sleep(1)
-
-            if response.status_code == 200:
-                self.session = session
-                self.session_created_at = datetime.now()
-                logger.debug("NSE session created successfully")
-                return session
-            else:
-                logger.warning(f"NSE session creation failed: HTTP {response.status_code}")
-                return None
-
-        except Exception as e:
-            logger.warning(f"Failed to create NSE session: {str(e)[:100]}")
-            return None
-
-    def _get_session(self) -> Optional[requests.Session]:
-        """Get current session or create new one if expired"""
-        # Session expires after 30 minutes
-        if self.session is None or \
-           (self.session_created_at and (datetime.now() - self.session_created_at) > timedelta(minutes=30)):
-            return self._create_session()
-        return self.session
-
-    def _is_market_hours(self) -> bool:
-        """Check if NSE market is currently open"""
-        now = datetime.now()
-
-        # NSE hours: Monday-Friday, 9:15 AM - 3:30 PM IST
-        if now.weekday() >= 5:  # Saturday/Sunday
-            return False
-
-        market_start = now.replace(hour=9, minute=15, second=0, microsecond=0)
-        market_end = now.replace(hour=15, minute=30, second=0, microsecond=0)
-
-        return market_start <= now <= market_end
-
-    def _get_cached_price(self, ticker: str) -> Optional[Dict]:
-        """Get cached price if still valid"""
-        with self.cache_lock:
-            if ticker in self.cache:
-                cached_data = self.cache[ticker]
-                age = (datetime.now() - cached_data['cached_at']).total_seconds()
-
-                # Shorter TTL during market hours (5 min), longer outside (15 min)
-                ttl = self.cache_ttl if self._is_market_hours() else self.cache_ttl * 3
-
-                if age < ttl:
-                    logger.debug(f"Using cached price for {ticker} (age: {age:.0f}s)")
-                    return cached_data
-
-        return None
-
-    def _cache_price(self, ticker: str, data: Dict):
-        """Cache price data"""
-        with self.cache_lock:
-            data['cached_at'] = datetime.now()
-            self.cache[ticker] = data
-
-    def fetch_nse_price(self, ticker: str) -> Optional[Dict]:
-        """
-        Fetch real-time price from NSE Direct API
-
-        Args:
-            ticker: Stock symbol (e.g., 'RELIANCE', 'TRENT')
-
-        Returns:
-            Dict with price data or None if failed
-        """
-        try:
-            session = self._get_session()
-            if not session:
-                logger.debug(f"No NSE session available for {ticker}")
-                return None
-
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
-
-            # Use same simple headers for API call
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json',
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
-
-            url = f"{self.quote_url}?symbol={ticker.upper()}"
-            response = session.get(url, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                # Extract price info
-                price_info = data.get('priceInfo', {})
-                pre_open = data.get('preOpenMarket', {})
-
-                if not price_info:
-                    logger.warning(f"No price info in NSE response for {ticker}")
-                    return None
-
-                result = {
-                    'price': price_info.get('lastPrice'),
-                    'change': price_info.get('change'),
-                    'change_pct': price_info.get('pChange'),
-                    'open': price_info.get('open'),
-                    'high': price_info.get('intraDayHighLow', {}).get('max'),
-                    'low': price_info.get('intraDayHighLow', {}).get('min'),
-                    'volume': pre_open.get('totalTradedVolume', 0),
-                    'timestamp': datetime.now(),
-                    'source': 'NSE_DIRECT',
-                    'market_status': 'OPEN' if self._is_market_hours() else 'CLOSED'
-                }
-
-                logger.debug(f"NSE: {ticker} = ₹{result['price']} (change: {result['change']})")
-                return result
-
-            else:
-                logger.warning(f"NSE API returned HTTP {response.status_code} for {ticker}")
-                return None
-
-        except requests.exceptions.Timeout:
-            logger.warning(f"NSE API timeout for {ticker}")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"NSE API request failed for {ticker}: {str(e)[:100]}")
-            return None
-        except Exception as e:
-            logger.warning(f"NSE fetch error for {ticker}: {str(e)[:100]}")
-            return None
-
-    def fetch_yfinance_price(self, ticker: str) -> Optional[Dict]:
-        """
-        Fetch price from yfinance as fallback
-
-        Args:
-            ticker: Stock symbol (e.g., 'RELIANCE', 'TRENT')
-
-        Returns:
-            Dict with price data or None if failed
-        """
-        try:
-            symbol = f"{ticker}.NS"
-            stock = yf.Ticker(symbol)
-            info = stock.info
-
-            # Try multiple price fields
-            price = info.get('currentPrice') or \
-                    info.get('regularMarketPrice') or \
-                    info.get('previousClose')
-
-            if not price:
-                logger.warning(f"No price found in yfinance for {ticker}")
-                return None
-
-            result = {
-                'price': price,
-                'change': info.get('regularMarketChange'),
-                'change_pct': info.get('regularMarketChangePercent'),
-                'open': info.get('regularMarketOpen') or info.get('open'),
-                'high': info.get('regularMarketDayHigh') or info.get('dayHigh'),
-                'low': info.get('regularMarketDayLow') or info.get('dayLow'),
-                'volume': info.get('regularMarketVolume') or info.get('volume'),
-                'timestamp': datetime.now(),
-                'source': 'YFINANCE',
-                'market_status': 'UNKNOWN'
-            }
-
-            logger.debug(f"yfinance: {ticker} = ₹{result['price']}")
-            return result
-
-        except Exception as e:
-            logger.warning(f"yfinance fetch error for {ticker}: {str(e)[:100]}")
-            return None
-
-    def get_realtime_price(self, ticker: str, force_nse: bool = False) -> Dict:
-        """
-        Get most current price with smart source selection
-
-        Priority during market hours:
-        1. Check cache (if valid)
-        2. Try NSE Direct API (real-time)
-        3. Fallback to yfinance (15-min delayed)
-
-        Priority outside market hours:
-        1. Check cache (if valid)
-        2. Use yfinance (delay doesn't matter)
-        3. Fallback to NSE if yfinance fails
-
-        Args:
-            ticker: Stock symbol (e.g., 'RELIANCE', 'TRENT')
-            force_nse: Force NSE fetch even outside market hours
-
-        Returns:
-            Dict with price, source, timestamp, etc.
-        """
-        # Normalize ticker
-        ticker = ticker.upper().replace('.NS', '').replace('.BO', '')
-
-        # Check cache first
-        cached = self._get_cached_price(ticker)
-        if cached:
-            return cached
-
-        result = None
-        is_market_open = self._is_market_hours()
-
-        # During market hours OR if forced, prefer NSE
-        if is_market_open or force_nse:
-            result = self.fetch_nse_price(ticker)
-
-            # If NSE failed, fallback to yfinance
-            if not result:
-                logger.debug(f"NSE failed for {ticker}, falling back to yfinance")
-                result = self.fetch_yfinance_price(ticker)
-        else:
-            # Outside market hours, prefer yfinance (faster, no session needed)
-            result = self.fetch_yfinance_price(ticker)
-
-            # If yfinance failed, try NSE
-            if not result:
-                logger.debug(f"yfinance failed for {ticker}, trying NSE")
-                result = self.fetch_nse_price(ticker)
-
-        # If both failed, return error
-        if not result:
-            logger.error(f"All price sources failed for {ticker}")
-            return {
-                'price': None,
-                'source': 'FAILED',
-                'timestamp': datetime.now(),
-                'error': 'All data sources failed'
-            }
-
-        # Cache the result
-        self._cache_price(ticker, result)
-
-        return result
-
-    def get_multiple_prices(self, tickers: list) -> Dict[str, Dict]:
-        """
-        Fetch prices for multiple tickers efficiently
-
-        Args:
-            tickers: List of stock symbols
-
-        Returns:
-            Dict mapping ticker to price data
-        """
-        results = {}
-
-        for ticker in tickers:
-            try:
-                results[ticker] = self.get_realtime_price(ticker)
-                # Small delay to avoid rate limiting
-                time.sleep(0.3)
-            except Exception as e:
-                logger.warning(f"Failed to fetch {ticker}: {str(e)[:100]}")
-                results[ticker] = {
-                    'price': None,
-                    'source': 'ERROR',
-                    'error': str(e)[:100]
-                }
-
-        return results
-
-    def clear_cache(self):
-        """Clear price cache"""
-        with self.cache_lock:
-            self.cache.clear()
-            logger.debug("Price cache cleared")
-
-
-# Singleton instance for reuse
-_fetcher_instance = None
-_fetcher_lock = Lock()
-
-def get_nse_fetcher() -> NSEDataFetcher:
-    """Get singleton NSE fetcher instance"""
-    global _fetcher_instance
-
-    if _fetcher_instance is None:
-        with _fetcher_lock:
-            if _fetcher_instance is None:
-                _fetcher_instance = NSEDataFetcher()
-
-    return _fetcher_instance
-
-
-# ============================================================================
-# Convenience Functions
-# ============================================================================
-
-def get_realtime_price(ticker: str) -> Dict:
-    """
-    Convenience function to get real-time price
-
-    Args:
-        ticker: Stock symbol (e.g., 'RELIANCE', 'TRENT')
-
-    Returns:
-        Dict with price, source, timestamp, etc.
-    """
-    fetcher = get_nse_fetcher()
-    return fetcher.get_realtime_price(ticker)
-
-
-def get_multiple_prices(tickers: list) -> Dict[str, Dict]:
-    """
-    Convenience function to get multiple prices
-
-    Args:
-        tickers: List of stock symbols
-
-    Returns:
-        Dict mapping ticker to price data
-    """
-    fetcher = get_nse_fetcher()
-    return fetcher.get_multiple_prices(tickers)
-
-
-# ============================================================================
-# Test/Demo Code
-# ============================================================================
-
-if __name__ == '__main__':
-    print("=" * 80)
-    print("NSE DATA FETCHER TEST")
-    print("=" * 80)
-    print()
-
-    fetcher = NSEDataFetcher()
-
-    # Test single ticker
-    print("Testing RELIANCE...")
-    data = fetcher.get_realtime_price('RELIANCE')
-    print(f"Price: ₹{data.get('price', 'N/A')}")
-    print(f"Source: {data.get('source', 'N/A')}")
-    print(f"Timestamp: {data.get('timestamp', 'N/A')}")
-    print(f"Market Status: {data.get('market_status', 'N/A')}")
-    print()
-
-    # Test multiple tickers
-    print("Testing multiple tickers...")
-    tickers = ['RELIANCE', 'TRENT', 'INFY']
-    results = fetcher.get_multiple_prices(tickers)
-
-    for ticker, data in results.items():
-        if data.get('price'):
-            print(f"{ticker:10s}: ₹{data['price']:.2f} ({data['source']})")
-        else:
-            print(f"{ticker:10s}: FAILED ({data.get('source', 'UNKNOWN')})")
-
-    print()
-    print("=" * 80)
-    print("TEST COMPLETE")
-    print("=" * 80)
+#!/usr/bin/env python3
+"""
+NSE Direct API Data Fetcher
+
+Fetches real-time price data from NSE (National Stock Exchange) Direct API.
+Provides more current prices than yfinance (~0 delay vs ~15 min delay).
+
+Features:
+- Real-time price fetching from NSE
+- Automatic session management
+- Smart caching (5-min TTL during market hours)
+- Fallback to yfinance if NSE fails
+- Market hours detection
+- Bulk quote snapshots: index-constituent payloads (NSE) or one multi-symbol
+  download (yfinance), then a bounded asyncio fan-out for the rest
+
+Usage:
+    from nse_data_fetcher import NSEDataFetcher
+
+    fetcher = NSEDataFetcher()
+    data = fetcher.get_realtime_price('RELIANCE')
+    print(f"Price: ₹{data['price']}, Source: {data['source']}")
+
+    snapshot = fetcher.get_quote_snapshot(['RELIANCE', 'TRENT', 'INFY'])
+    print(snapshot.as_of, snapshot.skew_seconds, snapshot.quotes['TRENT']['price'])
+"""
+
+import asyncio
+import requests
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import quote
+import yfinance as yf
+from threading import Lock
+import os
+
+from rate_limiter import get_bucket
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Index payloads tried for bulk NSE quotes (together they cover the NIFTY Total Market)
+BULK_INDICES = ("NIFTY 500", "NIFTY MICROCAP 250")
+BULK_MIN_SYMBOLS = 5          # below this, per-symbol quotes are cheaper than an index payload
+MAX_CONCURRENT_QUOTES = 8
+
+
+@dataclass
+class QuoteSnapshot:
+    """Quotes for many tickers, aligned to one as-of time."""
+    as_of: datetime
+    quotes: Dict[str, Dict]
+    skew_seconds: float = 0.0                       # spread of the underlying quote times
+    sources: Dict[str, int] = field(default_factory=dict)
+
+
+def _parse_nse_time(value) -> Optional[datetime]:
+    """NSE timestamps look like '11-Nov-2025 09:45:53'."""
+    try:
+        return datetime.strptime(str(value).strip(), "%d-%b-%Y %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+
+
+class NSEDataFetcher:
+    """Fetch real-time data from NSE Direct API with yfinance fallback"""
+
+    def __init__(self, cache_ttl: int = 300, base_url: str = "https://www.nseindia.com"):
+        """
+        Initialize NSE data fetcher
+
+        Args:
+            cache_ttl: Cache time-to-live in seconds (default: 300 = 5 minutes)
+            base_url: NSE site root (a local stand-in can be used for testing)
+        """
+        self.cache_ttl = cache_ttl
+        self.session = None
+        self.session_created_at = None
+        self.cache = {}
+        self.cache_lock = Lock()
+        self.session_lock = Lock()
+        self.bucket = get_bucket('nse')
+
+        # NSE API endpoints
+        self.base_url = base_url.rstrip('/')
+        self.quote_url = f"{self.base_url}/api/quote-equity"
+        self.index_url = f"{self.base_url}/api/equity-stockIndices"
+
+        # Headers for NSE requests
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'application/json',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+        }
+
+        logger.info("NSEDataFetcher initialized with %ds cache TTL", cache_ttl)
+
+    def _create_session(self) -> requests.Session:
+        """Create a new NSE session with proper cookies"""
+        try:
+            session = requests.Session()
+
+            # Simpler headers that work
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Accept': 'application/json',
+                'Accept-Language': 'en-US,en;q=0.9',
+            }
+
+            # NSE requires initial page visit to set cookies
+            logger.debug("Creating NSE session...")
+            response = session.get(self.base_url, headers=headers, timeout=10)
+
+            # Critical: Wait for cookies to be set
+            time.sleep(1)
+
+            if response.status_code == 200:
+                self.session = session
+                self.session_created_at = datetime.now()
+                logger.debug("NSE session created successfully")
+                return session
+            else:
+                logger.warning(f"NSE session creation failed: HTTP {response.status_code}")
+                return None
+
+        except Exception as e:
+            logger.warning(f"Failed to create NSE session: {str(e)[:100]}")
+            return None
+
+    def _get_session(self) -> Optional[requests.Session]:
+        """Get current session or create new one if expired"""
+        # Session expires after 30 minutes
+        with self.session_lock:
+            if self.session is None or \
+               (self.session_created_at and (datetime.now() - self.session_created_at) > timedelta(minutes=30)):
+                return self._create_session()
+            return self.session
+
+    def _is_market_hours(self) -> bool:
+        """Check if NSE market is currently open"""
+        now = datetime.now()
+
+        # NSE hours: Monday-Friday, 9:15 AM - 3:30 PM IST
+        if now.weekday() >= 5:  # Saturday/Sunday
+            return False
+
+        market_start = now.replace(hour=9, minute=15, second=0, microsecond=0)
+        market_end = now.replace(hour=15, minute=30, second=0, microsecond=0)
+
+        return market_start <= now <= market_end
+
+    def _get_cached_price(self, ticker: str) -> Optional[Dict]:
+        """Get cached price if still valid"""
+        with self.cache_lock:
+            if ticker in self.cache:
+                cached_data = self.cache[ticker]
+                age = (datetime.now() - cached_data['cached_at']).total_seconds()
+
+                # Shorter TTL during market hours (5 min), longer outside (15 min)
+                ttl = self.cache_ttl if self._is_market_hours() else self.cache_ttl * 3
+
+                if age < ttl:
+                    logger.debug(f"Using cached price for {ticker} (age: {age:.0f}s)")
+                    return cached_data
+
+        return None
+
+    def _cache_price(self, ticker: str, data: Dict):
+        """Cache price data"""
+        with self.cache_lock:
+            data['cached_at'] = datetime.now()
+            self.cache[ticker] = data
+
+    def fetch_nse_price(self, ticker: str) -> Optional[Dict]:
+        """
+        Fetch real-time price from NSE Direct API
+
+        Args:
+            ticker: Stock symbol (e.g., 'RELIANCE', 'TRENT')
+
+        Returns:
+            Dict with price data or None if failed
+        """
+        try:
+            session = self._get_session()
+            if not session:
+                logger.debug(f"No NSE session available for {ticker}")
+                return None
+
+            # Shared NSE token bucket instead of a fixed delay
+            self.bucket.acquire()
+
+            # Use same simple headers for API call
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Accept': 'application/json',
+                'Accept-Language': 'en-US,en;q=0.9',
+            }
+
+            url = f"{self.quote_url}?symbol={quote(ticker.upper())}"
+            response = session.get(url, headers=headers, timeout=10)
+            self.bucket.report(response.status_code, response.headers.get('Retry-After'))
+
+            if response.status_code == 200:
+                data = response.json()
+
+                # Extract price info
+                price_info = data.get('priceInfo', {})
+                pre_open = data.get('preOpenMarket', {})
+
+                if not price_info:
+                    logger.warning(f"No price info in NSE response for {ticker}")
+                    return None
+
+                result = {
+                    'price': price_info.get('lastPrice'),
+                    'change': price_info.get('change'),
+                    'change_pct': price_info.get('pChange'),
+                    'open': price_info.get('open'),
+                    'high': price_info.get('intraDayHighLow', {}).get('max'),
+                    'low': price_info.get('intraDayHighLow', {}).get('min'),
+                    'volume': pre_open.get('totalTradedVolume', 0),
+                    'timestamp': datetime.now(),
+                    'quote_time': _parse_nse_time(data.get('metadata', {}).get('lastUpdateTime')),
+                    'source': 'NSE_DIRECT',
+                    'market_status': 'OPEN' if self._is_market_hours() else 'CLOSED'
+                }
+
+                logger.debug(f"NSE: {ticker} = ₹{result['price']} (change: {result['change']})")
+                return result
+
+            else:
+                logger.warning(f"NSE API returned HTTP {response.status_code} for {ticker}")
+                return None
+
+        except requests.exceptions.Timeout:
+            logger.warning(f"NSE API timeout for {ticker}")
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"NSE API request failed for {ticker}: {str(e)[:100]}")
+            return None
+        except Exception as e:
+            logger.warning(f"NSE fetch error for {ticker}: {str(e)[:100]}")
+            return None
+
+    def fetch_yfinance_price(self, ticker: str) -> Optional[Dict]:
+        """
+        Fetch price from yfinance as fallback
+
+        Args:
+            ticker: Stock symbol (e.g., 'RELIANCE', 'TRENT')
+
+        Returns:
+            Dict with price data or None if failed
+        """
+        bucket = get_bucket('yahoo')
+        try:
+            symbol = f"{ticker}.NS"
+            stock = yf.Ticker(symbol)
+            bucket.acquire()
+            info = stock.info
+            bucket.reward()
+
+            # Try multiple price fields
+            price = info.get('currentPrice') or \
+                    info.get('regularMarketPrice') or \
+                    info.get('previousClose')
+
+            if not price:
+                logger.warning(f"No price found in yfinance for {ticker}")
+                return None
+
+            result = {
+                'price': price,
+                'change': info.get('regularMarketChange'),
+                'change_pct': info.get('regularMarketChangePercent'),
+                'open': info.get('regularMarketOpen') or info.get('open'),
+                'high': info.get('regularMarketDayHigh') or info.get('dayHigh'),
+                'low': info.get('regularMarketDayLow') or info.get('dayLow'),
+                'volume': info.get('regularMarketVolume') or info.get('volume'),
+                'timestamp': datetime.now(),
+                'source': 'YFINANCE',
+                'market_status': 'UNKNOWN'
+            }
+
+            logger.debug(f"yfinance: {ticker} = ₹{result['price']}")
+            return result
+
+        except Exception as e:
+            bucket.report_error(e)
+            logger.warning(f"yfinance fetch error for {ticker}: {str(e)[:100]}")
+            return None
+
+    def get_realtime_price(self, ticker: str, force_nse: bool = False) -> Dict:
+        """
+        Get most current price with smart source selection
+
+        Priority during market hours:
+        1. Check cache (if valid)
+        2. Try NSE Direct API (real-time)
+        3. Fallback to yfinance (15-min delayed)
+
+        Priority outside market hours:
+        1. Check cache (if valid)
+        2. Use yfinance (delay doesn't matter)
+        3. Fallback to NSE if yfinance fails
+
+        Args:
+            ticker: Stock symbol (e.g., 'RELIANCE', 'TRENT')
+            force_nse: Force NSE fetch even outside market hours
+
+        Returns:
+            Dict with price, source, timestamp, etc.
+        """
+        # Normalize ticker
+        ticker = ticker.upper().replace('.NS', '').replace('.BO', '')
+
+        # Check cache first
+        cached = self._get_cached_price(ticker)
+        if cached:
+            return cached
+
+        result = None
+        is_market_open = self._is_market_hours()
+
+        # During market hours OR if forced, prefer NSE
+        if is_market_open or force_nse:
+            result = self.fetch_nse_price(ticker)
+
+            # If NSE failed, fallback to yfinance
+            if not result:
+                logger.debug(f"NSE failed for {ticker}, falling back to yfinance")
+                result = self.fetch_yfinance_price(ticker)
+        else:
+            # Outside market hours, prefer yfinance (faster, no session needed)
+            result = self.fetch_yfinance_price(ticker)
+
+            # If yfinance failed, try NSE
+            if not result:
+                logger.debug(f"yfinance failed for {ticker}, trying NSE")
+                result = self.fetch_nse_price(ticker)
+
+        # If both failed, return error
+        if not result:
+            logger.error(f"All price sources failed for {ticker}")
+            return {
+                'price': None,
+                'source': 'FAILED',
+                'timestamp': datetime.now(),
+                'error': 'All data sources failed'
+            }
+
+        # Cache the result
+        self._cache_price(ticker, result)
+
+        return result
+
+    def fetch_index_quotes(self, index: str) -> Dict[str, Dict]:
+        """
+        Fetch quotes for every constituent of an NSE index in one request
+
+        Args:
+            index: NSE index name (e.g., 'NIFTY 500')
+
+        Returns:
+            Dict mapping symbol to price data (empty if the request failed)
+        """
+        session = self._get_session()
+        if not session:
+            return {}
+        try:
+            self.bucket.acquire()
+            response = session.get(f"{self.index_url}?index={quote(index)}", headers=self.headers, timeout=15)
+            self.bucket.report(response.status_code, response.headers.get('Retry-After'))
+            if response.status_code != 200:
+                logger.warning(f"NSE index API returned HTTP {response.status_code} for {index}")
+                return {}
+            payload = response.json()
+        except Exception as e:
+            logger.warning(f"NSE index fetch failed for {index}: {str(e)[:100]}")
+            return {}
+
+        fetched_at = datetime.now()
+        payload_time = _parse_nse_time(payload.get('timestamp'))
+        market_status = 'OPEN' if self._is_market_hours() else 'CLOSED'
+        quotes = {}
+        for row in payload.get('data', []):
+            symbol = str(row.get('symbol', '')).upper()
+            # The first row describes the index itself
+            if not symbol or symbol == index.upper() or row.get('lastPrice') is None:
+                continue
+            quotes[symbol] = {
+                'price': row.get('lastPrice'),
+                'change': row.get('change'),
+                'change_pct': row.get('pChange'),
+                'open': row.get('open'),
+                'high': row.get('dayHigh'),
+                'low': row.get('dayLow'),
+                'volume': row.get('totalTradedVolume', 0),
+                'timestamp': fetched_at,
+                'quote_time': _parse_nse_time(row.get('lastUpdateTime')) or payload_time,
+                'source': 'NSE_INDEX',
+                'market_status': market_status
+            }
+        logger.debug(f"NSE index {index}: {len(quotes)} quotes")
+        return quotes
+
+    def fetch_yfinance_bulk(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch latest daily bars for many tickers in one yfinance download
+
+        Args:
+            tickers: Normalized stock symbols
+
+        Returns:
+            Dict mapping ticker to price data (tickers without data are omitted)
+        """
+        if not tickers:
+            return {}
+        bucket = get_bucket('yahoo')
+        try:
+            bucket.acquire()
+            data = yf.download([f"{t}.NS" for t in tickers], period="5d", interval="1d",
+                               group_by="ticker", progress=False, threads=True, auto_adjust=False)
+        except Exception as e:
+            bucket.report_error(e)
+            logger.warning(f"yfinance bulk download failed: {str(e)[:100]}")
+            return {}
+        if data is None or data.empty:
+            return {}
+        bucket.reward()
+
+        fetched_at = datetime.now()
+        quotes = {}
+        for ticker in tickers:
+            try:
+                bars = data[f"{ticker}.NS"] if data.columns.nlevels > 1 else data
+                bars = bars.dropna(subset=['Close'])
+            except Exception:
+                continue
+            if bars.empty:
+                continue
+            last = bars.iloc[-1]
+            prev_close = float(bars['Close'].iloc[-2]) if len(bars) > 1 else None
+            price = float(last['Close'])
+            change = price - prev_close if prev_close else None
+            quotes[ticker] = {
+                'price': price,
+                'change': change,
+                'change_pct': (change / prev_close * 100) if prev_close else None,
+                'open': float(last['Open']),
+                'high': float(last['High']),
+                'low': float(last['Low']),
+                'volume': float(last['Volume']),
+                'timestamp': fetched_at,
+                'quote_time': bars.index[-1].to_pydatetime().replace(tzinfo=None),
+                'source': 'YFINANCE_BULK',
+                'market_status': 'UNKNOWN'
+            }
+        return quotes
+
+    def get_multiple_prices(self, tickers: list) -> Dict[str, Dict]:
+        """
+        Fetch prices for multiple tickers efficiently
+
+        Args:
+            tickers: List of stock symbols
+
+        Returns:
+            Dict mapping ticker to price data
+        """
+        return self.get_quote_snapshot(tickers).quotes
+
+    def get_quote_snapshot(self, tickers: list, force_nse: bool = False,
+                           max_concurrency: int = MAX_CONCURRENT_QUOTES) -> QuoteSnapshot:
+        """
+        Quotes for many tickers as one time-aligned snapshot
+
+        Cached quotes are used first; the rest come from bulk payloads (NSE
+        index constituents during market hours, one yfinance download
+        otherwise) and whatever is still missing from a bounded asyncio
+        fan-out over get_realtime_price.
+
+        Args:
+            tickers: List of stock symbols
+            force_nse: Prefer NSE even outside market hours
+            max_concurrency: Upper bound on concurrent single-symbol fetches
+
+        Returns:
+            QuoteSnapshot keyed by the tickers as passed in
+        """
+        coro = self.get_quote_snapshot_async(tickers, force_nse, max_concurrency)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Called from inside an event loop: run the snapshot on its own loop in a worker thread
+        box = {}
+        worker = threading.Thread(target=lambda: box.setdefault('snapshot', asyncio.run(coro)))
+        worker.start()
+        worker.join()
+        return box['snapshot']
+
+    async def get_quote_snapshot_async(self, tickers: list, force_nse: bool = False,
+                                       max_concurrency: int = MAX_CONCURRENT_QUOTES) -> QuoteSnapshot:
+        """Async version of get_quote_snapshot."""
+        names = {t: t.upper().replace('.NS', '').replace('.BO', '') for t in tickers}
+        wanted = list(dict.fromkeys(names.values()))
+        found = {}
+        for symbol in wanted:
+            cached = self._get_cached_price(symbol)
+            if cached:
+                found[symbol] = cached
+        missing = [s for s in wanted if s not in found]
+
+        if len(missing) >= BULK_MIN_SYMBOLS:
+            if self._is_market_hours() or force_nse:
+                for index in BULK_INDICES:
+                    if not missing:
+                        break
+                    constituents = await asyncio.to_thread(self.fetch_index_quotes, index)
+                    for symbol in missing:
+                        if symbol in constituents:
+                            found[symbol] = constituents[symbol]
+                            self._cache_price(symbol, constituents[symbol])
+                    missing = [s for s in missing if s not in found]
+            else:
+                bulk = await asyncio.to_thread(self.fetch_yfinance_bulk, missing)
+                for symbol, data in bulk.items():
+                    found[symbol] = data
+                    self._cache_price(symbol, data)
+                missing = [s for s in missing if s not in found]
+
+        if missing:
+            limit = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def one(symbol: str):
+                async with limit:
+                    try:
+                        return symbol, await asyncio.to_thread(self.get_realtime_price, symbol, force_nse)
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch {symbol}: {str(e)[:100]}")
+                        return symbol, {
+                            'price': None,
+                            'source': 'ERROR',
+                            'error': str(e)[:100]
+                        }
+
+            for symbol, data in await asyncio.gather(*(one(s) for s in missing)):
+                found[symbol] = data
+
+        quote_times = [q.get('quote_time') or q.get('timestamp') for q in found.values() if q.get('price') is not None]
+        quote_times = [t for t in quote_times if t is not None]
+        as_of = max(quote_times) if quote_times else datetime.now()
+        skew = (max(quote_times) - min(quote_times)).total_seconds() if quote_times else 0.0
+        sources: Dict[str, int] = {}
+        quotes = {}
+        for t, symbol in names.items():
+            data = dict(found[symbol])
+            data['snapshot_time'] = as_of
+            quotes[t] = data
+            sources[data.get('source', 'UNKNOWN')] = sources.get(data.get('source', 'UNKNOWN'), 0) + 1
+        return QuoteSnapshot(as_of=as_of, quotes=quotes, skew_seconds=skew, sources=sources)
+
+    def clear_cache(self):
+        """Clear price cache"""
+        with self.cache_lock:
+            self.cache.clear()
+            logger.debug("Price cache cleared")
+
+
+# Singleton instance for reuse
+_fetcher_instance = None
+_fetcher_lock = Lock()
+
+def get_nse_fetcher() -> NSEDataFetcher:
+    """Get singleton NSE fetcher instance"""
+    global _fetcher_instance
+
+    if _fetcher_instance is None:
+        with _fetcher_lock:
+            if _fetcher_instance is None:
+                _fetcher_instance = NSEDataFetcher()
+
+    return _fetcher_instance
+
+
+# ============================================================================
+# Convenience Functions
+# ============================================================================
+
+def get_realtime_price(ticker: str) -> Dict:
+    """
+    Convenience function to get real-time price
+
+    Args:
+        ticker: Stock symbol (e.g., 'RELIANCE', 'TRENT')
+
+    Returns:
+        Dict with price, source, timestamp, etc.
+    """
+    fetcher = get_nse_fetcher()
+    return fetcher.get_realtime_price(ticker)
+
+
+def get_multiple_prices(tickers: list) -> Dict[str, Dict]:
+    """
+    Convenience function to get multiple prices
+
+    Args:
+        tickers: List of stock symbols
+
+    Returns:
+        Dict mapping ticker to price data
+    """
+    fetcher = get_nse_fetcher()
+    return fetcher.get_multiple_prices(tickers)
+
+
+# ============================================================================
+# Test/Demo Code
+# ============================================================================
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("NSE DATA FETCHER TEST")
+    print("=" * 80)
+    print()
+
+    fetcher = NSEDataFetcher()
+
+    # Test single ticker
+    print("Testing RELIANCE...")
+    data = fetcher.get_realtime_price('RELIANCE')
+    print(f"Price: ₹{data.get('price', 'N/A')}")
+    print(f"Source: {data.get('source', 'N/A')}")
+    print(f"Timestamp: {data.get('timestamp', 'N/A')}")
+    print(f"Market Status: {data.get('market_status', 'N/A')}")
+    print()
+
+    # Test multiple tickers
+    print("Testing multiple tickers...")
+    tickers = ['RELIANCE', 'TRENT', 'INFY']
+    results = fetcher.get_multiple_prices(tickers)
+
+    for ticker, data in results.items():
+        if data.get('price'):
+            print(f"{ticker:10s}: ₹{data['price']:.2f} ({data['source']})")
+        else:
+            print(f"{ticker:10s}: FAILED ({data.get('source', 'UNKNOWN')})")
+
+    print()
+    print("=" * 80)
+    print("TEST COMPLETE")
+    print("=" * 80)
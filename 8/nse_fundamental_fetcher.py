@@ -35,6 +35,8 @@ from typing import Dict, Optional, List
 import json
 from threading import Lock
 
+from rate_limiter import get_bucket
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -53,6 +55,7 @@ class NSEFundamentalFetcher:
         self.session_created_at = None
         self.cache = {}
         self.cache_lock = Lock()
+        self.bucket = get_bucket('nse')  # shared NSE budget (all fetchers)
 
         # NSE API endpoints
         self.base_url = "https://www.nseindia.com"
@@ -81,7 +84,7 @@ class NSEFundamentalFetcher:
             session = requests.Session()
 
             # Initial page visit to set cookies
-            response = session.get(self.base_url, headers=self.headers, timeout=10)
+            response = self._get(session, self.base_url, timeout=10)
             time.sleep(1)  # Wait for cookies
 
             if response.status_code == 200:
@@ -97,6 +100,13 @@ class NSEFundamentalFetcher:
             logger.warning(f"Failed to create NSE session: {str(e)[:100]}")
             return None
 
+    def _get(self, session: requests.Session, url: str, timeout: int = 15) -> requests.Response:
+        """GET under the shared NSE token bucket; 429/401 responses back the bucket off."""
+        self.bucket.acquire()
+        response = session.get(url, headers=self.headers, timeout=timeout)
+        self.bucket.report(response.status_code, response.headers.get('Retry-After'))
+        return response
+
     def _get_session(self) -> Optional[requests.Session]:
         """Get current session or create new one if expired"""
         if self.session is None or \
@@ -152,9 +162,7 @@ class NSEFundamentalFetcher:
 
             # Get quote info which includes shareholding data
             url = f"{self.endpoints['quote_info']}?symbol={ticker.upper()}"
-            time.sleep(0.5)
-
-            response = session.get(url, headers=self.headers, timeout=15)
+            response = self._get(session, url)
 
             if response.status_code == 200:
                 data = response.json()
@@ -244,9 +252,7 @@ class NSEFundamentalFetcher:
 
             # Get financial results
             url = f"{self.endpoints['quote_info']}?symbol={ticker.upper()}"
-            time.sleep(0.5)
-
-            response = session.get(url, headers=self.headers, timeout=15)
+            response = self._get(session, url)
 
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Local OHLCV cache shared by the evaluation, backtest and feature modules.
+
+Daily bars are kept per symbol under .ohlcv_cache/ (one pickle per symbol,
+tz-naive date index, split/dividend-adjusted Open/High/Low/Close/Volume, the
+same prices Ticker.history returns by default). Stale or missing
+symbols are refreshed with a single multi-symbol yf.download; symbols that
+already cover the requested window only fetch the bars since their last
+cached session. A process-wide memory layer serves repeat lookups.
+download_intraday fetches today's minute bars for many symbols in one call
+(not cached: they are stale within minutes).
+
+This is the daily-bar layer for price_eval (price reactions, intraday
+changes) and continuation_retry in both trees: they need long adjusted
+windows that are topped up incrementally, which yf_gateway's whole-response
+TTL cache would refetch in full. Other modules' history/info/statement
+calls go through yf_gateway; both draw on the same "yahoo" rate bucket.
+
+Usage:
+    from ohlcv_cache import get_ohlcv_cache, download_intraday
+    bars = get_ohlcv_cache().get_many(["TCS.NS", "INFY.NS"], lookback_days=185)
+    intraday = download_intraday(["TCS.NS", "INFY.NS"], interval="5m")
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from rate_limiter import get_bucket
+
+DEFAULT_CACHE_DIR = os.getenv("OHLCV_CACHE_DIR", ".ohlcv_cache")
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+# Bumped when the stored bars change meaning (2: adjusted prices); older entries are refetched
+CACHE_VERSION = 2
+# Bars re-downloaded before the last cached session when topping up a symbol
+_OVERLAP_DAYS = 5
+# Overlapping closes differing by more than this mean Yahoo re-adjusted the history
+# (split or dividend since the last fetch): the symbol is downloaded again in full
+_REBASE_TOLERANCE = 1e-4
+
+
+def _safe_name(symbol: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.&-]", "_", symbol)
+
+
+def normalize_bars(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Return OHLCV columns on a sorted, de-duplicated, tz-naive date index."""
+    if df is None or len(df) == 0:
+        return None
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    cols = [c for c in OHLCV_COLUMNS if c in df.columns]
+    if "Close" not in cols:
+        return None
+    out = df[cols].astype("float64")
+    idx = pd.DatetimeIndex(out.index)
+    if idx.tz is not None:
+        # Keep the exchange-local calendar date (same as Timestamp.date())
+        idx = idx.tz_localize(None)
+    out.index = idx.normalize()
+    out = out[~out.index.duplicated(keep="last")].sort_index()
+    out = out.dropna(subset=["Close"])
+    return out if len(out) else None
+
+
+def split_download(data: Optional[pd.DataFrame], symbols: List[str], normalize=normalize_bars) -> Dict[str, pd.DataFrame]:
+    """Split a (possibly multi-symbol) yf.download frame into per-symbol bars."""
+    out: Dict[str, pd.DataFrame] = {}
+    if data is None or len(data) == 0:
+        return out
+    if isinstance(data.columns, pd.MultiIndex):
+        level0 = set(data.columns.get_level_values(0))
+        level1 = set(data.columns.get_level_values(1))
+        for sym in symbols:
+            try:
+                if sym in level0:
+                    frame = data[sym]
+                elif sym in level1:
+                    frame = data.xs(sym, axis=1, level=1)
+                else:
+                    continue
+                bars = normalize(frame.dropna(how="all"))
+                if bars is not None:
+                    out[sym] = bars
+            except Exception:
+                continue
+    elif len(symbols) == 1:
+        bars = normalize(data)
+        if bars is not None:
+            out[symbols[0]] = bars
+    return out
+
+
+def _rebased(old: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """True when the bars both frames share have different (re-adjusted) closes."""
+    common = old.index.intersection(new.index)
+    if not len(common):
+        return False
+    a = old.loc[common, "Close"].to_numpy()
+    b = new.loc[common, "Close"].to_numpy()
+    return bool(np.nanmax(np.abs(a - b) / np.maximum(np.abs(a), 1e-12)) > _REBASE_TOLERANCE)
+
+
+def _intraday_bars(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """OHLCV columns on the original (timestamped) index, rows without a close dropped."""
+    if df is None or len(df) == 0 or "Close" not in df.columns:
+        return None
+    out = df[[c for c in OHLCV_COLUMNS if c in df.columns]].astype("float64").dropna(subset=["Close"])
+    return out if len(out) else None
+
+
+def _yf_download(symbols: List[str], normalize=normalize_bars, **kwargs) -> Dict[str, pd.DataFrame]:
+    """One yf.download for all symbols, then a single-symbol retry for any the batch dropped.
+
+    Each download takes a token from the shared "yahoo" bucket, the same
+    budget yf_gateway draws from.
+    """
+    try:
+        import yfinance as yf
+    except Exception:
+        return {}
+    bucket = get_bucket("yahoo")
+    kwargs.setdefault("auto_adjust", True)
+    try:
+        bucket.acquire()
+        data = yf.download(symbols if len(symbols) > 1 else symbols[0], progress=False, group_by="ticker",
+                           threads=True, **kwargs)
+    except Exception as e:
+        bucket.report_error(e)
+        data = None
+    got = split_download(data, symbols, normalize)
+    if got:
+        bucket.reward()
+    if len(symbols) > 1:
+        for sym in [s for s in symbols if s not in got]:
+            try:
+                bucket.acquire()
+                single = yf.download(sym, progress=False, threads=False, **kwargs)
+                if single is not None and len(single):
+                    bucket.reward()
+                got.update(split_download(single, [sym], normalize))
+            except Exception as e:
+                bucket.report_error(e)
+                continue
+    return got
+
+
+def download_intraday(symbols: Iterable[str], interval: str = "5m", period: str = "1d",
+                      prepost: bool = False) -> Dict[str, pd.DataFrame]:
+    """{symbol: intraday bars} for every symbol with data, fetched in one batch."""
+    uniq = list(dict.fromkeys(s for s in symbols if s))
+    if not uniq:
+        return {}
+    return _yf_download(uniq, normalize=_intraday_bars, period=period, interval=interval, prepost=prepost)
+
+
+class OHLCVCache:
+    """Per-symbol daily bar store with batched refresh."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_age_hours: float = 12.0):
+        self.cache_dir = cache_dir
+        self.max_age_hours = max_age_hours
+        self._mem: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "downloaded": 0, "batches": 0}
+
+    # ------------------------------------------------------------------ storage
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{_safe_name(symbol)}.pkl")
+
+    def _load_entry(self, symbol: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            entry = self._mem.get(symbol)
+        if entry is not None:
+            self.stats["memory_hits"] += 1
+            return entry
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            if not isinstance(entry, dict) or not isinstance(entry.get("bars"), pd.DataFrame) \
+                    or entry.get("version") != CACHE_VERSION:
+                return None
+        except Exception:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        self.stats["disk_hits"] += 1
+        with self._lock:
+            self._mem[symbol] = entry
+        return entry
+
+    def _store_entry(self, symbol: str, bars: pd.DataFrame, start: datetime) -> None:
+        entry = {"bars": bars, "fetched": time.time(), "start": start, "version": CACHE_VERSION}
+        with self._lock:
+            self._mem[symbol] = entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self._path(symbol) + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(symbol))
+        except Exception:
+            pass
+
+    # ----------------------------------------------------------------- download
+    def _download(self, symbols: List[str], start: datetime) -> Dict[str, pd.DataFrame]:
+        self.stats["batches"] += 1
+        got = _yf_download(symbols, start=start.strftime("%Y-%m-%d"), interval="1d")
+        self.stats["downloaded"] += len(got)
+        return got
+
+    # --------------------------------------------------------------------- API
+    def get_many(
+        self,
+        symbols: Iterable[str],
+        lookback_days: int = 185,
+        max_age_hours: Optional[float] = None,
+        offline: bool = False,
+    ) -> Dict[str, pd.DataFrame]:
+        """Return {symbol: bars} covering the last lookback_days.
+
+        Symbols whose cached bars are older than max_age_hours (default: the
+        instance TTL) are refreshed in one batch; offline=True never downloads.
+        """
+        ttl = self.max_age_hours if max_age_hours is None else max_age_hours
+        start = datetime.now() - timedelta(days=max(1, int(lookback_days)))
+        uniq = list(dict.fromkeys(s for s in symbols if s))
+        result: Dict[str, pd.DataFrame] = {}
+        full: List[str] = []
+        topup: Dict[str, pd.DataFrame] = {}
+        now = time.time()
+        for sym in uniq:
+            entry = self._load_entry(sym)
+            if entry is None:
+                full.append(sym)
+                continue
+            bars = entry["bars"]
+            covered = entry.get("start") is not None and entry["start"] <= start + timedelta(days=3)
+            fresh = (now - float(entry.get("fetched") or 0.0)) / 3600.0 < ttl
+            if not covered:
+                full.append(sym)
+            elif not fresh:
+                topup[sym] = bars
+            result[sym] = bars
+
+        if not offline:
+            if topup:
+                since = min(b.index[-1] for b in topup.values()) - timedelta(days=_OVERLAP_DAYS)
+                fetched = self._download(list(topup), since.to_pydatetime())
+                for sym, old in topup.items():
+                    new = fetched.get(sym)
+                    if new is None:
+                        continue  # keep the old fetched time so the next call retries
+                    if _rebased(old, new):
+                        full.append(sym)
+                        continue
+                    entry = self._load_entry(sym) or {}
+                    bars = pd.concat([old, new])
+                    bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+                    self._store_entry(sym, bars, entry.get("start") or start)
+                    result[sym] = bars
+            if full:
+                for sym, bars in self._download(full, start).items():
+                    old = result.get(sym)
+                    if old is not None and not _rebased(old, bars):
+                        bars = pd.concat([old, bars])
+                        bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+                    self._store_entry(sym, bars, start)
+                    result[sym] = bars
+
+        return {sym: bars[bars.index >= pd.Timestamp(start.date())] for sym, bars in result.items()}
+
+    def get(self, symbol: str, lookback_days: int = 185, **kwargs) -> Optional[pd.DataFrame]:
+        return self.get_many([symbol], lookback_days=lookback_days, **kwargs).get(symbol)
+
+    def put(self, symbol: str, bars: pd.DataFrame, start: Optional[datetime] = None) -> None:
+        """Seed the cache with bars obtained elsewhere (e.g. recorded data)."""
+        norm = normalize_bars(bars)
+        if norm is not None:
+            self._store_entry(symbol, norm, start or norm.index[0].to_pydatetime())
+
+
+_DEFAULT_CACHE: Optional[OHLCVCache] = None
+
+
+def get_ohlcv_cache() -> OHLCVCache:
+    """Process-wide cache instance."""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = OHLCVCache()
+    return _DEFAULT_CACHE
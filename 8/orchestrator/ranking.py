@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import csv
+import json
 import os
 import re
-from datetime import datetime
-from typing import Dict, List, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from orchestrator.config import load_config, OUTPUTS_DIR, load_entities
+from orchestrator.config import load_config, OUTPUTS_DIR, load_entities, BASE_DIR
 import math
 
 
@@ -79,7 +83,7 @@ def calculate_relative_magnitude(title: str, ticker: str) -> float:
         return 0.0
     
     try:
-        import yfinance as yf
+        import yf_gateway as yf
         symbol = f"{ticker}.NS" if not ticker.endswith('.NS') else ticker
         stock = yf.Ticker(symbol)
         info = stock.info
@@ -159,7 +163,7 @@ def _get_company_aliases(ticker: str) -> List[str]:
         pass
     # Try yfinance for long/short names
     try:
-        import yfinance as yf
+        import yf_gateway as yf
         sym = _ensure_ns(ticker)
         info = yf.Ticker(sym).info or {}
         for k in ('longName','shortName'):  # type: ignore
@@ -330,29 +334,215 @@ def resolve_ambiguous_ticker(title: str, ticker: str) -> str:
     return tkr
 
 
+# ---------------------------------------------------------------------------
+# Quarter-aware fundamentals bundle
+#
+# One bundle per symbol holds what the fundamental helpers below need from
+# the quarterly income statement and balance sheet (net income series, latest
+# total assets / total liabilities). ai_adjust_rank prefetches bundles for the
+# whole candidate list in parallel; they persist in .cache/fundamentals_bundle.json.
+# A bundle stays valid until the quarter after its latest reported quarter has
+# ended; from then on (the filing window) it is refreshed at most once every
+# RESULTS_WINDOW_TTL_HOURS until the new quarter shows up.
+# ---------------------------------------------------------------------------
+
+FUNDAMENTALS_CACHE_PATH = os.path.join(BASE_DIR, ".cache", "fundamentals_bundle.json")
+RESULTS_WINDOW_TTL_HOURS = 24.0
+PREFETCH_WORKERS = 8
+# Bumped when the bundle layout changes; older bundles are refetched
+BUNDLE_VERSION = 2
+
+NET_INCOME_LABELS = ("Net Income", "NetIncome", "Net Income Applicable To Common Shares")
+TOTAL_ASSETS_LABELS = ("Total Assets", "TotalAssets", "Assets")
+TOTAL_LIABILITIES_LABELS = ("Total Liabilities", "TotalLiabilities", "Liabilities")
+
+
+def _period_iso(col) -> str:
+    return col.date().isoformat() if hasattr(col, "date") else str(col)
+
+
+def _net_income_series(qis) -> List[List[object]]:
+    """[[period_end_iso, value], ...] newest first, from the first net income label present."""
+    if qis is None or getattr(qis, "empty", True):
+        return []
+    for label in NET_INCOME_LABELS:
+        if label in qis.index:
+            out: List[List[object]] = []
+            for col, val in qis.loc[label].dropna().items():
+                try:
+                    out.append([_period_iso(col), float(val)])
+                except (ValueError, TypeError):
+                    continue
+            return out
+    return []
+
+
+def _latest_value(bs, labels: Tuple[str, ...]) -> Optional[float]:
+    """Value in the latest balance sheet column for the first usable label (None if missing or NaN)."""
+    for label in labels:
+        if label in bs.index:
+            try:
+                val = float(bs.loc[label, bs.columns[0]])
+            except (ValueError, TypeError):
+                continue
+            return None if math.isnan(val) else val
+    return None
+
+
+def _next_quarter_end(period_end: str) -> Optional[datetime]:
+    try:
+        d = datetime.fromisoformat(period_end)
+    except Exception:
+        return None
+    month, year = d.month + 3, d.year
+    if month > 12:
+        month, year = month - 12, year + 1
+    first_of_next = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return first_of_next - timedelta(days=1)
+
+
+def is_bundle_fresh(bundle: Dict[str, object], now: Optional[float] = None) -> bool:
+    if bundle.get("version") != BUNDLE_VERSION:
+        return False
+    now = time.time() if now is None else now
+    latest = bundle.get("latest_quarter")
+    q_end = _next_quarter_end(str(latest)) if latest else None
+    if q_end is not None and now < q_end.timestamp():
+        return True
+    return (now - float(bundle.get("fetched") or 0.0)) / 3600.0 < RESULTS_WINDOW_TTL_HOURS
+
+
+def fetch_bundle(symbol: str) -> Dict[str, object]:
+    """Pull the quarterly income statement and balance sheet once for symbol.
+
+    Statements come through yf_gateway (shared "yahoo" rate bucket, request
+    coalescing); the bundle's own quarter-aware expiry decides when they are
+    asked for again.
+    """
+    import yf_gateway as yf
+
+    tk = yf.Ticker(symbol)
+    errors: List[Exception] = []
+    net_income: List[List[object]] = []
+    try:
+        net_income = _net_income_series(getattr(tk, "quarterly_income_stmt", None))
+    except Exception as e:
+        errors.append(e)
+    bs_quarter = total_assets = total_liabilities = None
+    try:
+        bs = getattr(tk, "quarterly_balance_sheet", None)
+        if bs is not None and not bs.empty:
+            bs_quarter = _period_iso(bs.columns[0])
+            total_assets = _latest_value(bs, TOTAL_ASSETS_LABELS)
+            total_liabilities = _latest_value(bs, TOTAL_LIABILITIES_LABELS)
+    except Exception as e:
+        errors.append(e)
+    if len(errors) == 2:
+        raise errors[-1]  # nothing fetched: leave the symbol uncached so it is retried
+    dates = [d for d, _ in net_income] + ([bs_quarter] if bs_quarter else [])
+    return {
+        "version": BUNDLE_VERSION,
+        "symbol": symbol,
+        "fetched": time.time(),
+        "latest_quarter": max(dates) if dates else None,
+        "net_income": net_income,
+        "balance_sheet_quarter": bs_quarter,
+        "total_assets": total_assets,
+        "total_liabilities": total_liabilities,
+    }
+
+
+class FundamentalsCache:
+    """Per-symbol fundamentals bundles, persisted as one JSON file."""
+
+    def __init__(self, path: str = FUNDAMENTALS_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._bundles: Dict[str, Dict[str, object]] = {}
+        self._dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f) or {}
+            if isinstance(data, dict):
+                self._bundles = data
+        except Exception:
+            self._bundles = {}
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self._bundles)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def _fresh(self, symbol: str) -> Optional[Dict[str, object]]:
+        b = self._bundles.get(symbol)
+        return b if b is not None and is_bundle_fresh(b) else None
+
+    def _store(self, symbol: str, bundle: Dict[str, object]) -> None:
+        with self._lock:
+            self._bundles[symbol] = bundle
+            self._dirty = True
+
+    def prefetch(self, tickers: Iterable[str], max_workers: int = PREFETCH_WORKERS) -> int:
+        """Fetch stale/missing bundles for all tickers in parallel; returns count fetched."""
+        syms = list(dict.fromkeys(_ensure_ns(t) for t in tickers if t))
+        todo = [s for s in syms if self._fresh(s) is None]
+        if not todo:
+            return 0
+
+        def _one(sym: str) -> None:
+            try:
+                self._store(sym, fetch_bundle(sym))
+            except Exception:
+                pass
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as pool:
+            list(pool.map(_one, todo))
+        self.save()
+        return len(todo)
+
+    def get(self, ticker: str) -> Dict[str, object]:
+        sym = _ensure_ns(ticker)
+        bundle = self._fresh(sym)
+        if bundle is None:
+            try:
+                bundle = fetch_bundle(sym)
+            except Exception:
+                return {}
+            self._store(sym, bundle)
+            self.save()
+        return bundle
+
+
+_FUNDAMENTALS_CACHE: Optional[FundamentalsCache] = None
+
+
+def get_fundamentals_cache() -> FundamentalsCache:
+    global _FUNDAMENTALS_CACHE
+    if _FUNDAMENTALS_CACHE is None:
+        _FUNDAMENTALS_CACHE = FundamentalsCache()
+    return _FUNDAMENTALS_CACHE
+
+
 def try_profit_growth(ticker: str) -> float:
     """Best-effort quarterly profit growth (%). Returns 0 if unavailable.
     Computes latest YoY growth if possible, else sequential.
+    Reads the cached fundamentals bundle (see get_fundamentals_cache).
     """
     try:
-        import yfinance as yf
-        sym = _ensure_ns(ticker)
-        tk = yf.Ticker(sym)
-        qis = getattr(tk, 'quarterly_income_stmt', None)
-        if qis is None or qis.empty:
-            return 0.0
-        # Prefer Net Income
-        label = None
-        for cand in ("Net Income", "NetIncome", "Net Income Applicable To Common Shares"):
-            if cand in qis.index:
-                label = cand
-                break
-        if not label:
-            return 0.0
-        s = qis.loc[label].dropna()
+        s = get_fundamentals_cache().get(ticker).get("net_income") or []
         if len(s) < 2:
             return 0.0
-        latest = float(s.iloc[0]); prev = float(s.iloc[1])
+        latest = float(s[0][1]); prev = float(s[1][1])
         if prev == 0:
             return 0.0
         return max(-100.0, min(300.0, (latest - prev) / abs(prev) * 100.0))
@@ -366,25 +556,11 @@ def check_negative_quarterly_growth(ticker: str) -> bool:
     Returns True if negative growth detected, False otherwise (including unavailable data).
     """
     try:
-        import yfinance as yf
-        sym = _ensure_ns(ticker)
-        tk = yf.Ticker(sym)
-        qis = getattr(tk, 'quarterly_income_stmt', None)
-        if qis is None or qis.empty:
-            return False
-        # Prefer Net Income
-        label = None
-        for cand in ("Net Income", "NetIncome", "Net Income Applicable To Common Shares"):
-            if cand in qis.index:
-                label = cand
-                break
-        if not label:
-            return False
-        s = qis.loc[label].dropna()
+        s = get_fundamentals_cache().get(ticker).get("net_income") or []
         if len(s) < 2:
             return False
-        latest = float(s.iloc[0])
-        prev = float(s.iloc[1])
+        latest = float(s[0][1])
+        prev = float(s[1][1])
         if prev == 0:
             return False
         growth_pct = (latest - prev) / abs(prev) * 100.0
@@ -400,39 +576,13 @@ def check_negative_networth(ticker: str) -> bool:
     Returns True if negative networth detected, False otherwise (including unavailable data).
     """
     try:
-        import yfinance as yf
-        sym = _ensure_ns(ticker)
-        tk = yf.Ticker(sym)
-        bs = getattr(tk, 'quarterly_balance_sheet', None)
-        if bs is None or bs.empty:
-            return False
-
-        # Get latest quarter data
-        latest_col = bs.iloc[:, 0]
-
-        # Try multiple label variations for Total Assets
-        total_assets = None
-        for cand in ("Total Assets", "TotalAssets", "Assets"):
-            if cand in bs.index:
-                try:
-                    total_assets = float(bs.loc[cand, latest_col.name])
-                    break
-                except (ValueError, TypeError):
-                    continue
+        bundle = get_fundamentals_cache().get(ticker)
+        total_assets = bundle.get("total_assets")
+        total_liabilities = bundle.get("total_liabilities")
 
-        # Try multiple label variations for Total Liabilities
-        total_liabilities = None
-        for cand in ("Total Liabilities", "TotalLiabilities", "Liabilities"):
-            if cand in bs.index:
-                try:
-                    total_liabilities = float(bs.loc[cand, latest_col.name])
-                    break
-                except (ValueError, TypeError):
-                    continue
-
-        # Calculate networth: Assets - Liabilities
+        # Calculate networth: Assets - Liabilities (latest balance sheet quarter)
         if total_assets is not None and total_liabilities is not None:
-            networth = total_assets - total_liabilities
+            networth = float(total_assets) - float(total_liabilities)
             return networth < 0
 
         return False
@@ -502,6 +652,9 @@ def ai_adjust_rank(csv_path: str, top_n: int = 25) -> Tuple[List[Dict[str, str]]
     ev_bonus: Dict[str, float] = cfg.get("event_bonus", {}) or {}
     tkr_penalty: Dict[str, float] = cfg.get("ticker_penalty", {}) or {}
 
+    # Fundamentals for every candidate in one parallel pass (quarter-aware disk cache)
+    get_fundamentals_cache().prefetch((r.get("ticker") or "").strip().upper() for r in rows)
+
     # Build duplicate counts by title
     dup: Dict[str, int] = {}
     for r in rows:
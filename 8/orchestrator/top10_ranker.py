@@ -178,6 +178,18 @@ def _tokenize(text: str) -> List[str]:
 
 
 def compute_article_score(title: str, body: str, source: str, published: str, half_life: float = 72.0) -> float:
+    base = compute_article_base_score(title, body, source)
+    if base == 0.0:
+        return 0.0
+    return base * recency_decay(hours_ago(published) if published else 9999.0, half_life)
+
+
+def compute_article_base_score(title: str, body: str, source: str, cfg: Dict[str, Any] | None = None) -> float:
+    """Time-independent part of compute_article_score (cues x source weight).
+
+    The full score is base * recency_decay(hours_ago(published), half_life), so
+    callers that cache the base only need to recompute the decay factor.
+    """
     text = f"{title}\n{body}".lower()
     score = 0.0
     pos_hits = 0
@@ -207,7 +219,8 @@ def compute_article_score(title: str, body: str, source: str, published: str, ha
         score *= 0.7
 
     # Institutional cues and circuits (small boosts)
-    cfg = load_config()
+    if cfg is None:
+        cfg = load_config()
     fw = cfg.get("feature_weights", {}) or {}
     if INST_CUES_RE.search(text):
         score *= (1.0 + float(fw.get("inst_cues", 0.0)))
@@ -223,10 +236,8 @@ def compute_article_score(title: str, body: str, source: str, published: str, ha
     if LIVE_UPDATES_RE.search(title):
         score *= 0.7
 
-    # Source & recency
-    w = domain_weight(source)
-    decay = recency_decay(hours_ago(published) if published else 9999.0, half_life)
-    return score * w * decay
+    # Source weight (recency is applied by compute_article_score)
+    return score * domain_weight(source)
 
 
 def find_aggregated(days: int) -> List[str]:
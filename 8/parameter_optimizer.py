@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Parallel parameter sweep for the screener signal strategy
+
+Evaluates many BacktestParameters combinations against one precomputed
+indicator panel (enhanced_backtester.PanelIndicators):
+
+  * the panel and indicators are built once in the parent; with the fork
+    start method worker processes inherit them read-only (copy-on-write), so
+    no bars are pickled per task. Other platforms ship them once per worker
+    through the pool initializer.
+  * each combination is scored in-sample on the train range and
+    out-of-sample on the held-out tail, and the ranked table (CSV) carries
+    both sets of metrics.
+  * search methods: "grid" (cartesian product), "random" (uniform samples
+    from ranges / choices) and "bayes" (numpy Gaussian-process surrogate with
+    expected improvement, proposing batches for the pool).
+
+Usage:
+    python3 parameter_optimizer.py --symbols TCS INFY ... --start 2016-01-01 --method random --trials 2000
+    python3 parameter_optimizer.py --synthetic 200 --years 8 --method bayes --trials 400 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from enhanced_backtester import (
+    BacktestParameters,
+    EnhancedBacktester,
+    PanelIndicators,
+    PricePanel,
+    simulate,
+    synthetic_panel,
+)
+
+# name -> list of choices (grid / random choice) or (low, high) range (random / bayes).
+# Integer-typed fields are rounded after sampling.
+DEFAULT_SPACE: Dict[str, Any] = {
+    "rsi_lower": [20, 25, 30, 35, 40],
+    "rsi_upper": [60, 65, 70, 75, 80],
+    "bb_lower": [10, 15, 20, 25, 30],
+    "volume_threshold": [1.0, 1.25, 1.5, 2.0, 2.5],
+    "stop_atr_mult": [1.0, 1.5, 2.0, 2.5],
+    "target_atr_mult": [2.0, 3.0, 4.0, 5.0],
+    "max_hold_days": [10, 20, 30],
+}
+
+METRIC_COLUMNS = ["sharpe_ratio", "total_return", "annualized_return", "max_drawdown", "win_rate", "total_trades", "avg_trade_return"]
+DEFAULT_OOS_FRACTION = 0.3
+DEFAULT_RESULTS_PATH = "optimizer_results.csv"
+
+_INT_FIELDS = {f.name for f in fields(BacktestParameters) if f.type in ("int", int)}
+
+# Read-only state inherited by forked workers (or installed by _init_worker)
+_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(panel: Optional[PricePanel], spans: Sequence[int]) -> None:
+    if panel is not None:
+        _STATE["panel"] = panel
+        _STATE["ind"] = PanelIndicators(panel)
+        for s in spans:
+            _STATE["ind"].ema(s)
+
+
+def _evaluate_chunk(args: Tuple[BacktestParameters, List[Dict[str, Any]], Tuple[int, int, int], str, int]) -> List[Dict[str, Any]]:
+    base, combos, (s, split, e), objective, min_trades = args
+    panel, ind = _STATE["panel"], _STATE["ind"]
+    rows: List[Dict[str, Any]] = []
+    for combo in combos:
+        p = replace(base, **combo)
+        ins = simulate(panel, ind, p, s, split)
+        oos = simulate(panel, ind, p, split, e) if e > split else None
+        row: Dict[str, Any] = dict(combo)
+        for m in METRIC_COLUMNS:
+            row[f"is_{m}"] = getattr(ins, m)
+            row[f"oos_{m}"] = getattr(oos, m) if oos is not None else float("nan")
+        score = getattr(ins, objective)
+        row["score"] = float(score) if ins.total_trades >= min_trades and np.isfinite(score) else float("-inf")
+        rows.append(row)
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# Samplers
+# -----------------------------------------------------------------------------
+
+def _cast(name: str, value: Any) -> Any:
+    if name in _INT_FIELDS:
+        return int(round(float(value)))
+    if isinstance(value, (np.floating, np.integer)):
+        return value.item()
+    return value
+
+
+def grid_combos(space: Dict[str, Any]) -> List[Dict[str, Any]]:
+    keys = list(space)
+    # Ranges are gridded at five evenly spaced points
+    choices = [list(np.linspace(v[0], v[1], 5)) if isinstance(v, tuple) else list(v) for v in (space[k] for k in keys)]
+    return [{k: _cast(k, v) for k, v in zip(keys, combo)} for combo in itertools.product(*choices)]
+
+
+def _combo_key(combo: Dict[str, Any], keys: Sequence[str]) -> Tuple[Any, ...]:
+    return tuple(combo[k] for k in keys)
+
+
+def random_combos(space: Dict[str, Any], n: int, rng: np.random.Generator, seen: Optional[set] = None) -> List[Dict[str, Any]]:
+    """Up to n distinct random parameter sets not already in seen (which is updated in place).
+
+    Integer fields and choice lists make repeats likely; draws that repeat are
+    skipped, so fewer than n come back only when the space is nearly exhausted.
+    """
+    seen = set() if seen is None else seen
+    keys = list(space)
+    out = []
+    for _ in range(50 * max(n, 1)):
+        if len(out) >= n:
+            break
+        combo = {}
+        for k, v in space.items():
+            if isinstance(v, tuple):
+                combo[k] = _cast(k, rng.uniform(v[0], v[1]))
+            else:
+                combo[k] = _cast(k, v[rng.integers(len(v))])
+        key = _combo_key(combo, keys)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(combo)
+    return out
+
+
+def _bounds(space: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+    return {k: ((float(v[0]), float(v[1])) if isinstance(v, tuple) else (float(min(v)), float(max(v)))) for k, v in space.items()}
+
+
+def _encode(combos: List[Dict[str, Any]], bounds: Dict[str, Tuple[float, float]]) -> np.ndarray:
+    keys = list(bounds)
+    x = np.array([[float(c[k]) for k in keys] for c in combos], dtype=float)
+    lo = np.array([bounds[k][0] for k in keys])
+    span = np.array([max(bounds[k][1] - bounds[k][0], 1e-12) for k in keys])
+    return (x - lo) / span
+
+
+def _gp_expected_improvement(x_obs: np.ndarray, y_obs: np.ndarray, x_new: np.ndarray, length: float = 0.3, noise: float = 1e-3) -> np.ndarray:
+    """EI of x_new under a zero-mean RBF Gaussian process fitted to standardized y_obs."""
+    mu_y, sd_y = y_obs.mean(), y_obs.std() or 1.0
+    y = (y_obs - mu_y) / sd_y
+    sq = lambda a, b: ((a[:, None, :] - b[None, :, :]) ** 2).sum(-1)
+    k_oo = np.exp(-0.5 * sq(x_obs, x_obs) / length ** 2) + noise * np.eye(len(x_obs))
+    k_no = np.exp(-0.5 * sq(x_new, x_obs) / length ** 2)
+    chol = np.linalg.cholesky(k_oo)
+    alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, y))
+    mean = k_no @ alpha
+    v = np.linalg.solve(chol, k_no.T)
+    sd = np.sqrt(np.clip(1.0 - (v ** 2).sum(0), 1e-12, None))
+    z = (mean - y.max()) / sd
+    cdf = 0.5 * (1 + np.vectorize(math.erf)(z / math.sqrt(2)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+    return (mean - y.max()) * cdf + sd * pdf
+
+
+# -----------------------------------------------------------------------------
+# Sweep
+# -----------------------------------------------------------------------------
+
+class ParameterSweep:
+    """Ranks parameter combinations by in-sample objective with out-of-sample metrics alongside."""
+
+    def __init__(
+        self,
+        panel: PricePanel,
+        ind: Optional[PanelIndicators] = None,
+        base: Optional[BacktestParameters] = None,
+        workers: Optional[int] = None,
+        objective: str = "sharpe_ratio",
+        min_trades: int = 10,
+    ):
+        self.panel = panel
+        self.ind = ind or PanelIndicators(panel)
+        self.base = base or BacktestParameters()
+        self.workers = max(1, workers or min(8, os.cpu_count() or 1))
+        self.objective = objective
+        self.min_trades = min_trades
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    # ------------------------------------------------------------------ pool
+    def _open_pool(self, space: Dict[str, Any]) -> None:
+        spans = {int(self.base.ema_short), int(self.base.ema_long)}
+        for k in ("ema_short", "ema_long"):
+            v = space.get(k)
+            if isinstance(v, list):
+                spans.update(int(x) for x in v)
+        for s in spans:
+            self.ind.ema(s)
+        _STATE["panel"], _STATE["ind"] = self.panel, self.ind
+        if self.workers == 1:
+            return
+        if "fork" in mp.get_all_start_methods():
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=mp.get_context("fork"))
+        else:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.panel, sorted(spans)))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _evaluate(self, combos: List[Dict[str, Any]], ranges: Tuple[int, int, int]) -> List[Dict[str, Any]]:
+        if not combos:
+            return []
+        if self._pool is None:
+            return _evaluate_chunk((self.base, combos, ranges, self.objective, self.min_trades))
+        n_chunks = min(len(combos), self.workers * 4)
+        chunks = [combos[i::n_chunks] for i in range(n_chunks)]
+        out: List[Dict[str, Any]] = []
+        for rows in self._pool.map(_evaluate_chunk, [(self.base, c, ranges, self.objective, self.min_trades) for c in chunks]):
+            out.extend(rows)
+        return out
+
+    # ------------------------------------------------------------------- run
+    def split(self, start_idx: int, end_idx: int, oos_fraction: float) -> Tuple[int, int, int]:
+        split = end_idx - int(round((end_idx - start_idx) * max(0.0, min(oos_fraction, 0.9))))
+        return start_idx, split, end_idx
+
+    def run(
+        self,
+        space: Optional[Dict[str, Any]] = None,
+        method: str = "grid",
+        n_trials: int = 500,
+        start_idx: int = 0,
+        end_idx: Optional[int] = None,
+        oos_fraction: float = DEFAULT_OOS_FRACTION,
+        seed: int = 7,
+        batch_size: Optional[int] = None,
+    ) -> pd.DataFrame:
+        space = dict(space or DEFAULT_SPACE)
+        end_idx = len(self.panel.dates) if end_idx is None else end_idx
+        ranges = self.split(start_idx, end_idx, oos_fraction)
+        rng = np.random.default_rng(seed)
+        self._open_pool(space)
+        try:
+            if method == "grid":
+                rows = self._evaluate(grid_combos(space), ranges)
+            elif method == "random":
+                rows = self._evaluate(random_combos(space, n_trials, rng), ranges)
+            elif method == "bayes":
+                rows = self._bayes(space, n_trials, ranges, rng, batch_size or self.workers * 4)
+            else:
+                raise ValueError(f"Unknown search method: {method}")
+        finally:
+            self.close()
+
+        table = pd.DataFrame(rows)
+        if table.empty:
+            return table
+        table = table.drop_duplicates(subset=list(space)).sort_values("score", ascending=False).reset_index(drop=True)
+        table.index = table.index + 1
+        table.index.name = "rank"
+        table.attrs["train"] = (self.panel.dates[ranges[0]].date().isoformat(), self.panel.dates[ranges[1] - 1].date().isoformat())
+        if ranges[2] > ranges[1]:
+            table.attrs["test"] = (self.panel.dates[ranges[1]].date().isoformat(), self.panel.dates[ranges[2] - 1].date().isoformat())
+        return table
+
+    def _bayes(self, space, n_trials, ranges, rng, batch) -> List[Dict[str, Any]]:
+        bounds = _bounds(space)
+        keys = list(space)
+        seen: set = set()  # parameter sets already evaluated or queued
+        n_init = min(n_trials, max(batch, 2 * len(space) + 2))
+        rows = self._evaluate(random_combos(space, n_init, rng, seen), ranges)
+        while len(rows) < n_trials:
+            ok = [r for r in rows if np.isfinite(r["score"])]
+            if len(ok) < 3:
+                new = random_combos(space, min(batch, n_trials - len(rows)), rng, seen)
+            else:
+                x_obs = _encode(ok, bounds)
+                y_obs = np.array([r["score"] for r in ok])
+                # Candidates exclude every evaluated set; only the chosen ones join `seen`
+                pool = random_combos(space, 50 * batch, rng, set(seen))
+                if not pool:
+                    break
+                ei = _gp_expected_improvement(x_obs, y_obs, _encode(pool, bounds))
+                new = [pool[i] for i in np.argsort(-ei)[: min(batch, n_trials - len(rows))]]
+                seen.update(_combo_key(c, keys) for c in new)
+            if not new:
+                break  # every parameter set in the space has been tried
+            rows.extend(self._evaluate(new, ranges))
+        return rows
+
+
+def best_parameters(table: pd.DataFrame, base: Optional[BacktestParameters] = None) -> BacktestParameters:
+    base = base or BacktestParameters()
+    if table is None or table.empty or not np.isfinite(table["score"].iloc[0]):
+        return base
+    names = {f.name for f in fields(BacktestParameters)}
+    top = table.iloc[0]
+    return replace(base, **{k: _cast(k, top[k]) for k in table.columns if k in names})
+
+
+def _print_table(table: pd.DataFrame, top: int) -> None:
+    if table.empty:
+        print("No results")
+        return
+    cols = [c for c in table.columns if not c.startswith(("is_", "oos_")) and c != "score"]
+    cols += ["score", "is_total_trades", "oos_sharpe_ratio", "oos_total_return", "oos_max_drawdown", "oos_total_trades"]
+    with pd.option_context("display.width", 200, "display.max_columns", 30, "display.float_format", "{:.3f}".format):
+        print(table[cols].head(top).to_string())
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Parallel parameter sweep for the screener strategy")
+    ap.add_argument("--symbols", nargs="*", default=[])
+    ap.add_argument("--start", default="2016-01-01")
+    ap.add_argument("--end", default=None)
+    ap.add_argument("--offline", action="store_true", help="Use cached bars only")
+    ap.add_argument("--synthetic", type=int, default=0, help="Sweep on N synthetic tickers instead")
+    ap.add_argument("--years", type=int, default=8)
+    ap.add_argument("--method", choices=["grid", "random", "bayes"], default="random")
+    ap.add_argument("--trials", type=int, default=1000)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--oos-fraction", type=float, default=DEFAULT_OOS_FRACTION)
+    ap.add_argument("--objective", default="sharpe_ratio", choices=METRIC_COLUMNS)
+    ap.add_argument("--output", default=DEFAULT_RESULTS_PATH)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    bt = EnhancedBacktester(offline=args.offline)
+    t0 = time.perf_counter()
+    if args.synthetic:
+        panel = synthetic_panel(args.synthetic, args.years)
+        ind = PanelIndicators(panel)
+        s, e = 0, len(panel.dates)
+    else:
+        if not args.symbols:
+            ap.error("--symbols or --synthetic is required")
+        panel, ind = bt.load(args.symbols, args.start, args.end)
+        s, e = bt._range(panel, args.start, args.end)
+    t1 = time.perf_counter()
+
+    sweep = ParameterSweep(panel, ind, workers=args.workers, objective=args.objective)
+    table = sweep.run(method=args.method, n_trials=args.trials, start_idx=s, end_idx=e, oos_fraction=args.oos_fraction)
+    t2 = time.perf_counter()
+    print(f"🔍 {len(table)} combinations ({args.method}, {sweep.workers} workers) on "
+          f"{len(panel.symbols)} tickers x {e - s} bars: panel {t1 - t0:.1f}s, sweep {t2 - t1:.1f}s")
+    if table.attrs.get("train"):
+        print(f"   In-sample {table.attrs['train'][0]}..{table.attrs['train'][1]}"
+              + (f", out-of-sample {table.attrs['test'][0]}..{table.attrs['test'][1]}" if table.attrs.get("test") else ""))
+    _print_table(table, args.top)
+    table.to_csv(args.output)
+    print(f"💾 Ranked table saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Token-bucket rate limiting shared across threads, asyncio tasks and
+(optionally) processes.
+
+A bucket refills at `rate` tokens per second up to `capacity` (the burst
+size). acquire() takes a token, sleeping only for the time until the next
+token is due, so concurrent workers spend the request budget in parallel
+instead of queueing behind one global sleep. acquire_async() is the same for
+coroutines.
+
+Buckets are keyed by provider ("yahoo", "nse", "screener", ...);
+bucket_for_url() maps a URL's host onto its provider, and any other host gets
+its own default bucket. report(status) adapts the budget: a 429 / 401 halves
+the bucket's rate and blocks it for an exponentially growing pause (or the
+server's Retry-After), and successful responses restore the rate step by step.
+
+Set RATE_LIMIT_STATE_DIR (or pass shared=True) to keep bucket state in small
+lock-protected files there, so several screener processes share one budget.
+
+Usage:
+    from rate_limiter import get_bucket, bucket_for_url
+    get_bucket("yahoo").acquire()
+    bucket = bucket_for_url(url); bucket.acquire(); resp = session.get(url)
+    bucket.report(resp.status_code, resp.headers.get("Retry-After"))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets stay per-process
+    fcntl = None
+
+# Responses that mean "slow down" (Yahoo answers throttling with 401 Invalid Crumb)
+BACKOFF_STATUSES = {401, 429}
+# Status codes only count next to HTTP/status wording ("HTTP Error 429", "status code: 401",
+# "401 Client Error"), so symbols or numbers such as "401.NS" in other errors do not back off
+_RATE_LIMIT_TEXT = re.compile(
+    r"(?:\bhttp(?:\s+error)?|\bstatus(?:\s+code)?|\bresponse(?:\s+code)?)\s*[:=]?\s*(?:429|401)\b"
+    r"|\b(?:429|401)\s+client\s+error"
+    r"|too many requests|rate limit|invalid crumb", re.I)
+
+
+class TokenBucket:
+    """Thread-safe token bucket with adaptive backoff."""
+
+    def __init__(self, rate: float, capacity: float, name: str = "",
+                 base_backoff: float = 2.0, max_backoff: float = 120.0):
+        self.name = name
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._tokens = float(capacity)
+        self._updated = self._clock()
+        self._blocked_until = 0.0
+        self._strikes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    @contextmanager
+    def _state(self):
+        """Exclusive access to the bucket state; yields the current time."""
+        with self._lock:
+            yield self._clock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available; otherwise return seconds until they will be."""
+        with self._state() as now:
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available (or timeout elapses)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """acquire() for coroutines: waits with asyncio.sleep instead of blocking the loop."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float] = None) -> float:
+        """Throttled by the server: halve the rate, drain tokens and pause. Returns the pause."""
+        with self._state() as now:
+            self._strikes += 1
+            self.rate = max(self.base_rate / 16.0, self.rate / 2.0)
+            self._tokens = 0.0
+            self._updated = now
+            pause = retry_after if retry_after else min(self.max_backoff, self.base_backoff * 2 ** (self._strikes - 1))
+            self._blocked_until = max(self._blocked_until, now + pause)
+            return pause
+
+    def reward(self) -> None:
+        """Successful response: step the rate back toward its configured value."""
+        if self._strikes == 0 and self.rate >= self.base_rate:
+            return
+        with self._state():
+            self._strikes = 0
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 10.0)
+
+    def report(self, status_code: Optional[int], retry_after=None) -> None:
+        """Feed a response status back into the bucket."""
+        if status_code in BACKOFF_STATUSES:
+            self.penalize(_parse_retry_after(retry_after))
+        elif status_code is not None and 200 <= status_code < 400:
+            self.reward()
+
+    def report_error(self, error) -> bool:
+        """Penalize if an exception / message looks like throttling; returns True if it did."""
+        if error is not None and _RATE_LIMIT_TEXT.search(str(error)):
+            self.penalize()
+            return True
+        return False
+
+
+class SharedTokenBucket(TokenBucket):
+    """TokenBucket whose state lives in a lock-protected file shared by processes."""
+
+    def __init__(self, rate: float, capacity: float, name: str, state_dir: str, **kwargs):
+        self.path = os.path.join(state_dir, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}.bucket.json")
+        os.makedirs(state_dir, exist_ok=True)
+        super().__init__(rate, capacity, name=name, **kwargs)
+
+    @staticmethod
+    def _clock() -> float:
+        return time.time()  # comparable across processes
+
+    @contextmanager
+    def _state(self):
+        with self._lock, open(self.path, "a+") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            fh.seek(0)
+            try:
+                saved = json.loads(fh.read() or "{}")
+            except ValueError:
+                saved = {}
+            if saved:
+                self._tokens = float(saved.get("tokens", self._tokens))
+                self._updated = float(saved.get("updated", self._updated))
+                self.rate = float(saved.get("rate", self.rate))
+                self._blocked_until = float(saved.get("blocked_until", 0.0))
+                self._strikes = int(saved.get("strikes", 0))
+            yield self._clock()
+            fh.seek(0)
+            fh.truncate()
+            json.dump({"tokens": self._tokens, "updated": self._updated, "rate": self.rate,
+                       "blocked_until": self._blocked_until, "strikes": self._strikes}, fh)
+            fh.flush()
+
+    def reward(self) -> None:
+        with self._state():
+            if self._strikes or self.rate < self.base_rate:
+                self._strikes = 0
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 10.0)
+
+
+def _parse_retry_after(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+# Default budgets per provider: (tokens per second, burst capacity)
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "yahoo": (2.0, 5.0),
+    "nse": (0.5, 2.0),
+    "bse": (0.5, 2.0),
+    "screener": (1.0, 2.0),
+    "default": (1.6, 2.0),   # other hosts: ~0.6s spacing, bursts of 2
+}
+
+# Host suffix -> provider bucket
+HOST_PROVIDERS: Dict[str, str] = {
+    "finance.yahoo.com": "yahoo",
+    "yahoo.com": "yahoo",
+    "yimg.com": "yahoo",
+    "nseindia.com": "nse",
+    "bseindia.com": "bse",
+    "screener.in": "screener",
+}
+
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def provider_for_host(host: str) -> str:
+    """Provider bucket name for a host ("www.nseindia.com" -> "nse"); unknown hosts key by host."""
+    host = (host or "").lower().split(":")[0]
+    for suffix, provider in HOST_PROVIDERS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return provider
+    return host or "default"
+
+
+def get_bucket(name: str, rate: Optional[float] = None, capacity: Optional[float] = None,
+               shared: Optional[bool] = None) -> TokenBucket:
+    """Process-wide bucket for a provider, created on first use.
+
+    shared=None follows RATE_LIMIT_STATE_DIR; shared buckets need fcntl (POSIX).
+    """
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(name)
+        if bucket is None:
+            d_rate, d_cap = DEFAULT_LIMITS.get(name, DEFAULT_LIMITS["default"])
+            rate = rate if rate is not None else d_rate
+            capacity = capacity if capacity is not None else d_cap
+            state_dir = os.environ.get("RATE_LIMIT_STATE_DIR")
+            if shared and not state_dir:
+                state_dir = os.path.join(".cache", "rate_limits")
+            if (shared or (shared is None and state_dir)) and fcntl is not None:
+                bucket = SharedTokenBucket(rate, capacity, name=name, state_dir=state_dir)
+            else:
+                bucket = TokenBucket(rate, capacity, name=name)
+            _BUCKETS[name] = bucket
+        return bucket
+
+
+def bucket_for_url(url: str) -> TokenBucket:
+    return get_bucket(provider_for_host(urllib.parse.urlparse(url).netloc))
+
+
+def is_rate_limit_error(error) -> bool:
+    return error is not None and bool(_RATE_LIMIT_TEXT.search(str(error)))
@@ -1285,8 +1285,8 @@ CRITICAL INSTRUCTION:
         fundamental_data = {}
         fundamental_context = ""
         try:
-            from fundamental_data_fetcher import FundamentalDataFetcher
-            fetcher = FundamentalDataFetcher(use_cache=False)
+            from fundamental_data_fetcher import get_fundamental_fetcher
+            fetcher = get_fundamental_fetcher()
             fundamental_data = fetcher.fetch_comprehensive_fundamentals(ticker)
             if fundamental_data.get('data_available'):
                 fundamental_context = fetcher.format_for_ai_prompt(fundamental_data)
@@ -2489,6 +2489,28 @@ Ticker to validate: {ticker}
         except Exception as e:
             logger.warning(f"Quant feature computation failed for {yf_symbol}: {e}")
             return None
+
+    def prefetch_quant_features(self, tickers: List[str]) -> int:
+        """Fill the run's quant cache for many tickers with one panel load.
+
+        Uses QuantFeatureEngine.compute_features_many (shared OHLCV cache, one
+        batched download, vectorized features); tickers it cannot cover fall
+        back to per-ticker compute_features later. Returns the number cached.
+        """
+        if not (self.frontier_alpha_enabled and getattr(self, 'quant_engine', None)):
+            return 0
+        symbols = [s for s in dict.fromkeys(self._map_to_yf_symbol(t) for t in tickers if t)
+                   if s not in self._quant_cache]
+        if not symbols:
+            return 0
+        try:
+            features = self.quant_engine.compute_features_many(symbols)
+        except Exception as e:
+            logger.warning(f"Batched quant features failed for {len(symbols)} tickers: {e}")
+            return 0
+        self._quant_cache.update(features)
+        logger.info(f"📊 Quant features prefetched for {len(features)}/{len(symbols)} tickers")
+        return len(features)
     
     def _combine_scores(self, ai_analysis: Dict, frontier_score: Dict) -> float:
         """Combine AI and Frontier scores using a weighted schema that avoids saturation.
@@ -2909,6 +2931,8 @@ class RealtimeCollectorIntegration:
         valid_tickers = 0
         invalid_tickers = []
 
+        self.analyzer.prefetch_quant_features(tickers)
+
         for idx, ticker in enumerate(tickers, 1):
             print(f"\n[{idx}/{len(tickers)}] Processing {ticker}...")
             logger.info(f"[{idx}/{len(tickers)}] Processing {ticker}...")
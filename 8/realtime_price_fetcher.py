@@ -32,8 +32,10 @@ Usage:
 
 import json
 import os
+import sqlite3
 import sys
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 
 # Import NSE data fetcher (new primary source)
@@ -58,8 +60,9 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
-PRICE_CACHE_FILE = 'offline_price_cache.json'
-_PRICE_CACHE: Optional[Dict[str, Dict]] = None
+PRICE_CACHE_DB = 'offline_price_cache.db'
+LEGACY_PRICE_CACHE_FILE = 'offline_price_cache.json'   # imported once into the store
+PRICE_HISTORY_RETENTION_DAYS = 7
 ALLOW_OFFLINE_PRICE_CACHE = os.getenv('ALLOW_OFFLINE_PRICE_CACHE', '0').strip() == '1'
 
 
@@ -72,40 +75,122 @@ def _normalize_cache_ticker(ticker: str) -> str:
     return ticker
 
 
-def _load_price_cache() -> Dict[str, Dict]:
-    """Load cached price data from disk once per process."""
-    if not ALLOW_OFFLINE_PRICE_CACHE:
-        return {}
-    global _PRICE_CACHE
-    if _PRICE_CACHE is not None:
-        return _PRICE_CACHE
-
-    if not os.path.exists(PRICE_CACHE_FILE):
-        _PRICE_CACHE = {}
-        return _PRICE_CACHE
-
-    try:
-        with open(PRICE_CACHE_FILE, 'r', encoding='utf-8') as f:
-            _PRICE_CACHE = json.load(f)
-            if not isinstance(_PRICE_CACHE, dict):
-                _PRICE_CACHE = {}
-    except Exception as exc:
-        print(f"⚠️  WARNING: Failed to load offline price cache ({exc})", file=sys.stderr)
-        _PRICE_CACHE = {}
-    return _PRICE_CACHE
+class QuoteStore:
+    """
+    SQLite quote store shared by concurrent analyzers.
 
+    Every quote is appended to `quote_history` (kept for intraday lookups)
+    and upserted into `latest_quote`, one row per ticker, in the same short
+    transaction. WAL mode lets readers proceed while one writer commits, and
+    the busy timeout queues concurrent writers instead of dropping updates.
+    """
 
-def _save_price_cache(cache: Dict[str, Dict]) -> None:
-    """Persist cache back to disk (best effort)."""
-    if not ALLOW_OFFLINE_PRICE_CACHE:
-        return
-    global _PRICE_CACHE
-    _PRICE_CACHE = cache
-    try:
-        with open(PRICE_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, indent=2)
-    except Exception as exc:
-        print(f"⚠️  WARNING: Could not save offline price cache ({exc})", file=sys.stderr)
+    def __init__(self, db_path: str = PRICE_CACHE_DB, legacy_json: Optional[str] = LEGACY_PRICE_CACHE_FILE):
+        self.db_path = db_path
+        self._local = threading.local()
+        con = self._conn()
+        with con:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS latest_quote (
+                    ticker TEXT PRIMARY KEY,
+                    current_price REAL NOT NULL,
+                    timestamp TEXT,
+                    symbol TEXT,
+                    source TEXT,
+                    cached_at TEXT
+                )
+                """
+            )
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quote_history (
+                    ticker TEXT NOT NULL,
+                    cached_at TEXT NOT NULL,
+                    current_price REAL NOT NULL,
+                    timestamp TEXT,
+                    symbol TEXT,
+                    source TEXT
+                )
+                """
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS idx_quote_history_ticker ON quote_history(ticker, cached_at)")
+            cutoff = (datetime.now() - timedelta(days=PRICE_HISTORY_RETENTION_DAYS)).isoformat()
+            con.execute("DELETE FROM quote_history WHERE cached_at < ?", (cutoff,))
+            empty = con.execute("SELECT 1 FROM latest_quote LIMIT 1").fetchone() is None
+        if empty and legacy_json:
+            self._import_legacy(legacy_json)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (and per process: connections must not cross fork)."""
+        con = getattr(self._local, 'con', None)
+        if con is None or self._local.pid != os.getpid():
+            con = sqlite3.connect(self.db_path, timeout=30)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con, self._local.pid = con, os.getpid()
+        return con
+
+    def _import_legacy(self, path: str) -> None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(legacy, dict):
+            return
+        for ticker, entry in legacy.items():
+            if isinstance(entry, dict) and entry.get('current_price') is not None:
+                self.put(ticker, entry, cached_at=entry.get('cached_at'))
+
+    def put(self, ticker: str, entry: Dict, cached_at: Optional[str] = None) -> None:
+        """Append a quote to the history and make it the ticker's latest."""
+        cached_at = cached_at or datetime.now().isoformat()
+        row = (_normalize_cache_ticker(ticker), float(entry['current_price']),
+               entry.get('timestamp'), entry.get('symbol', ticker), entry.get('source'), cached_at)
+        con = self._conn()
+        with con:
+            con.execute(
+                "INSERT INTO quote_history (ticker, current_price, timestamp, symbol, source, cached_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", row)
+            con.execute(
+                """
+                INSERT INTO latest_quote (ticker, current_price, timestamp, symbol, source, cached_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(ticker) DO UPDATE SET
+                    current_price=excluded.current_price, timestamp=excluded.timestamp,
+                    symbol=excluded.symbol, source=excluded.source, cached_at=excluded.cached_at
+                WHERE excluded.cached_at >= latest_quote.cached_at
+                """, row)
+
+    def latest(self, ticker: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT current_price, timestamp, symbol, source, cached_at FROM latest_quote WHERE ticker=?",
+            (_normalize_cache_ticker(ticker),)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('current_price', 'timestamp', 'symbol', 'source', 'cached_at'), row))
+
+    def history(self, ticker: str, since: Optional[datetime] = None) -> list:
+        """Quotes recorded for ticker (oldest first), optionally only since a time."""
+        since_iso = since.isoformat() if since else ''
+        rows = self._conn().execute(
+            "SELECT current_price, timestamp, symbol, source, cached_at FROM quote_history "
+            "WHERE ticker=? AND cached_at>=? ORDER BY cached_at",
+            (_normalize_cache_ticker(ticker), since_iso)).fetchall()
+        return [dict(zip(('current_price', 'timestamp', 'symbol', 'source', 'cached_at'), r)) for r in rows]
+
+
+_QUOTE_STORE: Optional[QuoteStore] = None
+_QUOTE_STORE_LOCK = threading.Lock()
+
+
+def _get_quote_store() -> QuoteStore:
+    global _QUOTE_STORE
+    with _QUOTE_STORE_LOCK:
+        if _QUOTE_STORE is None:
+            _QUOTE_STORE = QuoteStore()
+        return _QUOTE_STORE
 
 
 def _update_price_cache(ticker: str, price_info: Dict) -> None:
@@ -114,28 +199,36 @@ def _update_price_cache(ticker: str, price_info: Dict) -> None:
         return
     if not price_info or price_info.get('current_price') is None:
         return
-    cache = _load_price_cache()
-    cache_key = _normalize_cache_ticker(ticker)
-    if not cache_key:
+    if not _normalize_cache_ticker(ticker):
         return
     entry = {
         'current_price': float(price_info.get('current_price')),
         'timestamp': price_info.get('timestamp', datetime.now().isoformat()),
         'symbol': price_info.get('symbol', ticker),
         'source': price_info.get('source', 'yfinance'),
-        'cached_at': datetime.now().isoformat()
     }
-    cache[cache_key] = entry
-    _save_price_cache(cache)
+    try:
+        _get_quote_store().put(ticker, entry)
+    except sqlite3.Error as exc:
+        print(f"⚠️  WARNING: Could not save offline price cache ({exc})", file=sys.stderr)
+
+
+def get_price_history(ticker: str, since: Optional[datetime] = None) -> list:
+    """Intraday quote history recorded for ticker (empty when the offline cache is disabled)."""
+    if not ALLOW_OFFLINE_PRICE_CACHE:
+        return []
+    return _get_quote_store().history(ticker, since)
 
 
 def _get_cached_price(ticker: str) -> Optional[Dict]:
     """Return cached price if live fetch fails."""
     if not ALLOW_OFFLINE_PRICE_CACHE:
         return None
-    cache = _load_price_cache()
-    cache_key = _normalize_cache_ticker(ticker)
-    entry = cache.get(cache_key)
+    try:
+        entry = _get_quote_store().latest(ticker)
+    except sqlite3.Error as exc:
+        print(f"⚠️  WARNING: Failed to load offline price cache ({exc})", file=sys.stderr)
+        return None
     if not entry or entry.get('current_price') is None:
         return None
     cached_at = entry.get('cached_at')
@@ -1,351 +1,667 @@
-#!/usr/bin/env python3
-"""
-Real-Time Price Monitor - Automated Performance Tracking
-Monitors stock prices and automatically updates feedback loop
-
-Usage:
-    # Monitor all active predictions (continuous)
-    python3 realtime_price_monitor.py --monitor --interval 180
-
-    # Monitor specific stocks
-    python3 realtime_price_monitor.py --monitor --tickers SAGILITY,WORTH,BHEL
-
-    # One-time check
-    python3 realtime_price_monitor.py --check-all
-
-    # Auto-learn when threshold met
-    python3 realtime_price_monitor.py --monitor --auto-learn --min-samples 5
-"""
-
-import json
-import os
-import sys
-import time
-import argparse
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import subprocess
-
-try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
-    print("⚠️  yfinance not available. Install with: pip install yfinance")
-
-from realtime_feedback_loop import FeedbackLoopTracker
-
-# Configuration
-PREDICTIONS_DB = 'learning/predictions_tracking.json'
-CHECK_INTERVAL_SECONDS = 180  # 3 minutes default
-MAX_PREDICTION_AGE_HOURS = 24  # Auto-update after 24 hours
-
-
-class RealTimePriceMonitor:
-    """Monitors stock prices and updates feedback loop automatically"""
-
-    def __init__(self, tracker: Optional[FeedbackLoopTracker] = None):
-        self.tracker = tracker or FeedbackLoopTracker()
-        self.last_check = {}
-
-    def fetch_current_price(self, ticker: str) -> Optional[Dict]:
-        """Fetch current price and technical data for a stock"""
-        if not YFINANCE_AVAILABLE:
-            return self._mock_price_fetch(ticker)
-
-        try:
-            # Add .NS for NSE stocks (Indian market)
-            symbol = f"{ticker}.NS" if not ticker.endswith('.NS') else ticker
-
-            stock = yf.Ticker(symbol)
-            info = stock.info
-
-            # Get recent data for RSI/volume
-            hist = stock.history(period='5d')
-
-            if hist.empty:
-                print(f"⚠️  No data for {ticker}")
-                return None
-
-            current_price = hist['Close'].iloc[-1]
-            current_volume = hist['Volume'].iloc[-1]
-
-            # Calculate volume change
-            avg_volume = hist['Volume'].mean()
-            volume_change_pct = ((current_volume - avg_volume) / avg_volume * 100) if avg_volume > 0 else 0
-
-            # Simple RSI calculation (14-period)
-            rsi = self._calculate_rsi(hist['Close'])
-
-            return {
-                'price': round(current_price, 2),
-                'volume_change_pct': round(volume_change_pct, 1),
-                'rsi': int(rsi),
-                'timestamp': datetime.now().isoformat(),
-                'source': 'yfinance'
-            }
-
-        except Exception as e:
-            print(f"❌ Error fetching {ticker}: {e}")
-            return None
-
-    def _calculate_rsi(self, prices, period=14) -> float:
-        """Calculate RSI indicator"""
-        if len(prices) < period + 1:
-            return 50  # Default neutral
-
-        deltas = prices.diff()
-        gains = deltas.where(deltas > 0, 0)
-        losses = -deltas.where(deltas < 0, 0)
-
-        avg_gain = gains.rolling(window=period).mean().iloc[-1]
-        avg_loss = losses.rolling(window=period).mean().iloc[-1]
-
-        if avg_loss == 0:
-            return 100
-
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi
-
-    def _mock_price_fetch(self, ticker: str) -> Dict:
-        """Mock price data for testing without yfinance"""
-        import random
-
-        # Generate realistic mock data
-        base_price = random.uniform(100, 1000)
-        change_pct = random.uniform(-5, 5)
-
-        return {
-            'price': round(base_price, 2),
-            'volume_change_pct': round(random.uniform(-30, 50), 1),
-            'rsi': random.randint(30, 80),
-            'timestamp': datetime.now().isoformat(),
-            'source': 'mock'
-        }
-
-    def check_active_predictions(self) -> List[Dict]:
-        """Check all active predictions and identify those ready for update"""
-        predictions = self.tracker._load_predictions()
-
-        if not predictions:
-            print("ℹ️  No active predictions to monitor")
-            return []
-
-        print(f"\n🔍 Checking {len(predictions)} active predictions...")
-
-        updates_ready = []
-
-        for ticker, prediction in predictions.items():
-            # Check if prediction is old enough to evaluate
-            pred_time = datetime.fromisoformat(prediction['timestamp'])
-            age_hours = (datetime.now() - pred_time).total_seconds() / 3600
-
-            # Fetch current price
-            current_data = self.fetch_current_price(ticker)
-
-            if not current_data:
-                continue
-
-            current_price = current_data['price']
-            initial_price = prediction['initial_price']
-
-            if initial_price == 0:
-                continue
-
-            change_pct = ((current_price - initial_price) / initial_price) * 100
-
-            status = {
-                'ticker': ticker,
-                'age_hours': round(age_hours, 1),
-                'initial_price': initial_price,
-                'current_price': current_price,
-                'change_pct': round(change_pct, 2),
-                'predicted_move': prediction['expected_move_pct'],
-                'recommendation': prediction['recommendation'],
-                'current_data': current_data,
-                'ready_for_update': age_hours >= 3  # Update after 3+ hours
-            }
-
-            updates_ready.append(status)
-
-            # Print status
-            direction = "✅" if change_pct > 0 else "❌" if change_pct < 0 else "➡️"
-            ready_marker = "🔔" if status['ready_for_update'] else "⏳"
-
-            print(f"{ready_marker} {ticker:12s} | {age_hours:>5.1f}h | "
-                  f"₹{initial_price:>7.2f} → ₹{current_price:>7.2f} | "
-                  f"{direction} {change_pct:>+6.2f}% | {prediction['recommendation']}")
-
-        return updates_ready
-
-    def auto_update_predictions(self, updates: List[Dict]) -> int:
-        """Automatically update predictions that are ready"""
-        updated_count = 0
-
-        for update in updates:
-            if not update['ready_for_update']:
-                continue
-
-            ticker = update['ticker']
-            current_data = update['current_data']
-
-            print(f"\n📝 Auto-updating {ticker}...")
-
-            record = self.tracker.update_actual_performance(
-                ticker,
-                current_data['price'],
-                current_data['volume_change_pct'],
-                current_data['rsi']
-            )
-
-            if record:
-                updated_count += 1
-
-        return updated_count
-
-    def monitor_continuous(self, interval_seconds: int = 180,
-                          auto_learn: bool = False,
-                          min_samples_for_learning: int = 5):
-        """Continuously monitor predictions and auto-update"""
-        print(f"\n🚀 Starting continuous monitoring (interval: {interval_seconds}s)")
-        print(f"   Auto-learn: {auto_learn} (min samples: {min_samples_for_learning})")
-        print("   Press Ctrl+C to stop\n")
-
-        iteration = 0
-
-        try:
-            while True:
-                iteration += 1
-                print(f"\n{'='*60}")
-                print(f"Iteration {iteration} - {datetime.now().strftime('%H:%M:%S')}")
-                print(f"{'='*60}")
-
-                # Check predictions
-                updates = self.check_active_predictions()
-
-                # Auto-update ready predictions
-                if updates:
-                    ready_count = sum(1 for u in updates if u['ready_for_update'])
-                    if ready_count > 0:
-                        updated = self.auto_update_predictions(updates)
-                        print(f"\n✅ Updated {updated} predictions")
-
-                        # Trigger learning if threshold met
-                        if auto_learn:
-                            performance_count = len(self.tracker._load_performance())
-                            if performance_count >= min_samples_for_learning:
-                                print(f"\n🧠 Learning threshold met ({performance_count} samples), running learning...")
-                                self.tracker.learn_from_performance()
-
-                # Wait for next iteration
-                print(f"\n⏳ Waiting {interval_seconds}s until next check...")
-                time.sleep(interval_seconds)
-
-        except KeyboardInterrupt:
-            print("\n\n⛔ Monitoring stopped by user")
-            return 0
-
-    def generate_monitoring_dashboard(self) -> str:
-        """Generate a real-time dashboard view"""
-        predictions = self.tracker._load_predictions()
-        performance = self.tracker._load_performance()
-
-        if not predictions and not performance:
-            return "No data available"
-
-        dashboard = f"""
-╔══════════════════════════════════════════════════════════════╗
-║           REAL-TIME MONITORING DASHBOARD                      ║
-╠══════════════════════════════════════════════════════════════╣
-║ Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S'):49s} ║
-╠══════════════════════════════════════════════════════════════╣
-"""
-
-        # Active predictions section
-        if predictions:
-            dashboard += f"║ ACTIVE PREDICTIONS ({len(predictions)}):                                  ║\n"
-            dashboard += "║ " + "-" * 58 + " ║\n"
-
-            for ticker, pred in predictions.items():
-                age = (datetime.now() - datetime.fromisoformat(pred['timestamp'])).total_seconds() / 3600
-                dashboard += f"║ {ticker:8s} | {pred['recommendation']:10s} | ₹{pred['initial_price']:>7.2f} | {age:>4.1f}h ago ║\n"
-        else:
-            dashboard += "║ No active predictions                                        ║\n"
-
-        dashboard += "╠══════════════════════════════════════════════════════════════╣\n"
-
-        # Recent performance section
-        if performance:
-            recent_perf = performance[-5:]  # Last 5
-            correct = sum(1 for p in recent_perf if p['prediction_correct'])
-            accuracy = (correct / len(recent_perf) * 100) if recent_perf else 0
-
-            dashboard += f"║ RECENT PERFORMANCE (last {len(recent_perf)}):                               ║\n"
-            dashboard += "║ " + "-" * 58 + " ║\n"
-
-            for perf in reversed(recent_perf):
-                result = "✅" if perf['prediction_correct'] else "❌"
-                change = perf['actual_change_pct']
-                dashboard += f"║ {result} {perf['ticker']:8s} | {change:>+6.2f}% | {perf['recommendation']:10s}              ║\n"
-
-            dashboard += f"║ Accuracy: {accuracy:>5.1f}%                                              ║\n"
-
-        dashboard += "╚══════════════════════════════════════════════════════════════╝"
-
-        return dashboard
-
-
-def main():
-    parser = argparse.ArgumentParser(description='Real-Time Price Monitor')
-    parser.add_argument('--monitor', action='store_true', help='Start continuous monitoring')
-    parser.add_argument('--interval', type=int, default=180, help='Check interval in seconds (default: 180)')
-    parser.add_argument('--check-all', action='store_true', help='Check all active predictions once')
-    parser.add_argument('--tickers', type=str, help='Comma-separated tickers to monitor')
-    parser.add_argument('--auto-learn', action='store_true', help='Auto-trigger learning when threshold met')
-    parser.add_argument('--min-samples', type=int, default=5, help='Minimum samples before auto-learning')
-    parser.add_argument('--dashboard', action='store_true', help='Show monitoring dashboard')
-
-    args = parser.parse_args()
-
-    monitor = RealTimePriceMonitor()
-
-    # Show dashboard
-    if args.dashboard:
-        dashboard = monitor.generate_monitoring_dashboard()
-        print(dashboard)
-        return 0
-
-    # Check all predictions once
-    if args.check_all:
-        updates = monitor.check_active_predictions()
-
-        if updates:
-            ready = [u for u in updates if u['ready_for_update']]
-            print(f"\n📊 Summary: {len(ready)}/{len(updates)} predictions ready for update")
-
-            if ready:
-                response = input("\nUpdate ready predictions now? (y/n): ")
-                if response.lower() == 'y':
-                    count = monitor.auto_update_predictions(updates)
-                    print(f"\n✅ Updated {count} predictions")
-
-        return 0
-
-    # Continuous monitoring
-    if args.monitor:
-        monitor.monitor_continuous(
-            interval_seconds=args.interval,
-            auto_learn=args.auto_learn,
-            min_samples_for_learning=args.min_samples
-        )
-        return 0
-
-    # Default: show help
-    parser.print_help()
-    return 1
-
-
-if __name__ == '__main__':
-    sys.exit(main())
+#!/usr/bin/env python3
+"""
+Real-Time Price Monitor - Automated Performance Tracking
+Monitors stock prices and automatically updates feedback loop
+
+Usage:
+    # Monitor all active predictions (continuous)
+    python3 realtime_price_monitor.py --monitor --interval 180
+
+    # Monitor specific stocks
+    python3 realtime_price_monitor.py --monitor --tickers SAGILITY,WORTH,BHEL
+
+    # One-time check
+    python3 realtime_price_monitor.py --check-all
+
+    # Auto-learn when threshold met
+    python3 realtime_price_monitor.py --monitor --auto-learn --min-samples 5
+
+    # Replay recorded ticks (CSV/JSONL: timestamp,ticker,price[,volume_change_pct,rsi])
+    python3 realtime_price_monitor.py --monitor --replay ticks.csv
+
+The continuous monitor is asyncio based: each ticker has its own polling
+interval (MIN_POLL_SECONDS near a stop/target, halved on large moves, doubled
+up to MAX_POLL_SECONDS while quiet), due tickers are fetched concurrently
+under the shared "yahoo" rate-limit bucket, and stop/target crossings and
+ready-for-update events are published on an AlertBus that callers can
+subscribe to.
+"""
+
+import asyncio
+import bisect
+import csv
+import heapq
+import inspect
+import json
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Union
+import subprocess
+
+try:
+    import yfinance as yf
+    YFINANCE_AVAILABLE = True
+except ImportError:
+    YFINANCE_AVAILABLE = False
+    print("⚠️  yfinance not available. Install with: pip install yfinance")
+
+from rate_limiter import get_bucket
+from realtime_feedback_loop import FeedbackLoopTracker
+
+# Configuration
+PREDICTIONS_DB = 'learning/predictions_tracking.json'
+CHECK_INTERVAL_SECONDS = 180  # 3 minutes default
+MAX_PREDICTION_AGE_HOURS = 24  # Auto-update after 24 hours
+READY_AFTER_HOURS = 3  # Predictions are evaluated after 3+ hours
+
+# Adaptive polling
+MIN_POLL_SECONDS = 15      # Price within NEAR_LEVEL_PCT of a stop/target
+MAX_POLL_SECONDS = 600     # Ceiling for quiet tickers
+NEAR_LEVEL_PCT = 1.5       # Distance to a level that counts as "near"
+ACTIVE_MOVE_PCT = 1.0      # Move since last poll that halves the interval
+QUIET_MOVE_PCT = 0.2       # Move since last poll below which the interval doubles
+MAX_CONCURRENT_FETCHES = 8
+LEVEL_KINDS = ('stop_loss', 'target_1', 'target_2')
+
+
+@dataclass
+class PriceAlert:
+    """Threshold crossing (stop_loss / target_1 / target_2) or 'ready_for_update'"""
+    ticker: str
+    kind: str
+    price: float
+    level: Optional[float] = None
+    timestamp: str = ''
+    data: Dict = field(default_factory=dict)
+
+
+AlertCallback = Callable[[PriceAlert], Union[None, Awaitable[None]]]
+
+
+class AlertBus:
+    """Dispatches PriceAlerts to callbacks subscribed by kind ('*' = all kinds)"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[AlertCallback]] = defaultdict(list)
+        self.history: List[PriceAlert] = []
+
+    def subscribe(self, kind: str, callback: AlertCallback) -> None:
+        self._subscribers[kind].append(callback)
+
+    def unsubscribe(self, kind: str, callback: AlertCallback) -> None:
+        if callback in self._subscribers.get(kind, []):
+            self._subscribers[kind].remove(callback)
+
+    async def publish(self, alert: PriceAlert) -> None:
+        """Run the callbacks in subscription order; async callbacks are awaited"""
+        self.history.append(alert)
+        for callback in self._subscribers.get(alert.kind, []) + self._subscribers.get('*', []):
+            try:
+                result = callback(alert)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"⚠️  Alert callback failed for {alert.ticker} {alert.kind}: {e}")
+
+
+class LivePriceSource:
+    """Wall-clock source: fetch_current_price in a worker thread under the yahoo bucket"""
+
+    def __init__(self, monitor: 'RealTimePriceMonitor'):
+        self.monitor = monitor
+        self.bucket = get_bucket('yahoo')
+
+    def clock(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    def exhausted(self) -> bool:
+        return False
+
+    async def fetch(self, ticker: str) -> Optional[Dict]:
+        await self.bucket.acquire_async()
+        data = await asyncio.to_thread(self.monitor.fetch_current_price, ticker)
+        if data is not None:
+            self.bucket.reward()
+        return data
+
+
+class ReplayPriceSource:
+    """Recorded ticks on a virtual clock, for deterministic offline runs and benchmarks.
+
+    fetch() returns the latest tick at or before the virtual time; sleep()
+    advances the clock without waiting. Ticks are read from CSV or JSON lines
+    with timestamp (ISO), ticker, price and optional volume_change_pct / rsi.
+    """
+
+    def __init__(self, ticks: List[Dict]):
+        self._ticks: Dict[str, List[Dict]] = defaultdict(list)
+        for tick in sorted(ticks, key=lambda t: t['timestamp']):
+            self._ticks[tick['ticker']].append(tick)
+        self._times = {t: [x['timestamp'].timestamp() for x in rows] for t, rows in self._ticks.items()}
+        self.start = min((rows[0] for rows in self._times.values()), default=0.0)
+        self.end = max((rows[-1] for rows in self._times.values()), default=0.0)
+        self._clock = self.start
+        self.fetches = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ReplayPriceSource':
+        with open(path, encoding='utf-8') as f:
+            if path.endswith(('.jsonl', '.json')):
+                rows = [json.loads(line) for line in f if line.strip()]
+            else:
+                rows = list(csv.DictReader(f))
+        ticks = []
+        for row in rows:
+            ticks.append({
+                'timestamp': datetime.fromisoformat(str(row['timestamp'])),
+                'ticker': row['ticker'],
+                'price': float(row['price']),
+                'volume_change_pct': float(row.get('volume_change_pct') or 0),
+                'rsi': int(float(row.get('rsi') or 50)),
+            })
+        return cls(ticks)
+
+    def tickers(self) -> List[str]:
+        return list(self._ticks)
+
+    def clock(self) -> float:
+        return self._clock
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._clock)
+
+    async def sleep(self, seconds: float) -> None:
+        self._clock += max(0.0, seconds)
+        await asyncio.sleep(0)
+
+    def exhausted(self) -> bool:
+        return self._clock > self.end
+
+    async def fetch(self, ticker: str) -> Optional[Dict]:
+        self.fetches += 1
+        i = bisect.bisect_right(self._times.get(ticker, []), self._clock)
+        if i == 0:
+            return None
+        tick = self._ticks[ticker][i - 1]
+        return {
+            'price': round(tick['price'], 2),
+            'volume_change_pct': tick['volume_change_pct'],
+            'rsi': tick['rsi'],
+            'timestamp': tick['timestamp'].isoformat(),
+            'source': 'replay'
+        }
+
+
+@dataclass
+class _WatchState:
+    ticker: str
+    prediction: Dict
+    base_interval: float
+    interval: float
+    last_price: Optional[float] = None
+    fired: Set[str] = field(default_factory=set)
+    done: bool = False
+
+
+class RealTimePriceMonitor:
+    """Monitors stock prices and updates feedback loop automatically"""
+
+    def __init__(self, tracker: Optional[FeedbackLoopTracker] = None):
+        self.tracker = tracker or FeedbackLoopTracker()
+        self.last_check = {}
+        self.alerts = AlertBus()
+        self.alerts.subscribe('*', self.print_alert)
+
+    def fetch_current_price(self, ticker: str) -> Optional[Dict]:
+        """Fetch current price and technical data for a stock"""
+        if not YFINANCE_AVAILABLE:
+            return self._mock_price_fetch(ticker)
+
+        try:
+            # Add .NS for NSE stocks (Indian market)
+            symbol = f"{ticker}.NS" if not ticker.endswith('.NS') else ticker
+
+            stock = yf.Ticker(symbol)
+
+            # Get recent data for RSI/volume
+            hist = stock.history(period='5d')
+
+            if hist.empty:
+                print(f"⚠️  No data for {ticker}")
+                return None
+
+            current_price = hist['Close'].iloc[-1]
+            current_volume = hist['Volume'].iloc[-1]
+
+            # Calculate volume change
+            avg_volume = hist['Volume'].mean()
+            volume_change_pct = ((current_volume - avg_volume) / avg_volume * 100) if avg_volume > 0 else 0
+
+            # Simple RSI calculation (14-period)
+            rsi = self._calculate_rsi(hist['Close'])
+
+            return {
+                'price': round(current_price, 2),
+                'volume_change_pct': round(volume_change_pct, 1),
+                'rsi': int(rsi),
+                'timestamp': datetime.now().isoformat(),
+                'source': 'yfinance'
+            }
+
+        except Exception as e:
+            print(f"❌ Error fetching {ticker}: {e}")
+            return None
+
+    def _calculate_rsi(self, prices, period=14) -> float:
+        """Calculate RSI indicator"""
+        if len(prices) < period + 1:
+            return 50  # Default neutral
+
+        deltas = prices.diff()
+        gains = deltas.where(deltas > 0, 0)
+        losses = -deltas.where(deltas < 0, 0)
+
+        avg_gain = gains.rolling(window=period).mean().iloc[-1]
+        avg_loss = losses.rolling(window=period).mean().iloc[-1]
+
+        if avg_loss == 0:
+            return 100
+
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+
+        return rsi
+
+    def _mock_price_fetch(self, ticker: str) -> Dict:
+        """Mock price data for testing without yfinance"""
+        import random
+
+        # Generate realistic mock data
+        base_price = random.uniform(100, 1000)
+        change_pct = random.uniform(-5, 5)
+
+        return {
+            'price': round(base_price, 2),
+            'volume_change_pct': round(random.uniform(-30, 50), 1),
+            'rsi': random.randint(30, 80),
+            'timestamp': datetime.now().isoformat(),
+            'source': 'mock'
+        }
+
+    def check_active_predictions(self) -> List[Dict]:
+        """Check all active predictions and identify those ready for update"""
+        predictions = self.tracker._load_predictions()
+
+        if not predictions:
+            print("ℹ️  No active predictions to monitor")
+            return []
+
+        print(f"\n🔍 Checking {len(predictions)} active predictions...")
+
+        updates_ready = []
+
+        for ticker, prediction in predictions.items():
+            # Check if prediction is old enough to evaluate
+            pred_time = datetime.fromisoformat(prediction['timestamp'])
+            age_hours = (datetime.now() - pred_time).total_seconds() / 3600
+
+            # Fetch current price
+            current_data = self.fetch_current_price(ticker)
+
+            if not current_data:
+                continue
+
+            current_price = current_data['price']
+            initial_price = prediction['initial_price']
+
+            if initial_price == 0:
+                continue
+
+            change_pct = ((current_price - initial_price) / initial_price) * 100
+
+            status = {
+                'ticker': ticker,
+                'age_hours': round(age_hours, 1),
+                'initial_price': initial_price,
+                'current_price': current_price,
+                'change_pct': round(change_pct, 2),
+                'predicted_move': prediction['expected_move_pct'],
+                'recommendation': prediction['recommendation'],
+                'current_data': current_data,
+                'ready_for_update': age_hours >= READY_AFTER_HOURS
+            }
+
+            updates_ready.append(status)
+
+            # Print status
+            direction = "✅" if change_pct > 0 else "❌" if change_pct < 0 else "➡️"
+            ready_marker = "🔔" if status['ready_for_update'] else "⏳"
+
+            print(f"{ready_marker} {ticker:12s} | {age_hours:>5.1f}h | "
+                  f"₹{initial_price:>7.2f} → ₹{current_price:>7.2f} | "
+                  f"{direction} {change_pct:>+6.2f}% | {prediction['recommendation']}")
+
+        return updates_ready
+
+    def auto_update_predictions(self, updates: List[Dict]) -> int:
+        """Automatically update predictions that are ready"""
+        updated_count = 0
+
+        for update in updates:
+            if not update['ready_for_update']:
+                continue
+
+            ticker = update['ticker']
+            current_data = update['current_data']
+
+            print(f"\n📝 Auto-updating {ticker}...")
+
+            record = self.tracker.update_actual_performance(
+                ticker,
+                current_data['price'],
+                current_data['volume_change_pct'],
+                current_data['rsi']
+            )
+
+            if record:
+                updated_count += 1
+
+        return updated_count
+
+    def monitor_continuous(self, interval_seconds: int = 180,
+                          auto_learn: bool = False,
+                          min_samples_for_learning: int = 5,
+                          tickers: Optional[List[str]] = None,
+                          source=None,
+                          max_concurrency: int = MAX_CONCURRENT_FETCHES):
+        """Continuously monitor predictions and auto-update (see run_async)"""
+        print(f"\n🚀 Starting continuous monitoring (base interval: {interval_seconds}s, "
+              f"adaptive {MIN_POLL_SECONDS}-{MAX_POLL_SECONDS}s)")
+        print(f"   Auto-learn: {auto_learn} (min samples: {min_samples_for_learning})")
+        print("   Press Ctrl+C to stop\n")
+
+        try:
+            stats = asyncio.run(self.run_async(
+                source=source,
+                interval_seconds=interval_seconds,
+                auto_learn=auto_learn,
+                min_samples_for_learning=min_samples_for_learning,
+                tickers=tickers,
+                max_concurrency=max_concurrency,
+            ))
+            print(f"\n✅ Monitoring finished: {stats['polls']} polls, {stats['alerts']} alerts, "
+                  f"{stats['updated']} predictions updated")
+            return 0
+        except KeyboardInterrupt:
+            print("\n\n⛔ Monitoring stopped by user")
+            return 0
+
+    async def run_async(self, source=None, interval_seconds: float = CHECK_INTERVAL_SECONDS,
+                        auto_update: bool = True, auto_learn: bool = False,
+                        min_samples_for_learning: int = 5,
+                        tickers: Optional[List[str]] = None,
+                        predictions: Optional[Dict] = None,
+                        max_concurrency: int = MAX_CONCURRENT_FETCHES,
+                        duration_seconds: Optional[float] = None) -> Dict[str, int]:
+        """Event loop of the monitor; returns poll/alert/update counts.
+
+        Watches `predictions` (default: the tracker's active predictions,
+        reloaded every interval_seconds to pick up new ones; a newer
+        prediction for a watched ticker replaces the old one) restricted to
+        `tickers`. Ends when nothing is left to watch (explicit predictions
+        or replay), the replay is exhausted, or duration_seconds elapsed.
+        """
+        source = source or LivePriceSource(self)
+        reload = predictions is None and isinstance(source, LivePriceSource)
+        wanted = {t.strip().upper() for t in tickers} if tickers else None
+        limit = asyncio.Semaphore(max_concurrency)
+        stats = {'polls': 0, 'alerts': 0, 'updated': 0}
+        states: Dict[str, _WatchState] = {}
+        heap: List = []  # (due, ticker, prediction timestamp); stale entries are dropped when popped
+
+        def watch(preds: Dict) -> None:
+            for ticker, pred in preds.items():
+                if wanted and ticker.upper() not in wanted:
+                    continue
+                stamp = pred.get('timestamp', '')
+                if ticker in states and states[ticker].prediction.get('timestamp', '') == stamp:
+                    continue
+                states[ticker] = _WatchState(ticker, pred, interval_seconds, interval_seconds)
+                heapq.heappush(heap, (source.clock(), ticker, stamp))
+
+        async def on_ready(alert: PriceAlert) -> None:
+            data = alert.data
+            state = states[alert.ticker]
+            print(f"\n📝 Auto-updating {alert.ticker}...")
+            updated = False
+            try:
+                updated = self.tracker.update_actual_performance(
+                    alert.ticker, data['price'], data['volume_change_pct'], data['rsi'])
+            finally:
+                if not updated:
+                    state.fired.discard('ready')  # publish again on the next poll
+            if updated:
+                stats['updated'] += 1
+                state.done = True
+                if auto_learn:
+                    performance_count = self.tracker.performance_count()
+                    if performance_count >= min_samples_for_learning:
+                        print(f"\n🧠 Learning threshold met ({performance_count} samples), running learning...")
+                        self.tracker.learn_from_performance()
+
+        if auto_update:
+            self.alerts.subscribe('ready_for_update', on_ready)
+
+        async def poll(ticker: str) -> Optional[Dict]:
+            async with limit:
+                try:
+                    return await source.fetch(ticker)
+                except Exception as e:
+                    print(f"❌ Error fetching {ticker}: {e}")
+                    return None
+
+        watch(predictions if predictions is not None else self.tracker._load_predictions())
+        start = source.clock()
+        next_reload = start + interval_seconds
+        try:
+            while not source.exhausted():
+                now = source.clock()
+                if duration_seconds is not None and now - start >= duration_seconds:
+                    break
+                if reload and now >= next_reload:
+                    watch(self.tracker._load_predictions())
+                    next_reload = now + interval_seconds
+                if not heap:
+                    if not reload:
+                        break
+                    await source.sleep(next_reload - now)
+                    continue
+
+                wake = heap[0][0] if not reload else min(heap[0][0], next_reload)
+                if wake > now:
+                    await source.sleep(wake - now)
+                    continue
+
+                due = []
+                while heap and heap[0][0] <= now:
+                    _, ticker, stamp = heapq.heappop(heap)
+                    if states[ticker].prediction.get('timestamp', '') == stamp:
+                        due.append(ticker)
+                results = await asyncio.gather(*(poll(t) for t in due))
+                stats['polls'] += len(due)
+
+                for ticker, data in zip(due, results):
+                    state = states[ticker]
+                    if data:
+                        stats['alerts'] += await self._evaluate_tick(state, data, source.now())
+                    if not state.done:
+                        heapq.heappush(heap, (now + state.interval, ticker, state.prediction.get('timestamp', '')))
+        finally:
+            if auto_update:
+                self.alerts.unsubscribe('ready_for_update', on_ready)
+        return stats
+
+    async def _evaluate_tick(self, state: _WatchState, data: Dict, now: datetime) -> int:
+        """Publish level crossings (once per level) and readiness; adapt the interval"""
+        pred = state.prediction
+        price = data['price']
+        prev = state.last_price if state.last_price is not None else pred.get('initial_price') or price
+        published = 0
+
+        for kind in LEVEL_KINDS:
+            level = pred.get(kind) or 0
+            if level <= 0 or kind in state.fired:
+                continue
+            if prev < level <= price or prev > level >= price:
+                state.fired.add(kind)
+                await self.alerts.publish(PriceAlert(state.ticker, kind, price, level, data['timestamp'], data))
+                published += 1
+
+        pred_time = datetime.fromisoformat(pred['timestamp'])
+        if 'ready' not in state.fired and (now - pred_time).total_seconds() / 3600 >= READY_AFTER_HOURS:
+            state.fired.add('ready')
+            await self.alerts.publish(PriceAlert(state.ticker, 'ready_for_update', price, None, data['timestamp'], data))
+            published += 1
+
+        state.interval = self._next_interval(state, prev, price)
+        state.last_price = price
+        return published
+
+    def _next_interval(self, state: _WatchState, prev: float, price: float) -> float:
+        """Fast near an unfired stop/target, faster on big moves, backs off while quiet"""
+        base = state.base_interval
+        levels = [state.prediction.get(k) or 0 for k in LEVEL_KINDS if k not in state.fired]
+        if price > 0 and any(l > 0 and abs(price - l) / price * 100 <= NEAR_LEVEL_PCT for l in levels):
+            return MIN_POLL_SECONDS
+        move_pct = abs(price - prev) / prev * 100 if prev else 0.0
+        if move_pct >= ACTIVE_MOVE_PCT:
+            return max(MIN_POLL_SECONDS, min(state.interval, base) / 2)
+        if move_pct < QUIET_MOVE_PCT:
+            return min(MAX_POLL_SECONDS, state.interval * 2)
+        return base
+
+    @staticmethod
+    def print_alert(alert: PriceAlert) -> None:
+        marker = {'stop_loss': '🛑', 'target_1': '🎯', 'target_2': '🏁'}.get(alert.kind, '🔔')
+        level = f" (level ₹{alert.level:.2f})" if alert.level else ""
+        print(f"{marker} {alert.timestamp[:19]} {alert.ticker:12s} {alert.kind:16s} ₹{alert.price:>8.2f}{level}")
+
+    def generate_monitoring_dashboard(self) -> str:
+        """Generate a real-time dashboard view"""
+        predictions = self.tracker._load_predictions()
+        performance = self.tracker.recent_performance(5)
+
+        if not predictions and not performance:
+            return "No data available"
+
+        dashboard = f"""
+╔══════════════════════════════════════════════════════════════╗
+║           REAL-TIME MONITORING DASHBOARD                      ║
+╠══════════════════════════════════════════════════════════════╣
+║ Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S'):49s} ║
+╠══════════════════════════════════════════════════════════════╣
+"""
+
+        # Active predictions section
+        if predictions:
+            dashboard += f"║ ACTIVE PREDICTIONS ({len(predictions)}):                                  ║\n"
+            dashboard += "║ " + "-" * 58 + " ║\n"
+
+            for ticker, pred in predictions.items():
+                age = (datetime.now() - datetime.fromisoformat(pred['timestamp'])).total_seconds() / 3600
+                dashboard += f"║ {ticker:8s} | {pred['recommendation']:10s} | ₹{pred['initial_price']:>7.2f} | {age:>4.1f}h ago ║\n"
+        else:
+            dashboard += "║ No active predictions                                        ║\n"
+
+        dashboard += "╠══════════════════════════════════════════════════════════════╣\n"
+
+        # Recent performance section
+        if performance:
+            recent_perf = performance  # Last 5
+            correct = sum(1 for p in recent_perf if p['prediction_correct'])
+            accuracy = (correct / len(recent_perf) * 100) if recent_perf else 0
+
+            dashboard += f"║ RECENT PERFORMANCE (last {len(recent_perf)}):                               ║\n"
+            dashboard += "║ " + "-" * 58 + " ║\n"
+
+            for perf in reversed(recent_perf):
+                result = "✅" if perf['prediction_correct'] else "❌"
+                change = perf['actual_change_pct']
+                dashboard += f"║ {result} {perf['ticker']:8s} | {change:>+6.2f}% | {perf['recommendation']:10s}              ║\n"
+
+            dashboard += f"║ Accuracy: {accuracy:>5.1f}%                                              ║\n"
+
+        dashboard += "╚══════════════════════════════════════════════════════════════╝"
+
+        return dashboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Real-Time Price Monitor')
+    parser.add_argument('--monitor', action='store_true', help='Start continuous monitoring')
+    parser.add_argument('--interval', type=int, default=180, help='Check interval in seconds (default: 180)')
+    parser.add_argument('--check-all', action='store_true', help='Check all active predictions once')
+    parser.add_argument('--tickers', type=str, help='Comma-separated tickers to monitor')
+    parser.add_argument('--auto-learn', action='store_true', help='Auto-trigger learning when threshold met')
+    parser.add_argument('--min-samples', type=int, default=5, help='Minimum samples before auto-learning')
+    parser.add_argument('--dashboard', action='store_true', help='Show monitoring dashboard')
+    parser.add_argument('--replay', type=str, help='Replay recorded ticks (CSV/JSONL) instead of live prices')
+    parser.add_argument('--max-concurrency', type=int, default=MAX_CONCURRENT_FETCHES,
+                        help=f'Concurrent price fetches (default: {MAX_CONCURRENT_FETCHES})')
+
+    args = parser.parse_args()
+
+    monitor = RealTimePriceMonitor()
+
+    # Show dashboard
+    if args.dashboard:
+        dashboard = monitor.generate_monitoring_dashboard()
+        print(dashboard)
+        return 0
+
+    # Check all predictions once
+    if args.check_all:
+        updates = monitor.check_active_predictions()
+
+        if updates:
+            ready = [u for u in updates if u['ready_for_update']]
+            print(f"\n📊 Summary: {len(ready)}/{len(updates)} predictions ready for update")
+
+            if ready:
+                response = input("\nUpdate ready predictions now? (y/n): ")
+                if response.lower() == 'y':
+                    count = monitor.auto_update_predictions(updates)
+                    print(f"\n✅ Updated {count} predictions")
+
+        return 0
+
+    # Continuous monitoring
+    if args.monitor:
+        monitor.monitor_continuous(
+            interval_seconds=args.interval,
+            auto_learn=args.auto_learn,
+            min_samples_for_learning=args.min_samples,
+            tickers=args.tickers.split(',') if args.tickers else None,
+            source=ReplayPriceSource.from_file(args.replay) if args.replay else None,
+            max_concurrency=args.max_concurrency
+        )
+        return 0
+
+    # Default: show help
+    parser.print_help()
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
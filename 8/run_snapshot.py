@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Screener run-state snapshot for incremental reruns
+
+Each scored ticker is stored with a hash of its scoring inputs (news set,
+price history tail, market cap / name / spread) and the per-ticker results of
+the technical scoring pass. A rerun with --incremental recomputes only the
+tickers whose inputs hash changed (or whose entry is older than the news
+plateau window, since sentiment decays with time) and restores the rest.
+
+The final tier of every ticker is kept per run as well, so each run can
+report which tickers entered, left or moved between tiers since the last one.
+
+A change of CLI options or of the screener source invalidates all entries
+(config hash).
+
+Usage:
+    from run_snapshot import RunSnapshot, config_hash, ticker_inputs_hash, diff_tiers, format_diff
+    snap = RunSnapshot(config_hash=config_hash(args, __file__))
+    states = snap.reusable({"TCS": ticker_inputs_hash(news, df, mcap, name, spread)})
+    prev_ts, prev = snap.previous_tiers(); snap.put_tiers(run_ts, tiers)
+    print(format_diff(diff_tiers(prev, tiers), prev_ts))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+SNAPSHOT_DB = os.path.join(".yf_cache", "run_snapshot.db")
+MAX_REUSE_HOURS = 6.0
+TIER_ORDER = {"TIER1": 1, "TIER2": 2, "TIER3": 3}
+
+# CLI options that only affect input discovery or presentation
+_NEUTRAL_ARGS = {"files", "incremental", "debug", "debug_institutional", "excel_view", "excel_file",
+                 "csv_enhanced", "no_legacy_table", "show_raw", "validation_report"}
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha1(json.dumps(obj, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def config_hash(args, code_path: Optional[str] = None) -> str:
+    """Hash of the scoring-relevant CLI options and the screener source file."""
+    opts = {k: v for k, v in sorted(vars(args).items()) if k not in _NEUTRAL_ARGS}
+    code = None
+    if code_path:
+        try:
+            st = os.stat(code_path)
+            code = (st.st_size, int(st.st_mtime))
+        except OSError:
+            pass
+    return _digest([opts, code])
+
+
+def news_signature(items: Iterable) -> List[Tuple]:
+    """Order-independent signature of a ticker's news items."""
+    sig = []
+    for n in items or ():
+        ts = getattr(n, "ts", None)
+        sig.append((getattr(n, "headline", ""), getattr(n, "snippet", ""),
+                    ts.isoformat() if ts is not None else "", round(float(getattr(n, "sent", 0.0) or 0.0), 6)))
+    return sorted(sig)
+
+
+def bar_signature(df: Optional[pd.DataFrame]) -> Tuple:
+    """Length, date range, latest bar and close sum (catches split/dividend re-adjustment)."""
+    if df is None or df.empty:
+        return ()
+    last = df.iloc[-1]
+    cols = [c for c in ("Open", "High", "Low", "Close", "Volume") if c in df.columns]
+    return (len(df), str(df.index[0]), str(df.index[-1]),
+            tuple(round(float(last[c]), 6) for c in cols),
+            round(float(df["Close"].sum()), 4) if "Close" in df.columns else None)
+
+
+def ticker_inputs_hash(news_entry: Optional[dict], df: Optional[pd.DataFrame],
+                       mcap: Optional[float], name: Optional[str], spread: Optional[float]) -> str:
+    entry = news_entry or {}
+    return _digest([entry.get("name"), news_signature(entry.get("news")), bar_signature(df),
+                    round(float(mcap or 0.0), 4), name or "", round(float(spread or 0.0), 6)])
+
+
+class RunSnapshot:
+    """Per-ticker scoring state and per-run tier assignments (SQLite)."""
+
+    def __init__(self, db_path: str = SNAPSHOT_DB, config_hash: str = "",
+                 max_reuse_hours: float = MAX_REUSE_HOURS):
+        self.db_path = db_path
+        self.config_hash = config_hash
+        self.max_reuse_hours = max_reuse_hours
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        con = sqlite3.connect(db_path)
+        try:
+            con.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS ticker_state (
+                    symbol TEXT PRIMARY KEY,
+                    config_hash TEXT,
+                    inputs_hash TEXT,
+                    computed_at REAL,
+                    score REAL,
+                    state BLOB
+                );
+                CREATE TABLE IF NOT EXISTS run_tiers (
+                    run_ts TEXT,
+                    symbol TEXT,
+                    tier TEXT,
+                    score REAL,
+                    PRIMARY KEY (run_ts, symbol)
+                );
+                """
+            )
+            con.commit()
+        finally:
+            con.close()
+
+    def reusable(self, symbols_hashes: Dict[str, str]) -> Dict[str, dict]:
+        """symbol -> stored state for entries whose config and inputs hash match and are recent."""
+        if not symbols_hashes:
+            return {}
+        oldest = time.time() - self.max_reuse_hours * 3600
+        out: Dict[str, dict] = {}
+        symbols = list(symbols_hashes)
+        con = sqlite3.connect(self.db_path)
+        try:
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i + 500]
+                q = ",".join("?" * len(chunk))
+                for sym, h, blob in con.execute(
+                        f"SELECT symbol, inputs_hash, state FROM ticker_state "
+                        f"WHERE config_hash=? AND computed_at>=? AND symbol IN ({q})",
+                        [self.config_hash, oldest, *chunk]):
+                    if h != symbols_hashes.get(sym):
+                        continue
+                    try:
+                        out[sym] = pickle.loads(blob)
+                    except Exception:
+                        continue
+        finally:
+            con.close()
+        return out
+
+    def put_states(self, rows: List[Tuple[str, str, dict]]) -> None:
+        """rows: (symbol, inputs_hash, state); state["rank"] is the score or None if filtered."""
+        if not rows:
+            return
+        now = time.time()
+        with self._lock:
+            con = sqlite3.connect(self.db_path)
+            try:
+                con.executemany(
+                    "INSERT OR REPLACE INTO ticker_state (symbol, config_hash, inputs_hash, computed_at, score, state) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(sym, self.config_hash, h, now, state.get("rank"), pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+                     for sym, h, state in rows],
+                )
+                con.commit()
+            finally:
+                con.close()
+
+    def previous_tiers(self) -> Tuple[str, Dict[str, Tuple[str, float]]]:
+        """(run_ts, symbol -> (tier, score)) of the latest recorded run."""
+        con = sqlite3.connect(self.db_path)
+        try:
+            row = con.execute("SELECT MAX(run_ts) FROM run_tiers").fetchone()
+            if not row or row[0] is None:
+                return "", {}
+            return row[0], {sym: (tier, score) for sym, tier, score in con.execute(
+                "SELECT symbol, tier, score FROM run_tiers WHERE run_ts=?", (row[0],))}
+        finally:
+            con.close()
+
+    def put_tiers(self, run_ts: str, tiers: Dict[str, Tuple[str, float]], keep_runs: int = 30) -> None:
+        with self._lock:
+            con = sqlite3.connect(self.db_path)
+            try:
+                con.executemany(
+                    "INSERT OR REPLACE INTO run_tiers (run_ts, symbol, tier, score) VALUES (?, ?, ?, ?)",
+                    [(run_ts, sym, tier, float(score)) for sym, (tier, score) in tiers.items()],
+                )
+                con.execute(
+                    "DELETE FROM run_tiers WHERE run_ts NOT IN "
+                    "(SELECT DISTINCT run_ts FROM run_tiers ORDER BY run_ts DESC LIMIT ?)", (keep_runs,))
+                con.commit()
+            finally:
+                con.close()
+
+
+def diff_tiers(prev: Dict[str, Tuple[str, float]], curr: Dict[str, Tuple[str, float]]) -> Dict[str, list]:
+    """Tickers that entered, left or moved between tiers (moves carry old -> new tier)."""
+    entered = sorted(((t, tier, s) for t, (tier, s) in curr.items() if t not in prev), key=lambda x: (TIER_ORDER.get(x[1], 9), -x[2]))
+    left = sorted(((t, tier, s) for t, (tier, s) in prev.items() if t not in curr), key=lambda x: (TIER_ORDER.get(x[1], 9), -x[2]))
+    moved = sorted(((t, prev[t][0], tier, s) for t, (tier, s) in curr.items() if t in prev and prev[t][0] != tier),
+                   key=lambda x: (TIER_ORDER.get(x[2], 9), -x[3]))
+    return {"entered": entered, "left": left, "moved": moved}
+
+
+def format_diff(diff: Dict[str, list], prev_run: str = "") -> str:
+    lines = [f"TIER CHANGES since {prev_run or 'previous run'}:"]
+    lines.append(f"Entered ({len(diff['entered'])}):")
+    lines += [f"+ {t} -> {tier} (score {s:.2f})" for t, tier, s in diff["entered"]] or ["- None"]
+    lines.append(f"Left ({len(diff['left'])}):")
+    lines += [f"- {t} (was {tier}, score {s:.2f})" for t, tier, s in diff["left"]] or ["- None"]
+    lines.append(f"Moved ({len(diff['moved'])}):")
+    lines += [f"{'^' if TIER_ORDER.get(new, 9) < TIER_ORDER.get(old, 9) else 'v'} {t}: {old} -> {new} (score {s:.2f})"
+              for t, old, new, s in diff["moved"]] or ["- None"]
+    return "\n".join(lines)
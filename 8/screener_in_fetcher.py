@@ -26,6 +26,8 @@ from typing import Dict, List, Optional
 import time
 import logging
 
+from rate_limiter import get_bucket
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,14 @@ class ScreenerFetcher:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.bucket = get_bucket('screener')
+
+    def _get(self, url: str, timeout: int = 15) -> requests.Response:
+        """GET under the shared Screener.in token bucket; 429/401 responses back it off."""
+        self.bucket.acquire()
+        response = self.session.get(url, timeout=timeout)
+        self.bucket.report(response.status_code, response.headers.get('Retry-After'))
+        return response
 
     def _parse_number(self, value: str) -> Optional[float]:
         """Parse Indian number format (e.g., '1,234.5' or '1,23,45,678')"""
@@ -74,7 +84,7 @@ class ScreenerFetcher:
         try:
             # Screener.in consolidated financials page
             url = f"{self.base_url}/company/{ticker}/consolidated/"
-            response = self.session.get(url, timeout=15)
+            response = self._get(url)
 
             if response.status_code != 200:
                 result['error'] = f'HTTP {response.status_code}'
@@ -189,7 +199,7 @@ class ScreenerFetcher:
 
         try:
             url = f"{self.base_url}/company/{ticker}/consolidated/"
-            response = self.session.get(url, timeout=15)
+            response = self._get(url)
 
             if response.status_code != 200:
                 result['error'] = f'HTTP {response.status_code}'
@@ -243,7 +253,6 @@ class ScreenerFetcher:
         logger.info(f"{'='*80}")
 
         quarterly = self.get_quarterly_results(ticker)
-        time.sleep(0.5)  # Be polite
 
         shareholding = self.get_shareholding_pattern(ticker)
 
@@ -40,15 +40,17 @@ SECTOR_WEIGHTS = {
 
 import argparse, glob, logging, os, re, sys, warnings, math, time
 import asyncio
+import sqlite3
+import threading
 # Optional aiohttp with graceful fallback
 try:
     import aiohttp  # type: ignore
 except Exception:  # pragma: no cover
     aiohttp = None  # fallback to requests-based path later
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from math import log2
-from typing import NamedTuple, Optional, Dict, List, Iterable, Tuple, Any
+from typing import NamedTuple, Optional, Dict, List, Iterable, Set, Tuple, Any
 
 import numpy as np
 import pandas as pd
@@ -246,6 +248,8 @@ performance_optimizer = PerformanceOptimizer()
 # VECTORIZED TECHNICAL INDICATORS - High Performance Implementation
 # =============================================================================
 
+from indicator_panel import IndicatorPanel, default_indicators
+
 class VectorizedIndicators:
     """High-performance vectorized technical indicator calculations"""
     
@@ -262,76 +266,22 @@ class VectorizedIndicators:
         if df.empty or len(df) < 50:
             return self._get_default_indicators()
         
-        # Use quality-assured data if available
-        price_data = get_quality_safe_price_data(df, prefer_capped=True)
-        close = price_data['close'].astype('float32')
-        high = df['High'].astype('float32')
-        low = df['Low'].astype('float32')
-        volume = price_data['volume'].astype('float32')
-        
         perf_log.debug("📊 Computing vectorized indicators for %s (%d bars)", ticker, len(df))
-        
-        # KEY INDICATORS - Use correct implementations
-        rsi = rsi14(close)  # Wilder's RSI implementation
-        bb_pos = bollinger_band_position(close)  # 0-100 scale
-        atr = average_true_range(df[['High', 'Low', 'Close']])  # True ATR
-        
-        # Additional indicators for comprehensive analysis
-        ema20 = close.ewm(span=20, adjust=False).mean().astype('float32')
-        ema50 = close.ewm(span=50, adjust=False).mean().astype('float32')
-        
-        # Volume analysis (vectorized)
-        volume_sma = volume.rolling(50, min_periods=20).mean()
-        volume_ratio = (volume / volume_sma).fillna(1.0).astype('float32')
-        
-        # Get current values efficiently
-        current_idx = -1
-        current_close = close.iloc[current_idx]
-        current_rsi = rsi.iloc[current_idx] if not rsi.empty else 50.0
-        current_bb_pos = bb_pos.iloc[current_idx] if not bb_pos.empty else 50.0
-        current_atr = atr.iloc[current_idx] if not atr.empty else 0.0
-        
-        # EMA slope calculation (vectorized)
-        ema_slope = self._calculate_ema_slope_vectorized(ema20)
-        
-        # Risk/Reward calculation using ATR
-        support_level, resistance_level = self._calculate_support_resistance_vectorized(high, low, close)
-        rr_ratio = self._calculate_risk_reward_ratio(current_close, support_level, resistance_level)
-        
-        # Volume confirmation
-        current_volume_ratio = volume_ratio.iloc[current_idx]
-        
-        # Daily return using quality data
-        daily_return = price_data['returns'].iloc[current_idx] * 100 if not price_data['returns'].empty else 0.0
-        volatility = price_data['returns'].std() * 100 if len(price_data['returns']) > 1 else 0.0
-        
-        indicators = {
-            # Core indicators (foundation)
-            'rsi': float(current_rsi),
-            'bb_position': float(current_bb_pos),
-            'atr': float(current_atr),
-            
-            # Additional indicators
-            'ema20': float(ema20.iloc[current_idx]),
-            'ema50': float(ema50.iloc[current_idx]),
-            'ema_slope': float(ema_slope),
-            'volume_ratio': float(current_volume_ratio),
-            'rr_ratio': float(rr_ratio),
-            'support_level': float(support_level),
-            'resistance_level': float(resistance_level),
-            'daily_return': float(daily_return),
-            'volatility': float(volatility),
-            
-            # Data quality info
-            'data_source': price_data['data_source'],
-            'close_price': float(current_close),
-        }
-        
-        # Memory cleanup
-        del ema20, ema50, volume_sma
-        gc.collect()
-        
-        return indicators
+        key = ticker or "_"
+        return IndicatorPanel.from_frames({key: df}).latest(key)
+    
+    @performance_optimizer.time_function("vectorized_batch_indicators")
+    def calculate_batch(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, dict]:
+        """
+        Indicators for many tickers in a single pass over a (bars x tickers) panel.
+        Returns {ticker: indicators} with the same keys as calculate_all_indicators.
+        """
+        usable = {t: df for t, df in frames.items() if df is not None and len(df) >= 50}
+        out = {t: self._get_default_indicators() for t in frames if t not in usable}
+        if usable:
+            perf_log.debug("📊 Computing panel indicators for %d tickers", len(usable))
+            out.update(IndicatorPanel.from_frames(usable).latest_all())
+        return out
     
     def _calculate_rsi_vectorized(self, close: pd.Series, price_changes: pd.Series) -> pd.Series:
         """Vectorized RSI calculation"""
@@ -451,30 +401,7 @@ class VectorizedIndicators:
     
     def _get_default_indicators(self) -> dict:
         """Return default indicators for insufficient data"""
-        return {
-            # Core indicators (foundation)
-            'rsi': 50.0,
-            'bb_position': 50.0,
-            'atr': 0.0,
-            
-            # Additional indicators
-            'ema20': 0.0,
-            'ema50': 0.0,
-            'ema_slope': 0.0,
-            'volume_ratio': 1.0,
-            'rr_ratio': 1.0,
-            'support_level': 0.0,
-            'resistance_level': 0.0,
-            'daily_return': 0.0,
-            'volatility': 0.0,
-            
-            # Data quality and scoring info
-            'data_source': 'insufficient_data',
-            'close_price': 0.0,
-            'passed_quality_filters': False,
-            'opportunity_score': 0.0,
-            'tier_classification': 'Rejected'
-        }
+        return default_indicators()
 
 # Global vectorized indicators instance
 vectorized_indicators = VectorizedIndicators()
@@ -518,6 +445,7 @@ import pickle
 import random
 from hashlib import md5
 from requests.exceptions import RequestException
+from rate_limiter import get_bucket
 
 # Optional sentiment analysis import
 try:
@@ -530,18 +458,24 @@ except ImportError:
 # --------------------------------------------------------------------------- #
 import gc
 
-def memory_cleanup(*args):
-    """Explicitly delete variables and trigger garbage collection."""
+def memory_cleanup(*args, collect: bool = False):
+    """Explicitly delete variables; a full garbage collection only when asked
+    (the cyclic collector already runs on its own thresholds)."""
     for var in args:
         try:
             del var
         except Exception:
             pass
-    gc.collect()
+    if collect:
+        gc.collect()
 
-def rate_limit(seconds: float = 1.0):
-    """Simple sleep-based rate limiter for external API calls."""
-    time.sleep(seconds)
+def rate_limit(seconds: float = 1.0, provider: str = "yahoo"):
+    """Take a token from the provider's shared bucket before an external API call.
+
+    `seconds` was the old fixed sleep; the bucket's rate and burst now set the
+    spacing, so concurrent threads no longer queue behind one another.
+    """
+    get_bucket(provider).acquire()
 
 
 # =============================================================================
@@ -586,20 +520,21 @@ def is_fresh_data_required(period: str, cache_type: str = "history") -> bool:
     return False
 
 def enforce_rate_limits():
-    """Block if >15 requests in 60s"""
-    now = time.time()
+    """Take a Yahoo token (shared bucket with adaptive 429/401 backoff)."""
     global _REQUEST_LOG
-    
-    # Clear old requests (>60s)
+    get_bucket("yahoo").acquire()
+    now = time.time()
+    # Request log only feeds get_cache_stats
     _REQUEST_LOG = [t for t in _REQUEST_LOG if now - t < 60]
-    
-    if len(_REQUEST_LOG) >= 15:
-        sleep_time = 61 - (now - _REQUEST_LOG[0])
-        if sleep_time > 0:
-            print(f"Rate limit protection: sleeping {sleep_time:.1f}s...")
-            time.sleep(sleep_time)
-    
-    _REQUEST_LOG.append(now)  # Log new request
+    _REQUEST_LOG.append(now)
+
+def note_rate_limit_error(error) -> bool:
+    """Back off the Yahoo bucket if an error looks like throttling (429 / 401)."""
+    return get_bucket("yahoo").report_error(error)
+
+def note_rate_limit_ok() -> None:
+    """A Yahoo call succeeded: step the bucket's rate back up after earlier backoff."""
+    get_bucket("yahoo").reward()
 
 def is_cached(ticker, cache_type="history", period="1y"):
     """Check memory/disk cache with freshness TTL and fresh data requirements"""
@@ -747,6 +682,7 @@ def safe_yf_download(tickers, period="1y", max_retries=3, timeout=10):
                 enforce_rate_limits()
                 
                 data = yf.Ticker(ticker).history(period=period, timeout=timeout)
+                note_rate_limit_ok()
                 if not data.empty:
                     cache_data(ticker, data, "history", period)
                     results[ticker] = data
@@ -757,10 +693,11 @@ def safe_yf_download(tickers, period="1y", max_retries=3, timeout=10):
                 break  # Exit retry loop on success
                 
             except (RequestException, ConnectionError, Exception) as e:
+                throttled = note_rate_limit_error(e)
                 if attempt == max_retries - 1:
                     print(f"✗ {ticker}: Failed after {max_retries} attempts - {str(e)[:50]}")
-                else:
-                    # Exponential backoff with jitter
+                elif not throttled:
+                    # Exponential backoff with jitter (throttling waits in the bucket)
                     backoff = (2 ** attempt) + random.uniform(0, 1)
                     time.sleep(backoff)
     
@@ -782,14 +719,17 @@ def safe_yf_info(ticker, max_retries=2):
         try:
             enforce_rate_limits()
             info = yf.Ticker(ticker).info
+            note_rate_limit_ok()
             if info:
                 cache_data(ticker, info, "info")
                 return info
         except Exception as e:
+            throttled = note_rate_limit_error(e)
             if attempt == max_retries - 1:
                 print(f"Warning: Could not get info for {ticker}: {e}")
                 return {}
-            time.sleep(1)
+            if not throttled:
+                time.sleep(1)
     return {}
 
 def batch_download(tickers, period="1y"):
@@ -828,6 +768,7 @@ def batch_download(tickers, period="1y"):
             timeout=15,
             progress=False
         )
+        note_rate_limit_ok()
         
         # Parse batch results
         if len(live_tickers) == 1:
@@ -859,6 +800,7 @@ def batch_download(tickers, period="1y"):
         return results
         
     except Exception as e:
+        note_rate_limit_error(e)
         print(f"Batch download failed: {e}. Falling back to individual downloads...")
         return safe_yf_download(tickers, period)  # Fallback to individual downloads
 
@@ -897,6 +839,7 @@ def get_fresh_intraday_data(ticker: str, period: str = "1d") -> pd.DataFrame:
         enforce_rate_limits()
         # Direct yfinance call with no caching for critical calculations
         data = yf.Ticker(ticker).history(period=period, interval="5m", timeout=15)
+        note_rate_limit_ok()
         
         if not data.empty:
             print(f"🔵 LIVE: {ticker} - {len(data)} 5min bars, latest: {data.index[-1]}")
@@ -927,6 +870,7 @@ def get_fresh_current_price(ticker: str) -> dict:
         
         # Get current info for real-time price
         info = ticker_obj.info
+        note_rate_limit_ok()
         
         result = {
             'current_price': info.get('currentPrice', 0.0),
@@ -1657,7 +1601,7 @@ class YFinanceDataValidator:
         Returns: validated info dict
         """
         try:
-            rate_limit(0.1)  # Rate limiting
+            # Throttled inside safe_yf_* (only cache misses hit the network)
             # --- FIX: prevent double ".NS" ---------------------------------
             yf_symbol = ensure_ns_suffix(ticker)
             info = safe_yf_info(yf_symbol)
@@ -1681,7 +1625,7 @@ class YFinanceDataValidator:
         Returns: validated dataframe
         """
         try:
-            rate_limit(0.1)  # Rate limiting
+            # Throttled inside safe_yf_* (only cache misses hit the network)
             # --- FIX: prevent double ".NS" ---------------------------------
             yf_symbol = ensure_ns_suffix(ticker)
             result = safe_yf_download([yf_symbol], period=period)
@@ -2804,6 +2748,16 @@ def average_true_range(ohlc_df: pd.DataFrame, period: int = 14) -> pd.Series:
 # INTEGRATED DATA QUALITY + KEY INDICATORS PIPELINE
 # =============================================================================
 
+def align_and_cap_history(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """Business-day alignment (forward filled) + daily close returns capped at +/-50%.
+
+    Returns the adjusted frame and the capped return series.
+    """
+    df = df.reindex(pd.bdate_range(df.index.min(), df.index.max())).ffill()
+    ret_capped = df['Close'].pct_change().clip(-0.5, 0.5)
+    df['Close'] = (1 + ret_capped.fillna(0)).cumprod() * df['Close'].iloc[0]
+    return df, ret_capped
+
 def process_ticker_data_complete(ticker: str, period: str = "1y") -> pd.DataFrame:
     """
     Complete data processing pipeline following your exact approach:
@@ -2821,9 +2775,7 @@ def process_ticker_data_complete(ticker: str, period: str = "1y") -> pd.DataFram
             return pd.DataFrame()
         
         # DATA QUALITY - Your exact approach
-        df = df.reindex(pd.bdate_range(df.index.min(), df.index.max())).ffill()
-        ret_capped = df['Close'].pct_change().clip(-0.5, 0.5)
-        df['Close'] = (1 + ret_capped.fillna(0)).cumprod() * df['Close'].iloc[0]
+        df, ret_capped = align_and_cap_history(df)
         
         # Store the capped returns for analysis
         df['Returns_Raw'] = df['Close'].pct_change()
@@ -2930,147 +2882,280 @@ class PaperTrade:
     tier: str = "Watch"
     confidence: float = 0.0
 
+_TRADE_COLUMNS = ('trade_id', 'ticker', 'trade_type', 'entry_time', 'entry_price', 'stop_loss',
+                  'take_profit', 'quantity', 'status', 'exit_time', 'exit_price', 'pnl',
+                  'pnl_percent', 'tier', 'confidence')
+_SIGNAL_COLUMNS = ('ticker', 'signal_time', 'signal_type', 'entry_price', 'stop_loss', 'take_profit',
+                   'confidence', 'indicators', 'tier', 'reason')
+
+
 class BacktestHooks:
-    """Comprehensive backtesting and paper trading system"""
+    """Comprehensive backtesting and paper trading system
+
+    Trades and signals live in an SQLite ledger (WAL journal, one transaction
+    per update) indexed by ticker and status, with an append-only fills table
+    recording every entry / exit. The ledger is opened on the first read or
+    write, not in __init__, so importing the screener (which builds the
+    module-level backtest_hooks) creates no files. Legacy paper_trades.json /
+    trade_signals.json files are imported once, in a single transaction, the
+    first time the ledger is opened next to them.
+    """
     
-    def __init__(self, log_file: str = "paper_trades.json", signal_file: str = "trade_signals.json"):
+    def __init__(self, log_file: str = "paper_trades.json", signal_file: str = "trade_signals.json",
+                 db_path: str = "paper_trades.db"):
         self.log_file = Path(log_file)
         self.signal_file = Path(signal_file)
-        self.paper_trades = self._load_paper_trades()
-        self.trade_signals = self._load_trade_signals()
-        self.trade_counter = len(self.paper_trades) + 1
-        
-    def _load_paper_trades(self) -> List[PaperTrade]:
-        """Load existing paper trades from file"""
-        if self.log_file.exists():
-            try:
-                with open(self.log_file, 'r') as f:
-                    content = f.read().strip()
-                    if not content:
-                        # Empty file
-                        return []
-                    data = json.loads(content)
-                    
-                # Ensure data is a list
-                if not isinstance(data, list):
-                    data_log.warning("Paper trades file contains invalid format (not a list), resetting")
-                    self._backup_and_reset_trades_file()
-                    return []
-                    
-                trades = []
-                for trade_dict in data:
-                    # Convert string enums back to enum types
-                    trade_dict['trade_type'] = TradeType(trade_dict['trade_type'])
-                    trade_dict['status'] = TradeStatus(trade_dict['status'])
-                    trades.append(PaperTrade(**trade_dict))
-                return trades
-            except json.JSONDecodeError as e:
-                data_log.warning("Failed to parse paper trades JSON (corrupted file): %s", e)
-                data_log.info("Backing up corrupted file and creating fresh paper trades log")
-                self._backup_and_reset_trades_file()
-                return []
-            except Exception as e:
-                data_log.warning("Failed to load paper trades: %s", e)
-                return []
-        return []
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._open_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._trade_counter: Optional[int] = None
+    
+    # -------------------------------------------------------------- connection
+    def _connect(self) -> sqlite3.Connection:
+        with self._open_lock:
+            if self._conn is None:
+                con = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+                con.execute("PRAGMA journal_mode=WAL")
+                con.execute("PRAGMA synchronous=NORMAL")
+                self._ensure_schema(con)
+                self._import_legacy_json(con)
+                self._conn = con
+        return self._conn
+    
+    @property
+    def _con(self) -> sqlite3.Connection:
+        """Ledger connection, opened (schema + legacy import) on first use."""
+        return self._conn if self._conn is not None else self._connect()
+    
+    @property
+    def trade_counter(self) -> int:
+        if self._trade_counter is None:
+            self._trade_counter = self._count("SELECT COUNT(*) FROM trades") + 1
+        return self._trade_counter
+    
+    @trade_counter.setter
+    def trade_counter(self, value: int):
+        self._trade_counter = value
+    
+    # ------------------------------------------------------------------ schema
+    def _ensure_schema(self, con: sqlite3.Connection):
+        with con:
+            con.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS trades (
+                    trade_id TEXT PRIMARY KEY,
+                    ticker TEXT NOT NULL,
+                    trade_type TEXT NOT NULL,
+                    entry_time TEXT,
+                    entry_price REAL,
+                    stop_loss REAL,
+                    take_profit REAL,
+                    quantity INTEGER,
+                    status TEXT NOT NULL,
+                    exit_time TEXT,
+                    exit_price REAL,
+                    pnl REAL DEFAULT 0,
+                    pnl_percent REAL DEFAULT 0,
+                    tier TEXT,
+                    confidence REAL
+                );
+                CREATE INDEX IF NOT EXISTS ix_trades_status_ticker ON trades(status, ticker);
+                CREATE INDEX IF NOT EXISTS ix_trades_ticker ON trades(ticker);
+                CREATE TABLE IF NOT EXISTS signals (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ticker TEXT NOT NULL,
+                    signal_time TEXT,
+                    signal_type TEXT,
+                    entry_price REAL,
+                    stop_loss REAL,
+                    take_profit REAL,
+                    confidence REAL,
+                    indicators TEXT,
+                    tier TEXT,
+                    reason TEXT
+                );
+                CREATE INDEX IF NOT EXISTS ix_signals_ticker_time ON signals(ticker, signal_time);
+                CREATE TABLE IF NOT EXISTS fills (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    trade_id TEXT NOT NULL,
+                    ts TEXT,
+                    side TEXT,
+                    price REAL,
+                    quantity INTEGER,
+                    status TEXT
+                );
+                CREATE INDEX IF NOT EXISTS ix_fills_trade ON fills(trade_id);
+                CREATE TABLE IF NOT EXISTS ledger_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                """
+            )
     
-    def _backup_and_reset_trades_file(self):
-        """Backup corrupted trades file and create fresh one"""
-        try:
-            if self.log_file.exists():
-                backup_name = f"{self.log_file.stem}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                backup_path = self.log_file.parent / backup_name
-                self.log_file.rename(backup_path)
-                data_log.info(f"Corrupted trades file backed up as: {backup_name}")
-            
-            # Create fresh empty trades file
-            with open(self.log_file, 'w') as f:
-                json.dump([], f, indent=2)
-            data_log.info("Created fresh paper trades file")
-        except Exception as e:
-            data_log.error(f"Failed to backup/reset trades file: {e}")
+    def _count(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return int(self._con.execute(sql, params).fetchone()[0] or 0)
     
-    def _load_trade_signals(self) -> List[TradeSignal]:
-        """Load existing trade signals from file"""
-        if self.signal_file.exists():
-            try:
-                with open(self.signal_file, 'r') as f:
-                    content = f.read().strip()
-                    if not content:
-                        # Empty file
-                        return []
-                    data = json.loads(content)
-                    
-                # Ensure data is a list
-                if not isinstance(data, list):
-                    data_log.warning("Trade signals file contains invalid format (not a list), resetting")
-                    self._backup_and_reset_signals_file()
-                    return []
-                    
-                signals = []
-                for signal_dict in data:
-                    # Convert string enums back to enum types
-                    signal_dict['signal_type'] = TradeType(signal_dict['signal_type'])
-                    signals.append(TradeSignal(**signal_dict))
-                return signals
-            except json.JSONDecodeError as e:
-                data_log.warning("Failed to parse trade signals JSON (corrupted file): %s", e)
-                data_log.info("Backing up corrupted file and creating fresh trade signals log")
-                self._backup_and_reset_signals_file()
-                return []
-            except Exception as e:
-                data_log.warning("Failed to load trade signals: %s", e)
-                return []
-        return []
+    # ------------------------------------------------------------ conversions
+    @staticmethod
+    def _trade_row(trade: PaperTrade) -> tuple:
+        d = asdict(trade)
+        d['trade_type'] = trade.trade_type.value
+        d['status'] = trade.status.value
+        return tuple(d[c] for c in _TRADE_COLUMNS)
     
-    def _backup_and_reset_signals_file(self):
-        """Backup corrupted signals file and create fresh one"""
-        try:
-            if self.signal_file.exists():
-                backup_name = f"{self.signal_file.stem}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                backup_path = self.signal_file.parent / backup_name
-                self.signal_file.rename(backup_path)
-                data_log.info(f"Corrupted signals file backed up as: {backup_name}")
-            
-            # Create fresh empty signals file
-            with open(self.signal_file, 'w') as f:
-                json.dump([], f, indent=2)
-            data_log.info("Created fresh trade signals file")
-        except Exception as e:
-            data_log.error(f"Failed to backup/reset signals file: {e}")
+    @staticmethod
+    def _row_trade(row: tuple) -> PaperTrade:
+        d = dict(zip(_TRADE_COLUMNS, row))
+        d['trade_type'] = TradeType(d['trade_type'])
+        d['status'] = TradeStatus(d['status'])
+        return PaperTrade(**d)
     
-    def _save_paper_trades(self):
-        """Save paper trades to file"""
-        try:
-            # Convert to JSON-serializable format
-            trades_data = []
-            for trade in self.paper_trades:
-                trade_dict = asdict(trade)
-                # Convert enums to strings
-                trade_dict['trade_type'] = trade.trade_type.value
-                trade_dict['status'] = trade.status.value
-                trades_data.append(trade_dict)
-            
-            with open(self.log_file, 'w') as f:
-                json.dump(trades_data, f, indent=2)
-        except Exception as e:
-            data_log.error("Failed to save paper trades: %s", e)
+    @staticmethod
+    def _signal_row(signal: TradeSignal) -> tuple:
+        d = asdict(signal)
+        d['signal_type'] = signal.signal_type.value
+        d['indicators'] = json.dumps(d.get('indicators') or {}, default=str)
+        return tuple(d[c] for c in _SIGNAL_COLUMNS)
     
-    def _save_trade_signals(self):
-        """Save trade signals to file"""
+    @staticmethod
+    def _row_signal(row: tuple) -> TradeSignal:
+        d = dict(zip(_SIGNAL_COLUMNS, row))
+        d['signal_type'] = TradeType(d['signal_type'])
         try:
-            # Convert to JSON-serializable format
-            signals_data = []
-            for signal in self.trade_signals:
-                signal_dict = asdict(signal)
-                # Convert enums to strings
-                signal_dict['signal_type'] = signal.signal_type.value
-                signals_data.append(signal_dict)
-            
-            with open(self.signal_file, 'w') as f:
-                json.dump(signals_data, f, indent=2)
-        except Exception as e:
-            data_log.error("Failed to save trade signals: %s", e)
+            d['indicators'] = json.loads(d['indicators'] or '{}')
+        except Exception:
+            d['indicators'] = {}
+        return TradeSignal(**d)
+    
+    # ---------------------------------------------------------- legacy import
+    def _import_legacy_json(self, con: sqlite3.Connection):
+        """One-pass import of paper_trades.json / trade_signals.json (skipped once recorded)."""
+        for path, kind in ((self.log_file, 'trades'), (self.signal_file, 'signals')):
+            if not path.exists():
+                continue
+            key = f"imported:{kind}:{path.resolve()}"
+            done = con.execute("SELECT value FROM ledger_meta WHERE key=?", (key,)).fetchone()
+            if done:
+                continue
+            try:
+                content = path.read_text().strip()
+                data = json.loads(content) if content else []
+                if not isinstance(data, list):
+                    data_log.warning("%s contains invalid format (not a list), skipping import", path)
+                    data = []
+                if kind == 'trades':
+                    rows = []
+                    for d in data:
+                        d['trade_type'] = TradeType(d['trade_type'])
+                        d['status'] = TradeStatus(d['status'])
+                        rows.append(self._trade_row(PaperTrade(**d)))
+                else:
+                    rows = []
+                    for d in data:
+                        d['signal_type'] = TradeType(d['signal_type'])
+                        rows.append(self._signal_row(TradeSignal(**d)))
+            except Exception as e:
+                data_log.warning("Failed to import %s: %s", path, e)
+                continue
+            with con:
+                con.execute("BEGIN")
+                if kind == 'trades':
+                    con.executemany(
+                        f"INSERT OR IGNORE INTO trades ({', '.join(_TRADE_COLUMNS)}) VALUES ({', '.join('?' * len(_TRADE_COLUMNS))})",
+                        rows)
+                else:
+                    con.executemany(
+                        f"INSERT INTO signals ({', '.join(_SIGNAL_COLUMNS)}) VALUES ({', '.join('?' * len(_SIGNAL_COLUMNS))})",
+                        rows)
+                con.execute("INSERT OR REPLACE INTO ledger_meta (key, value) VALUES (?, ?)",
+                            (key, datetime.now().isoformat(timespec='seconds')))
+            data_log.info("Imported %d %s from %s into %s", len(rows), kind, path, self.db_path)
+    
+    # ----------------------------------------------------------------- trades
+    def add_trade(self, trade: PaperTrade):
+        """Insert a new trade and its entry fill."""
+        with self._lock, self._con:
+            self._con.execute("BEGIN")
+            self._con.execute(
+                f"INSERT OR REPLACE INTO trades ({', '.join(_TRADE_COLUMNS)}) VALUES ({', '.join('?' * len(_TRADE_COLUMNS))})",
+                self._trade_row(trade))
+            self._con.execute(
+                "INSERT INTO fills (trade_id, ts, side, price, quantity, status) VALUES (?, ?, 'ENTRY', ?, ?, ?)",
+                (trade.trade_id, trade.entry_time, trade.entry_price, trade.quantity, trade.status.value))
+    
+    def update_trade(self, trade: PaperTrade):
+        """Persist a trade's current state; closing it appends an exit fill."""
+        with self._lock, self._con:
+            self._con.execute("BEGIN")
+            self._con.execute(
+                f"UPDATE trades SET {', '.join(f'{c}=?' for c in _TRADE_COLUMNS[1:])} WHERE trade_id=?",
+                self._trade_row(trade)[1:] + (trade.trade_id,))
+            if trade.status != TradeStatus.OPEN and trade.exit_price is not None:
+                self._con.execute(
+                    "INSERT INTO fills (trade_id, ts, side, price, quantity, status) VALUES (?, ?, 'EXIT', ?, ?, ?)",
+                    (trade.trade_id, trade.exit_time, trade.exit_price, trade.quantity, trade.status.value))
+    
+    def get_trades(self, status: Optional[Iterable[TradeStatus]] = None, ticker: Optional[str] = None) -> List[PaperTrade]:
+        """Trades filtered by status (one or several) and/or ticker, oldest first."""
+        clauses, params = [], []
+        if status is not None:
+            statuses = [status] if isinstance(status, TradeStatus) else list(status)
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(st.value for st in statuses)
+        if ticker:
+            clauses.append("ticker=?")
+            params.append(ticker)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._con.execute(
+                f"SELECT {', '.join(_TRADE_COLUMNS)} FROM trades{where} ORDER BY rowid", params).fetchall()
+        return [self._row_trade(r) for r in rows]
+    
+    def open_trades(self, ticker: Optional[str] = None) -> List[PaperTrade]:
+        return self.get_trades(TradeStatus.OPEN, ticker)
+    
+    def get_fills(self, trade_id: str) -> List[dict]:
+        with self._lock:
+            rows = self._con.execute(
+                "SELECT ts, side, price, quantity, status FROM fills WHERE trade_id=? ORDER BY id", (trade_id,)).fetchall()
+        return [dict(zip(('ts', 'side', 'price', 'quantity', 'status'), r)) for r in rows]
+    
+    # ---------------------------------------------------------------- signals
+    def add_signal(self, signal: TradeSignal):
+        with self._lock, self._con:
+            self._con.execute(
+                f"INSERT INTO signals ({', '.join(_SIGNAL_COLUMNS)}) VALUES ({', '.join('?' * len(_SIGNAL_COLUMNS))})",
+                self._signal_row(signal))
+    
+    def get_signals(self, ticker: Optional[str] = None, since: Optional[str] = None) -> List[TradeSignal]:
+        clauses, params = [], []
+        if ticker:
+            clauses.append("ticker=?")
+            params.append(ticker)
+        if since:
+            clauses.append("signal_time>=?")
+            params.append(since)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._con.execute(
+                f"SELECT {', '.join(_SIGNAL_COLUMNS)} FROM signals{where} ORDER BY id", params).fetchall()
+        return [self._row_signal(r) for r in rows]
+    
+    # ---------------------------------------------------------- compatibility
+    @property
+    def paper_trades(self) -> List[PaperTrade]:
+        """All trades (full scan; prefer get_trades / open_trades)."""
+        return self.get_trades()
+    
+    @property
+    def trade_signals(self) -> List[TradeSignal]:
+        """All signals (full scan; prefer get_signals)."""
+        return self.get_signals()
+    
+    def trade_count(self) -> int:
+        return self._count("SELECT COUNT(*) FROM trades")
 
 def generate_trading_signals(df: pd.DataFrame, ticker: str = "") -> dict:
     """
@@ -3240,8 +3325,7 @@ def log_trade(ticker: str, entry: float, sl: float, tp: float,
     )
     
     # Add to tracking
-    backtest_hooks.paper_trades.append(paper_trade)
-    backtest_hooks._save_paper_trades()
+    backtest_hooks.add_trade(paper_trade)
     
     # Calculate risk metrics
     risk_per_share = abs(entry - sl)
@@ -3266,13 +3350,7 @@ def update_paper_trades(current_prices: dict = None):
     if 'backtest_hooks' not in globals():
         return
     
-    updated_trades = []
-    
-    for trade in backtest_hooks.paper_trades:
-        if trade.status != TradeStatus.OPEN:
-            updated_trades.append(trade)
-            continue
-        
+    for trade in backtest_hooks.open_trades():
         # Get current price
         current_price = None
         if current_prices and trade.ticker in current_prices:
@@ -3285,11 +3363,9 @@ def update_paper_trades(current_prices: dict = None):
                     current_price = float(df['Close'].iloc[-1])
             except Exception as e:
                 data_log.warning("Failed to get current price for %s: %s", trade.ticker, e)
-                updated_trades.append(trade)
                 continue
         
         if current_price is None:
-            updated_trades.append(trade)
             continue
         
         # Check exit conditions
@@ -3317,11 +3393,7 @@ def update_paper_trades(current_prices: dict = None):
             perf_log.info("🎯 Trade closed: %s - %s at ₹%.2f, P&L: ₹%.2f (%.2f%%), Reason: %s", 
                          trade.trade_id, trade.ticker, trade.exit_price, 
                          trade.pnl, trade.pnl_percent, exit_reason)
-        
-        updated_trades.append(trade)
-    
-    backtest_hooks.paper_trades = updated_trades
-    backtest_hooks._save_paper_trades()
+            backtest_hooks.update_trade(trade)
 
 def get_paper_trading_summary() -> dict:
     """Get summary of paper trading performance"""
@@ -3330,12 +3402,13 @@ def get_paper_trading_summary() -> dict:
     if 'backtest_hooks' not in globals():
         return {'error': 'No paper trades found'}
     
-    open_trades = [t for t in backtest_hooks.paper_trades if t.status == TradeStatus.OPEN]
-    closed_trades = [t for t in backtest_hooks.paper_trades if t.status in [TradeStatus.CLOSED, TradeStatus.STOPPED]]
+    total_trades = backtest_hooks.trade_count()
+    open_trades = backtest_hooks.open_trades()
+    closed_trades = backtest_hooks.get_trades([TradeStatus.CLOSED, TradeStatus.STOPPED])
     
     if not closed_trades:
         return {
-            'total_trades': len(backtest_hooks.paper_trades),
+            'total_trades': total_trades,
             'open_trades': len(open_trades),
             'closed_trades': 0,
             'win_rate': 0.0,
@@ -3363,7 +3436,7 @@ def get_paper_trading_summary() -> dict:
             }
     
     summary = {
-        'total_trades': len(backtest_hooks.paper_trades),
+        'total_trades': total_trades,
         'open_trades': len(open_trades),
         'closed_trades': len(closed_trades),
         'winning_trades': len(winning_trades),
@@ -3376,19 +3449,48 @@ def get_paper_trading_summary() -> dict:
     
     return summary
 
+def _first_exit_hits(future: np.ndarray, stop: np.ndarray, target: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """First bar index where a (signals x horizon) close window hits stop or target.
+
+    Returns (index, outcome) with outcome 0=STOP_LOSS, 1=TAKE_PROFIT, 2=OPEN;
+    for OPEN rows the index is the last available bar. Stop is checked first on
+    each bar, as in the original per-price loop.
+    """
+    with np.errstate(invalid='ignore'):
+        stop_hit = future <= stop[:, None]
+        tgt_hit = future >= target[:, None]
+    event = stop_hit | tgt_hit
+    has = event.any(axis=1)
+    last = np.maximum((~np.isnan(future)).sum(axis=1) - 1, 0)
+    idx = np.where(has, event.argmax(axis=1), last)
+    rows = np.arange(len(idx))
+    outcome = np.where(~has, 2, np.where(stop_hit[rows, idx], 0, 1))
+    return idx, outcome
+
+
 def backtest_strategy(tickers: List[str], period: str = "6mo", 
-                     initial_capital: float = 100000) -> dict:
+                     initial_capital: float = 100000, horizon: int = 50) -> dict:
     """
     Comprehensive strategy backtesting on historical data.
     
+    Every bar of every ticker is evaluated with the generate_trading_signals
+    rules (RSI < 30, BB_Pos < 20, Volume > 1.5x 50-day average). Each signal
+    enters at that bar's close with the ATR stop / target and is resolved on
+    the following `horizon` closes. Data is fetched in one batch, indicators
+    are computed on a (bars x tickers) panel and exits are resolved for all
+    signals at once.
+    
     Args:
         tickers: List of tickers to backtest
         period: Historical period to test
         initial_capital: Starting capital for backtesting
+        horizon: Bars after the signal used to resolve stop / target
         
     Returns:
-        Backtest results with performance metrics
+        Backtest results with performance metrics and per-signal history
     """
+    from enhanced_backtester import PanelIndicators, PricePanel
+
     perf_log.info("🔄 Starting strategy backtest on %d tickers (%s period)", len(tickers), period)
     
     backtest_results = {
@@ -3397,76 +3499,109 @@ def backtest_strategy(tickers: List[str], period: str = "6mo",
         'initial_capital': initial_capital,
         'signals_generated': 0,
         'trades_completed': 0,
-        'performance': {}
+        'performance': {},
+        'per_ticker': {},
+        'signal_history': []
     }
     
-    all_signals = []
-    
-    for ticker in tickers:
+    # One batched download, then the same data quality step as process_ticker_data_complete
+    symbols = {ensure_ns_suffix(t): t for t in tickers}
+    try:
+        raw = batch_download(list(symbols), period) or {}
+    except Exception as e:
+        data_log.warning("Backtest download failed: %s", e)
+        raw = {}
+    frames = {}
+    for sym, df in raw.items():
+        ticker = symbols.get(sym, sym)
         try:
-            # Get historical data
-            df = process_ticker_data_complete(ticker, period)
-            if df.empty or len(df) < 100:
+            if df is None or df.empty:
                 continue
-            
-            # Generate signals for historical data
-            signal_results = generate_trading_signals(df, ticker)
-            
-            if signal_results['signal_generated']:
-                all_signals.append(signal_results)
-                backtest_results['signals_generated'] += 1
-                
-                # Simulate historical performance if we have enough data
-                if len(df) > 200:  # Need enough data for forward testing
-                    entry_price = signal_results['entry_price']
-                    stop_loss = signal_results['stop_loss']
-                    take_profit = signal_results['take_profit']
-                    
-                    # Simple forward simulation (this could be enhanced)
-                    future_prices = df['Close'].tail(50)  # Look at next 50 periods
-                    
-                    for price in future_prices:
-                        if price <= stop_loss:
-                            # Stop loss hit
-                            pnl_percent = (stop_loss - entry_price) / entry_price * 100
-                            signal_results['simulated_outcome'] = 'STOP_LOSS'
-                            signal_results['simulated_pnl_percent'] = pnl_percent
-                            break
-                        elif price >= take_profit:
-                            # Take profit hit
-                            pnl_percent = (take_profit - entry_price) / entry_price * 100
-                            signal_results['simulated_outcome'] = 'TAKE_PROFIT'
-                            signal_results['simulated_pnl_percent'] = pnl_percent
-                            break
-                    else:
-                        # No exit condition met
-                        final_price = future_prices.iloc[-1]
-                        pnl_percent = (final_price - entry_price) / entry_price * 100
-                        signal_results['simulated_outcome'] = 'OPEN'
-                        signal_results['simulated_pnl_percent'] = pnl_percent
-                    
-                    if 'simulated_outcome' in signal_results:
-                        backtest_results['trades_completed'] += 1
-                
+            if isinstance(df.columns, pd.MultiIndex):
+                df = df.copy()
+                df.columns = df.columns.get_level_values(0)
+            df = df[['Open', 'High', 'Low', 'Close', 'Volume']].dropna(subset=['Close']).astype('float64')
+            if df.index.tz is not None:
+                df.index = df.index.tz_localize(None)
+            df, _ = align_and_cap_history(df)
+            if len(df) < 100:
+                continue
+            frames[ticker] = df
         except Exception as e:
             data_log.warning("Backtest failed for %s: %s", ticker, e)
-    
-    # Calculate overall performance
-    if all_signals:
-        completed_signals = [s for s in all_signals if 'simulated_outcome' in s]
-        
-        if completed_signals:
-            winning_signals = [s for s in completed_signals if s.get('simulated_pnl_percent', 0) > 0]
-            
-            backtest_results['performance'] = {
-                'total_signals': len(all_signals),
-                'completed_trades': len(completed_signals),
-                'winning_trades': len(winning_signals),
-                'win_rate': len(winning_signals) / len(completed_signals) * 100,
-                'avg_pnl_percent': sum(s.get('simulated_pnl_percent', 0) for s in completed_signals) / len(completed_signals),
-                'best_trade': max(s.get('simulated_pnl_percent', 0) for s in completed_signals),
-                'worst_trade': min(s.get('simulated_pnl_percent', 0) for s in completed_signals)
+    if not frames:
+        perf_log.info("✅ Backtest complete: 0 signals, 0 completed trades")
+        return backtest_results
+    
+    panel = PricePanel.from_frames(frames)
+    ind = PanelIndicators(panel)
+    with np.errstate(invalid='ignore'):
+        signal = ind.ready & (ind.rsi < 30) & (ind.bb_pos < 20) & (ind.vol_ratio > 1.5)
+    rows, cols = np.nonzero(signal)
+    backtest_results['signals_generated'] = int(len(rows))
+    if not len(rows):
+        perf_log.info("✅ Backtest complete: 0 signals, 0 completed trades")
+        return backtest_results
+    
+    n_bars = len(panel.dates)
+    entry = panel.close[rows, cols]
+    atr = ind.atr[rows, cols]
+    stop = entry - 1.5 * atr
+    target = entry + 3 * atr
+    rsi, bb, vol_ratio = ind.rsi[rows, cols], ind.bb_pos[rows, cols], ind.vol_ratio[rows, cols]
+    confidence = np.minimum(1.0,
+        np.select([rsi <= 20, rsi <= 25, rsi <= 30], [0.4, 0.3, 0.2], 0.0)
+        + np.select([bb <= 10, bb <= 15, bb <= 20], [0.3, 0.2, 0.1], 0.0)
+        + np.select([vol_ratio >= 3.0, vol_ratio >= 2.0, vol_ratio >= 1.5], [0.3, 0.2, 0.1], 0.0))
+    
+    # Forward closes after each signal; bars past the end of data are NaN
+    offs = np.arange(1, horizon + 1)
+    fwd = rows[:, None] + offs
+    future = np.where(fwd < n_bars, panel.close[np.minimum(fwd, n_bars - 1), cols[:, None]], np.nan)
+    completed = fwd[:, 0] < n_bars
+    idx, outcome = _first_exit_hits(future, stop, target)
+    exit_price = np.select([outcome == 0, outcome == 1], [stop, target], future[np.arange(len(idx)), idx])
+    pnl_percent = (exit_price - entry) / entry * 100
+    backtest_results['trades_completed'] = int(completed.sum())
+    
+    outcome_names = np.array(['STOP_LOSS', 'TAKE_PROFIT', 'OPEN'])
+    history = pd.DataFrame({
+        'ticker': [panel.symbols[c] for c in cols],
+        'date': panel.dates[rows].strftime('%Y-%m-%d'),
+        'entry_price': entry,
+        'stop_loss': stop,
+        'take_profit': target,
+        'confidence': confidence,
+        'rsi': rsi,
+        'bb_position': bb,
+        'volume_ratio': vol_ratio,
+        'simulated_outcome': np.where(completed, outcome_names[outcome], None),
+        'simulated_pnl_percent': np.where(completed, pnl_percent, np.nan),
+        'bars_held': np.where(completed, idx + 1, 0),
+    })
+    backtest_results['signal_history'] = history.to_dict('records')
+    
+    done = history[completed]
+    if len(done):
+        pnl = done['simulated_pnl_percent']
+        backtest_results['performance'] = {
+            'total_signals': int(len(history)),
+            'completed_trades': int(len(done)),
+            'winning_trades': int((pnl > 0).sum()),
+            'win_rate': float((pnl > 0).mean() * 100),
+            'avg_pnl_percent': float(pnl.mean()),
+            'best_trade': float(pnl.max()),
+            'worst_trade': float(pnl.min())
+        }
+        grouped = done.groupby('ticker')['simulated_pnl_percent']
+        backtest_results['per_ticker'] = {
+            ticker: {
+                'signals': int(g.size),
+                'win_rate': float((g > 0).mean() * 100),
+                'avg_pnl_percent': float(g.mean())
             }
+            for ticker, g in grouped
+        }
     
     perf_log.info("✅ Backtest complete: %d signals, %d completed trades", 
                  backtest_results['signals_generated'], backtest_results['trades_completed'])
@@ -3671,11 +3806,12 @@ def analyze_single_ticker_optimized(ticker_data: Tuple[str, pd.DataFrame]) -> di
     Optimized single ticker analysis for process pool execution.
     This function is designed to be pickle-able for multiprocessing.
     """
-    ticker, df = ticker_data
+    ticker, df = ticker_data[0], ticker_data[1]
+    precomputed = ticker_data[2] if len(ticker_data) > 2 else None
     
     try:
-        # Use vectorized indicators for maximum performance
-        indicators = vectorized_indicators.calculate_all_indicators(df, ticker)
+        # Indicators normally come precomputed from the batch panel pass
+        indicators = precomputed or vectorized_indicators.calculate_all_indicators(df, ticker)
         
         # Calculate swing reversal signals efficiently
         swing_signals = calculate_swing_reversal_signals_fast(df)
@@ -3804,7 +3940,7 @@ class MemoryMonitor:
             )
             
             if should_cleanup:
-                self.perform_cleanup()
+                self.perform_cleanup(collect=current_memory > self.cleanup_threshold)
                 self.last_cleanup = current_time
                 perf_log.info("🧹 Memory cleanup performed: %.1fMB", current_memory)
                 return True
@@ -3814,13 +3950,14 @@ class MemoryMonitor:
         
         return False
     
-    def perform_cleanup(self):
+    def perform_cleanup(self, collect: bool = False):
         """Perform memory cleanup operations"""
         # Clear old cache entries
         cache_manager._cleanup_old_entries()
         
-        # Force garbage collection
-        gc.collect()
+        # Full collection only under memory pressure
+        if collect:
+            gc.collect()
         
         # Clear yfinance cache if available
         try:
@@ -3838,8 +3975,7 @@ memory_monitor = MemoryMonitor()
 
 def optimize_screener_for_processes() -> None:
     """
-    Configure the screener for optimal multiprocessing performance.
-    Call this function before using ProcessPoolExecutor.
+    Configure the screener for multiprocessing (quieter subprocess logging).
     """
     # Configure global performance settings
     global performance_optimizer, cache_manager, memory_monitor
@@ -3847,9 +3983,6 @@ def optimize_screener_for_processes() -> None:
     # Reduce cache size for subprocess memory efficiency
     cache_manager.cleanup_interval = 600  # 10 minutes
     
-    # Enable aggressive garbage collection
-    gc.set_threshold(700, 10, 10)  # More frequent GC
-    
     # Disable debug logging in subprocesses for performance
     if not DEBUG_ENABLED:
         logging.getLogger('screener.performance').setLevel(logging.WARNING)
@@ -3857,12 +3990,55 @@ def optimize_screener_for_processes() -> None:
     
     perf_log.info("🚀 Screener optimized for multiprocessing")
 
+def _analyze_shared(ticker: str, df: pd.DataFrame, indicators: Optional[dict]) -> dict:
+    """Worker entry for map_shared: df is a view of the shared OHLCV block."""
+    return analyze_single_ticker_optimized((ticker, df, indicators))
+
+def _analysis_error(ticker: str, error: str) -> dict:
+    """Result for a ticker whose analysis raised (same shape on the process and thread paths)."""
+    return {
+        'ticker': ticker,
+        'error': error,
+        'score': 0.0,
+        'indicators': {},
+        'swing_signals': {}
+    }
+
+def fetch_history_batch(tickers: List[str], period: str = "1y", max_bars: int = 300) -> Dict[str, pd.DataFrame]:
+    """OHLCV frames for many tickers via one batch_download (per-ticker fallback for misses)."""
+    hist_data: Dict[str, pd.DataFrame] = {}
+    try:
+        raw = batch_download(list(tickers), period) or {}
+    except Exception as e:
+        perf_log.warning("Batch download failed: %s", e)
+        raw = {}
+    for ticker in tickers:
+        df = raw.get(ticker)
+        try:
+            if df is None or df.empty:
+                df = get_history_optimized(ticker, period=period, use_cache=True)
+            if df is None or df.empty:
+                continue
+            if isinstance(df.columns, pd.MultiIndex):
+                df = df.copy()
+                df.columns = df.columns.get_level_values(0)
+            df = df[['Open', 'High', 'Low', 'Close', 'Volume']].dropna(subset=['Close']).tail(max_bars)
+            if not df.empty:
+                hist_data[ticker] = df
+        except Exception as e:
+            perf_log.warning("History unavailable for %s: %s", ticker, e)
+    return hist_data
+
 @performance_optimizer.time_function("batch_analyze_optimized")
 def batch_analyze_with_process_pool(tickers: List[str], max_workers: int = None, 
                                   use_processes: bool = True) -> List[dict]:
     """
     OPTIMIZED: Analyze multiple tickers using process pool for CPU-bound operations.
-    Performance improvement: 2-4x faster on multi-core systems.
+    
+    History is fetched with one batch download, indicators are computed in one
+    panel pass, and the OHLCV block is placed once in shared memory; workers
+    of the persistent pool (shared_ohlcv.get_pool) attach zero-copy views
+    instead of receiving pickled DataFrames.
     """
     if not tickers:
         return []
@@ -3877,68 +4053,32 @@ def batch_analyze_with_process_pool(tickers: List[str], max_workers: int = None,
     
     results = []
     
-    # Pre-fetch data efficiently in batches
-    perf_log.debug("📡 Pre-fetching historical data in batches...")
-    hist_data = {}
+    perf_log.debug("📡 Pre-fetching historical data in one batch...")
+    hist_data = fetch_history_batch(tickers, period="1y")
     
-    # Batch download for efficiency
-    batch_size = 50
-    for i in range(0, len(tickers), batch_size):
-        batch_tickers = tickers[i:i + batch_size]
-        
-        try:
-            # Use our optimized cached download
-            for ticker in batch_tickers:
-                df = get_history_optimized(ticker, period="1y", use_cache=True)
-                if not df.empty:
-                    hist_data[ticker] = df
-                    
-        except Exception as e:
-            perf_log.warning("Batch download failed for batch %d: %s", i//batch_size, e)
+    # Indicators for the whole batch in one panel pass
+    batch_indicators = vectorized_indicators.calculate_batch(hist_data)
     
-    # Prepare data for process pool
-    ticker_data_pairs = [(ticker, hist_data.get(ticker, pd.DataFrame())) 
+    # Prepare data for the thread fallback
+    ticker_data_pairs = [(ticker, hist_data.get(ticker, pd.DataFrame()), batch_indicators.get(ticker)) 
                         for ticker in tickers if ticker in hist_data]
     
     if use_processes and len(ticker_data_pairs) > 5:
-        # Use ProcessPoolExecutor for CPU-bound analysis
-        from concurrent.futures import ProcessPoolExecutor
+        from shared_ohlcv import SharedOHLCV, map_shared
         
         try:
-            with ProcessPoolExecutor(max_workers=max_workers) as executor:
-                # Configure each process for optimal performance
-                executor.submit(optimize_screener_for_processes).result()
-                
-                # Submit analysis tasks
-                future_to_ticker = {
-                    executor.submit(analyze_single_ticker_optimized, data): data[0] 
-                    for data in ticker_data_pairs
-                }
-                
-                # Collect results as they complete
-                for future in as_completed(future_to_ticker):
-                    try:
-                        result = future.result(timeout=30)  # 30 second timeout per ticker
-                        results.append(result)
-                        
-                        if len(results) % 10 == 0:
-                            perf_log.debug("✅ Completed %d/%d ticker analyses", 
-                                         len(results), len(ticker_data_pairs))
-                            
-                    except Exception as e:
-                        ticker = future_to_ticker[future]
-                        perf_log.error("❌ Analysis failed for %s: %s", ticker, str(e))
-                        results.append({
-                            'ticker': ticker,
-                            'error': str(e),
-                            'score': 0.0,
-                            'indicators': {},
-                            'swing_signals': {}
-                        })
+            with SharedOHLCV(hist_data) as shared:
+                results = map_shared(_analyze_shared, shared, max_workers=max_workers,
+                                     extras=batch_indicators, timeout=30 * len(ticker_data_pairs),
+                                     on_error=_analysis_error)
+            perf_log.debug("✅ Completed %d ticker analyses on shared memory", len(results))
                         
         except Exception as e:
-            perf_log.error("ProcessPoolExecutor failed: %s, falling back to ThreadPoolExecutor", e)
+            perf_log.error("Shared-memory process pool failed: %s, falling back to ThreadPoolExecutor", e)
+            results = []
             use_processes = False
+    else:
+        use_processes = False
     
     if not use_processes:
         # Fallback to ThreadPoolExecutor for I/O-bound or small datasets
@@ -3955,13 +4095,7 @@ def batch_analyze_with_process_pool(tickers: List[str], max_workers: int = None,
                 except Exception as e:
                     ticker = future_to_ticker[future]
                     perf_log.error("❌ Thread analysis failed for %s: %s", ticker, str(e))
-                    results.append({
-                        'ticker': ticker,
-                        'error': str(e),
-                        'score': 0.0,
-                        'indicators': {},
-                        'swing_signals': {}
-                    })
+                    results.append(_analysis_error(ticker, str(e)))
     
     # Performance summary
     successful = len([r for r in results if 'error' not in r])
@@ -6271,7 +6405,6 @@ def calculate_enhanced_buyer_dominance(ticker: str, daily_df: pd.DataFrame, skip
         # Method 1: 5-minute intraday data (if not skipped)
         if not skip_intraday:
             try:
-                rate_limit(0.5)  # 500ms between calls
                 df5 = YFinanceDataValidator.safe_ticker_history(ticker, period="1d", interval="5m")
                 if not df5.empty and len(df5) >= 5:
                     if all(col in df5.columns for col in ['Close', 'Open', 'Volume']):
@@ -6682,6 +6815,7 @@ _MOJIBAKE_DASHES = (
     "ÃƒÂ¢Ã‹â€ Ã¢â‚¬â„¢","ÃƒÂ¢Ã¢â€šÂ¬Ã‚Â¯","ÃƒÂ¢Ã¢â€šÂ¬"
 )
 _dash_map = {ord(ch): "-" for ch in _DASHES}
+_WS_RUN = re.compile(r"\s+")
 
 def _latin1_roundtrip_fix(txt: str) -> str:
     if "Ãƒ" not in txt:
@@ -6697,10 +6831,11 @@ def _latin1_roundtrip_fix(txt: str) -> str:
 def normalize_hyphens(text: str) -> str:
     if not text: return ""
     txt = _latin1_roundtrip_fix(text).translate(_dash_map)
-    for seq in _MOJIBAKE_DASHES:
-        txt = txt.replace(seq, "-")
+    if "Ã" in txt:  # every mojibake dash sequence starts with it
+        for seq in _MOJIBAKE_DASHES:
+            txt = txt.replace(seq, "-")
     txt = txt.replace("\u200b","").replace("\u200c","").replace("\u200d","")
-    return re.sub(r"\s+"," ", txt)
+    return _WS_RUN.sub(" ", txt)
 
 def deduplicate_news_by_signature(news: List[News]) -> List[News]:
     """
@@ -6918,13 +7053,6 @@ class RSI_EMA_BB_Strategy:
             features["vol_ratio"] = 1.0
             features["vol_zscore"] = 0.0
 
-        # OPTIMIZED: Memory cleanup for large DataFrames
-        if len(df) > 500:  # Only cleanup for large datasets
-            del rolling_20, volume_rolling_20
-            if 'rolling_20_fallback' in locals():
-                del rolling_20_fallback
-            gc.collect()
-
         return features
 
     def calculate_score(self, features: dict) -> float:
@@ -7775,24 +7903,35 @@ def money_cr(txt: str) -> float:
             continue
     return total
 
+# One scanner for money expressions and deal keywords: amounts are _M
+# matches; the deal type is the first DEAL_PATTERN keyword in the text
+# (an "investment" unit is also that keyword), shared by every amount.
+_DEAL_SCAN = re.compile(
+    r"(?P<deal>" + DEAL_PATTERN.pattern + r")|(?P<money>" + _M.pattern + r")",
+    re.I
+)
+_SCAN_NUM = _DEAL_SCAN.groupindex["money"] + 1   # _M's number / unit groups
+_SCAN_UNIT = _SCAN_NUM + 1
+
+@functools.lru_cache(maxsize=16384)
+def _scan_deal_amounts(txt: str) -> Tuple[Tuple[float, str], ...]:
+    amounts: List[float] = []
+    deal_type = None
+    for m in _DEAL_SCAN.finditer(txt):
+        if m.group("deal") is not None:
+            if deal_type is None:
+                deal_type = m.group("deal").lower().strip()
+            continue
+        unit = (m.group(_SCAN_UNIT) or "").lower()
+        if deal_type is None and unit == "investment":
+            deal_type = "investment"
+        amounts.append(normalize_number(m.group(_SCAN_NUM)) * MULT.get(unit, 1.0))
+    deal_type = deal_type or "general"
+    return tuple((amount, deal_type) for amount in amounts)
+
 def extract_deal_amounts(txt: str) -> List[Tuple[float, str]]:
     """Return list of (absolute_amount_in_base_units, deal_type_str)."""
-    amounts: List[Tuple[float, str]] = []
-    for num_str, unit in _M.findall(txt):
-        try:
-            num = normalize_number(num_str)
-            mult = MULT.get((unit or "").lower(), 1.0)
-            amount = num * mult
-            deal_type = "general"
-            m = DEAL_PATTERN.search(txt)
-            if m:
-                deal_type = m.group(1).lower().strip()
-            amounts.append((amount, deal_type))
-            # Debug output for amount extraction
-            # print(f"DEBUG extract: '{num_str}' '{unit}' -> {num} * {mult} = {amount} ({deal_type})")
-        except Exception:
-            continue
-    return amounts
+    return list(_scan_deal_amounts(txt))
 
 def consolidate_deals(news: List[News]) -> Tuple[float,int]:
     """Aggregate monetary values with sentiment & deal-type weighting.
@@ -7818,19 +7957,18 @@ def consolidate_deals(news: List[News]) -> Tuple[float,int]:
     if not deal_amounts:
         return 0.0, 0
 
+    # Sorted sweep: an amount that starts a new group is at least
+    # (1 + MONEY_TOLERANCE) x every earlier group's average, so earlier
+    # groups can never match again and only the newest one is compared.
     deal_amounts.sort()
     consolidated: List[Tuple[float,int]] = []
     for amt in deal_amounts:
-        matched = False
-        for i, (base, cnt) in enumerate(consolidated):
+        if consolidated:
+            base, cnt = consolidated[-1]
             if base > 0 and abs(amt - base) / base < MONEY_TOLERANCE:
-                new_cnt = cnt + 1
-                new_avg = (base * cnt + amt) / new_cnt
-                consolidated[i] = (new_avg, new_cnt)
-                matched = True
-                break
-        if not matched:
-            consolidated.append((amt, 1))
+                consolidated[-1] = ((base * cnt + amt) / (cnt + 1), cnt + 1)
+                continue
+        consolidated.append((amt, 1))
 
     total_amount = sum(a for a, _ in consolidated)
     return total_amount, deal_count
@@ -8274,11 +8412,35 @@ def batched_history_download(tickers: List[str], soft_mode: bool = False) -> Dic
         return results
 
 def fetch_financials_late(tickers: List[str], hist_data: Dict[str, pd.DataFrame], args) -> Dict[str, Fin]:
-    """Fetch financials only for top candidates"""
+    """Fetch financials only for top candidates.
+
+    Served from the quarterly fundamentals cache; symbols whose entry is missing
+    or expired are fetched concurrently (FIN_FETCH_WORKERS threads sharing the
+    Yahoo token bucket) and written back. Symbols that failed earlier today
+    are skipped until their negative entry expires.
+    """
+    if args.skip_financial:
+        return {t: Fin(0.0, 0.0, None) for t in tickers}
+    cache = get_fin_cache()
+    symbols = [ensure_ns_suffix(t) for t in tickers]
+    base = cache.fresh(symbols)
+    missed = cache.missed([s for s in symbols if s not in base])
+    todo = [t for t in dict.fromkeys(tickers) if ensure_ns_suffix(t) not in base and ensure_ns_suffix(t) not in missed]
+    if todo:
+        logging.info(f"Fetching quarterly fundamentals for {len(todo)} symbols "
+                     f"({len(base)} cached, {len(missed)} failed earlier)...")
+        records = []
+        with ThreadPoolExecutor(max(1, min(FIN_FETCH_WORKERS, len(todo)))) as ex:
+            for rec in ex.map(_fetch_fin_record, todo):
+                if rec is not None:
+                    records.append(rec)
+                    if rec.fin is not None:
+                        base[rec.symbol] = rec.fin
+        cache.put_many(records)
+
     fin_data = {}
     for t in tickers:
-        df = hist_data.get(t, pd.DataFrame())
-        f = get_fin(t, not args.allow_negative, args.skip_financial, hist_df=df)
+        f = _finalize_fin(base.get(ensure_ns_suffix(t)), not args.allow_negative, hist_data.get(t))
         if f:
             fin_data[t] = f
     return fin_data
@@ -8287,7 +8449,6 @@ def fetch_financials_late(tickers: List[str], hist_data: Dict[str, pd.DataFrame]
 # Yahoo Helpers
 # =============================================================================
 def _hist(t: str) -> Tuple[str, pd.DataFrame]:
-    rate_limit(0.5)  # 500ms between calls
     try:
         # Use our resilient download system - prevent double .NS suffix
         yf_symbol = ensure_ns_suffix(t)
@@ -8301,68 +8462,218 @@ def _hist(t: str) -> Tuple[str, pd.DataFrame]:
         logging.debug(f"Yahoo history error {t}: {e}")
         return t, pd.DataFrame()
 
-def _meta(t: str) -> Tuple[str, float, str, float]:
-    """Return (ticker, market_cap, name, bid_ask_spread_pct) with data validation"""
-    rate_limit(0.5)  # 500ms between calls
-    try:
-        # Use safe data fetching with validation
-        info = YFinanceDataValidator.safe_ticker_info(t)
-        
-        if not info:
-            logging.debug(f"No valid metadata available for {t}")
-            return t, 0.0, "", 0.0
-        
-        # Extract and validate name
-        name = ""
-        for name_field in ['longName', 'shortName', 'symbol']:
-            if name_field in info and info[name_field]:
-                name = str(info[name_field]).strip()
-                break
-        
-        # Extract and validate market cap
+# -----------------------------------------------------------------------------
+# Daily metadata snapshot (market cap / name / bid-ask / sector)
+# -----------------------------------------------------------------------------
+
+META_SNAPSHOT_DB = os.path.join(".yf_cache", "meta_snapshot.db")
+
+
+class MetadataSnapshot:
+    """symbol -> validated Yahoo metadata, refreshed in bulk once per day.
+
+    Rows carry the day they were fetched; only today's rows are served, so a
+    same-day rerun of the screener makes no metadata requests. Symbols whose
+    info was empty or failed validation are stored too, as an empty row, so
+    they are not asked for again until the next day.
+    """
+
+    def __init__(self, db_path: str = META_SNAPSHOT_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        con = sqlite3.connect(db_path)
+        try:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meta_snapshot (
+                    symbol TEXT PRIMARY KEY,
+                    snapshot_date TEXT,
+                    market_cap REAL,
+                    long_name TEXT,
+                    short_name TEXT,
+                    bid REAL,
+                    ask REAL,
+                    price REAL,
+                    sector TEXT,
+                    info_json TEXT
+                )
+                """
+            )
+            con.commit()
+        finally:
+            con.close()
+
+    def get(self, symbol: str, day: Optional[str] = None) -> Optional[dict]:
+        day = day or date.today().isoformat()
+        con = sqlite3.connect(self.db_path)
+        try:
+            row = con.execute(
+                "SELECT info_json FROM meta_snapshot WHERE symbol=? AND snapshot_date=?", (symbol, day)
+            ).fetchone()
+        finally:
+            con.close()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0] or "{}")
+        except Exception:
+            return {}
+
+    def missing(self, symbols: List[str], day: Optional[str] = None) -> List[str]:
+        day = day or date.today().isoformat()
+        if not symbols:
+            return []
+        con = sqlite3.connect(self.db_path)
+        try:
+            have = set()
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i + 500]
+                q = ",".join("?" * len(chunk))
+                have.update(r[0] for r in con.execute(
+                    f"SELECT symbol FROM meta_snapshot WHERE snapshot_date=? AND symbol IN ({q})", [day, *chunk]))
+        finally:
+            con.close()
+        return [s for s in symbols if s not in have]
+
+    def put_many(self, rows: List[Tuple[str, dict, dict]], day: Optional[str] = None) -> None:
+        """rows: (symbol, validated_info, raw_info)."""
+        day = day or date.today().isoformat()
+        with self._lock:
+            con = sqlite3.connect(self.db_path)
+            try:
+                con.executemany(
+                    """
+                    INSERT OR REPLACE INTO meta_snapshot
+                    (symbol, snapshot_date, market_cap, long_name, short_name, bid, ask, price, sector, info_json)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            sym, day,
+                            clean.get('marketCap'), clean.get('longName'), clean.get('shortName'),
+                            raw.get('bid'), raw.get('ask'),
+                            raw.get('currentPrice') or raw.get('regularMarketPrice') or raw.get('previousClose'),
+                            clean.get('sector'),
+                            json.dumps(clean, default=str),
+                        )
+                        for sym, clean, raw in rows
+                    ],
+                )
+                con.commit()
+            finally:
+                con.close()
+
+
+_META_SNAPSHOT: Optional[MetadataSnapshot] = None
+
+
+def get_meta_snapshot() -> MetadataSnapshot:
+    global _META_SNAPSHOT
+    if _META_SNAPSHOT is None:
+        _META_SNAPSHOT = MetadataSnapshot()
+    return _META_SNAPSHOT
+
+
+def _fetch_meta_info(t: str) -> Tuple[str, dict, dict]:
+    """Validated Yahoo .info via safe_yf_info (token bucket, retry, info cache); returns (symbol, clean, raw)."""
+    sym = ensure_ns_suffix(t)
+    raw = safe_yf_info(sym) or {}
+    is_valid, error_msg, clean = YFinanceDataValidator.validate_info_data(raw, t)
+    if not is_valid:
+        logging.debug(f"Info validation failed for {t}: {error_msg}")
+        clean = {}
+    return sym, clean, raw
+
+
+def refresh_meta_snapshot(tickers: List[str], max_workers: int = None) -> int:
+    """Bulk-fetch today's metadata for tickers missing from the snapshot; returns count fetched.
+
+    Every fetched symbol is snapshotted, empty or invalid ones as an empty row,
+    so neither _meta nor a same-day rerun asks Yahoo for them again.
+    """
+    snap = get_meta_snapshot()
+    todo = snap.missing(list(dict.fromkeys(ensure_ns_suffix(t) for t in tickers)))
+    if not todo:
+        return 0
+    logging.info(f"Refreshing Yahoo metadata snapshot for {len(todo)} symbols...")
+    with ThreadPoolExecutor(max_workers or MAX_WORKERS) as ex:
+        rows: List[Tuple[str, dict, dict]] = list(ex.map(_fetch_meta_info, todo))
+    snap.put_many(rows)
+    return len(todo)
+
+
+def _meta_from_info(t: str, info: dict) -> Tuple[str, float, str, float]:
+    """Return (ticker, market_cap, name, bid_ask_spread_pct) from validated info"""
+    if not info:
+        logging.debug(f"No valid metadata available for {t}")
+        return t, 0.0, "", 0.0
+
+    # Extract and validate name
+    name = ""
+    for name_field in ['longName', 'shortName', 'symbol']:
+        if name_field in info and info[name_field]:
+            name = str(info[name_field]).strip()
+            break
+
+    # Extract and validate market cap
+    mc = 0.0
+    market_cap_raw = info.get('marketCap', 0) or 0
+    if isinstance(market_cap_raw, (int, float)) and market_cap_raw > 0:
+        mc = market_cap_raw / 1e7  # Convert to Cr
+        # Validate reasonable market cap range
+        if mc < 0.1 or mc > 1000000:  # 0.1 Cr to 10 lakh Cr
+            logging.debug(f"Extreme market cap {mc} Cr for {t}")
+            mc = max(0.1, min(mc, 1000000))
+
+    # Calculate bid-ask spread as percentage with validation
+    spread_pct = 0.0
+    bid = info.get('bid', 0) or 0
+    ask = info.get('ask', 0) or 0
+    current_price = (info.get('currentPrice', 0) or
+                    info.get('regularMarketPrice', 0) or
+                    info.get('previousClose', 0) or 0)
+
+    # Validate price data
+    if (isinstance(bid, (int, float)) and bid > 0 and
+        isinstance(ask, (int, float)) and ask > 0 and
+        isinstance(current_price, (int, float)) and current_price > 0):
+
+        # Ensure ask >= bid (basic sanity check)
+        if ask >= bid:
+            spread_pct = (ask - bid) / current_price
+            # Validate reasonable spread (0% to 10%)
+            if spread_pct < 0 or spread_pct > 0.1:
+                logging.debug(f"Extreme spread {spread_pct*100:.2f}% for {t}")
+                spread_pct = max(0, min(spread_pct, 0.1))
+        else:
+            logging.debug(f"Invalid bid-ask data for {t}: bid={bid}, ask={ask}")
+            spread_pct = 0.0
+
+    # Final validation
+    if not isinstance(mc, (int, float)) or np.isnan(mc) or np.isinf(mc):
         mc = 0.0
-        market_cap_raw = info.get('marketCap', 0) or 0
-        if isinstance(market_cap_raw, (int, float)) and market_cap_raw > 0:
-            mc = market_cap_raw / 1e7  # Convert to Cr
-            # Validate reasonable market cap range
-            if mc < 0.1 or mc > 1000000:  # 0.1 Cr to 10 lakh Cr
-                logging.debug(f"Extreme market cap {mc} Cr for {t}")
-                mc = max(0.1, min(mc, 1000000))
-        
-        # Calculate bid-ask spread as percentage with validation
+    if not isinstance(spread_pct, (int, float)) or np.isnan(spread_pct) or np.isinf(spread_pct):
         spread_pct = 0.0
-        bid = info.get('bid', 0) or 0
-        ask = info.get('ask', 0) or 0
-        current_price = (info.get('currentPrice', 0) or 
-                        info.get('regularMarketPrice', 0) or 
-                        info.get('previousClose', 0) or 0)
-        
-        # Validate price data
-        if (isinstance(bid, (int, float)) and bid > 0 and
-            isinstance(ask, (int, float)) and ask > 0 and
-            isinstance(current_price, (int, float)) and current_price > 0):
-            
-            # Ensure ask >= bid (basic sanity check)
-            if ask >= bid:
-                spread_pct = (ask - bid) / current_price
-                # Validate reasonable spread (0% to 10%)
-                if spread_pct < 0 or spread_pct > 0.1:
-                    logging.debug(f"Extreme spread {spread_pct*100:.2f}% for {t}")
-                    spread_pct = max(0, min(spread_pct, 0.1))
-            else:
-                logging.debug(f"Invalid bid-ask data for {t}: bid={bid}, ask={ask}")
-                spread_pct = 0.0
-        
-        # Final validation
-        if not isinstance(mc, (int, float)) or np.isnan(mc) or np.isinf(mc):
-            mc = 0.0
-        if not isinstance(spread_pct, (int, float)) or np.isnan(spread_pct) or np.isinf(spread_pct):
-            spread_pct = 0.0
-        if not isinstance(name, str):
-            name = ""
-        
-        return t, mc, name, spread_pct
-        
+    if not isinstance(name, str):
+        name = ""
+
+    return t, mc, name, spread_pct
+
+
+def _meta(t: str, fetch: bool = True) -> Tuple[str, float, str, float]:
+    """Return (ticker, market_cap, name, bid_ask_spread_pct), served from today's snapshot.
+
+    fetch=False (after refresh_meta_snapshot) never goes to Yahoo: a symbol the
+    bulk pass could not snapshot just gets the empty defaults.
+    """
+    try:
+        snap = get_meta_snapshot()
+        info = snap.get(ensure_ns_suffix(t))
+        if info is None and fetch:
+            sym, info, raw = _fetch_meta_info(t)
+            snap.put_many([(sym, info, raw)])
+        return _meta_from_info(t, info or {})
     except Exception as e:
         logging.debug(f"Yahoo meta error {t}: {e}")
         return t, 0.0, "", 0.0
@@ -8376,9 +8687,9 @@ def get_yahoo(tks: List[str]) -> Tuple[Dict[str,pd.DataFrame], Dict[str,float],
         fut_h = {ex.submit(_hist, t): t for t in tks}
         for f in as_completed(fut_h):
             t, df = f.result(); h[t] = df
-        fut_m = {ex.submit(_meta, t): t for t in tks}
-        for f in as_completed(fut_m):
-            t, m, name, spread = f.result(); mc[t] = m; nm[t] = name; sp[t] = spread
+    refresh_meta_snapshot(tks)
+    for t in tks:
+        t, m, name, spread = _meta(t, fetch=False); mc[t] = m; nm[t] = name; sp[t] = spread
     return h, mc, nm, sp
 
 # =============================================================================
@@ -8390,19 +8701,231 @@ def _first(vs: List[Optional[float]]) -> Optional[float]:
             return v
     return None
 
-def get_fin(t: str, require_positive: bool=True, skip: bool=False, hist_df: Optional[pd.DataFrame]=None) -> Optional[Fin]:
-    if skip:
-        return Fin(0.0, 0.0, None)
-    rate_limit(0.5)  # 500ms between calls
+# -----------------------------------------------------------------------------
+# Quarterly fundamentals cache
+# -----------------------------------------------------------------------------
+FIN_CACHE_DB = os.path.join(".yf_cache", "fundamentals.db")
+FIN_FETCH_WORKERS = 4
+# SEBI LODR filing windows: 45 days after a quarter ends, 60 for the year-end (March) quarter
+RESULTS_FILING_DAYS = 45
+ANNUAL_RESULTS_FILING_DAYS = 60
+FIN_MISS_TTL_DAYS = 1  # failed pulls are not retried before the next day
+
+
+class FinRecord(NamedTuple):
+    symbol: str
+    fin: Optional[Fin]        # None: the pull failed (negative entry)
+    period_end: Optional[date]  # end of the latest reported quarter
+    next_check: date          # first day the entry must be re-fetched
+
+
+def _quarter_end(d: date) -> date:
+    """Last day of the calendar quarter containing d."""
+    m = ((d.month - 1) // 3 + 1) * 3
+    return (date(d.year + (m == 12), (m % 12) + 1, 1) - timedelta(days=1))
+
+
+def _next_quarter_end(d: date) -> date:
+    return _quarter_end(_quarter_end(d) + timedelta(days=1))
+
+
+def fiscal_quarter_label(period_end: date) -> str:
+    """Indian fiscal quarter for a quarter-end date: 2025-06-30 -> 'FY26Q1'."""
+    q = ((period_end.month - 4) % 12) // 3 + 1
+    fy = period_end.year + (period_end.month > 3)
+    return f"FY{fy % 100:02d}Q{q}"
+
+
+def _filing_deadline(period_end: date) -> date:
+    days = ANNUAL_RESULTS_FILING_DAYS if period_end.month == 3 else RESULTS_FILING_DAYS
+    return period_end + timedelta(days=days)
+
+
+def fin_next_check(period_end: date, today: Optional[date] = None,
+                   results_date: Optional[date] = None) -> date:
+    """Expiry for fundamentals reported up to period_end.
+
+    Nothing newer can be filed before the next quarter closes, so the entry
+    holds until then (or until the announced results date, if Yahoo has one
+    inside the filing window). During the filing window it is re-checked
+    daily; past the deadline (late filer / stale Yahoo data) weekly.
+    """
+    today = today or date.today()
+    nxt = _next_quarter_end(period_end)
+    deadline = _filing_deadline(nxt)
+    due = nxt
+    if results_date is not None and nxt < results_date <= deadline:
+        due = results_date + timedelta(days=1)
+    if today < due:
+        return due
+    if today <= deadline:
+        return today + timedelta(days=1)
+    return today + timedelta(days=7)
+
+
+class FundamentalsCache:
+    """(symbol, fiscal quarter) -> Fin, with a results-calendar-aware expiry.
+
+    One row per reported quarter is kept; lookups serve a symbol's latest row
+    while its next_check date lies in the future. Failed pulls are kept apart
+    as negative entries until their own next_check (see missed()).
+    """
+
+    def __init__(self, db_path: str = FIN_CACHE_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        con = sqlite3.connect(db_path)
+        try:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fundamentals (
+                    symbol TEXT,
+                    fiscal_quarter TEXT,
+                    period_end TEXT,
+                    fetched_at TEXT,
+                    next_check TEXT,
+                    fin_json TEXT,
+                    PRIMARY KEY (symbol, fiscal_quarter)
+                )
+                """
+            )
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fundamentals_missed (
+                    symbol TEXT PRIMARY KEY,
+                    fetched_at TEXT,
+                    next_check TEXT
+                )
+                """
+            )
+            con.commit()
+        finally:
+            con.close()
+
+    def fresh(self, symbols: List[str], day: Optional[str] = None) -> Dict[str, Fin]:
+        """Unexpired fundamentals for symbols (latest quarter per symbol)."""
+        day = day or date.today().isoformat()
+        out: Dict[str, Fin] = {}
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return out
+        con = sqlite3.connect(self.db_path)
+        try:
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i + 500]
+                q = ",".join("?" * len(chunk))
+                rows = con.execute(
+                    f"""
+                    SELECT symbol, fin_json, next_check FROM fundamentals
+                    WHERE symbol IN ({q}) ORDER BY symbol, period_end
+                    """, chunk).fetchall()
+                latest = {sym: (js, nc) for sym, js, nc in rows}  # last row per symbol wins
+                for sym, (js, nc) in latest.items():
+                    if nc > day:
+                        try:
+                            out[sym] = Fin(**json.loads(js))
+                        except Exception:
+                            continue
+        finally:
+            con.close()
+        return out
+
+    def missed(self, symbols: List[str], day: Optional[str] = None) -> Set[str]:
+        """Symbols whose last pull failed and is not due for a retry yet."""
+        day = day or date.today().isoformat()
+        out: Set[str] = set()
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return out
+        con = sqlite3.connect(self.db_path)
+        try:
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i + 500]
+                q = ",".join("?" * len(chunk))
+                rows = con.execute(
+                    f"SELECT symbol FROM fundamentals_missed WHERE symbol IN ({q}) AND next_check > ?",
+                    chunk + [day]).fetchall()
+                out.update(sym for (sym,) in rows)
+        finally:
+            con.close()
+        return out
+
+    def put_many(self, records: List[FinRecord]) -> None:
+        if not records:
+            return
+        now = datetime.now().isoformat(timespec="seconds")
+        found = [r for r in records if r.fin is not None]
+        with self._lock:
+            con = sqlite3.connect(self.db_path)
+            try:
+                con.executemany(
+                    """
+                    INSERT OR REPLACE INTO fundamentals
+                    (symbol, fiscal_quarter, period_end, fetched_at, next_check, fin_json)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (r.symbol, fiscal_quarter_label(r.period_end), r.period_end.isoformat(), now,
+                         r.next_check.isoformat(), json.dumps(r.fin._asdict()))
+                        for r in found
+                    ],
+                )
+                con.executemany("DELETE FROM fundamentals_missed WHERE symbol = ?", [(r.symbol,) for r in found])
+                con.executemany(
+                    "INSERT OR REPLACE INTO fundamentals_missed (symbol, fetched_at, next_check) VALUES (?, ?, ?)",
+                    [(r.symbol, now, r.next_check.isoformat()) for r in records if r.fin is None],
+                )
+                con.commit()
+            finally:
+                con.close()
+
+
+_FIN_CACHE: Optional[FundamentalsCache] = None
+
+
+def get_fin_cache() -> FundamentalsCache:
+    global _FIN_CACHE
+    if _FIN_CACHE is None:
+        _FIN_CACHE = FundamentalsCache()
+    return _FIN_CACHE
+
+
+def _results_date(info: dict) -> Optional[date]:
+    """Announced results date from Yahoo info, if any."""
+    for key in ("earningsTimestampStart", "earningsTimestamp"):
+        ts = info.get(key)
+        if isinstance(ts, (int, float)) and ts > 0:
+            return datetime.fromtimestamp(ts).date()
+    return None
+
+
+def _fetch_fin_record(t: str) -> Optional[FinRecord]:
+    """Fetch statement-level fundamentals for one symbol under the Yahoo token bucket.
+
+    A failed pull comes back as a negative record (fin=None) good for
+    FIN_MISS_TTL_DAYS; None means Yahoo throttled us and nothing is cached.
+    """
+    bucket = get_bucket("yahoo")
+    yf_symbol = ensure_ns_suffix(t)
+    miss = FinRecord(yf_symbol, None, None, date.today() + timedelta(days=FIN_MISS_TTL_DAYS))
     try:
-        # Prevent double .NS suffix
-        yf_symbol = ensure_ns_suffix(t)
         tk = yf.Ticker(yf_symbol)
         if yshared._ERRORS.get(yf_symbol) == 404:
-            return None
+            return miss
+        bucket.acquire()
         fi = tk.fast_info or {}
         info = tk.info or {}
 
+        stmts: Dict[str, pd.DataFrame] = {}
+
+        def stmt(name: str) -> Optional[pd.DataFrame]:
+            # One token per statement request; each statement is requested once
+            if name not in stmts:
+                bucket.acquire()
+                stmts[name] = getattr(tk, name)
+            return stmts[name]
+
         def latest(df: pd.DataFrame, keys: List[str]) -> Optional[float]:
             if df is None or df.empty:
                 return None
@@ -8414,23 +8937,22 @@ def get_fin(t: str, require_positive: bool=True, skip: bool=False, hist_df: Opti
             return None
 
         net = _first([
-            latest(tk.quarterly_balancesheet, ["Total Stockholder Equity","Total Shareholder Equity","Net Worth","Shareholders Funds"]),
-            latest(tk.balance_sheet, ["Total Stockholder Equity","Total Shareholder Equity","Net Worth","Shareholders Funds","Total Equity"]),
+            latest(stmt("quarterly_balancesheet"), ["Total Stockholder Equity","Total Shareholder Equity","Net Worth","Shareholders Funds"]),
+            latest(stmt("balance_sheet"), ["Total Stockholder Equity","Total Shareholder Equity","Net Worth","Shareholders Funds","Total Equity"]),
             fi.get("book_value") and fi.get("book_value") * (fi.get("shares_outstanding") or info.get("sharesOutstanding")),
             info.get("totalStockholderEquity")
         ])
+        q_inc = stmt("quarterly_income_stmt")
         inc = _first([
-            latest(tk.quarterly_income_stmt, ["Net Income","Net Profit","Profit After Tax"]),
-            latest(tk.income_stmt, ["Net Income","Net Profit","Profit After Tax"]),
+            latest(q_inc, ["Net Income","Net Profit","Profit After Tax"]),
+            latest(stmt("income_stmt"), ["Net Income","Net Profit","Profit After Tax"]),
             fi.get("ttm_net_income"),
             info.get("netIncome") or info.get("netIncomeToCommon")
         ])
-        if require_positive and ((net or 0) < 0 or (inc or 0) < 0):
-            return None
 
         # margin
         try:
-            inc_stmt = tk.income_stmt
+            inc_stmt = stmt("income_stmt")
             if inc_stmt is not None and not inc_stmt.empty:
                 op_income = None; revenue = None
                 for cand in ["Operating Income","OperatingIncome","EBIT","Ebit"]:
@@ -8449,16 +8971,10 @@ def get_fin(t: str, require_positive: bool=True, skip: bool=False, hist_df: Opti
         except:
             margin = None
 
-        # volume growth (simple last-day vs avg)
-        try:
-            vg = hist_df["Volume"].pct_change().iloc[-1] if (hist_df is not None and not hist_df.empty) else None
-        except:
-            vg = None
-
         # debt reduction
         debt_red = None
         try:
-            bs = tk.balance_sheet
+            bs = stmt("balance_sheet")
             if bs is not None and not bs.empty and "Total Debt" in bs.index:
                 s = bs.loc["Total Debt"].dropna()
                 if len(s) >= 2:
@@ -8470,10 +8986,51 @@ def get_fin(t: str, require_positive: bool=True, skip: bool=False, hist_df: Opti
 
         pe_ratio = info.get('trailingPE') or info.get('forwardPE') or 0.0
 
-        return Fin(net or 0.0, inc or 0.0, info.get("debtToEquity"), margin, vg, debt_red, None, pe_ratio)
+        # Latest reported quarter; without quarterly statements assume the last closed one
+        today = date.today()
+        try:
+            period_end = _quarter_end(pd.Timestamp(max(q_inc.columns)).date())
+        except Exception:
+            period_end = date(today.year, 3 * ((today.month - 1) // 3) + 1, 1) - timedelta(days=1)
+        fin = Fin(net or 0.0, inc or 0.0, info.get("debtToEquity"), margin, None, debt_red, None, pe_ratio)
+        bucket.reward()
+        return FinRecord(yf_symbol, fin, period_end, fin_next_check(period_end, today, _results_date(info)))
     except Exception as e:
         logging.debug(f"Fin err {t}: {e}")
+        return None if note_rate_limit_error(e) else miss
+
+
+def _finalize_fin(base: Optional[Fin], require_positive: bool, hist_df: Optional[pd.DataFrame]) -> Optional[Fin]:
+    """Apply the positive-equity/profit filter and today's volume growth to cached fundamentals."""
+    if base is None:
+        return None
+    if require_positive and ((base.net or 0) < 0 or (base.inc or 0) < 0):
         return None
+    # volume growth (simple last-day vs avg)
+    try:
+        vg = hist_df["Volume"].pct_change().iloc[-1] if (hist_df is not None and not hist_df.empty) else None
+    except:
+        vg = None
+    return base._replace(volume_growth=vg)
+
+
+def get_fin(t: str, require_positive: bool=True, skip: bool=False, hist_df: Optional[pd.DataFrame]=None) -> Optional[Fin]:
+    if skip:
+        return Fin(0.0, 0.0, None)
+    sym = ensure_ns_suffix(t)
+    cache = get_fin_cache()
+    base = cache.fresh([sym]).get(sym)
+    if base is None:
+        if cache.missed([sym]):
+            return None
+        rec = _fetch_fin_record(t)
+        if rec is None:
+            return None
+        cache.put_many([rec])
+        if rec.fin is None:
+            return None
+        base = rec.fin
+    return _finalize_fin(base, require_positive, hist_df)
 
 # =============================================================================
 # Enhanced Sector Detection + Dynamic P/E Analysis
@@ -9021,11 +9578,12 @@ def scaled_score(raw_plus_near: float, fin_data: Fin, news: List[News], base_sca
 # =============================================================================
 def get_oi_change(tkr: str) -> Optional[float]:
     try:
-        rate_limit(0.5)  # 500ms between calls
+        rate_limit()  # Yahoo token bucket
         # Prevent double .NS suffix
         yf_symbol = ensure_ns_suffix(tkr)
         tk = yf.Ticker(yf_symbol)
         exp = tk.options
+        note_rate_limit_ok()
         if len(exp) < 2:
             return None
         today, prev = tk.option_chain(exp[0]), tk.option_chain(exp[1])
@@ -9398,11 +9956,12 @@ _QUARTER_LABELS_PRIORITY = [
 
 def _single_quarter_growth(sym: str) -> Optional[float]:
     try:
-        rate_limit(0.5)  # 500ms between calls
+        rate_limit()  # Yahoo token bucket
         # Prevent double .NS suffix
         yf_symbol = ensure_ns_suffix(sym)
         tk = yf.Ticker(yf_symbol)
         qis = tk.quarterly_income_stmt
+        note_rate_limit_ok()
         if qis is None or qis.empty or len(qis.columns) < 2:
             return None
         for label in _QUARTER_LABELS_PRIORITY:
@@ -9486,11 +10045,16 @@ async def main(argv=None):
     # Ticker file input (bypasses news analysis)
     ap.add_argument("--ticker-file", type=str, help="Use pre-ranked ticker list from file (bypasses news analysis)")
     ap.add_argument("--ticker-count", type=int, default=100, help="Maximum number of tickers to read from ticker file (default: 100)")
+    ap.add_argument("--quick-scan", action="store_true",
+                   help="Only score the shortlist on indicators + swing signals (shared-memory process pool) and exit")
     
     # Backtesting and optimization arguments
     ap.add_argument("--backtest", type=str, nargs=2, metavar=("START_DATE", "END_DATE"), 
                    help="Run backtest mode with date range (YYYY-MM-DD YYYY-MM-DD)")
     ap.add_argument("--optimize", action="store_true", help="Run parameter optimization sweep")
+    ap.add_argument("--optimize-method", choices=["grid", "random", "bayes"], default="grid",
+                   help="Parameter search method for --optimize (default: grid)")
+    ap.add_argument("--optimize-trials", type=int, default=500, help="Combinations to try for random/bayes search (default: 500)")
     ap.add_argument("--validate", action="store_true", help="Run rolling window validation on best parameters")
     ap.add_argument("--backtest-symbols", type=str, nargs="*", default=None,
                    help="Specific symbols for backtesting (default: use top screening results)")
@@ -9503,6 +10067,10 @@ async def main(argv=None):
     ap.add_argument("--validation-report", action="store_true", help="Generate detailed data validation report")
     ap.add_argument("--allow-partial-data", action="store_true", help="Allow processing with partial/missing data (less strict)")
     
+    # Incremental reruns
+    ap.add_argument("--incremental", action="store_true",
+                   help="Rescore only tickers whose news, price bars or metadata changed since the last run; report tier changes")
+    
     ap.add_argument("files", nargs="*", help="News files to analyze (default: auto-detect latest 4-5 non-empty news_output_*.txt files)")
     args = ap.parse_args(argv)
 
@@ -9650,19 +10218,31 @@ async def main(argv=None):
         shortlist = lightweight_shortlist(news, top_n=shortlist_size, soft_mode=args.soft_mode)
         logging.info(f"Lightweight shortlist created: {len(shortlist)} candidates from {len(news)} total")
 
+    # Quick scan: technical scores for the shortlist on the warm process pool, no filters/financials
+    if args.quick_scan:
+        analysed = batch_analyze_with_process_pool([ensure_ns_suffix(t) for t in shortlist])
+        ranked = sorted((r for r in analysed if 'error' not in r), key=lambda r: r['score'], reverse=True)
+        print(f"\n🎯 QUICK SCAN ({len(ranked)}/{len(shortlist)} analysed)")
+        print(f"{'Ticker':<14} {'Score':>6} {'Price':>9} {'RSI':>6} {'BB%':>6} {'Bars':>5}")
+        print("-" * 51)
+        for r in ranked[:args.top]:
+            ind = r['indicators']
+            print(f"{r['ticker']:<14} {r['score']:>6.1f} {ind.get('close_price', 0):>9.1f} "
+                  f"{ind.get('rsi', 0):>6.1f} {ind.get('bb_position', 0):>6.1f} {r['data_points']:>5}")
+        return
+
     # Stage 1: Batched market data download for shortlist only
     logging.info("Fetching market data for shortlisted candidates...")
     hist = batched_history_download(shortlist, args.soft_mode)
     
-    # Parallel meta fetching only for shortlist
+    # Meta for shortlist: one bulk refresh of today's snapshot, then local reads
     mcap, names, spreads = {}, {}, {}
-    with ThreadPoolExecutor(MAX_WORKERS) as ex:
-        fut_m = {ex.submit(_meta, t): t for t in shortlist}
-        for f in as_completed(fut_m):
-            t, m, name, spread = f.result()
-            mcap[t] = m
-            names[t] = name
-            spreads[t] = spread
+    refresh_meta_snapshot(shortlist)
+    for t in shortlist:
+        t, m, name, spread = _meta(t, fetch=False)
+        mcap[t] = m
+        names[t] = name
+        spreads[t] = spread
     
     yshared._ERRORS = {}
     
@@ -9695,9 +10275,32 @@ async def main(argv=None):
     positive_count_map: Dict[str,int] = {}
     liquidity_map: Dict[str, Tuple[float, str, bool]] = {}  # (score, warning_level, is_short)
 
+    # ---------- Incremental mode: restore unchanged tickers from the run snapshot ----------
+    run_snap = None
+    to_score = shortlist
+    if args.incremental:
+        from run_snapshot import RunSnapshot, config_hash, ticker_inputs_hash
+        scoring_maps = {
+            "metrics": metrics, "rel_map": rel_map, "positive_count_map": positive_count_map,
+            "deal_amount_map": deal_amount_map, "deal_count_map": deal_count_map, "deal_pct_map": deal_pct_map,
+            "deal_impact_map": deal_impact_map, "liquidity_map": liquidity_map, "raw_score_map": raw_score_map,
+            "base_part_map": base_part_map, "fundamental_part_map": fundamental_part_map,
+        }
+        run_snap = RunSnapshot(config_hash=config_hash(args, __file__), max_reuse_hours=PLATEAU_HR)
+        input_hashes = {t: ticker_inputs_hash(news.get(t), hist.get(t), mcap.get(t), names.get(t), spreads.get(t))
+                        for t in shortlist}
+        restored = run_snap.reusable(input_hashes)
+        for t, state in restored.items():
+            for name, value in state.get("maps", {}).items():
+                scoring_maps[name][t] = value
+            if state.get("rank") is not None:
+                ranks.append((t, state["rank"]))
+        to_score = [t for t in shortlist if t not in restored]
+        logging.info(f"[INCREMENTAL] {len(restored)} tickers unchanged since last run, rescoring {len(to_score)}")
+
     # ---------- Technical scoring pass (no financials yet) ----------
-    logging.info(f"Technical scoring for {len(shortlist)} candidates...")
-    for t in shortlist:
+    logging.info(f"Technical scoring for {len(to_score)} candidates...")
+    for t in to_score:
         d = news.get(t)
         if not d:
             continue
@@ -10459,6 +11062,15 @@ async def main(argv=None):
         # After processing each ticker
         memory_cleanup(df, df5 if 'df5' in locals() else None, chosen if 'chosen' in locals() else None, rel, recent if 'recent' in locals() else None)
 
+    if run_snap is not None:
+        # Filtered-out tickers are stored too (rank None) so they are not rescored either
+        rank_of = dict(ranks)
+        run_snap.put_states([
+            (t, input_hashes[t], {"rank": rank_of.get(t),
+                                  "maps": {name: m[t] for name, m in scoring_maps.items() if t in m}})
+            for t in to_score
+        ])
+
     # Debug: Show scoring summary before filtering
     if not ranks:
         # Count total processed candidates and show sample scores from metrics if available
@@ -13315,8 +13927,17 @@ async def main(argv=None):
                     best_params = await backtester.optimize_parameters(
                         symbols=backtest_symbols,
                         start_date=start_date,
-                        end_date=end_date
+                        end_date=end_date,
+                        method=args.optimize_method,
+                        n_trials=args.optimize_trials
                     )
+                    ranked = backtester.last_optimization
+                    if ranked is not None and not ranked.empty:
+                        ranked.to_csv("optimizer_results.csv")
+                        print(f"   Ranked {len(ranked)} combinations -> optimizer_results.csv")
+                        top = ranked.iloc[0]
+                        print(f"   Out-of-sample: Sharpe {top['oos_sharpe_ratio']:.2f}, "
+                              f"Return {top['oos_total_return']:.2%}, Trades {int(top['oos_total_trades'])}")
                     
                     print("\n📊 OPTIMIZATION RESULTS:")
                     print(f"   Best RSI Lower: {best_params.rsi_lower}")
@@ -13458,6 +14079,21 @@ async def main(argv=None):
     with open("tickers.txt","w",encoding="utf-8") as fh:
         fh.write("\n".join(t for t,_ in ranks))
 
+    # ---- Tier changes since the previous incremental run ----
+    if run_snap is not None:
+        from run_snapshot import diff_tiers, format_diff
+        current_tiers = {t: (name, s) for name, rows in (("TIER1", tier1), ("TIER2", tier2), ("TIER3", tier3))
+                         for t, s in rows}
+        prev_run_ts, prev_tiers = run_snap.previous_tiers()
+        run_snap.put_tiers(run_ts, current_tiers)
+        if prev_tiers:
+            diff_report = format_diff(diff_tiers(prev_tiers, current_tiers), prev_run_ts)
+        else:
+            diff_report = "TIER CHANGES: no previous run recorded"
+        print("\n" + diff_report)
+        with open("swing_tier_changes.txt", "w", encoding="utf-8") as fh:
+            fh.write(f"Run: {run_ts}\n{diff_report}\n")
+
 # =============================================================================
 # Entry-point
 # =============================================================================
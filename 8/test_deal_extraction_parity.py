@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Deal extraction parity check
+
+Runs the screener's single-pass extract_deal_amounts / sorted-sweep
+consolidate_deals against frozen copies of the previous implementations
+(findall + per-amount DEAL_PATTERN search, nested-loop consolidation) on
+text drawn from the aggregated_full_articles_* files. Lines are paired into
+headline/snippet items and grouped into per-ticker news lists.
+
+Usage:
+    python3 test_deal_extraction_parity.py [--files 20] [--group 40]
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+import swing_screener_v23_9o_full_TECH_plus_TECHOUT_check_methods as scr
+
+
+def legacy_normalize_hyphens(text: str) -> str:
+    if not text: return ""
+    txt = scr._latin1_roundtrip_fix(text).translate(scr._dash_map)
+    for seq in scr._MOJIBAKE_DASHES:
+        txt = txt.replace(seq, "-")
+    txt = txt.replace("\u200b", "").replace("\u200c", "").replace("\u200d", "")
+    return re.sub(r"\s+", " ", txt)
+
+
+def legacy_extract(txt: str):
+    amounts = []
+    for num_str, unit in scr._M.findall(txt):
+        try:
+            num = scr.normalize_number(num_str)
+            mult = scr.MULT.get((unit or "").lower(), 1.0)
+            deal_type = "general"
+            m = scr.DEAL_PATTERN.search(txt)
+            if m:
+                deal_type = m.group(1).lower().strip()
+            amounts.append((num * mult, deal_type))
+        except Exception:
+            continue
+    return amounts
+
+
+def legacy_consolidate(news):
+    seen_deals = set()
+    deal_amounts = []
+    for n in news:
+        txt = legacy_normalize_hyphens(n.headline + " " + n.snippet)
+        sentiment_weight = 1.0 + abs(n.sent) / 2
+        for amt, deal_type in legacy_extract(txt):
+            sig = (deal_type, round(amt))
+            if sig in seen_deals:
+                continue
+            seen_deals.add(sig)
+            deal_amounts.append(amt * sentiment_weight * scr.DEAL_TYPES.get(deal_type, 1.0))
+    deal_count = len(seen_deals)
+    if not deal_amounts:
+        return 0.0, 0
+    deal_amounts.sort()
+    consolidated = []
+    for amt in deal_amounts:
+        matched = False
+        for i, (base, cnt) in enumerate(consolidated):
+            if base > 0 and abs(amt - base) / base < scr.MONEY_TOLERANCE:
+                consolidated[i] = ((base * cnt + amt) / (cnt + 1), cnt + 1)
+                matched = True
+                break
+        if not matched:
+            consolidated.append((amt, 1))
+    return sum(a for a, _ in consolidated), deal_count
+
+
+def corpus_lines(n_files: int):
+    here = os.path.dirname(os.path.abspath(__file__))
+    files = sorted(f for f in glob.glob(os.path.join(here, "aggregated_full_articles_*")) if os.path.isfile(f))
+    lines = []
+    for path in files[-n_files:]:
+        with open(path, encoding="utf-8", errors="ignore") as fh:
+            lines.extend(l.strip() for l in fh if l.strip() and not l.startswith("===="))
+    return lines
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=20)
+    ap.add_argument("--group", type=int, default=40, help="news items per synthetic ticker")
+    args = ap.parse_args()
+
+    lines = corpus_lines(args.files)
+    if not lines:
+        print("❌ No aggregated_full_articles_* files found")
+        return 1
+    rng = random.Random(3)
+    items = [scr.News("SYN", rng.uniform(-1, 1), lines[i], lines[i + 1] if i + 1 < len(lines) else "", None)
+             for i in range(0, len(lines), 2)]
+    # Synthetic near-duplicate amounts exercise the tolerance merge
+    items += [scr.News("SYN", 0.5, f"Company wins order worth Rs {v:.1f} crore", "", None)
+              for v in (100, 101, 102.5, 104, 110, 111, 500, 520, 0, 0)]
+    rng.shuffle(items)
+    groups = [items[i:i + args.group] for i in range(0, len(items), args.group)]
+
+    failures = 0
+    for n in items:
+        for text in (n.headline, n.snippet, n.headline + " " + n.snippet):
+            a, b = scr.normalize_hyphens(text), legacy_normalize_hyphens(text)
+            if a != b:
+                failures += 1
+                print(f"❌ normalize_hyphens differs: {text[:80]!r}")
+            if scr.extract_deal_amounts(b) != legacy_extract(b):
+                failures += 1
+                if failures <= 10:
+                    print(f"❌ extract differs: {b[:80]!r}\n   new={scr.extract_deal_amounts(b)}\n   old={legacy_extract(b)}")
+
+    t0 = time.perf_counter()
+    old = [legacy_consolidate(g) for g in groups]
+    t1 = time.perf_counter()
+    scr._scan_deal_amounts.cache_clear()
+    new = [scr.consolidate_deals(g) for g in groups]
+    t2 = time.perf_counter()
+    for g, (o, nw) in enumerate(zip(old, new)):
+        if o != nw:
+            failures += 1
+            print(f"❌ consolidate_deals group {g}: new={nw} old={o}")
+
+    print(f"{len(items)} items in {len(groups)} groups; consolidate old {t1 - t0:.2f}s, new {t2 - t1:.2f}s")
+    if failures:
+        print(f"❌ {failures} mismatches")
+        return 1
+    print("✅ Deal extraction and consolidation match the previous implementation")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
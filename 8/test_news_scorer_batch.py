@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Parity test and throughput benchmark for LLMNewsScorer.score_news_batch
+
+Splits every archived aggregated_full_articles_* file into its per-ticker
+sections (the same split frontier_ai_real_integration uses), scores each
+section's lines with the pattern-by-pattern score_news_reference and with
+one score_news_batch call, and checks that every NewsMetrics is identical.
+A few hand-written headline lists cover word boundaries, overlapping terms,
+the duplicated sentiment word and NUL characters.
+
+Usage:
+    python3 test_news_scorer_batch.py [--limit N]   # N archived files (default: all)
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from typing import List
+
+from frontier_ai_quant_alpha_core import LLMNewsScorer, NewsMetrics
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SECTION = re.compile(r'Full Article Fetch Test - \S+\s*\n={70,}')
+
+EDGE_CASES = [
+    [],
+    [''],
+    ["Investment arm invests in funding round; stake capital raised"],
+    ["Profitable quarter: profit beats, revenue up; net income at ₹1,200 crore"],
+    ["Shares down, down and breakdown as losses mount; weak outlook, struggle continues"],
+    ["Company may announce, might have announced; mayor signed the deal. Announced!"],
+    ["$250 million takeover approved in Q3 FY25; completed on 12/09/2025"],
+    ["Plans considered, plans-in-progress, replans: expects €40 mn order"],
+    ["IPO listing\x00stock float at 20% premium", "second line\x00with nul"],
+    ["Full Article Fetch Test - X", "(no fresh items in last 10h)"],
+    ["a"] * 7,
+]
+
+
+def score_news_reference(scorer: LLMNewsScorer, headlines: List[str]) -> NewsMetrics:
+    """The pattern-by-pattern scorer that score_news_batch replaced (parity reference)."""
+    if not headlines:
+        return NewsMetrics('none', 0, 0, 'neutral', 0, 'no_news', '')
+
+    combined_text = ' '.join(headlines).lower()
+
+    # Detect catalysts
+    catalyst_counts = {cat: len(re.findall(pat, combined_text)) for cat, pat in scorer.CATALYST_TYPES.items()}
+    primary_catalyst = max(catalyst_counts.items(), key=lambda x: x[1])
+
+    # Sentiment
+    pos_count = sum(combined_text.count(w) for w in scorer.SENTIMENT_WORDS['positive'])
+    neg_count = sum(combined_text.count(w) for w in scorer.SENTIMENT_WORDS['negative'])
+    sentiment = 'positive' if pos_count > neg_count else ('negative' if neg_count > pos_count else 'neutral')
+
+    # Deal value
+    deal_value = scorer.parse_deal_value(combined_text)
+
+    # IMPROVED CERTAINTY CALCULATION
+    certainty_score = 0
+
+    # 1. Base score (20 points) - Has news at all
+    certainty_score += 20
+
+    # 2. Specificity (up to 25 points) - Numbers, percentages, amounts
+    numbers = len(re.findall(r'\d{1,4}[,\d]*(?:\.\d+)?', combined_text))
+    percentages = len(re.findall(r'\d+(?:\.\d+)?%', combined_text))
+    amounts = len(re.findall(r'[₹$€]\s*\d+', combined_text))
+    specificity_score = min(25, numbers * 2 + percentages * 3 + amounts * 5)
+    certainty_score += specificity_score
+
+    # 3. Temporal markers (up to 15 points) - Dates, quarters, years
+    dates = len(re.findall(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}', combined_text))
+    quarters = len(re.findall(r'\bq[1-4]\b|\bfirst quarter\b|\bsecond quarter\b|\bthird quarter\b|\bfourth quarter\b', combined_text))
+    years = len(re.findall(r'\b20\d{2}\b|\bfy\d{2}\b', combined_text))
+    temporal_score = min(15, dates * 5 + quarters * 3 + years * 2)
+    certainty_score += temporal_score
+
+    # 4. Action verbs (up to 15 points) - Confirmed actions vs speculation
+    confirmed_actions = len(re.findall(r'\b(?:announced|approved|signed|launched|completed|reported|filed|declared|awarded|acquired)\b', combined_text))
+    speculation_words = len(re.findall(r'\b(?:may|might|could|possibly|potentially|expects|plans|considering|exploring)\b', combined_text))
+    action_score = min(15, confirmed_actions * 3 - speculation_words * 2)
+    action_score = max(0, action_score)  # Don't go negative
+    certainty_score += action_score
+
+    # 5. Catalyst strength (up to 15 points) - Multiple mentions = stronger
+    catalyst_strength = primary_catalyst[1]
+    catalyst_score = min(15, catalyst_strength * 5)
+    certainty_score += catalyst_score
+
+    # 6. Deal/financial specificity (up to 10 points) - Real numbers vs vague
+    if deal_value > 0:
+        certainty_score += 10  # Has actual deal value
+    elif any(word in combined_text for word in ['crore', 'million', 'billion', 'lakh']):
+        certainty_score += 5   # Mentions amounts but not parsed
+
+    # Normalize to 0-100
+    certainty = min(100, certainty_score)
+
+    # Penalty for test/dummy data
+    if 'full article fetch test' in combined_text:
+        certainty = max(20, certainty - 40)  # Reduce by 40 for test data
+
+    # Source quality (weighted by headline count and content quality)
+    source_quality = 'premium' if len(headlines) > 5 else 'standard'
+
+    headline_text = headlines[0] if headlines else ''
+
+    return NewsMetrics(
+        catalyst_type=primary_catalyst[0],
+        catalyst_count=primary_catalyst[1],
+        deal_value_cr=deal_value,
+        sentiment=sentiment,
+        certainty=int(certainty),
+        source_quality=source_quality,
+        headline_text=headline_text
+    )
+
+
+def archived_sections(limit=None):
+    files = sorted(glob.glob(os.path.join(HERE, '**', 'aggregated_full_articles*'), recursive=True))
+    if limit:
+        files = files[:limit]
+    batch = []
+    for path in files:
+        with open(path, encoding='utf-8', errors='ignore') as fh:
+            content = fh.read()
+        for section in SECTION.split(content)[1:]:
+            batch.append([line.strip() for line in section.splitlines() if line.strip()])
+    return files, batch
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args()
+
+    scorer = LLMNewsScorer()
+    files, batch = archived_sections(args.limit)
+    batch = EDGE_CASES + batch
+    lines = sum(len(h) for h in batch)
+
+    t0 = time.perf_counter()
+    reference = [score_news_reference(scorer, h) for h in batch]
+    ref_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batched = scorer.score_news_batch(batch)
+    batch_s = time.perf_counter() - t0
+
+    print(f"{len(files)} archived files, {len(batch)} sections, {lines} lines")
+    print(f"reference: {ref_s:.2f}s ({lines / ref_s:,.0f} lines/s)")
+    print(f"batch:     {batch_s:.2f}s ({lines / batch_s:,.0f} lines/s, {ref_s / batch_s:.1f}x)")
+
+    failures = 0
+    mismatched = [i for i, (a, b) in enumerate(zip(reference, batched)) if a.to_dict() != b.to_dict()]
+    if len(batched) != len(batch) or mismatched:
+        failures += 1
+        print(f"❌ {len(mismatched)} sections scored differently")
+        for i in mismatched[:3]:
+            print(f"   {batch[i][:2]}\n   reference {reference[i].to_dict()}\n   batch     {batched[i].to_dict()}")
+
+    single = [scorer.score_news(h).to_dict() for h in EDGE_CASES]
+    if single != [m.to_dict() for m in reference[:len(EDGE_CASES)]]:
+        failures += 1
+        print("❌ score_news differs from the reference on the edge cases")
+
+    if failures:
+        return 1
+    print("✅ Batch scorer matches score_news_reference on every section")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Offline test for NSEDataFetcher bulk quote snapshots
+
+Starts a local HTTP stand-in for nseindia.com that serves the recorded
+quote-equity payload (nse_basic_quote_RELIANCE.json) for single symbols and
+index-constituent payloads in the equity-stockIndices shape, then refreshes a
+200-name watchlist through get_quote_snapshot(force_nse=True):
+  - 150 names come from the NIFTY 500 payload, 30 from NIFTY MICROCAP 250
+  - 20 names are in neither and go through the bounded single-quote fan-out
+
+Usage:
+    python3 test_nse_bulk_quotes.py
+"""
+
+import copy
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from nse_data_fetcher import BULK_INDICES, NSEDataFetcher
+from rate_limiter import TokenBucket
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+QUOTE_LATENCY = 0.05
+
+with open(os.path.join(HERE, "nse_basic_quote_RELIANCE.json"), encoding="utf-8") as fh:
+    RECORDED_QUOTE = json.load(fh)
+
+INDEX_MEMBERS = {
+    BULK_INDICES[0]: [f"LARGE{i:03d}" for i in range(150)],
+    BULK_INDICES[1]: [f"MICRO{i:03d}" for i in range(30)],
+}
+OTHER = [f"SME{i:03d}" for i in range(20)]
+REQUESTS = {"index": 0, "quote": 0}
+
+
+def price_of(symbol: str) -> float:
+    return 100.0 + sum(map(ord, symbol)) % 900
+
+
+def index_payload(index: str) -> dict:
+    stamp = RECORDED_QUOTE["metadata"]["lastUpdateTime"]
+    rows = [{"priority": 1, "symbol": index, "lastPrice": 24000.0, "lastUpdateTime": stamp}]
+    for sym in INDEX_MEMBERS.get(index, []):
+        p = price_of(sym)
+        rows.append({"priority": 0, "symbol": sym, "open": p, "dayHigh": p * 1.01, "dayLow": p * 0.99,
+                     "lastPrice": p, "previousClose": p, "change": 0.0, "pChange": 0.0,
+                     "totalTradedVolume": 1000, "lastUpdateTime": stamp})
+    return {"name": index, "timestamp": stamp, "data": rows}
+
+
+def quote_payload(symbol: str) -> dict:
+    payload = copy.deepcopy(RECORDED_QUOTE)
+    payload["info"]["symbol"] = symbol
+    payload["priceInfo"]["lastPrice"] = price_of(symbol)
+    return payload
+
+
+class StandIn(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/":
+            body, ctype = b"<html></html>", "text/html"
+        elif url.path == "/api/equity-stockIndices":
+            REQUESTS["index"] += 1
+            body, ctype = json.dumps(index_payload(query["index"][0])).encode(), "application/json"
+        elif url.path == "/api/quote-equity":
+            REQUESTS["quote"] += 1
+            time.sleep(QUOTE_LATENCY)
+            body, ctype = json.dumps(quote_payload(query["symbol"][0])).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main() -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    fetcher = NSEDataFetcher(base_url=base)
+    fetcher.bucket = TokenBucket(1000, 1000, name="nse-test")  # the stand-in has no rate limit
+    watchlist = INDEX_MEMBERS[BULK_INDICES[0]] + INDEX_MEMBERS[BULK_INDICES[1]] + OTHER
+
+    failures = 0
+    t0 = time.perf_counter()
+    snap = fetcher.get_quote_snapshot(watchlist, force_nse=True)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(watchlist)} quotes in {elapsed:.2f}s, requests {REQUESTS}, sources {snap.sources}, "
+          f"skew {snap.skew_seconds:.0f}s, as_of {snap.as_of}")
+
+    wrong = [t for t in watchlist if snap.quotes[t].get("price") != price_of(t)]
+    if wrong:
+        failures += 1
+        print(f"❌ Wrong or missing prices for {len(wrong)} tickers, e.g. {wrong[:5]}")
+    if REQUESTS["index"] != len(BULK_INDICES) or REQUESTS["quote"] != len(OTHER):
+        failures += 1
+        print(f"❌ Expected {len(BULK_INDICES)} index and {len(OTHER)} quote requests")
+    if any(q["snapshot_time"] != snap.as_of for q in snap.quotes.values()):
+        failures += 1
+        print("❌ Quotes are not stamped with the snapshot time")
+
+    # Second refresh within the TTL is served from the cache
+    before = dict(REQUESTS)
+    t0 = time.perf_counter()
+    fetcher.get_multiple_prices(watchlist)
+    cached = time.perf_counter() - t0
+    if REQUESTS != before:
+        failures += 1
+        print(f"❌ Cached refresh made requests: {REQUESTS}")
+    print(f"cached refresh in {cached * 1000:.1f}ms")
+
+    server.shutdown()
+    if failures:
+        return 1
+    print("✅ Bulk quote snapshot matches the recorded payloads")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Offline replay test for the asyncio RealTimePriceMonitor
+
+Writes 4 hours of recorded ticks (one every 15s) for 40 tickers to a temp
+CSV and replays them on the virtual clock:
+  - BREAKDOWN drifts through its stop loss, BREAKOUT through target_1 and
+    target_2; the other 38 names are quiet
+  - every prediction becomes ready for update after READY_AFTER_HOURS
+
+Checks that each crossing is published once at the right level, that two
+replays publish identical alerts, that ready predictions are handed to the
+tracker (again on the next poll when the tracker refuses the first update)
+and leave the watchlist, that adaptive polling needs fewer fetches than a
+fixed CHECK_INTERVAL_SECONDS loop, and that with reloading on, a newer
+prediction for an already-updated ticker is watched and updated too.
+
+Usage:
+    python3 test_price_monitor_replay.py
+"""
+
+import asyncio
+import csv
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from realtime_price_monitor import (CHECK_INTERVAL_SECONDS, READY_AFTER_HOURS, LivePriceSource,
+                                    RealTimePriceMonitor, ReplayPriceSource)
+
+START = datetime(2025, 6, 2, 9, 15)
+HOURS = 4
+STEP = 15
+QUIET = [f"QUIET{i:02d}" for i in range(38)]
+
+
+class RecordingTracker:
+    """Just the FeedbackLoopTracker calls the monitor makes, without touching learning/"""
+
+    def __init__(self, predictions, refuse_once=(), follow_ups=None):
+        self.predictions = dict(predictions)
+        self.updates = []
+        self.refuse_once = set(refuse_once)
+        self.follow_ups = dict(follow_ups or {})
+
+    def _load_predictions(self):
+        return dict(self.predictions)
+
+    def performance_count(self):
+        return len(self.updates)
+
+    def update_actual_performance(self, ticker, price, volume_change_pct, rsi):
+        if ticker not in self.predictions or ticker in self.refuse_once:
+            self.refuse_once.discard(ticker)
+            return None
+        del self.predictions[ticker]
+        if ticker in self.follow_ups:
+            self.predictions[ticker] = self.follow_ups.pop(ticker)
+        record = {'ticker': ticker, 'price': price}
+        self.updates.append(record)
+        return record
+
+
+class ReloadingReplay(ReplayPriceSource, LivePriceSource):
+    """Replay ticks, but let run_async reload the tracker's predictions as it does live"""
+
+
+def price_path(ticker, i):
+    if ticker == "BREAKDOWN":
+        return 100.0 - 0.01 * i          # stop 95 is reached at tick 500
+    if ticker == "BREAKOUT":
+        return 200.0 + 0.02 * i          # targets 206 / 212 at ticks 300 / 600
+    return 500.0 + (0.1 if i % 2 else 0.0)  # +/-0.02%: quiet
+
+
+def predictions():
+    preds = {}
+    for t in ["BREAKDOWN", "BREAKOUT"] + QUIET:
+        p0 = price_path(t, 0)
+        preds[t] = {'initial_price': p0, 'stop_loss': round(p0 * 0.95, 2), 'target_1': round(p0 * 1.03, 2),
+                    'target_2': round(p0 * 1.06, 2), 'expected_move_pct': 3.0, 'recommendation': 'BUY',
+                    'timestamp': START.isoformat()}
+    return preds
+
+
+def write_ticks(path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "ticker", "price", "volume_change_pct", "rsi"])
+        for i in range(HOURS * 3600 // STEP + 1):
+            ts = (START + timedelta(seconds=i * STEP)).isoformat()
+            for t in predictions():
+                w.writerow([ts, t, f"{price_path(t, i):.2f}", 0, 50])
+
+
+def replay(path):
+    tracker = RecordingTracker(predictions(), refuse_once=["QUIET00"])
+    monitor = RealTimePriceMonitor(tracker=tracker)
+    monitor.alerts.unsubscribe('*', monitor.print_alert)
+    source = ReplayPriceSource.from_file(path)
+    seen_at = {}
+    monitor.alerts.subscribe('stop_loss', lambda a: seen_at.setdefault(a.ticker, source.now()))
+    stats = asyncio.run(monitor.run_async(source=source))
+    return monitor, tracker, seen_at, stats
+
+
+def main() -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ticks.csv")
+        write_ticks(path)
+        t0 = time.perf_counter()
+        monitor, tracker, seen_at, stats = replay(path)
+        elapsed = time.perf_counter() - t0
+        again = replay(path)[0]
+
+    alerts = [(a.ticker, a.kind, a.level, a.timestamp) for a in monitor.alerts.history]
+    fixed_polls = len(predictions()) * (READY_AFTER_HOURS * 3600 // CHECK_INTERVAL_SECONDS + 1)
+    print(f"replayed {HOURS}h in {elapsed:.2f}s: {stats}, fixed-interval loop would poll {fixed_polls}x")
+
+    crossings = sorted(a[:3] for a in alerts if a[1] != 'ready_for_update')
+    expected = [("BREAKDOWN", "stop_loss", 95.0), ("BREAKOUT", "target_1", 206.0), ("BREAKOUT", "target_2", 212.0)]
+    if crossings != expected:
+        failures += 1
+        print(f"❌ Crossings {crossings} != {expected}")
+
+    # Near a level the ticker is polled every MIN_POLL_SECONDS, so the alert lags the tick by at most one poll
+    lag = (seen_at["BREAKDOWN"] - (START + timedelta(seconds=500 * STEP))).total_seconds()
+    if not 0 <= lag <= 15:
+        failures += 1
+        print(f"❌ Stop-loss alert lagged the crossing by {lag:.0f}s")
+
+    if alerts != [(a.ticker, a.kind, a.level, a.timestamp) for a in again.alerts.history]:
+        failures += 1
+        print("❌ Two replays of the same ticks published different alerts")
+
+    if tracker.predictions or stats['updated'] != len(predictions()):
+        failures += 1
+        print(f"❌ {len(tracker.predictions)} predictions were not updated when ready")
+
+    if stats['polls'] >= fixed_polls:
+        failures += 1
+        print(f"❌ Adaptive polling made {stats['polls']} fetches, not fewer than {fixed_polls}")
+
+    # A second BUY on BREAKOUT half an hour in: once the first one is updated, the reload picks it up
+    follow_up = dict(predictions()["BREAKOUT"], timestamp=(START + timedelta(minutes=30)).isoformat())
+    tracker = RecordingTracker({"BREAKOUT": predictions()["BREAKOUT"]}, follow_ups={"BREAKOUT": follow_up})
+    monitor = RealTimePriceMonitor(tracker=tracker)
+    monitor.alerts.unsubscribe('*', monitor.print_alert)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ticks.csv")
+        write_ticks(path)
+        reload_stats = asyncio.run(monitor.run_async(source=ReloadingReplay.from_file(path)))
+    if [u['ticker'] for u in tracker.updates] != ["BREAKOUT", "BREAKOUT"] or tracker.predictions:
+        failures += 1
+        print(f"❌ Newer BREAKOUT prediction was not watched after the first update: {reload_stats}")
+
+    if failures:
+        return 1
+    print("✅ Replay alerts, updates and adaptive polling as expected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
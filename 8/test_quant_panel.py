@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Offline test for the multi-ticker QuantFeatureEngine panel
+
+Seeds a temp OHLCVPanelCache with 120 synthetic tickers (demo OHLCV) plus
+one with only 40 bars, then checks that:
+  - fetch_panel serves every fresh ticker from the cache without a download
+    and drops the short history
+  - compute_panel_features, compute_alpha_panel and compute_levels_panel
+    match compute_features / compute_alpha / compute_levels per ticker
+
+Usage:
+    python3 test_quant_panel.py
+"""
+
+import math
+import os
+import sys
+import tempfile
+import time
+
+import frontier_ai_quant_alpha_core as core
+from frontier_ai_quant_alpha_core import (AlphaCalculator, NewsMetrics, OHLCVPanelCache, QuantFeatureEngine,
+                                          RiskManager, _frames_to_long)
+
+TICKERS = [f"SYN{i:03d}.NS" for i in range(120)]
+SHORT = "NEWLIST.NS"
+NEWS = NewsMetrics('earnings', 2, 0.9, 'positive', 80, 'certain', 'Q2 beat')
+
+
+def close_enough(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        if math.isnan(a) and math.isnan(b):
+            return True
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    return a == b
+
+
+def main() -> int:
+    failures = 0
+    demo = QuantFeatureEngine(use_demo=True)
+    frames = {t: demo._generate_demo_data(t) for t in TICKERS}
+    frames[SHORT] = frames[TICKERS[0]].tail(40)
+
+    downloads = []
+    core.yf.download = lambda *args, **kwargs: downloads.append(args) or None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = OHLCVPanelCache(os.path.join(tmp, "ohlcv_panel.db"))
+        cache.put(_frames_to_long(frames))
+
+        engine = QuantFeatureEngine()
+        engine._panel = cache
+        t0 = time.perf_counter()
+        panel = engine.fetch_panel(TICKERS + [SHORT])
+        features = engine.compute_panel_features(panel)
+        alpha = AlphaCalculator().compute_alpha_panel(features, NEWS)
+        levels = RiskManager.compute_levels_panel(features)
+        batched = time.perf_counter() - t0
+
+    if downloads:
+        failures += 1
+        print(f"❌ Fresh cached tickers triggered {len(downloads)} downloads")
+    if list(features.index) != sorted(TICKERS):
+        failures += 1
+        print(f"❌ Panel tickers {len(features)} != {len(TICKERS)} (short history must be dropped)")
+
+    engine.fetch_data = lambda ticker: frames[ticker]
+    calc = AlphaCalculator()
+    t0 = time.perf_counter()
+    single = {t: engine.compute_features(t) for t in TICKERS}
+    single_alpha = {t: calc.compute_alpha(single[t], NEWS) for t in TICKERS}
+    single_levels = {t: RiskManager.compute_levels(single[t].close, single[t].atr20) for t in TICKERS}
+    looped = time.perf_counter() - t0
+    print(f"{len(TICKERS)} tickers: panel {batched:.2f}s (incl. cache load), per-ticker {looped:.2f}s")
+
+    from_panel = engine.features_from_panel(features)
+    bad = [(t, k) for t in TICKERS for k, v in single[t].to_dict().items()
+           if not close_enough(v, getattr(from_panel[t], k))]
+    if bad:
+        failures += 1
+        print(f"❌ {len(bad)} feature mismatches, e.g. {bad[:5]}")
+
+    bad = [(t, k) for t in TICKERS for k, v in single_alpha[t][1].items()
+           if not close_enough(v, alpha.at[t, k])]
+    bad += [t for t in TICKERS if not close_enough(single_alpha[t][0], alpha.at[t, 'alpha'])]
+    if bad:
+        failures += 1
+        print(f"❌ {len(bad)} alpha mismatches, e.g. {bad[:5]}")
+
+    bad = [(t, k) for t in TICKERS for k, v in single_levels[t].items()
+           if not close_enough(float(v), float(levels.at[t, k]))]
+    if bad:
+        failures += 1
+        print(f"❌ {len(bad)} level mismatches, e.g. {bad[:5]}")
+
+    if failures:
+        return 1
+    print("✅ Panel features, alpha and levels match the per-ticker path")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
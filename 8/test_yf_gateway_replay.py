@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Offline record/replay test for the shared yf_gateway
+
+Records synthetic daily bars and .info for 30 tickers into a temp cassette
+through a RecordingBackend, then replays them behind a gateway whose backend
+counts calls and sleeps 50ms per call (like a slow upstream). Checks that:
+  - 30 concurrent Ticker(t).history() calls are merged into batched calls
+  - concurrent .info requests for one symbol share a single upstream call
+  - a second round is served from memory, and a fresh gateway from disk
+  - download() returns yfinance-shaped columns for the replayed data
+  - exit_intelligence_analyzer.get_stock_data runs on the replayed bars
+
+Usage:
+    python3 test_yf_gateway_replay.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import yf_gateway as yf
+from yf_gateway import DataGateway, RecordingBackend, ReplayBackend, ResponseStore, history_params
+
+TICKERS = [f"SYN{i:02d}.NS" for i in range(30)]
+LATENCY = 0.05
+
+
+class SyntheticBackend:
+    """Deterministic bars and info in the shape yfinance returns them."""
+
+    rate_limited = False
+
+    def history_many(self, symbols, params):
+        out = {}
+        for n, sym in enumerate(symbols):
+            idx = pd.date_range("2025-01-01", periods=130, freq="B", tz="Asia/Kolkata", name="Date")
+            rng = np.random.default_rng(sum(map(ord, sym)))
+            close = 100 + n + np.cumsum(rng.normal(0, 1, len(idx)))
+            out[sym] = pd.DataFrame({"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close,
+                                     "Volume": rng.integers(1_000, 50_000, len(idx)),
+                                     "Dividends": 0.0, "Stock Splits": 0.0}, index=idx)
+        return out
+
+    def info(self, symbol):
+        return {"symbol": symbol, "sector": "Technology", "marketCap": 10 ** 10}
+
+    def statement(self, symbol, name):
+        return pd.DataFrame()
+
+
+class CountingReplay(ReplayBackend):
+    def __init__(self, cassette):
+        super().__init__(cassette)
+        self.calls = {"history_many": 0, "info": 0}
+        self._count = threading.Lock()
+
+    def _tick(self, name):
+        with self._count:
+            self.calls[name] += 1
+        time.sleep(LATENCY)
+
+    def history_many(self, symbols, params):
+        self._tick("history_many")
+        return super().history_many(symbols, params)
+
+    def info(self, symbol):
+        self._tick("info")
+        return super().info(symbol)
+
+
+def main() -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette = ResponseStore(os.path.join(tmp, "cassette.db"))
+        recorder = RecordingBackend(SyntheticBackend(), cassette)
+        for period in ("6mo", "5d"):
+            recorder.history_many(TICKERS, history_params(period))
+        recorder.history_many(["SYN00.NS"], history_params("6mo", auto_adjust=False))
+        recorder.info("SYN00.NS")
+
+        backend = CountingReplay(cassette)
+        db_path = os.path.join(tmp, "gateway.db")
+        yf.set_gateway(DataGateway(backend, db_path=db_path, batch_window=0.05))
+        try:
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=len(TICKERS)) as pool:
+                frames = list(pool.map(lambda t: yf.Ticker(t).history(period="6mo"), TICKERS))
+                infos = list(pool.map(lambda _: yf.Ticker("SYN00.NS").info, range(10)))
+            first = time.perf_counter() - t0
+            print(f"first round {first:.2f}s, backend calls {backend.calls}, stats {yf.get_gateway().stats}")
+
+            if any(df.empty or len(df) != 130 for df in frames):
+                failures += 1
+                print("❌ Replayed history is missing bars")
+            if backend.calls["history_many"] > 2:
+                failures += 1
+                print(f"❌ {len(TICKERS)} concurrent history calls took {backend.calls['history_many']} upstream calls")
+            if backend.calls["info"] != 1 or any(i.get("sector") != "Technology" for i in infos):
+                failures += 1
+                print(f"❌ Concurrent .info made {backend.calls['info']} upstream calls")
+
+            before = dict(backend.calls)
+            t0 = time.perf_counter()
+            again = [yf.Ticker(t).history(period="6mo") for t in TICKERS]
+            print(f"memory round {(time.perf_counter() - t0) * 1000:.1f}ms")
+            if backend.calls != before or not all(a.equals(b) for a, b in zip(frames, again)):
+                failures += 1
+                print("❌ Second round was not served from memory")
+
+            yf.set_gateway(DataGateway(backend, db_path=db_path, batch_window=0.05))
+            from_disk = yf.Ticker("SYN05.NS").history(period="6mo")
+            if backend.calls != before or not from_disk.equals(frames[5]):
+                failures += 1
+                print("❌ New gateway did not serve the disk cache")
+
+            data = yf.download(TICKERS[:3], period="5d")
+            if not isinstance(data.columns, pd.MultiIndex) or list(data["Close"].columns) != TICKERS[:3] \
+                    or "Dividends" in data.columns.get_level_values(0) or data.index.tz is not None:
+                failures += 1
+                print(f"❌ download() shape differs from yfinance: {list(data.columns)[:6]}")
+            single = yf.download("SYN00.NS", period="6mo", auto_adjust=False, multi_level_index=False)
+            if list(single.columns) != ["Close", "High", "Low", "Open", "Volume"]:
+                failures += 1
+                print(f"❌ Single-ticker download columns {list(single.columns)}")
+
+            from exit_intelligence_analyzer import get_stock_data
+            stock = get_stock_data("SYN03")
+            if stock is None or len(stock) != 130:
+                failures += 1
+                print("❌ exit_intelligence_analyzer.get_stock_data did not read the replayed bars")
+        finally:
+            yf.set_gateway(None)
+
+    if failures:
+        return 1
+    print("✅ Replay gateway batches, coalesces and caches as expected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
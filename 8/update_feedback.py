@@ -122,11 +122,12 @@ def run_learning_algorithm():
     tracker = FeedbackLoopTracker()
 
     print("\n🧠 Running Learning Algorithm...")
-    print(f"   Performance records: {len(tracker.performance)}")
+    performance_count = tracker.performance_count()
+    print(f"   Performance records: {performance_count}")
 
-    if len(tracker.performance) < 3:
+    if performance_count < 3:
         print(f"\n⚠️  Need at least 3 performance records to learn.")
-        print(f"   Current records: {len(tracker.performance)}")
+        print(f"   Current records: {performance_count}")
         print("\n   To generate more data:")
         print("   1. Run analysis to create predictions")
         print("   2. Wait 3-24 hours")
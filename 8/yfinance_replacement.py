@@ -31,25 +31,10 @@ import re
 import json
 import hashlib
 from pathlib import Path
-from threading import Lock
 import random
 
-# Rate limiter for polite scraping
-class RateLimiter:
-    def __init__(self, min_interval: float = 2.0):
-        self.min_interval = min_interval
-        self.last_request_time = {}
-        self.lock = Lock()
+from rate_limiter import get_bucket, provider_for_host
 
-    def wait(self, key: str = 'default'):
-        with self.lock:
-            elapsed = time.time() - self.last_request_time.get(key, 0)
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed + random.uniform(0, 0.5))
-            self.last_request_time[key] = time.time()
-
-# Global rate limiter
-_rate_limiter = RateLimiter(min_interval=2.0)
 
 # Cache directory
 CACHE_DIR = Path('.yfinance_replacement_cache')
@@ -91,12 +76,14 @@ def _fetch_url(url: str, domain_key: str) -> Optional[requests.Response]:
         response.status_code = 200
         return response
 
-    # Rate limit per domain
-    _rate_limiter.wait(domain_key)
+    # Shared per-provider token bucket
+    bucket = get_bucket(provider_for_host(domain_key))
+    bucket.acquire()
 
     headers = {'User-Agent': random.choice(USER_AGENTS)}
     try:
         response = requests.get(url, headers=headers, timeout=15)
+        bucket.report(response.status_code, response.headers.get('Retry-After'))
         if response.status_code == 200:
             _set_cache(url, response.text)
         return response
@@ -233,10 +220,13 @@ class Ticker:
 
         # Get homepage first to set cookies
         try:
+            get_bucket('nse').acquire()
             session.get('https://www.nseindia.com', timeout=10)
             time.sleep(1)  # Wait for cookies
 
+            get_bucket('nse').acquire()
             response = session.get(url, timeout=10)
+            get_bucket('nse').report(response.status_code, response.headers.get('Retry-After'))
             if response.status_code == 200:
                 data = response.json()
                 price = data.get('priceInfo', {}).get('lastPrice')
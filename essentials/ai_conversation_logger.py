@@ -2,15 +2,132 @@
 """
 AI Conversation Logger for Quality Assurance
 Logs all AI requests and responses for later review and quality improvement
+
+Records are handed to a background writer thread, so log_conversation() does
+not block the AI call. AI_LOG_SINK selects where they go:
+  jsonl  (default) append to date-rotated conversations_YYYYMMDD.jsonl
+         segments (plus .txt segments when AI_LOG_FORMAT is text/both);
+         segments of previous days are gzip-compressed
+  sqlite full records in the conversations table of conversations.db
+  files  one .json/.txt file per conversation
+
+For jsonl and sqlite, conversations.db indexes every record by id, time,
+provider and error, so log_summary(), find_conversations() and
+get_conversation() query the index instead of scanning the log directory.
+iter_logged_conversations() reads every record back whichever sink wrote it
+(ai_log_helper.sh list/view/summary use it).
 """
 
 import os
+import sys
 import json
+import gzip
+import atexit
+import queue
+import shutil
+import sqlite3
 import datetime
+import threading
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 import hashlib
 
+SINKS = ('jsonl', 'sqlite', 'files')
+INDEX_DB = 'conversations.db'
+SEGMENT_PREFIX = 'conversations_'
+QUEUE_MAX = 10000  # Records waiting for the writer; beyond this log_conversation blocks
+
+
+class ConversationIndex:
+    """SQLite index of logged conversations (and the full records for the sqlite sink)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        con = self._conn()
+        con.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS conversations (
+                conversation_id TEXT PRIMARY KEY,
+                timestamp TEXT,
+                provider TEXT,
+                has_error INTEGER,
+                prompt_length INTEGER,
+                response_length INTEGER,
+                segment TEXT,
+                offset INTEGER,
+                length INTEGER,
+                data TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_conversations_provider ON conversations (provider, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations (timestamp);
+            CREATE INDEX IF NOT EXISTS idx_conversations_segment ON conversations (segment);
+            """
+        )
+        con.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        con = getattr(self._local, 'con', None)
+        if con is None or getattr(self._local, 'pid', None) != os.getpid():
+            con = sqlite3.connect(self.path, timeout=30)
+            con.execute('PRAGMA journal_mode=WAL')
+            con.row_factory = sqlite3.Row
+            self._local.con, self._local.pid = con, os.getpid()
+        return con
+
+    def add(self, rows: List[tuple]):
+        con = self._conn()
+        con.executemany(
+            "INSERT OR REPLACE INTO conversations (conversation_id, timestamp, provider, has_error, "
+            "prompt_length, response_length, segment, offset, length, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        con.commit()
+
+    def rename_segment(self, old: str, new: str):
+        con = self._conn()
+        con.execute("UPDATE conversations SET segment=? WHERE segment=?", (new, old))
+        con.commit()
+
+    def summary(self) -> Dict[str, Any]:
+        con = self._conn()
+        total, errors, first, last = con.execute(
+            "SELECT COUNT(*), COALESCE(SUM(has_error), 0), MIN(timestamp), MAX(timestamp) FROM conversations"
+        ).fetchone()
+        by_provider = dict(con.execute(
+            "SELECT provider, COUNT(*) FROM conversations GROUP BY provider ORDER BY COUNT(*) DESC"
+        ).fetchall())
+        return {'total': total, 'errors': errors, 'first': first, 'last': last, 'by_provider': by_provider}
+
+    def find(self, provider: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+             errors_only: bool = False, limit: int = 100) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if provider:
+            clauses.append("provider=?")
+            params.append(provider)
+        if since:
+            clauses.append("timestamp>=?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp<?")
+            params.append(until)
+        if errors_only:
+            clauses.append("has_error=1")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            "SELECT conversation_id, timestamp, provider, has_error, prompt_length, response_length, segment "
+            f"FROM conversations {where} ORDER BY timestamp DESC LIMIT ?", [*params, limit]
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get(self, conversation_id: str) -> Optional[sqlite3.Row]:
+        con = self._conn()
+        row = con.execute("SELECT * FROM conversations WHERE conversation_id=?", (conversation_id,)).fetchone()
+        if row is None and len(conversation_id) < 64:
+            row = con.execute("SELECT * FROM conversations WHERE conversation_id LIKE ? LIMIT 1",
+                              (conversation_id + '%',)).fetchone()
+        return row
+
 
 class AIConversationLogger:
     """Logs AI conversations (requests and responses) for QA purposes"""
@@ -20,12 +137,24 @@ class AIConversationLogger:
         self.enabled = os.getenv('AI_LOG_ENABLED', 'false').lower() in ['true', '1', 'yes']
         self.log_dir = os.getenv('AI_LOG_DIR', './logs/ai_conversations')
         self.log_format = os.getenv('AI_LOG_FORMAT', 'both')  # json, text, both
+        self.sink = os.getenv('AI_LOG_SINK', 'jsonl').lower()  # jsonl, sqlite, files
         self.max_prompt_length = int(os.getenv('AI_LOG_MAX_PROMPT', '5000'))
         self.max_response_length = int(os.getenv('AI_LOG_MAX_RESPONSE', '10000'))
+        if self.sink not in SINKS:
+            print(f"⚠️  Unknown AI_LOG_SINK '{self.sink}', using jsonl")
+            self.sink = 'jsonl'
+
+        self.index: Optional[ConversationIndex] = None
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._current_day: Optional[str] = None
 
         # Create log directory if logging is enabled
         if self.enabled:
             Path(self.log_dir).mkdir(parents=True, exist_ok=True)
+            if self.sink != 'files':
+                self.index = ConversationIndex(os.path.join(self.log_dir, INDEX_DB))
 
     def log_conversation(
         self,
@@ -67,6 +196,13 @@ class AIConversationLogger:
             'response_length': len(response) if response else 0,
         }
 
+        if self.sink != 'files':
+            self._start_writer()
+            self._queue.put(conversation_data)
+            if self.sink == 'sqlite':
+                return self.index.path
+            return self._segment_path(timestamp.strftime('%Y%m%d'), '.jsonl')
+
         # Generate file paths
         date_prefix = timestamp.strftime('%Y%m%d_%H%M%S')
         base_filename = f"{date_prefix}_{provider}_{conversation_id[:8]}"
@@ -84,11 +220,158 @@ class AIConversationLogger:
         if self.log_format in ['text', 'both']:
             text_path = os.path.join(self.log_dir, f"{base_filename}.txt")
             with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(self._format_text_log(conversation_data))
+                f.write(format_text_log(conversation_data))
             log_files.append(text_path)
 
         return log_files[0] if log_files else None
 
+    def _start_writer(self):
+        """Start the background writer thread on first use (and again after a fork)"""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            self._queue = queue.Queue(maxsize=QUEUE_MAX)
+            self._writer = threading.Thread(target=self._writer_loop, name='ai-log-writer', daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+
+    def _writer_loop(self):
+        if self.sink == 'jsonl':
+            self._compress_closed_segments()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 500:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self.sink == 'sqlite':
+                    self._write_sqlite(batch)
+                else:
+                    self._write_jsonl(batch)
+            except Exception as e:
+                print(f"⚠️  AI conversation log write failed: {e}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued record is written"""
+        if self._queue is not None and self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def _index_row(self, data: Dict, segment: Optional[str], offset: Optional[int],
+                   length: Optional[int], body: Optional[str]) -> tuple:
+        return (data['conversation_id'], data['timestamp'], data['provider'], 1 if data['error'] else 0,
+                data['prompt_length'], data['response_length'], segment, offset, length, body)
+
+    def _write_sqlite(self, batch: List[Dict]):
+        self.index.add([self._index_row(d, None, None, None, json.dumps(d, ensure_ascii=False)) for d in batch])
+
+    def _segment_path(self, day: str, suffix: str) -> str:
+        return os.path.join(self.log_dir, f"{SEGMENT_PREFIX}{day}{suffix}")
+
+    def _write_jsonl(self, batch: List[Dict]):
+        by_day: Dict[str, List[Dict]] = {}
+        for data in batch:
+            by_day.setdefault(data['timestamp'][:10].replace('-', ''), []).append(data)
+
+        rows = []
+        for day, records in by_day.items():
+            lines = [(json.dumps(d, ensure_ascii=False) + '\n').encode('utf-8') for d in records]
+            payload = b''.join(lines)
+            segment = os.path.basename(self._segment_path(day, '.jsonl'))
+            # One O_APPEND write per batch: offsets stay valid with several writer processes
+            fd = os.open(self._segment_path(day, '.jsonl'), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, payload)
+                offset = os.lseek(fd, 0, os.SEEK_CUR) - len(payload)
+            finally:
+                os.close(fd)
+            for data, line in zip(records, lines):
+                rows.append(self._index_row(data, segment, offset, len(line), None))
+                offset += len(line)
+
+            if self.log_format in ['text', 'both']:
+                with open(self._segment_path(day, '.txt'), 'a', encoding='utf-8') as f:
+                    f.write(''.join(format_text_log(d) + '\n\n' for d in records))
+        self.index.add(rows)
+
+        today = datetime.date.today().strftime('%Y%m%d')
+        if self._current_day != today:
+            self._current_day = today
+            self._compress_closed_segments()
+
+    def _compress_closed_segments(self):
+        """gzip segments of previous days and point the index at the .gz files"""
+        today = datetime.date.today().strftime('%Y%m%d')
+        for path in sorted(Path(self.log_dir).glob(f"{SEGMENT_PREFIX}*")):
+            if path.suffix not in ('.jsonl', '.txt') or path.stem[len(SEGMENT_PREFIX):] >= today:
+                continue
+            gz_path = path.with_name(path.name + '.gz')
+            tmp_path = path.with_name(path.name + '.gz.tmp')
+            try:
+                with open(path, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_path, gz_path)
+                if path.suffix == '.jsonl':
+                    self.index.rename_segment(path.name, gz_path.name)
+                path.unlink()
+            except OSError as e:
+                print(f"⚠️  Could not compress {path.name}: {e}", file=sys.stderr)
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Full record of a conversation (id or id prefix) via the index"""
+        if not self.enabled or self.index is None:
+            return None
+        self.flush()
+        row = self.index.get(conversation_id)
+        if row is None:
+            return None
+        if row['data'] is not None:
+            return json.loads(row['data'])
+        path = os.path.join(self.log_dir, row['segment'])
+        if not os.path.exists(path) and os.path.exists(path + '.gz'):
+            path += '.gz'  # compressed by another process since the lookup
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            f.seek(row['offset'])
+            return json.loads(f.read(row['length']))
+
+    def find_conversations(self, provider: Optional[str] = None, since: Optional[str] = None,
+                           until: Optional[str] = None, errors_only: bool = False,
+                           limit: int = 100) -> List[Dict[str, Any]]:
+        """Index rows (newest first) matching provider / ISO time range / errors"""
+        if not self.enabled or self.index is None:
+            return []
+        self.flush()
+        return self.index.find(provider, since, until, errors_only, limit)
+
+    def import_legacy_files(self) -> int:
+        """Move per-conversation .json/.txt files into the configured sink"""
+        if not self.enabled or self.index is None:
+            return 0
+        imported = []
+        for json_path in sorted(Path(self.log_dir).glob('*.json')):
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if 'conversation_id' not in data:
+                    continue
+            except Exception:
+                continue
+            self._start_writer()
+            self._queue.put(data)
+            imported.append(json_path)
+        self.flush()
+        for json_path in imported:
+            json_path.unlink()
+            json_path.with_suffix('.txt').unlink(missing_ok=True)
+        return len(imported)
+
     def _generate_conversation_id(self, provider: str, timestamp: datetime.datetime) -> str:
         """Generate a unique conversation ID"""
         unique_string = f"{provider}_{timestamp.isoformat()}_{os.getpid()}"
@@ -100,62 +383,26 @@ class AIConversationLogger:
             return text
         return text[:max_length] + f"\n\n... [TRUNCATED: {len(text) - max_length} more characters]"
 
-    def _format_text_log(self, data: Dict) -> str:
-        """Format conversation data as human-readable text"""
-        lines = [
-            "=" * 80,
-            f"AI CONVERSATION LOG",
-            "=" * 80,
-            f"Conversation ID: {data['conversation_id']}",
-            f"Timestamp: {data['timestamp']}",
-            f"Provider: {data['provider']}",
-            f"Prompt Length: {data['prompt_length']} chars",
-            f"Response Length: {data['response_length']} chars",
-            "",
-        ]
-
-        # Add metadata
-        if data['metadata']:
-            lines.append("METADATA:")
-            for key, value in data['metadata'].items():
-                lines.append(f"  {key}: {value}")
-            lines.append("")
-
-        # Add prompt
-        lines.extend([
-            "-" * 80,
-            "PROMPT:",
-            "-" * 80,
-            data['prompt'],
-            "",
-        ])
-
-        # Add response or error
-        if data['error']:
-            lines.extend([
-                "-" * 80,
-                "ERROR:",
-                "-" * 80,
-                data['error'],
-                "",
-            ])
-        elif data['response']:
-            lines.extend([
-                "-" * 80,
-                "RESPONSE:",
-                "-" * 80,
-                data['response'],
-                "",
-            ])
-
-        lines.append("=" * 80)
-        return "\n".join(lines)
-
     def log_summary(self) -> Dict[str, Any]:
         """Get a summary of logged conversations"""
         if not self.enabled or not os.path.exists(self.log_dir):
             return {'enabled': False}
 
+        if self.index is not None:
+            self.flush()
+            stats = self.index.summary()
+            return {
+                'enabled': True,
+                'log_directory': self.log_dir,
+                'total_conversations': stats['total'],
+                'log_format': self.log_format,
+                'sink': self.sink,
+                'errors': stats['errors'],
+                'first': stats['first'],
+                'last': stats['last'],
+                'by_provider': stats['by_provider'],
+            }
+
         log_files = list(Path(self.log_dir).glob('*.json'))
 
         summary = {
@@ -180,6 +427,93 @@ class AIConversationLogger:
         return summary
 
 
+def format_text_log(data: Dict) -> str:
+    """Format conversation data as human-readable text"""
+    lines = [
+        "=" * 80,
+        f"AI CONVERSATION LOG",
+        "=" * 80,
+        f"Conversation ID: {data['conversation_id']}",
+        f"Timestamp: {data['timestamp']}",
+        f"Provider: {data['provider']}",
+        f"Prompt Length: {data['prompt_length']} chars",
+        f"Response Length: {data['response_length']} chars",
+        "",
+    ]
+
+    # Add metadata
+    if data['metadata']:
+        lines.append("METADATA:")
+        for key, value in data['metadata'].items():
+            lines.append(f"  {key}: {value}")
+        lines.append("")
+
+    # Add prompt
+    lines.extend([
+        "-" * 80,
+        "PROMPT:",
+        "-" * 80,
+        data['prompt'],
+        "",
+    ])
+
+    # Add response or error
+    if data['error']:
+        lines.extend([
+            "-" * 80,
+            "ERROR:",
+            "-" * 80,
+            data['error'],
+            "",
+        ])
+    elif data['response']:
+        lines.extend([
+            "-" * 80,
+            "RESPONSE:",
+            "-" * 80,
+            data['response'],
+            "",
+        ])
+
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+def iter_logged_conversations(log_dir: str) -> Iterator[Dict[str, Any]]:
+    """Every record in log_dir, whichever sink wrote it: per-conversation .json
+    files, JSONL segments (plain or gzip-compressed) and sqlite-sink rows."""
+    root = Path(log_dir)
+    for path in sorted(root.glob('*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        if isinstance(data, dict) and 'conversation_id' in data:
+            yield data
+    for path in sorted(root.glob(f"{SEGMENT_PREFIX}*.jsonl*")):
+        if not path.name.endswith(('.jsonl', '.jsonl.gz')):
+            continue
+        opener = gzip.open if path.name.endswith('.gz') else open
+        try:
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # partial line of a batch still being written
+        except OSError:
+            continue
+    db_path = root / INDEX_DB
+    if db_path.exists():
+        con = sqlite3.connect(str(db_path), timeout=30)
+        try:
+            for (body,) in con.execute("SELECT data FROM conversations WHERE data IS NOT NULL ORDER BY timestamp"):
+                yield json.loads(body)
+        finally:
+            con.close()
+
+
 # Global logger instance
 _logger_instance = None
 
@@ -226,10 +560,13 @@ if __name__ == '__main__':
     if not logger.enabled:
         print("⚠️  Logging is DISABLED")
         print("To enable, set: export AI_LOG_ENABLED=true")
+    elif '--import-legacy' in sys.argv:
+        print(f"Imported {logger.import_legacy_files()} per-file conversations into the {logger.sink} sink")
     else:
         print("✅ Logging is ENABLED")
         print(f"Log directory: {logger.log_dir}")
         print(f"Log format: {logger.log_format}")
+        print(f"Log sink: {logger.sink}")
 
         # Log a test conversation
         test_prompt = "Analyze this stock: RELIANCE - Reports Q1 profit of ₹5000 crores"
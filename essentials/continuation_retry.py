@@ -5,7 +5,7 @@ Retry price/volume continuation metrics for the latest AI Top 10.
 Steps:
  1) Read latest outputs/ai_adjusted_top*.csv
  2) Take top 10 tickers
- 3) Attempt OHLCV fetch via yfinance with backoff (up to ~12 minutes)
+ 3) Attempt OHLCV fetch (shared ohlcv_cache, batched yfinance) with backoff (up to ~12 minutes)
  4) Print ranked continuation table by price-change% * log1p(vol_ratio_20D)
 """
 
@@ -39,11 +39,11 @@ def read_top10(path: str) -> List[str]:
 
 
 def fetch_continuation(tickers: List[str]) -> List[Dict[str, object]]:
-    import yfinance as yf
-    import pandas as pd  # noqa: F401
     import math
+    from ohlcv_cache import get_ohlcv_cache
     syms = [t if t.endswith('.NS') else f"{t}.NS" for t in tickers]
-    data = yf.download(syms, period='2mo', interval='1d', progress=False, auto_adjust=False, group_by='ticker', threads=False)
+    # Shared bar cache: retries within the TTL only download symbols still missing
+    data = get_ohlcv_cache().get_many(syms, lookback_days=62, max_age_hours=0.25)
     results: List[Dict[str, object]] = []
     for yf_sym, t in zip(syms, tickers):
         try:
@@ -77,10 +77,10 @@ except Exception:
     except Exception:
         pass
 
-# Try to import yfinance for real-time data
+# Market data through the shared yfinance-compatible gateway (cached, rate-limited)
 try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
+    import yf_gateway as yf
+    YFINANCE_AVAILABLE = yf.available()
 except ImportError:
     YFINANCE_AVAILABLE = False
     print("⚠️  yfinance not available, technical analysis will be limited", file=sys.stderr)
@@ -983,6 +983,13 @@ def process_exit_assessment(
         hdr = f"{'Ticker':<9} {'Score':<5} {'Decision':<12} {'Tech':<5} {'News':<5} {'Fund':<5} {'Lqd':<4} {'Conf':<5} {'Key Signals':<34} {'Action'}"
         print(hdr)
 
+    # One batched history load for the list; get_stock_data then hits the gateway cache
+    if YFINANCE_AVAILABLE and PANDAS_AVAILABLE:
+        try:
+            yf.prefetch_history([t if '.' in t else f"{t}.NS" for t in tickers], period="6mo")
+        except Exception:
+            pass
+
     for i, ticker in enumerate(tickers, 1):
         if not quiet:
             print(f"\n[{i}/{len(tickers)}] Processing {ticker}...", file=sys.stderr)
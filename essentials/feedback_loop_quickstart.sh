@@ -64,13 +64,11 @@ update_performance() {
     # Show active predictions
     echo "Active predictions:"
     python3 -c "
-import json, os
-if os.path.exists('learning/predictions_tracking.json'):
-    with open('learning/predictions_tracking.json', 'r') as f:
-        preds = json.load(f)
-    for ticker, pred in preds.items():
-        print(f'  • {ticker}: {pred[\"recommendation\"]} @ ₹{pred[\"initial_price\"]}')
-else:
+from realtime_feedback_loop import FeedbackLoopTracker
+preds = FeedbackLoopTracker().predictions
+for ticker, pred in preds.items():
+    print(f'  • {ticker}: {pred[\"recommendation\"]} @ ₹{pred[\"initial_price\"]}')
+if not preds:
     print('  (none)')
 "
 
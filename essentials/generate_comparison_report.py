@@ -38,9 +38,9 @@ def rerank_with_enhanced_scoring(results: List[Dict]) -> List[Dict]:
 
     vsm = VolumeAndSectorMomentum()
 
-    # Fetch sector momentum once for all stocks
-    print("\n📊 Fetching sector momentum data...")
-    vsm.sector_cache = vsm.fetch_sector_momentum()
+    # Fetch sector momentum and volume for all stocks in one download
+    print("\n📊 Fetching sector momentum and volume data...")
+    vsm.fetch_batch([row.get('ticker', '').strip().upper() for row in results])
 
     enhanced_results = []
 
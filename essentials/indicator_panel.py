@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Cross-sectional indicator engine
+
+Computes the screener's indicator set for many tickers in one pass over a
+(bars x tickers) float64 panel: Wilder RSI, Bollinger position, Wilder ATR,
+EMAs, MACD, ADX and volume ratio. Every function takes 2-D arrays and runs
+column-wise, so the per-call pandas overhead is paid once per batch instead
+of once per ticker.
+
+bar_panel() right-aligns each ticker's own bar sequence (last bar on the last
+row, leading NaN padding), which keeps every column numerically identical to
+running the single-series functions on that ticker's frame.
+
+Usage:
+    from indicator_panel import IndicatorPanel
+    panel = IndicatorPanel.from_frames({"TCS.NS": df_tcs, "INFY.NS": df_infy})
+    panel.latest("TCS.NS")            # same keys as VectorizedIndicators
+    panel.latest_all()                # {ticker: indicator dict}
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MIN_BARS = 50
+
+
+# -----------------------------------------------------------------------------
+# Panel construction
+# -----------------------------------------------------------------------------
+
+def _price_columns(df: pd.DataFrame, prefer_capped: bool = True) -> Dict[str, pd.Series]:
+    """Same column choice as get_quality_safe_price_data (capped close/volume when present)."""
+    if prefer_capped and "Close_Capped" in df.columns:
+        close = df["Close_Capped"]
+        returns = df["PctChange_Capped"] if "PctChange_Capped" in df.columns else close.pct_change()
+        source = "quality_capped"
+    else:
+        close = df["Close"]
+        returns = close.pct_change()
+        source = "raw"
+    volume = df["Volume_Capped"] if prefer_capped and "Volume_Capped" in df.columns else df["Volume"]
+    return {"close": close, "returns": returns, "volume": volume, "source": source,
+            "high": df["High"], "low": df["Low"], "raw_close": df["Close"]}
+
+
+def bar_panel(frames: Dict[str, pd.DataFrame], prefer_capped: bool = True,
+              max_bars: Optional[int] = None) -> Dict[str, object]:
+    """Right-aligned (bars x tickers) arrays for close/high/low/volume/returns."""
+    symbols = [s for s, df in frames.items() if df is not None and not df.empty]
+    n = max((len(frames[s]) for s in symbols), default=0)
+    if max_bars:
+        n = min(n, max_bars)
+    names = ("close", "raw_close", "high", "low", "volume", "returns")
+    arrays = {k: np.full((n, len(symbols)), np.nan) for k in names}
+    lengths = np.zeros(len(symbols), dtype=int)
+    sources: List[str] = []
+    for j, sym in enumerate(symbols):
+        cols = _price_columns(frames[sym], prefer_capped)
+        sources.append(cols["source"])
+        m = min(len(frames[sym]), n)
+        lengths[j] = m
+        for k in names:
+            arrays[k][n - m:, j] = np.asarray(cols[k], dtype="float64")[-m:]
+    return {"symbols": symbols, "lengths": lengths, "sources": sources, **arrays}
+
+
+# -----------------------------------------------------------------------------
+# Column-wise indicators
+# -----------------------------------------------------------------------------
+
+def wilder_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    c = pd.DataFrame(close)
+    delta = c.diff()
+    # First bar of each ticker counts as a zero change (as in rsi14); padding stays NaN
+    gains = delta.where(delta > 0, 0.0).where(c.notna())
+    losses = (-delta).where(delta < 0, 0.0).where(c.notna())
+    avg_g = gains.ewm(alpha=1.0 / period, adjust=False).mean()
+    avg_l = losses.ewm(alpha=1.0 / period, adjust=False).mean()
+    return (100 - 100 / (1 + avg_g / avg_l)).fillna(50.0).to_numpy()
+
+
+def bb_position(close: np.ndarray, period: int = 20, std_dev: float = 2.0) -> np.ndarray:
+    c = pd.DataFrame(close)
+    sma = c.rolling(period, min_periods=period).mean()
+    std = c.rolling(period, min_periods=period).std(ddof=0)
+    upper, lower = sma + std_dev * std, sma - std_dev * std
+    return ((c - lower) / (upper - lower) * 100).clip(0, 100).fillna(50.0).to_numpy()
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    return np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+
+
+def average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    tr = pd.DataFrame(true_range(high, low, close))
+    return tr.ewm(alpha=1.0 / period, adjust=False).mean().fillna(0.0).to_numpy()
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    return pd.DataFrame(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    line = ema(close, fast) - ema(close, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder ADX (0-100)."""
+    up = np.vstack([np.full((1, high.shape[1]), np.nan), np.diff(high, axis=0)])
+    down = np.vstack([np.full((1, low.shape[1]), np.nan), -np.diff(low, axis=0)])
+    with np.errstate(invalid="ignore"):
+        plus_dm = np.where((up > down) & (up > 0), up, np.where(np.isnan(up), np.nan, 0.0))
+        minus_dm = np.where((down > up) & (down > 0), down, np.where(np.isnan(down), np.nan, 0.0))
+    alpha = 1.0 / period
+    smooth = lambda a: pd.DataFrame(a).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    atr = smooth(true_range(high, low, close))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        plus_di = 100 * smooth(plus_dm) / atr
+        minus_di = 100 * smooth(minus_dm) / atr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return np.nan_to_num(smooth(dx), nan=0.0)
+
+
+def volume_ratio(volume: np.ndarray, window: int = 50, min_periods: int = 20) -> np.ndarray:
+    v = pd.DataFrame(volume)
+    return (v / v.rolling(window, min_periods=min_periods).mean()).fillna(1.0).to_numpy()
+
+
+# -----------------------------------------------------------------------------
+# Engine
+# -----------------------------------------------------------------------------
+
+def default_indicators() -> dict:
+    return {
+        'rsi': 50.0, 'bb_position': 50.0, 'atr': 0.0,
+        'ema20': 0.0, 'ema50': 0.0, 'ema_slope': 0.0, 'volume_ratio': 1.0,
+        'rr_ratio': 1.0, 'support_level': 0.0, 'resistance_level': 0.0,
+        'daily_return': 0.0, 'volatility': 0.0,
+        'macd': 0.0, 'macd_signal': 0.0, 'macd_hist': 0.0, 'adx': 0.0,
+        'data_source': 'insufficient_data', 'close_price': 0.0,
+        'passed_quality_filters': False, 'opportunity_score': 0.0, 'tier_classification': 'Rejected',
+    }
+
+
+class IndicatorPanel:
+    """Full indicator set for a batch of tickers, computed once.
+
+    Series are kept as (bars x tickers) arrays (rsi, bb_pos, atr, ema20, ema50,
+    macd, macd_signal, macd_hist, adx, volume_ratio) for callers that want
+    history; latest()/latest_all() give the per-ticker dicts the scoring code
+    consumes.
+    """
+
+    def __init__(self, data: Dict[str, object]):
+        self.symbols: List[str] = list(data["symbols"])
+        self._col = {s: j for j, s in enumerate(self.symbols)}
+        self.lengths = data["lengths"]
+        self.sources = data["sources"]
+        close, high, low = data["close"], data["high"], data["low"]
+        self.close, self.high, self.low, self.returns = close, high, low, data["returns"]
+        self.rsi = wilder_rsi(close)
+        self.bb_pos = bb_position(close)
+        self.atr = average_true_range(high, low, data["raw_close"])
+        self.ema20 = ema(close, 20)
+        self.ema50 = ema(close, 50)
+        self.macd, self.macd_signal, self.macd_hist = macd(close)
+        self.adx = adx(high, low, close)
+        self.volume_ratio = volume_ratio(data["volume"])
+        self._latest: Optional[Dict[str, dict]] = None
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], prefer_capped: bool = True,
+                    max_bars: Optional[int] = None) -> "IndicatorPanel":
+        return cls(bar_panel(frames, prefer_capped=prefer_capped, max_bars=max_bars))
+
+    def _compute_latest(self) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        if not self.symbols or self.close.shape[0] == 0:
+            return out
+        close_now = self.close[-1]
+        # EMA20 slope over the last 5 bars (least-squares, x = 0..4)
+        tail = self.ema20[-5:]
+        x = np.arange(tail.shape[0]) - (tail.shape[0] - 1) / 2.0
+        slope = (x[:, None] * tail).sum(axis=0) / (x ** 2).sum() if tail.shape[0] >= 2 else np.zeros(len(self.symbols))
+        resistance = np.percentile(self.high[-20:], 80, axis=0)
+        support = np.percentile(self.low[-20:], 20, axis=0)
+        daily_ret = self.returns[-1] * 100
+        with np.errstate(invalid="ignore"):
+            n_ret = np.sum(~np.isnan(self.returns), axis=0)
+            vol = np.where(n_ret > 1, np.nanstd(self.returns, axis=0, ddof=1) * 100, 0.0)
+
+        for j, sym in enumerate(self.symbols):
+            if self.lengths[j] < MIN_BARS:
+                out[sym] = default_indicators()
+                continue
+            price, sup, res = float(close_now[j]), float(support[j]), float(resistance[j])
+            if sup >= price or res <= price:
+                rr = 1.0
+            else:
+                risk = price - sup
+                rr = (res - price) / risk if risk > 0 else 5.0
+            out[sym] = {
+                'rsi': float(self.rsi[-1, j]),
+                'bb_position': float(self.bb_pos[-1, j]),
+                'atr': float(self.atr[-1, j]),
+                'ema20': float(self.ema20[-1, j]),
+                'ema50': float(self.ema50[-1, j]),
+                'ema_slope': float(slope[j]),
+                'volume_ratio': float(self.volume_ratio[-1, j]),
+                'rr_ratio': float(rr),
+                'support_level': sup,
+                'resistance_level': res,
+                'daily_return': float(daily_ret[j]),
+                'volatility': float(vol[j]),
+                'macd': float(self.macd[-1, j]),
+                'macd_signal': float(self.macd_signal[-1, j]),
+                'macd_hist': float(self.macd_hist[-1, j]),
+                'adx': float(self.adx[-1, j]),
+                'data_source': self.sources[j],
+                'close_price': price,
+            }
+        return out
+
+    def latest_all(self) -> Dict[str, dict]:
+        if self._latest is None:
+            self._latest = self._compute_latest()
+        return self._latest
+
+    def latest(self, symbol: str) -> dict:
+        return self.latest_all().get(symbol) or default_indicators()
+
+    def series(self, symbol: str) -> pd.DataFrame:
+        """Per-ticker view of the indicator history (valid bars only)."""
+        j = self._col[symbol]
+        m = int(self.lengths[j])
+        cols = {
+            'RSI': self.rsi, 'BB_Pos': self.bb_pos, 'ATR': self.atr, 'EMA20': self.ema20, 'EMA50': self.ema50,
+            'MACD': self.macd, 'MACD_Signal': self.macd_signal, 'MACD_Hist': self.macd_hist,
+            'ADX': self.adx, 'Volume_Ratio': self.volume_ratio,
+        }
+        return pd.DataFrame({k: v[-m:, j] for k, v in cols.items()}) if m else pd.DataFrame(columns=list(cols))
@@ -15,6 +15,9 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
+HARVEST_WATERMARK_KEY = "harvest_price_eval_rowid"
+
+
 def _now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
@@ -201,6 +204,54 @@ def ensure_db(db_path: str) -> None:
             cur.execute("CREATE INDEX IF NOT EXISTS ix_assistant_feedback_run ON assistant_feedback(run_id)")
         except Exception:
             pass
+        # Query-path indexes: per-run pick lookups, reliability leaderboards and
+        # the decision_feedback probe used by harvest_price_feedback.
+        for index_sql in [
+            "CREATE INDEX IF NOT EXISTS ix_picks_run_rank ON picks(run_id, rank)",
+            "CREATE INDEX IF NOT EXISTS ix_ticker_stats_reliability ON ticker_stats(reliability_score)",
+            "CREATE INDEX IF NOT EXISTS ix_price_eval_event_ts ON price_eval(event_ts)",
+            "CREATE INDEX IF NOT EXISTS ix_decision_feedback_lookup ON decision_feedback(run_id, ticker, event_ts)",
+        ]:
+            try:
+                cur.execute(index_sql)
+            except Exception:
+                pass
+        # Incremental feedback counters so self-assessment never scans decision_feedback
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS verdict_stats (
+                verdict TEXT PRIMARY KEY,
+                cnt INTEGER DEFAULT 0,
+                sum_actual REAL DEFAULT 0.0,
+                n_actual INTEGER DEFAULT 0,
+                sum_rating REAL DEFAULT 0.0,
+                n_rating INTEGER DEFAULT 0
+            )
+            """
+        )
+        # Key/value watermarks (e.g. last price_eval rowid harvested)
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS learning_state (
+                key TEXT PRIMARY KEY,
+                value INTEGER,
+                updated TEXT
+            )
+            """
+        )
+        cur.execute("SELECT 1 FROM verdict_stats LIMIT 1")
+        if cur.fetchone() is None:
+            # One-time backfill for databases created before verdict_stats existed
+            cur.execute(
+                """
+                INSERT OR IGNORE INTO verdict_stats (verdict, cnt, sum_actual, n_actual, sum_rating, n_rating)
+                SELECT COALESCE(verdict, ''), COUNT(*),
+                       COALESCE(SUM(actual_return), 0.0), COUNT(actual_return),
+                       COALESCE(SUM(rating), 0.0), COUNT(rating)
+                FROM decision_feedback
+                GROUP BY COALESCE(verdict, '')
+                """
+            )
         con.commit()
     finally:
         con.close()
@@ -360,6 +411,45 @@ def _upsert_event(cur: sqlite3.Cursor, event: str, adj: float, amt_cr: float, ts
     )
 
 
+def _upsert_verdict(cur: sqlite3.Cursor, verdict: str, actual: Optional[float], rating: Optional[float]) -> None:
+    cur.execute(
+        """
+        INSERT INTO verdict_stats (verdict, cnt, sum_actual, n_actual, sum_rating, n_rating)
+        VALUES (?, 1, ?, ?, ?, ?)
+        ON CONFLICT(verdict) DO UPDATE SET
+            cnt = verdict_stats.cnt + 1,
+            sum_actual = verdict_stats.sum_actual + excluded.sum_actual,
+            n_actual = verdict_stats.n_actual + excluded.n_actual,
+            sum_rating = verdict_stats.sum_rating + excluded.sum_rating,
+            n_rating = verdict_stats.n_rating + excluded.n_rating
+        """,
+        (
+            verdict or '',
+            actual if actual is not None else 0.0,
+            1 if actual is not None else 0,
+            rating if rating is not None else 0.0,
+            1 if rating is not None else 0,
+        ),
+    )
+
+
+def _get_state(cur: sqlite3.Cursor, key: str, default: int = 0) -> int:
+    cur.execute("SELECT value FROM learning_state WHERE key=?", (key,))
+    row = cur.fetchone()
+    return int(row[0]) if row and row[0] is not None else default
+
+
+def _set_state(cur: sqlite3.Cursor, key: str, value: int) -> None:
+    cur.execute(
+        """
+        INSERT INTO learning_state (key, value, updated)
+        VALUES (?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated=excluded.updated
+        """,
+        (key, int(value), _now_iso()),
+    )
+
+
 def update_from_ai_results(db_path: str, top_rows: List[Dict[str, str]], agg_file: str) -> int:
     """Persist a run and picks. Returns run_id."""
     if not top_rows:
@@ -739,6 +829,7 @@ def record_decision_feedback(db_path: str, feedback_entries: Iterable[Dict[str,
             if not inserted:
                 continue
 
+            _upsert_verdict(cur, item['verdict'], item['actual_return'], item['rating'])
             verdict = item['verdict']
             ticker = item['ticker']
             if ticker not in touched_tickers:
@@ -826,12 +917,13 @@ def generate_self_assessment(db_path: str, run_limit: int = 10) -> Dict[str, Any
             )
             prev_avg_adj = float(cur.fetchone()['avg_adj'] or 0.0)
 
-        cur.execute('SELECT verdict, COUNT(*) AS cnt FROM decision_feedback GROUP BY verdict ORDER BY cnt DESC')
-        feedback_counts = {row['verdict'] or '': row['cnt'] for row in cur.fetchall()}
-        cur.execute('SELECT AVG(actual_return) AS avg_ret, AVG(rating) AS avg_rating FROM decision_feedback')
-        row = cur.fetchone()
-        avg_actual_return = _safe_float(row['avg_ret'])
-        avg_rating = _safe_float(row['avg_rating'])
+        cur.execute('SELECT verdict, cnt, sum_actual, n_actual, sum_rating, n_rating FROM verdict_stats ORDER BY cnt DESC')
+        verdict_rows = cur.fetchall()
+        feedback_counts = {row['verdict'] or '': row['cnt'] for row in verdict_rows}
+        n_actual = sum(int(row['n_actual'] or 0) for row in verdict_rows)
+        n_rating = sum(int(row['n_rating'] or 0) for row in verdict_rows)
+        avg_actual_return = (sum(float(row['sum_actual'] or 0.0) for row in verdict_rows) / n_actual) if n_actual else None
+        avg_rating = (sum(float(row['sum_rating'] or 0.0) for row in verdict_rows) / n_rating) if n_rating else None
 
         cur.execute(
             '''
@@ -910,7 +1002,8 @@ def generate_self_assessment(db_path: str, run_limit: int = 10) -> Dict[str, Any
             for r in cur.fetchall()
         ]
 
-        cur.execute('SELECT COUNT(DISTINCT ticker) AS uniq FROM picks')
+        # ticker_stats holds one row per picked ticker, so this avoids a scan over picks
+        cur.execute('SELECT COUNT(*) AS uniq FROM ticker_stats WHERE appearances > 0')
         coverage = int(cur.fetchone()['uniq'] or 0)
 
         return {
@@ -938,8 +1031,14 @@ def generate_self_assessment(db_path: str, run_limit: int = 10) -> Dict[str, Any
         con.close()
 
 
-def harvest_price_feedback(db_path: str, min_hours: int = 24) -> Dict[str, Any]:
-    """Harvest price_eval rows into decision feedback for autonomous learning."""
+def harvest_price_feedback(db_path: str, min_hours: int = 24, rescan: bool = False) -> Dict[str, Any]:
+    """Harvest price_eval rows into decision feedback for autonomous learning.
+
+    Only rows past the stored watermark (price_eval rowid) are considered, and
+    the min_hours cutoff is applied in SQL. Rows still too recent keep the
+    watermark behind them so they are picked up by a later harvest. Pass
+    rescan=True to ignore the watermark and walk the whole table.
+    """
     if not os.path.exists(db_path):
         return {"status": "no_db", "message": f"Learning DB not found: {db_path}"}
 
@@ -947,38 +1046,63 @@ def harvest_price_feedback(db_path: str, min_hours: int = 24) -> Dict[str, Any]:
     con = sqlite3.connect(db_path)
     con.row_factory = sqlite3.Row
     harvested: List[Dict[str, Any]] = []
-    skipped_recent = 0
-    considered = 0
     try:
         cur = con.cursor()
-        cutoff = datetime.utcnow() - timedelta(hours=max(0, min_hours))
+        # One read transaction, and every scan is bounded by the max rowid taken first:
+        # rows inserted while harvesting stay above the new watermark for the next run.
+        cur.execute("BEGIN")
+        watermark = 0 if rescan else _get_state(cur, HARVEST_WATERMARK_KEY)
+        cur.execute("SELECT MAX(rowid) FROM price_eval")
+        max_rid = int(cur.fetchone()[0] or 0)
+        cutoff = (datetime.utcnow() - timedelta(hours=max(0, min_hours))).isoformat(timespec="seconds")
+        # Rows with a parseable event_ts newer than cutoff are "recent"; empty or
+        # unparseable timestamps are harvested immediately (matches prior behaviour).
+        recent_sql = "(julianday(p.event_ts) IS NOT NULL AND julianday(p.event_ts) > julianday(?))"
+        unmatched_sql = """
+            NOT EXISTS (
+                SELECT 1 FROM decision_feedback AS d
+                WHERE d.run_id = p.run_id AND d.ticker = p.ticker AND d.event_ts = p.event_ts
+            )
+            AND NOT (
+                (p.event_ts IS NULL OR p.event_ts = '')
+                AND EXISTS (
+                    SELECT 1 FROM decision_feedback AS d
+                    WHERE d.run_id = p.run_id AND d.ticker = p.ticker AND d.event_ts IS NULL
+                )
+            )
+        """
         cur.execute(
-            """
-            SELECT p.run_id, p.ticker, p.event_ts, p.event_type, p.title,
+            f"""
+            SELECT p.rowid AS rid, p.run_id, p.ticker, p.event_ts, p.event_type, p.title,
                    p.ret_1d, p.ret_3d, p.ret_5d, p.consistent, p.fake
             FROM price_eval AS p
-            LEFT JOIN decision_feedback AS d
-              ON d.run_id = p.run_id
-             AND d.ticker = p.ticker
-             AND (d.event_ts = p.event_ts OR (d.event_ts IS NULL AND (p.event_ts IS NULL OR p.event_ts = "")))
-            WHERE d.id IS NULL
-            """
+            WHERE p.rowid > ? AND p.rowid <= ? AND NOT {recent_sql} AND {unmatched_sql}
+            """,
+            (watermark, max_rid, cutoff),
         )
         rows = cur.fetchall()
+        cur.execute(
+            f"""
+            SELECT COUNT(*) AS cnt, MIN(p.rowid) AS first_rid
+            FROM price_eval AS p
+            WHERE p.rowid > ? AND p.rowid <= ? AND {recent_sql} AND {unmatched_sql}
+            """,
+            (watermark, max_rid, cutoff),
+        )
+        pending = cur.fetchone()
+        skipped_recent = int(pending['cnt'] or 0)
+        con.rollback()
     finally:
         con.close()
 
+    # Advance to the newest row, but never past a row that is still waiting out min_hours
+    new_watermark = max_rid
+    if skipped_recent:
+        new_watermark = min(new_watermark, int(pending['first_rid']) - 1)
+    considered = len(rows) + skipped_recent
+
     for row in rows:
-        considered += 1
         event_ts_str = row['event_ts'] or ''
-        try:
-            event_dt = datetime.fromisoformat(event_ts_str.replace('Z', '+00:00')) if event_ts_str else None
-        except Exception:
-            event_dt = None
-        if event_dt and event_dt > cutoff:
-            skipped_recent += 1
-            continue
-
         ret_5 = _safe_float(row['ret_5d'])
         ret_3 = _safe_float(row['ret_3d'])
         ret_1 = _safe_float(row['ret_1d'])
@@ -1022,6 +1146,7 @@ def harvest_price_feedback(db_path: str, min_hours: int = 24) -> Dict[str, Any]:
         })
 
     if not harvested:
+        _save_harvest_watermark(db_path, new_watermark)
         return {
             'status': 'noop',
             'considered': considered,
@@ -1030,6 +1155,7 @@ def harvest_price_feedback(db_path: str, min_hours: int = 24) -> Dict[str, Any]:
         }
 
     result = record_decision_feedback(db_path, harvested)
+    _save_harvest_watermark(db_path, new_watermark)
     result.update({
         'status': 'harvested',
         'considered': considered,
@@ -1040,6 +1166,17 @@ def harvest_price_feedback(db_path: str, min_hours: int = 24) -> Dict[str, Any]:
 
 
 
+def _save_harvest_watermark(db_path: str, rowid: int) -> None:
+    con = sqlite3.connect(db_path)
+    try:
+        cur = con.cursor()
+        if rowid > _get_state(cur, HARVEST_WATERMARK_KEY):
+            _set_state(cur, HARVEST_WATERMARK_KEY, rowid)
+            con.commit()
+    finally:
+        con.close()
+
+
 def get_latest_run_info(db_path: str) -> Dict[str, Any]:
     ensure_db(db_path)
     con = sqlite3.connect(db_path)
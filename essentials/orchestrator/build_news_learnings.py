@@ -9,6 +9,11 @@ Outputs:
 - outputs/news_learnings_top100_YYYYMMDD_HHMMSS.csv
 - learning/learnings_top100_YYYYMMDD.md (summary)
 
+With --incremental, parsed articles and their time-independent base scores
+are cached per aggregated file (outputs/news_learnings_cache.db, keyed by
+file size + mtime). Each run only parses new or changed files and re-applies
+the closed-form recency decay to the cached base scores.
+
 This script reuses the aggregated parser and news scoring from top10_ranker,
 adds impact heuristics and present-day price feedback, and produces a
 ranked Top-100 list.
@@ -27,8 +32,9 @@ from orchestrator.config import OUTPUTS_DIR, LEARNING_DIR, load_config, BASE_DIR
 from orchestrator.top10_ranker import (
     parse_aggregated_file,
     find_aggregated,
-    compute_article_score,
+    compute_article_base_score,
     hours_ago,
+    recency_decay,
 )
 from orchestrator.ranking import parse_amount_crore as parse_amt_cr
 from price_eval import evaluate_live
@@ -102,6 +108,109 @@ def load_reliability(db_path: str, tickers: List[str]) -> Dict[str, float]:
     return out
 
 
+ARTICLE_CACHE_PATH = os.path.join(OUTPUTS_DIR, 'news_learnings_cache.db')
+# Bump when compute_article_base_score or the cached article fields change
+ARTICLE_CACHE_VERSION = 1
+
+
+def _score_signature(cfg: Dict[str, Any]) -> str:
+    import hashlib
+    import json
+    fw = json.dumps(cfg.get("feature_weights", {}) or {}, sort_keys=True)
+    return hashlib.sha1(f"v{ARTICLE_CACHE_VERSION}|{fw}".encode("utf-8")).hexdigest()
+
+
+def _open_article_cache(cache_path: str, signature: str) -> sqlite3.Connection:
+    con = sqlite3.connect(cache_path)
+    cur = con.cursor()
+    cur.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime_ns INTEGER,
+            n_articles INTEGER
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS articles (
+            path TEXT,
+            seq INTEGER,
+            ticker TEXT,
+            title TEXT,
+            source TEXT,
+            published TEXT,
+            base_score REAL,
+            PRIMARY KEY (path, seq)
+        )
+        """
+    )
+    cur.execute("SELECT value FROM meta WHERE key='score_signature'")
+    row = cur.fetchone()
+    if row is None or row[0] != signature:
+        # Scoring inputs changed: cached base scores are no longer valid
+        cur.execute("DELETE FROM articles")
+        cur.execute("DELETE FROM files")
+        cur.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('score_signature', ?)", (signature,))
+    con.commit()
+    return con
+
+
+def load_articles_incremental(files: List[str], cfg: Dict[str, Any], cache_path: str = ARTICLE_CACHE_PATH) -> Tuple[List[Dict[str, Any]], int]:
+    """Return (articles with 'base_score', number of files parsed this run).
+
+    Files whose size and mtime match the cache are served from SQLite; new or
+    changed files are parsed and scored once and their rows replaced.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    con = _open_article_cache(cache_path, _score_signature(cfg))
+    articles: List[Dict[str, Any]] = []
+    parsed = 0
+    try:
+        cur = con.cursor()
+        for p in files:
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            cur.execute("SELECT size, mtime_ns FROM files WHERE path=?", (p,))
+            row = cur.fetchone()
+            if row is None or int(row[0]) != st.st_size or int(row[1]) != st.st_mtime_ns:
+                try:
+                    arts = parse_aggregated_file(p)
+                except Exception:
+                    continue
+                parsed += 1
+                cur.execute("DELETE FROM articles WHERE path=?", (p,))
+                cur.executemany(
+                    "INSERT INTO articles (path, seq, ticker, title, source, published, base_score) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            p, i, a.get('ticker') or '', a.get('title') or '', a.get('source') or '', a.get('published') or '',
+                            compute_article_base_score(a.get('title') or '', a.get('body') or '', a.get('source') or '', cfg),
+                        )
+                        for i, a in enumerate(arts)
+                    ],
+                )
+                cur.execute(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, n_articles) VALUES (?, ?, ?, ?)",
+                    (p, st.st_size, st.st_mtime_ns, len(arts)),
+                )
+                con.commit()
+            cur.execute(
+                "SELECT ticker, title, source, published, base_score FROM articles WHERE path=? ORDER BY seq",
+                (p,),
+            )
+            for tk, title, src, pub, base in cur.fetchall():
+                articles.append({'ticker': tk, 'title': title, 'source': src, 'published': pub, 'base_score': float(base or 0.0)})
+    finally:
+        con.close()
+    return articles, parsed
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Build Top-100 learnings from news age, impact, and today price")
     ap.add_argument("--days", type=int, default=7, help="Look-back window in days for aggregated files (default: 7)")
@@ -109,6 +218,7 @@ def main() -> None:
     ap.add_argument("--top", type=int, default=100, help="Top N tickers to include (default: 100)")
     ap.add_argument("--half-life", type=float, default=48.0, help="News half-life in hours for recency decay (default: 48)")
     ap.add_argument("--best-buy-top", type=int, default=25, help="Max Best-Buy-Today candidates to export (default: 25)")
+    ap.add_argument("--incremental", action="store_true", help="Reuse cached per-file articles/base scores; parse only new or changed files")
     args = ap.parse_args()
 
     cfg = load_config()
@@ -120,16 +230,22 @@ def main() -> None:
         return
     print(f"Using {len(files)} aggregated file(s) in last {args.days} days.")
 
-    # Parse all articles
+    # Parse all articles (or load cached ones) with their time-independent base score
     articles: List[Dict[str, Any]] = []
-    for p in files:
-        try:
-            arts = parse_aggregated_file(p)
-            if args.hours is not None:
-                arts = [a for a in arts if (a.get('published') and hours_ago(a.get('published')) <= float(args.hours))]
+    if args.incremental:
+        articles, parsed = load_articles_incremental(files, cfg)
+        print(f"Incremental: parsed {parsed} new/changed file(s), {len(files) - parsed} from cache.")
+    else:
+        for p in files:
+            try:
+                arts = parse_aggregated_file(p)
+            except Exception:
+                continue
+            for a in arts:
+                a['base_score'] = compute_article_base_score(a.get('title') or '', a.get('body') or '', a.get('source') or '', cfg)
             articles.extend(arts)
-        except Exception:
-            continue
+    if args.hours is not None:
+        articles = [a for a in articles if (a.get('published') and hours_ago(a.get('published')) <= float(args.hours))]
     if not articles:
         print("[INFO] No articles found in window; exiting.")
         return
@@ -158,11 +274,9 @@ def main() -> None:
         tk = (it.get('ticker') or '').split('.')[0].upper()
         if valid and tk not in valid:
             continue
-        title = it.get('title') or ''
-        src = it.get('source') or ''
         published = it.get('published') or ''
-        body = it.get('body') or ''
-        sc = compute_article_score(title, body, src, published, half_life=args.half_life)
+        base = float(it.get('base_score') or 0.0)
+        sc = base * recency_decay(hours_ago(published) if published else 9999.0, args.half_life) if base else 0.0
         per.setdefault(tk, []).append((sc, it))
 
     # Rank per ticker by sum of top-10 article scores
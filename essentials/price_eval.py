@@ -6,6 +6,8 @@ import re
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Tuple
 
+import numpy as np
+
 
 def _parse_aggregated_published(agg_path: str) -> Dict[str, str]:
     """Return map title -> published ISO string (best-effort)."""
@@ -42,92 +44,163 @@ def _parse_run_ts(agg_path: str) -> datetime | None:
     return None
 
 
+# Intraday reruns reuse daily bars fetched within this window
+LIVE_MAX_AGE_HOURS = 0.25
+
+
 def ensure_ns(t: str) -> str:
     t = (t or "").strip().upper()
     return t if "." in t else f"{t}.NS"
 
 
-def evaluate_reactions(top_rows: List[Dict[str, str]], agg_path: str) -> List[Dict[str, object]]:
+REACTION_HORIZONS = (1, 3, 5)
+
+
+def reaction_returns(dates: np.ndarray, closes: np.ndarray, event_dates: np.ndarray,
+                     horizons: Tuple[int, ...] = REACTION_HORIZONS) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised post-event returns for one symbol.
+
+    dates must be sorted datetime64[D]; t0 is the first bar on/after each event
+    date (searchsorted). Returns (t0 index, returns matrix events x horizons);
+    events with no bar on/after the date get t0 == len(dates). Horizons past
+    the last bar, or a non-positive t0 close, yield 0.0 (legacy behaviour).
+    """
+    n = len(dates)
+    t0 = np.searchsorted(dates, event_dates, side="left")
+    rets = np.zeros((len(event_dates), len(horizons)), dtype="float64")
+    if n == 0:
+        return t0, rets
+    c0 = closes[np.minimum(t0, n - 1)]
+    for k, h in enumerate(horizons):
+        j = t0 + h
+        ok = (t0 < n) & (j < n) & (c0 > 0)
+        c1 = closes[np.minimum(j, n - 1)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rets[:, k] = np.where(ok, (c1 - c0) / c0 * 100.0, 0.0)
+    return t0, rets
+
+
+def reaction_flags(rets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """consistent = 3d & 5d >= 2%; fake = 1d >= 2% but 5d <= 0.5% (columns 1d/3d/5d)."""
+    r1, r3, r5 = rets[:, 0], rets[:, 1], rets[:, 2]
+    consistent = ((r3 >= 2.0) & (r5 >= 2.0)).astype(int)
+    fake = ((r1 >= 2.0) & (r5 <= 0.5)).astype(int)
+    return consistent, fake
+
+
+def evaluate_reactions(top_rows: List[Dict[str, str]], agg_path: str, cache=None,
+                       lookback_days: int = 185) -> List[Dict[str, object]]:
     """Compute 1d/3d/5d returns after news for each top row.
-    Requires network for yfinance; gracefully degrades if unavailable.
+
+    Bars for every symbol come from the shared OHLCV cache in one batched
+    download; t0 lookup and returns are vectorised per symbol. Gracefully
+    degrades (returns []) when no price data can be obtained.
     """
     try:
-        import yfinance as yf
+        from ohlcv_cache import get_ohlcv_cache
     except Exception:
-        # No evaluation possible
         return []
+    cache = cache or get_ohlcv_cache()
 
     published_map = _parse_aggregated_published(agg_path)
     run_ts = _parse_run_ts(agg_path) or datetime.now(timezone.utc)
 
-    evals: List[Dict[str, object]] = []
+    events: List[Dict[str, object]] = []
     for row in top_rows:
         tkr = (row.get("ticker") or "").strip().upper()
         title = (row.get("top_title") or "").strip()
-        source = (row.get("top_source") or "").strip()
-        ev = (row.get("event_type") or "").strip()
-
-        sym = ensure_ns(tkr)
-        # Event time
         pts = published_map.get(title)
         try:
             event_ts = datetime.fromisoformat(pts.replace("Z", "+00:00")) if pts else run_ts
         except Exception:
             event_ts = run_ts
+        events.append({
+            "ticker": tkr,
+            "symbol": ensure_ns(tkr),
+            "event_type": (row.get("event_type") or "").strip(),
+            "title": title,
+            "source": (row.get("top_source") or "").strip(),
+            "event_ts": event_ts,
+        })
+    if not events:
+        return []
 
-        # Fetch prices
-        try:
-            hist = yf.Ticker(sym).history(period="6mo", interval="1d")
-            if hist is None or hist.empty:
-                continue
-            # Find t0: first bar with index >= event date
-            # Use date-only compare in UTC
-            event_date = event_ts.date()
-            idx = [d.date() for d in hist.index]
-            if event_date not in idx:
-                # pick next trading date after event
-                t0i = None
-                for i, d in enumerate(idx):
-                    if d >= event_date:
-                        t0i = i
-                        break
-            else:
-                t0i = idx.index(event_date)
-            if t0i is None:
-                continue
-            def ret(days: int) -> float:
-                j = t0i + days
-                if j >= len(hist):
-                    return 0.0
-                c0 = float(hist["Close"].iloc[t0i])
-                c1 = float(hist["Close"].iloc[j])
-                if c0 <= 0:
-                    return 0.0
-                return (c1 - c0) / c0 * 100.0
-            r1 = ret(1)
-            r3 = ret(3)
-            r5 = ret(5)
-            consistent = 1 if (r3 >= 2.0 and r5 >= 2.0) else 0
-            fake = 1 if (r1 >= 2.0 and r5 <= 0.5) else 0
-            evals.append({
-                "ticker": tkr,
-                "symbol": sym,
-                "event_type": ev,
-                "title": title,
-                "source": source,
-                "event_ts": event_ts.isoformat(),
-                "ret_1d": r1,
-                "ret_3d": r3,
-                "ret_5d": r5,
-                "consistent": consistent,
-                "fake": fake,
-            })
-        except Exception:
+    try:
+        bars = cache.get_many([e["symbol"] for e in events], lookback_days=lookback_days)
+    except Exception:
+        return []
+
+    # Group event positions by symbol, then resolve each group in one vector op
+    by_symbol: Dict[str, List[int]] = {}
+    for pos, e in enumerate(events):
+        by_symbol.setdefault(str(e["symbol"]), []).append(pos)
+    rets = np.zeros((len(events), len(REACTION_HORIZONS)), dtype="float64")
+    found = np.zeros(len(events), dtype=bool)
+    for sym, positions in by_symbol.items():
+        hist = bars.get(sym)
+        if hist is None or hist.empty:
             continue
+        dates = hist.index.values.astype("datetime64[D]")
+        closes = hist["Close"].to_numpy(dtype="float64")
+        ev_dates = np.array([np.datetime64(events[p]["event_ts"].date(), "D") for p in positions])
+        t0, sym_rets = reaction_returns(dates, closes, ev_dates)
+        idx = np.asarray(positions)
+        rets[idx] = sym_rets
+        found[idx] = t0 < len(dates)
 
+    consistent, fake = reaction_flags(rets)
+    evals: List[Dict[str, object]] = []
+    for pos in np.flatnonzero(found):
+        e = events[pos]
+        evals.append({
+            "ticker": e["ticker"],
+            "symbol": e["symbol"],
+            "event_type": e["event_type"],
+            "title": e["title"],
+            "source": e["source"],
+            "event_ts": e["event_ts"].isoformat(),
+            "ret_1d": float(rets[pos, 0]),
+            "ret_3d": float(rets[pos, 1]),
+            "ret_5d": float(rets[pos, 2]),
+            "consistent": int(consistent[pos]),
+            "fake": int(fake[pos]),
+        })
     return evals
 
 
+def intraday_changes(tickers: List[str], interval: str = "5m", window: int = 0) -> Dict[str, float]:
+    """Percent move from the first open to the last close of today's intraday bars.
+
+    All .NS symbols are fetched in one batch; tickers without NSE bars are
+    retried as .BO in a second batch. window > 0 keeps only the last N bars.
+    Tickers with no usable bars are left out.
+    """
+    try:
+        from ohlcv_cache import download_intraday
+    except Exception:
+        return {}
+    uniq = list(dict.fromkeys((t or "").strip().upper() for t in tickers if (t or "").strip()))
+    found: Dict[str, object] = {}
+    for suffix in (".NS", ".BO"):
+        # Tickers that already carry an exchange suffix are only tried as given
+        todo = {(t if "." in t else f"{t}{suffix}"): t for t in uniq
+                if t not in found and ("." not in t or suffix == ".NS")}
+        if not todo:
+            continue
+        for sym, bars in download_intraday(list(todo), interval=interval).items():
+            found[todo[sym]] = bars
+
+    out: Dict[str, float] = {}
+    for t, bars in found.items():
+        if window and len(bars) > window:
+            bars = bars.tail(window)
+        first = float(bars["Open"].iloc[0]) if "Open" in bars else float("nan")
+        last = float(bars["Close"].iloc[-1])
+        if first > 0:
+            out[t] = (last - first) / first * 100.0
+    return out
+
+
 def evaluate_live(top_rows: List[Dict[str, str]]) -> List[Dict[str, object]]:
     """Best-effort present-day feedback using recent OHLC data.
     Returns per-ticker: symbol, asof (iso date), price (last close or intraday),
@@ -157,12 +230,6 @@ def evaluate_live(top_rows: List[Dict[str, str]]) -> List[Dict[str, object]]:
 
     results: List[Dict[str, object]] = []
 
-    # Batch daily download to compute change vs previous close
-    try:
-        data = yf.download(list(sym_map.values()), period="5d", interval="1d", progress=False, auto_adjust=False, group_by="ticker", threads=False)
-    except Exception:
-        data = None
-
     def _append_from_series(t: str, ser_close) -> None:
         try:
             if ser_close is None or ser_close.empty:
@@ -186,38 +253,26 @@ def evaluate_live(top_rows: List[Dict[str, str]]) -> List[Dict[str, object]]:
         except Exception:
             return
 
-    if data is not None:
-        # data can be Panel-like with columns per symbol
-        for t, sym in sym_map.items():
-            try:
-                if sym in data and hasattr(data[sym], "__getitem__"):
-                    ser = data[sym]["Close"] if "Close" in data[sym] else None
-                    _append_from_series(t, ser)
-                else:
-                    # Single-symbol frame path
-                    if "Close" in data:
-                        _append_from_series(t, data["Close"])
-            except Exception:
-                continue
-
-    # Fallback for any missing tickers: try per-symbol daily
-    have = {r["ticker"] for r in results}
-    missing = [t for t in uniq if t not in have]
-    for t in missing:
-        sym = sym_map[t]
-        try:
-            h = yf.download(sym, period="5d", interval="1d", progress=False, auto_adjust=False, group_by="ticker", threads=False)
-            ser = h["Close"] if (h is not None and not h.empty and "Close" in h) else None
-            _append_from_series(t, ser)
-        except Exception:
-            continue
+    # Batch daily bars through the shared cache; a short TTL keeps them "live"
+    try:
+        from ohlcv_cache import get_ohlcv_cache
+        bars = get_ohlcv_cache().get_many(list(sym_map.values()), lookback_days=7, max_age_hours=LIVE_MAX_AGE_HOURS)
+    except Exception:
+        bars = {}
+    for t, sym in sym_map.items():
+        hist = bars.get(sym)
+        if hist is not None and "Close" in hist:
+            _append_from_series(t, hist["Close"])
 
     # Final fallback: fast_info per ticker (instant price vs previous_close)
     have = {r["ticker"] for r in results}
     import datetime as _dt
+    from rate_limiter import get_bucket
+    bucket = get_bucket("yahoo")
     for t in [x for x in uniq if x not in have]:
         sym = sym_map[t]
         try:
+            bucket.acquire()
             ti = yf.Ticker(sym)
             fi = getattr(ti, "fast_info", None)
             if not fi:
@@ -234,7 +289,7 @@ def evaluate_live(top_rows: List[Dict[str, str]]) -> List[Dict[str, object]]:
                     "prev_close": prev_close,
                     "live_ret": ret,
                 })
-        except Exception:
-            pass
+        except Exception as e:
+            bucket.report_error(e)
 
     return results
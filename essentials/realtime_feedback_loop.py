@@ -15,14 +15,23 @@ Usage:
 
     # View performance report
     python3 realtime_feedback_loop.py --report
+
+Predictions and outcomes live in an append-only SQLite store (FEEDBACK_DB).
+Predictions are keyed by (ticker, date); recording one supersedes the ticker's
+older active prediction instead of rewriting a JSON file. Each outcome updates
+success counters per factor (overbought, high volume, high certainty, each
+catalyst, each recommendation) for all history and for the last
+LEARNING_WINDOW outcomes, so learning and reports read the counters instead
+of rescanning every record. The legacy JSON files are imported once.
 """
 
 import json
 import os
+import sqlite3
 import sys
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import argparse
 from pathlib import Path
 
@@ -30,6 +39,15 @@ from pathlib import Path
 PREDICTIONS_DB = 'learning/predictions_tracking.json'
 PERFORMANCE_DB = 'learning/performance_history.json'
 LEARNED_CONFIG = 'learning/learned_weights.json'
+FEEDBACK_DB = 'learning/feedback_loop.db'
+LEARNING_WINDOW = 20  # Outcomes analyzed by learn_from_performance
+
+# Factor -> (performance record field, condition) for the success counters
+FACTOR_RULES = {
+    'overbought': ('initial_rsi', lambda rsi: rsi > 70),
+    'high_volume': ('volume_change_pct', lambda v: v > 20),
+    'high_certainty': ('certainty', lambda c: c > 70),
+}
 
 # Default weights (baseline)
 DEFAULT_WEIGHTS = {
@@ -55,27 +73,155 @@ DEFAULT_CATALYST_SCORES = {
 }
 
 
+def record_factors(record: Dict) -> List[str]:
+    """Counter keys a performance record contributes to"""
+    factors = ['overall', f"recommendation:{record.get('recommendation', 'HOLD')}"]
+    factors += [name for name, (field, condition) in FACTOR_RULES.items() if condition(record.get(field, 0))]
+    factors += [f"catalyst:{c}" for c in record.get('catalysts', [])]
+    return factors
+
+
+class PredictionStore:
+    """Append-only prediction / outcome store with incremental factor counters"""
+
+    def __init__(self, db_path: str = FEEDBACK_DB, window: int = LEARNING_WINDOW):
+        self.db_path = db_path
+        self.window = window
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.con = sqlite3.connect(db_path, timeout=30)
+        self.con.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS predictions (
+                ticker TEXT,
+                pred_date TEXT,
+                timestamp TEXT,
+                status TEXT,
+                data TEXT,
+                PRIMARY KEY (ticker, pred_date)
+            );
+            CREATE INDEX IF NOT EXISTS ix_predictions_status ON predictions (status, ticker);
+            CREATE TABLE IF NOT EXISTS performance (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker TEXT,
+                pred_date TEXT,
+                timestamp TEXT,
+                correct INTEGER,
+                data TEXT
+            );
+            CREATE INDEX IF NOT EXISTS ix_performance_ticker ON performance (ticker, pred_date);
+            CREATE TABLE IF NOT EXISTS factor_stats (
+                scope TEXT,
+                factor TEXT,
+                total INTEGER DEFAULT 0,
+                correct INTEGER DEFAULT 0,
+                PRIMARY KEY (scope, factor)
+            );
+            """
+        )
+        self.con.commit()
+        if self.con.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] == 0 \
+                and self.con.execute("SELECT COUNT(*) FROM performance").fetchone()[0] == 0:
+            self._import_legacy_json()
+
+    def _import_legacy_json(self):
+        """One-time import of predictions_tracking.json / performance_history.json"""
+        imported = False
+        if os.path.exists(PERFORMANCE_DB):
+            with open(PERFORMANCE_DB, 'r') as f:
+                for record in json.load(f):
+                    self.add_outcome(record.get('ticker', ''), record, commit=False)
+                    imported = True
+        if os.path.exists(PREDICTIONS_DB):
+            with open(PREDICTIONS_DB, 'r') as f:
+                for prediction in json.load(f).values():
+                    self.add_prediction(prediction, commit=False)
+                    imported = True
+        self.con.commit()
+        if imported:
+            print(f"ℹ️  Imported legacy feedback JSON into {self.db_path}")
+
+    def active_predictions(self) -> Dict[str, Dict]:
+        rows = self.con.execute(
+            "SELECT ticker, data FROM predictions WHERE status='active' ORDER BY timestamp").fetchall()
+        return {ticker: json.loads(data) for ticker, data in rows}
+
+    def add_prediction(self, prediction: Dict, commit: bool = True):
+        """Insert a prediction; the ticker's older active prediction is superseded"""
+        ticker = prediction['ticker']
+        self.con.execute("UPDATE predictions SET status='superseded' WHERE ticker=? AND status='active'", (ticker,))
+        self.con.execute(
+            "INSERT OR REPLACE INTO predictions (ticker, pred_date, timestamp, status, data) VALUES (?, ?, ?, 'active', ?)",
+            (ticker, prediction['timestamp'][:10], prediction['timestamp'], json.dumps(prediction)))
+        if commit:
+            self.con.commit()
+
+    def _bump(self, scope: str, factors: List[str], delta: int, correct: bool):
+        self.con.executemany(
+            "INSERT INTO factor_stats (scope, factor, total, correct) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (scope, factor) DO UPDATE SET total = total + excluded.total, correct = correct + excluded.correct",
+            [(scope, factor, delta, delta if correct else 0) for factor in factors])
+
+    def add_outcome(self, ticker: str, record: Dict, commit: bool = True):
+        """Close the ticker's active prediction, append the outcome and update the counters"""
+        correct = bool(record['prediction_correct'])
+        self.con.execute("UPDATE predictions SET status='closed' WHERE ticker=? AND status='active'", (ticker,))
+        self.con.execute(
+            "INSERT INTO performance (ticker, pred_date, timestamp, correct, data) VALUES (?, ?, ?, ?, ?)",
+            (ticker, str(record.get('prediction_time', ''))[:10], record.get('timestamp', ''), int(correct),
+             json.dumps(record)))
+        factors = record_factors(record)
+        self._bump('all', factors, 1, correct)
+        self._bump('window', factors, 1, correct)
+        # The outcome that just left the last-`window` set comes off the window counters
+        evicted = self.con.execute(
+            "SELECT correct, data FROM performance ORDER BY id DESC LIMIT 1 OFFSET ?", (self.window,)).fetchone()
+        if evicted:
+            self._bump('window', record_factors(json.loads(evicted[1])), -1, bool(evicted[0]))
+        if commit:
+            self.con.commit()
+
+    def stats(self, scope: str = 'window') -> Dict[str, Tuple[int, int]]:
+        """factor -> (total, correct)"""
+        return {factor: (total, correct) for factor, total, correct in self.con.execute(
+            "SELECT factor, total, correct FROM factor_stats WHERE scope=? AND total > 0", (scope,))}
+
+    def performance_count(self) -> int:
+        return self.con.execute("SELECT COUNT(*) FROM performance").fetchone()[0]
+
+    def recent_performance(self, limit: int) -> List[Dict]:
+        rows = self.con.execute("SELECT data FROM performance ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [json.loads(data) for data, in reversed(rows)]
+
+    def all_performance(self) -> List[Dict]:
+        return [json.loads(data) for data, in self.con.execute("SELECT data FROM performance ORDER BY id")]
+
+
 class FeedbackLoopTracker:
     """Tracks predictions and actual outcomes for learning"""
 
-    def __init__(self):
+    def __init__(self, store: Optional[PredictionStore] = None):
+        self.store = store or PredictionStore()
         self.predictions = self._load_predictions()
-        self.performance = self._load_performance()
         self.weights = self._load_learned_weights()
 
+    @property
+    def performance(self) -> List[Dict]:
+        """Full outcome history (loaded on demand)"""
+        return self._load_performance()
+
     def _load_predictions(self) -> Dict:
-        """Load active predictions"""
-        if os.path.exists(PREDICTIONS_DB):
-            with open(PREDICTIONS_DB, 'r') as f:
-                return json.load(f)
-        return {}
+        """Load active predictions (latest per ticker)"""
+        return self.store.active_predictions()
 
     def _load_performance(self) -> List[Dict]:
         """Load historical performance data"""
-        if os.path.exists(PERFORMANCE_DB):
-            with open(PERFORMANCE_DB, 'r') as f:
-                return json.load(f)
-        return []
+        return self.store.all_performance()
+
+    def performance_count(self) -> int:
+        return self.store.performance_count()
+
+    def recent_performance(self, limit: int = 10) -> List[Dict]:
+        return self.store.recent_performance(limit)
 
     def _load_learned_weights(self) -> Dict:
         """Load previously learned weights or defaults"""
@@ -85,18 +231,6 @@ class FeedbackLoopTracker:
                 return data.get('weights', DEFAULT_WEIGHTS)
         return DEFAULT_WEIGHTS.copy()
 
-    def _save_predictions(self):
-        """Save predictions to disk"""
-        os.makedirs(os.path.dirname(PREDICTIONS_DB), exist_ok=True)
-        with open(PREDICTIONS_DB, 'w') as f:
-            json.dump(self.predictions, f, indent=2)
-
-    def _save_performance(self):
-        """Save performance history to disk"""
-        os.makedirs(os.path.dirname(PERFORMANCE_DB), exist_ok=True)
-        with open(PERFORMANCE_DB, 'w') as f:
-            json.dump(self.performance, f, indent=2)
-
     def record_prediction(self, ticker: str, analysis: Dict):
         """Record an AI prediction for tracking"""
         prediction = {
@@ -118,7 +252,7 @@ class FeedbackLoopTracker:
         }
 
         self.predictions[ticker] = prediction
-        self._save_predictions()
+        self.store.add_prediction(prediction)
 
         print(f"✅ Recorded prediction for {ticker}: {analysis.get('recommendation')} @ ₹{prediction['initial_price']}")
 
@@ -165,13 +299,9 @@ class FeedbackLoopTracker:
             'weights_used': pred['weights_used']
         }
 
-        # Add to performance history
-        self.performance.append(performance_record)
-        self._save_performance()
-
-        # Remove from active predictions
+        # Append to performance history and close the active prediction
+        self.store.add_outcome(ticker, performance_record)
         del self.predictions[ticker]
-        self._save_predictions()
 
         print(f"\n📊 Performance Update: {ticker}")
         print(f"   Predicted: {pred['expected_move_pct']:+.2f}% | Actual: {actual_change_pct:+.2f}%")
@@ -209,30 +339,32 @@ class FeedbackLoopTracker:
 
     def learn_from_performance(self) -> Dict:
         """Analyze performance and update weights"""
-        if len(self.performance) < 3:
-            print(f"⚠️  Need at least 3 performance records to learn (have {len(self.performance)})")
+        performance_count = self.store.performance_count()
+        if performance_count < 3:
+            print(f"⚠️  Need at least 3 performance records to learn (have {performance_count})")
             return self.weights
 
-        print(f"\n🧠 Learning from {len(self.performance)} performance records...")
+        print(f"\n🧠 Learning from {performance_count} performance records...")
 
-        # Analyze recent performance (last 20 records or all if less)
-        recent_performance = self.performance[-20:]
+        # Counters over the last LEARNING_WINDOW records (or all if less)
+        recent_stats = self.store.stats('window')
+        samples = min(performance_count, self.store.window)
 
         # Calculate success rates for different factors
-        analysis = self._analyze_performance_patterns(recent_performance)
+        analysis = self._analyze_performance_patterns(recent_stats)
 
         # Update weights based on analysis
         updated_weights = self._update_weights(analysis)
 
         # Update catalyst scores
-        updated_catalyst_scores = self._update_catalyst_scores(recent_performance)
+        updated_catalyst_scores = self._update_catalyst_scores(recent_stats)
 
         # Save learned configuration
         learned_config = {
             'weights': updated_weights,
             'catalyst_scores': updated_catalyst_scores,
             'learning_timestamp': datetime.now().isoformat(),
-            'samples_analyzed': len(recent_performance),
+            'samples_analyzed': samples,
             'overall_accuracy': analysis['overall_accuracy'],
             'insights': analysis['insights']
         }
@@ -248,16 +380,15 @@ class FeedbackLoopTracker:
 
         return learned_config
 
-    def _analyze_performance_patterns(self, records: List[Dict]) -> Dict:
-        """Analyze patterns in performance data"""
-        total = len(records)
-        correct = sum(1 for r in records if r['prediction_correct'])
+    def _analyze_performance_patterns(self, stats: Dict[str, Tuple[int, int]]) -> Dict:
+        """Analyze patterns in the factor counters (factor -> (total, correct))"""
+        total, correct = stats.get('overall', (0, 0))
 
         # Analyze by different factors
-        overbought_analysis = self._analyze_factor(records, 'initial_rsi', lambda rsi: rsi > 70, 'Overbought stocks')
-        volume_analysis = self._analyze_factor(records, 'volume_change_pct', lambda v: v > 20, 'High volume stocks')
-        high_certainty_analysis = self._analyze_factor(records, 'certainty', lambda c: c > 70, 'High certainty predictions')
-        catalyst_analysis = self._analyze_catalyst_performance(records)
+        overbought_analysis = self._analyze_factor(stats, 'overbought', 'Overbought stocks')
+        volume_analysis = self._analyze_factor(stats, 'high_volume', 'High volume stocks')
+        high_certainty_analysis = self._analyze_factor(stats, 'high_certainty', 'High certainty predictions')
+        catalyst_analysis = self._analyze_catalyst_performance(stats)
 
         overall_accuracy = (correct / total * 100) if total > 0 else 0
 
@@ -282,37 +413,25 @@ class FeedbackLoopTracker:
             'insights': insights
         }
 
-    def _analyze_factor(self, records: List[Dict], field: str, condition, label: str) -> Dict:
+    def _analyze_factor(self, stats: Dict[str, Tuple[int, int]], factor: str, label: str) -> Dict:
         """Analyze success rate for a specific factor"""
-        matching = [r for r in records if condition(r.get(field, 0))]
+        total, correct = stats.get(factor, (0, 0))
 
-        if not matching:
+        if not total:
             return {'count': 0, 'success_rate': 0, 'label': label}
 
-        correct = sum(1 for r in matching if r['prediction_correct'])
-        success_rate = (correct / len(matching) * 100) if matching else 0
-
         return {
-            'count': len(matching),
-            'success_rate': success_rate,
+            'count': total,
+            'success_rate': correct / total * 100,
             'label': label
         }
 
-    def _analyze_catalyst_performance(self, records: List[Dict]) -> Dict:
+    def _analyze_catalyst_performance(self, stats: Dict[str, Tuple[int, int]]) -> Dict:
         """Analyze performance by catalyst type"""
-        catalyst_stats = {}
-
-        for record in records:
-            catalysts = record.get('catalysts', [])
-            correct = record['prediction_correct']
-
-            for catalyst in catalysts:
-                if catalyst not in catalyst_stats:
-                    catalyst_stats[catalyst] = {'total': 0, 'correct': 0}
-
-                catalyst_stats[catalyst]['total'] += 1
-                if correct:
-                    catalyst_stats[catalyst]['correct'] += 1
+        catalyst_stats = {
+            factor[len('catalyst:'):]: {'total': total, 'correct': correct}
+            for factor, (total, correct) in stats.items() if factor.startswith('catalyst:')
+        }
 
         # Calculate success rates
         for catalyst, stats in catalyst_stats.items():
@@ -343,9 +462,9 @@ class FeedbackLoopTracker:
 
         return new_weights
 
-    def _update_catalyst_scores(self, records: List[Dict]) -> Dict:
+    def _update_catalyst_scores(self, stats: Dict[str, Tuple[int, int]]) -> Dict:
         """Update catalyst effectiveness scores"""
-        catalyst_stats = self._analyze_catalyst_performance(records)
+        catalyst_stats = self._analyze_catalyst_performance(stats)
         updated_scores = DEFAULT_CATALYST_SCORES.copy()
 
         for catalyst, stats in catalyst_stats.items():
@@ -381,26 +500,21 @@ class FeedbackLoopTracker:
 
     def generate_performance_report(self) -> str:
         """Generate a comprehensive performance report"""
-        if not self.performance:
+        stats = self.store.stats('all')
+        if not stats:
             return "No performance data available yet."
 
-        total = len(self.performance)
-        correct = sum(1 for r in self.performance if r['prediction_correct'])
+        total, correct = stats.get('overall', (0, 0))
         accuracy = (correct / total * 100) if total > 0 else 0
 
         # Calculate by recommendation type
-        by_recommendation = {}
-        for record in self.performance:
-            rec = record['recommendation']
-            if rec not in by_recommendation:
-                by_recommendation[rec] = {'total': 0, 'correct': 0}
-
-            by_recommendation[rec]['total'] += 1
-            if record['prediction_correct']:
-                by_recommendation[rec]['correct'] += 1
+        by_recommendation = {
+            factor[len('recommendation:'):]: {'total': t, 'correct': c}
+            for factor, (t, c) in stats.items() if factor.startswith('recommendation:')
+        }
 
         # Recent performance (last 10)
-        recent = self.performance[-10:]
+        recent = self.store.recent_performance(10)
         recent_correct = sum(1 for r in recent if r['prediction_correct'])
         recent_accuracy = (recent_correct / len(recent) * 100) if recent else 0
 
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Shared-memory OHLCV panel and a warm process pool
+
+The parent packs every ticker's bars once into a multiprocessing.shared_memory
+block laid out (tickers, bars, OHLCV) float64, right-aligned so each ticker's
+history is one contiguous slice; a second int64 block holds the bar dates.
+Tasks carry only a small picklable handle plus ticker indices, and workers
+attach to the blocks (once per process per batch) and build DataFrames that
+are zero-copy, read-only views of the shared buffer. A ticker whose function
+raises is reported on its own; the rest of its chunk still runs.
+
+The ProcessPoolExecutor is created on first use and kept for later batches,
+so workers do not pay interpreter start-up and module import per call.
+
+Usage:
+    from shared_ohlcv import SharedOHLCV, map_shared
+    with SharedOHLCV(frames) as shared:
+        results = map_shared(analyze, shared, max_workers=4)   # analyze(ticker, df, extra)
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+_NAT = np.iinfo(np.int64).min
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without taking over its cleanup.
+
+    Pool workers share the owner's resource tracker, where registration is a
+    set (re-registering on attach is a no-op), so the owner's unlink stays the
+    only cleanup. Python 3.13+ can skip registration altogether.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+# Worker-side attachments: block name -> (SharedMemory, ndarray view)
+_ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+@dataclass(frozen=True)
+class SharedOHLCVHandle:
+    """Picklable description of a SharedOHLCV panel."""
+    data_name: str
+    dates_name: str
+    n_bars: int
+    symbols: Tuple[str, ...]
+    lengths: Tuple[int, ...]
+
+    def _array(self, name: str, dtype, shape) -> np.ndarray:
+        hit = _ATTACHED.get(name)
+        if hit is None:
+            # A new batch supersedes earlier blocks in this worker
+            for old in list(_ATTACHED):
+                if old not in (self.data_name, self.dates_name):
+                    shm, _ = _ATTACHED.pop(old)
+                    try:
+                        shm.close()
+                    except Exception:
+                        pass
+            shm = _attach(name)
+            arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            # Other workers read the same block; views handed to func must not write to it
+            arr.setflags(write=False)
+            hit = (shm, arr)
+            _ATTACHED[name] = hit
+        return hit[1]
+
+    def data(self) -> np.ndarray:
+        return self._array(self.data_name, np.float64, (len(self.symbols), self.n_bars, len(OHLCV_COLUMNS)))
+
+    def dates(self) -> np.ndarray:
+        return self._array(self.dates_name, np.int64, (len(self.symbols), self.n_bars))
+
+    def frame(self, j: int) -> pd.DataFrame:
+        """Bars of ticker j as a DataFrame backed by the shared buffer (read-only view)."""
+        m = self.lengths[j]
+        values = self.data()[j, self.n_bars - m:, :]
+        index = pd.DatetimeIndex(self.dates()[j, self.n_bars - m:].view("datetime64[ns]"))
+        return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS, copy=False)
+
+
+class SharedOHLCV:
+    """Owner of the shared blocks; unlinks them on close()."""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], max_bars: Optional[int] = None):
+        usable = {s: df for s, df in frames.items() if df is not None and not df.empty}
+        symbols = list(usable)
+        n = max((len(df) for df in usable.values()), default=1)
+        if max_bars:
+            n = min(n, max_bars)
+        n = max(n, 1)
+        k = max(len(symbols), 1)
+        self._data = shared_memory.SharedMemory(create=True, size=k * n * len(OHLCV_COLUMNS) * 8)
+        self._dates = shared_memory.SharedMemory(create=True, size=k * n * 8)
+        data = np.ndarray((k, n, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=self._data.buf)
+        dates = np.ndarray((k, n), dtype=np.int64, buffer=self._dates.buf)
+        data.fill(np.nan)
+        dates.fill(_NAT)
+        lengths: List[int] = []
+        for j, sym in enumerate(symbols):
+            df = usable[sym].tail(n)
+            m = len(df)
+            for c, col in enumerate(OHLCV_COLUMNS):
+                if col in df.columns:
+                    data[j, n - m:, c] = df[col].to_numpy(dtype="float64")
+            idx = pd.DatetimeIndex(df.index)
+            if idx.tz is not None:
+                idx = idx.tz_localize(None)
+            dates[j, n - m:] = idx.asi8
+            lengths.append(m)
+        del data, dates
+        self.handle = SharedOHLCVHandle(self._data.name, self._dates.name, n, tuple(symbols), tuple(lengths))
+
+    def close(self) -> None:
+        for shm in (self._data, self._dates):
+            try:
+                shm.close()
+                shm.unlink()
+            except Exception:
+                pass
+
+    def __enter__(self) -> "SharedOHLCV":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# -----------------------------------------------------------------------------
+# Warm pool
+# -----------------------------------------------------------------------------
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool kept alive across batches (recreated only if the size changes)."""
+    global _POOL, _POOL_WORKERS
+    workers = max(1, max_workers or (os.cpu_count() or 1))
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=True)
+            ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else None
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True)
+        _POOL, _POOL_WORKERS = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+def _run_chunk(func: Callable, handle: SharedOHLCVHandle, idxs: Sequence[int],
+               extras: Dict[str, Any]) -> List[Tuple[bool, Any]]:
+    """(True, result) or (False, error message) per ticker, so one failure does not sink the chunk."""
+    out: List[Tuple[bool, Any]] = []
+    for j in idxs:
+        sym = handle.symbols[j]
+        try:
+            out.append((True, func(sym, handle.frame(j), extras.get(sym))))
+        except Exception as e:
+            out.append((False, f"{type(e).__name__}: {e}"))
+    return out
+
+
+def map_shared(
+    func: Callable[[str, pd.DataFrame, Any], Any],
+    shared: SharedOHLCV,
+    max_workers: Optional[int] = None,
+    extras: Optional[Dict[str, Any]] = None,
+    chunks_per_worker: int = 4,
+    timeout: Optional[float] = None,
+    on_error: Optional[Callable[[str, str], Any]] = None,
+) -> List[Any]:
+    """Run func(ticker, bars_view, extras[ticker]) for every ticker on the warm pool.
+
+    func must be a module-level (picklable) callable. Results come back in
+    ticker order; a ticker whose func raised gets on_error(ticker, message)
+    (None without on_error). Only pool-level failures (a dead worker, a
+    timeout) propagate.
+    """
+    handle = shared.handle
+    n = len(handle.symbols)
+    if n == 0:
+        return []
+    extras = extras or {}
+    pool = get_pool(max_workers)
+    n_chunks = max(1, min(n, _POOL_WORKERS * chunks_per_worker))
+    chunks = [list(range(i, n, n_chunks)) for i in range(n_chunks)]
+    futures = [
+        pool.submit(_run_chunk, func, handle, idxs, {handle.symbols[j]: extras[handle.symbols[j]] for j in idxs if handle.symbols[j] in extras})
+        for idxs in chunks
+    ]
+    results: List[Any] = [None] * n
+    for idxs, fut in zip(chunks, futures):
+        for j, (ok, res) in zip(idxs, fut.result(timeout=timeout)):
+            if ok:
+                results[j] = res
+            elif on_error is not None:
+                results[j] = on_error(handle.symbols[j], res)
+    return results
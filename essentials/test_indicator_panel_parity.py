@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Indicator panel parity check
+
+Compares IndicatorPanel (one pass over a bars x tickers panel) against the
+per-ticker VectorizedIndicators.calculate_all_indicators computation it
+replaced (reproduced below as legacy_indicators, including the float32 casts)
+on synthetic tickers of different lengths, with and without capped columns.
+
+Usage:
+    python3 test_indicator_panel_parity.py [--tickers 200]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicator_panel import IndicatorPanel, default_indicators
+
+# float32 inputs in the legacy path limit agreement to ~1e-6 relative
+RTOL = 1e-4
+ATOL = 1e-4
+
+
+def legacy_indicators(df: pd.DataFrame) -> dict:
+    """Frozen copy of the previous per-ticker calculation."""
+    if 'Close_Capped' in df.columns:
+        close_src = df['Close_Capped']
+        returns = df.get('PctChange_Capped', df['Close_Capped'].pct_change())
+        source = 'quality_capped'
+    else:
+        close_src = df['Close']
+        returns = df['Close'].pct_change()
+        source = 'raw'
+    volume_src = df['Volume_Capped'] if 'Volume_Capped' in df.columns else df['Volume']
+    close = close_src.astype('float32')
+    high = df['High'].astype('float32')
+    low = df['Low'].astype('float32')
+    volume = volume_src.astype('float32')
+
+    delta = close.diff()
+    gains = delta.where(delta > 0, 0)
+    losses = -delta.where(delta < 0, 0)
+    rs = gains.ewm(alpha=1 / 14, adjust=False).mean() / losses.ewm(alpha=1 / 14, adjust=False).mean()
+    rsi = (100 - 100 / (1 + rs)).fillna(50.0)
+
+    sma = close.rolling(20, min_periods=20).mean()
+    std = close.rolling(20, min_periods=20).std(ddof=0)
+    bb = ((close - (sma - 2 * std)) / (4 * std) * 100).clip(0, 100).fillna(50.0)
+
+    prev = df['Close'].shift(1)
+    tr = pd.DataFrame({'a': df['High'] - df['Low'], 'b': (df['High'] - prev).abs(), 'c': (df['Low'] - prev).abs()}).max(axis=1)
+    atr = tr.ewm(alpha=1 / 14, adjust=False).mean().fillna(0.0)
+
+    ema20 = close.ewm(span=20, adjust=False).mean().astype('float32')
+    ema50 = close.ewm(span=50, adjust=False).mean().astype('float32')
+    vol_ratio = (volume / volume.rolling(50, min_periods=20).mean()).fillna(1.0).astype('float32')
+    slope = np.polyfit(np.arange(5), ema20.tail(5).values, 1)[0]
+    resistance = np.percentile(high.tail(20).values, 80)
+    support = np.percentile(low.tail(20).values, 20)
+    price = close.iloc[-1]
+    if support >= price or resistance <= price:
+        rr = 1.0
+    else:
+        rr = (resistance - price) / (price - support) if price - support > 0 else 5.0
+    return {
+        'rsi': rsi.iloc[-1], 'bb_position': bb.iloc[-1], 'atr': atr.iloc[-1],
+        'ema20': ema20.iloc[-1], 'ema50': ema50.iloc[-1], 'ema_slope': slope,
+        'volume_ratio': vol_ratio.iloc[-1], 'rr_ratio': rr,
+        'support_level': support, 'resistance_level': resistance,
+        'daily_return': returns.iloc[-1] * 100, 'volatility': returns.std() * 100,
+        'data_source': source, 'close_price': price,
+    }
+
+
+def synthetic_frames(n: int, seed: int = 5) -> dict:
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(n):
+        bars = int(rng.integers(60, 300))
+        idx = pd.bdate_range(end="2025-06-30", periods=bars)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+        high = close * (1 + np.abs(rng.normal(0, 0.01, bars)))
+        low = close * (1 - np.abs(rng.normal(0, 0.01, bars)))
+        df = pd.DataFrame({'Open': close, 'High': high, 'Low': low, 'Close': close,
+                           'Volume': rng.lognormal(12, 0.5, bars)}, index=idx)
+        if i % 3 == 0:
+            df['Close_Capped'] = df['Close'].clip(upper=df['Close'].quantile(0.95))
+            df['Volume_Capped'] = df['Volume'].clip(upper=df['Volume'].quantile(0.95))
+        frames[f"SYN{i:03d}.NS"] = df
+    return frames
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=200)
+    args = ap.parse_args()
+
+    frames = synthetic_frames(args.tickers)
+    t0 = time.perf_counter()
+    legacy = {t: legacy_indicators(df) for t, df in frames.items()}
+    t1 = time.perf_counter()
+    panel = IndicatorPanel.from_frames(frames).latest_all()
+    t2 = time.perf_counter()
+
+    failures = 0
+    for t, ref in legacy.items():
+        got = panel[t]
+        for k, v in ref.items():
+            if isinstance(v, str):
+                ok = got[k] == v
+            else:
+                ok = np.isclose(got[k], float(v), rtol=RTOL, atol=ATOL)
+            if not ok:
+                failures += 1
+                if failures <= 10:
+                    print(f"❌ {t} {k}: panel={got[k]} legacy={v}")
+        if not (0 <= got['adx'] <= 100):
+            failures += 1
+            print(f"❌ {t} adx out of range: {got['adx']}")
+
+    missing = set(next(iter(panel.values()))) - set(default_indicators())
+    if missing:
+        failures += 1
+        print(f"❌ Short-history defaults lack keys the panel returns: {sorted(missing)}")
+
+    print(f"Legacy per-ticker: {t1 - t0:.2f}s, panel: {t2 - t1:.2f}s for {len(frames)} tickers")
+    if failures:
+        print(f"❌ {failures} mismatches")
+        return 1
+    print("✅ Panel indicators match the per-ticker implementation")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
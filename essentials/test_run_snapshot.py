@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Incremental-run snapshot check
+
+Replays the screener's --incremental bookkeeping from main() on synthetic
+inputs in a temp directory: restore the scoring maps of unchanged tickers
+from RunSnapshot, rescore the rest, store their states, record the tiers and
+write swing_tier_changes.txt.
+  - run 1 scores all 12 tickers and reports that there is no previous run
+  - run 2 turns T00's news negative, pushes T03 below the score filter,
+    lifts T07's latest close and adds NEW; only those four are rescored,
+    the restored maps and ranks equal a full rescore, and
+    swing_tier_changes.txt lists exactly the tickers that entered, left or
+    moved
+A presentation-only option (debug) keeps the entries, a scoring option
+(min_score) or entries older than max_reuse_hours force a full rescore.
+
+Usage:
+    python3 test_run_snapshot.py
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+import swing_screener_v23_9o_full_TECH_plus_TECHOUT_check_methods as scr
+from run_snapshot import RunSnapshot, config_hash, diff_tiers, format_diff, ticker_inputs_hash
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCREENER = os.path.join(HERE, "swing_screener_v23_9o_full_TECH_plus_TECHOUT_check_methods.py")
+MAP_NAMES = ["metrics", "rel_map", "positive_count_map", "deal_amount_map", "deal_count_map", "deal_pct_map",
+             "deal_impact_map", "liquidity_map", "raw_score_map", "base_part_map", "fundamental_part_map"]
+SENTIMENT = [0.9, 0.8, 0.5, 0.3, 0.0, -0.1, -0.3, -0.5, 0.7, 0.2, -0.2, 0.6]
+RUN1, RUN2 = "2025-06-02 09:30:00", "2025-06-02 10:30:00"
+
+
+def news_entry(ticker, sent):
+    ts = datetime(2025, 6, 2, 8, 0)
+    return {"name": f"{ticker} Ltd", "news": [scr.News(ticker, sent, f"{ticker} headline", "snippet", ts)]}
+
+
+def bars(last_close=100.0):
+    idx = pd.date_range("2025-05-01", periods=20, freq="B")
+    close = [100.0] * 19 + [last_close]
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": [1e6] * 20}, index=idx)
+
+
+def inputs_run1():
+    news = {f"T{i:02d}": news_entry(f"T{i:02d}", s) for i, s in enumerate(SENTIMENT)}
+    return news, {t: bars() for t in news}
+
+
+def inputs_run2():
+    news, hist = inputs_run1()
+    news["T00"] = news_entry("T00", -0.6)
+    news["T03"] = news_entry("T03", -1.5)
+    hist["T07"] = bars(101.0)
+    news["NEW"] = news_entry("NEW", 0.9)
+    hist["NEW"] = bars()
+    return news, hist
+
+
+def score(entry, df, min_score):
+    """Stand-in for the technical scoring pass: rank (None if filtered) and per-map values."""
+    sent = sum(n.sent for n in entry["news"]) / len(entry["news"])
+    move = (df["Close"].iloc[-1] / df["Close"].iloc[-2] - 1) * 100
+    s = 5 + 3 * sent + move
+    maps = {name: (round(s, 6), i) for i, name in enumerate(MAP_NAMES)}
+    return (s if s >= min_score else None), maps
+
+
+def tier_of(s):
+    return "TIER1" if s >= 7 else ("TIER2" if s >= 4 else "TIER3")
+
+
+def run(db, tmp, news, hist, args, run_ts, max_reuse_hours=6.0):
+    """The --incremental steps of main(); returns rescored tickers, maps, ranks and the report."""
+    scoring_maps = {name: {} for name in MAP_NAMES}
+    ranks = []
+    snap = RunSnapshot(db, config_hash=config_hash(args, SCREENER), max_reuse_hours=max_reuse_hours)
+    input_hashes = {t: ticker_inputs_hash(news.get(t), hist.get(t), 1000.0, news[t]["name"], 0.1) for t in news}
+    restored = snap.reusable(input_hashes)
+    for t, state in restored.items():
+        for name, value in state.get("maps", {}).items():
+            scoring_maps[name][t] = value
+        if state.get("rank") is not None:
+            ranks.append((t, state["rank"]))
+    to_score = [t for t in news if t not in restored]
+
+    for t in to_score:
+        rank, maps = score(news[t], hist[t], args.min_score)
+        for name, value in maps.items():
+            scoring_maps[name][t] = value
+        if rank is not None:
+            ranks.append((t, rank))
+
+    rank_of = dict(ranks)
+    snap.put_states([
+        (t, input_hashes[t], {"rank": rank_of.get(t),
+                              "maps": {name: m[t] for name, m in scoring_maps.items() if t in m}})
+        for t in to_score
+    ])
+
+    current_tiers = {t: (tier_of(s), s) for t, s in ranks}
+    prev_run_ts, prev_tiers = snap.previous_tiers()
+    snap.put_tiers(run_ts, current_tiers)
+    if prev_tiers:
+        diff_report = format_diff(diff_tiers(prev_tiers, current_tiers), prev_run_ts)
+    else:
+        diff_report = "TIER CHANGES: no previous run recorded"
+    path = os.path.join(tmp, "swing_tier_changes.txt")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(f"Run: {run_ts}\n{diff_report}\n")
+    with open(path, encoding="utf-8") as fh:
+        report = fh.read()
+    return to_score, scoring_maps, sorted(ranks), report
+
+
+def main() -> int:
+    args = argparse.Namespace(min_score=2.0, debug=False, incremental=True)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "run_snapshot.db")
+
+        rescored, _, _, report = run(db, tmp, *inputs_run1(), args, RUN1)
+        if sorted(rescored) != sorted(inputs_run1()[0]):
+            failures += 1
+            print(f"❌ Run 1 should score every ticker, scored {rescored}")
+        if report != f"Run: {RUN1}\nTIER CHANGES: no previous run recorded\n":
+            failures += 1
+            print(f"❌ Run 1 tier report:\n{report}")
+
+        rescored, maps, ranks, report = run(db, tmp, *inputs_run2(), args, RUN2)
+        if sorted(rescored) != ["NEW", "T00", "T03", "T07"]:
+            failures += 1
+            print(f"❌ Run 2 rescored {sorted(rescored)}, expected only the changed tickers")
+        _, full_maps, full_ranks, _ = run(os.path.join(tmp, "full.db"), tmp, *inputs_run2(), args, RUN2)
+        if maps != full_maps or ranks != full_ranks:
+            failures += 1
+            print("❌ Restored scoring maps / ranks differ from a full rescore")
+        expected = "\n".join([
+            f"Run: {RUN2}",
+            f"TIER CHANGES since {RUN1}:",
+            "Entered (1):",
+            "+ NEW -> TIER1 (score 7.70)",
+            "Left (1):",
+            "- T03 (was TIER2, score 5.90)",
+            "Moved (2):",
+            "^ T07: TIER3 -> TIER2 (score 4.50)",
+            "v T00: TIER1 -> TIER3 (score 3.20)",
+        ]) + "\n"
+        if report != expected:
+            failures += 1
+            print(f"❌ swing_tier_changes.txt for run 2:\n{report}\nexpected:\n{expected}")
+
+        rerun = run(db, tmp, *inputs_run2(), args, "2025-06-02 11:30:00")
+        if rerun[0] or "Entered (0)" not in rerun[3] or "Moved (0)" not in rerun[3]:
+            failures += 1
+            print(f"❌ Unchanged rerun rescored {rerun[0]} or reported changes:\n{rerun[3]}")
+
+        if run(db, tmp, *inputs_run2(), argparse.Namespace(**{**vars(args), "debug": True}), "2025-06-02 12:00:00")[0]:
+            failures += 1
+            print("❌ A presentation-only option invalidated the snapshot")
+        if len(run(db, tmp, *inputs_run2(), argparse.Namespace(**{**vars(args), "min_score": 3.0}),
+                   "2025-06-02 12:30:00")[0]) != len(inputs_run2()[0]):
+            failures += 1
+            print("❌ Changing min_score did not force a full rescore")
+
+        con = sqlite3.connect(db)
+        con.execute("UPDATE ticker_state SET computed_at = computed_at - 7 * 3600")
+        con.commit()
+        con.close()
+        if len(run(db, tmp, *inputs_run2(), args, "2025-06-02 13:00:00", max_reuse_hours=6.0)[0]) != len(inputs_run2()[0]):
+            failures += 1
+            print("❌ Entries older than max_reuse_hours were reused")
+
+    if failures:
+        return 1
+    print("✅ Incremental restore matches a full rescore; tier changes reported as expected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
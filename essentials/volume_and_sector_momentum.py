@@ -14,6 +14,12 @@ Data Sources:
 - Yahoo Finance for volume data
 - NSE India for sector indices
 - Fallback to cached data if APIs fail
+
+fetch_batch() pulls 30 days of bars for all candidates and all sector indices
+in one multi-symbol download and computes volume multipliers and sector
+scores column-wise. Results are persisted in .cache/ with an intraday TTL
+(INTRADAY_TTL_MINUTES while the market is open, otherwise until the next
+session opens), so enrich_stock_data() is served from the cache afterwards.
 """
 
 from __future__ import annotations
@@ -26,14 +32,31 @@ from typing import Dict, List, Tuple, Optional
 import requests
 from pathlib import Path
 
-# Try importing yfinance, but make it optional
+# Market data through the shared yfinance-compatible gateway, but make it optional
 try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
+    import pandas as pd
+    import yf_gateway as yf
+    YFINANCE_AVAILABLE = yf.available()
 except ImportError:
     YFINANCE_AVAILABLE = False
     print("⚠️  yfinance not available - volume analysis will use fallback data")
 
+MARKET_OPEN = (9, 15)
+MARKET_CLOSE = (15, 30)
+INTRADAY_TTL_MINUTES = 15
+
+
+def intraday_valid_until(now: datetime) -> datetime:
+    """Expiry for data fetched at `now`: a short TTL in market hours, else the next open"""
+    market_open = now.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+    market_close = now.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0)
+    if now.weekday() < 5 and market_open <= now < market_close:
+        return min(now + timedelta(minutes=INTRADAY_TTL_MINUTES), market_close)
+    next_open = market_open if (now.weekday() < 5 and now < market_open) else market_open + timedelta(days=1)
+    while next_open.weekday() >= 5:
+        next_open += timedelta(days=1)
+    return next_open
+
 
 class VolumeAndSectorMomentum:
     """Enhanced scoring with volume and sector momentum"""
@@ -97,13 +120,20 @@ class VolumeAndSectorMomentum:
 
     # Cache directory
     CACHE_DIR = Path(__file__).parent / '.cache'
-    CACHE_EXPIRY_HOURS = 2  # Cache valid for 2 hours
+    CACHE_EXPIRY_HOURS = 2  # Sector cache files without valid_until
+
+    NEUTRAL_VOLUME = {
+        'current_volume': 0,
+        'avg_volume_20d': 0,
+        'volume_multiplier': 1.0,
+        'volume_score': 50.0
+    }
 
     def __init__(self):
-        """Initialize with cache directory"""
+        """Initialize with cache directory and still-valid persisted volume data"""
         self.CACHE_DIR.mkdir(exist_ok=True)
         self.sector_cache: Dict[str, float] = {}
-        self.volume_cache: Dict[str, Dict] = {}
+        self.volume_cache: Dict[str, Dict] = self._load_volume_cache()
 
     def get_ticker_sector(self, ticker: str) -> str:
         """Get sector for a ticker"""
@@ -124,7 +154,12 @@ class VolumeAndSectorMomentum:
                 with open(cache_file, 'r') as f:
                     cached = json.load(f)
                 cache_time = datetime.fromisoformat(cached.get('timestamp', '2000-01-01'))
-                if datetime.now() - cache_time < timedelta(hours=self.CACHE_EXPIRY_HOURS):
+                valid_until = cached.get('valid_until')
+                if valid_until:
+                    fresh = datetime.now() < datetime.fromisoformat(valid_until)
+                else:
+                    fresh = datetime.now() - cache_time < timedelta(hours=self.CACHE_EXPIRY_HOURS)
+                if fresh:
                     print(f"   📊 Using cached sector data (age: {(datetime.now() - cache_time).seconds // 60} min)")
                     return cached.get('data', {})
             except Exception as e:
@@ -132,49 +167,154 @@ class VolumeAndSectorMomentum:
 
         # Fetch fresh data
         print("   🌐 Fetching live sector momentum data...")
-        sector_scores = {}
 
         if not YFINANCE_AVAILABLE:
             print("   ⚠️  yfinance not available, using default sector scores")
             sector_scores = self._get_default_sector_scores()
         else:
-            # Fetch from Yahoo Finance (NSE indices)
-            for sector_name, index_symbol in self.SECTOR_INDICES.items():
-                try:
-                    ticker_obj = yf.Ticker(index_symbol)
-                    hist = ticker_obj.history(period='5d')
-
-                    if len(hist) >= 2:
-                        # Calculate % change over last day
-                        latest_close = hist['Close'].iloc[-1]
-                        prev_close = hist['Close'].iloc[-2]
-                        pct_change = ((latest_close - prev_close) / prev_close) * 100
-
-                        # Convert to 0-100 score (normalize -5% to +5% range)
-                        momentum_score = max(0, min(100, 50 + (pct_change * 10)))
-                        sector_scores[sector_name] = round(momentum_score, 1)
-
-                        print(f"      {sector_name}: {pct_change:+.2f}% → Score: {momentum_score:.1f}")
-                    else:
-                        sector_scores[sector_name] = 50.0  # Neutral
-
-                except Exception as e:
-                    print(f"      ⚠️  {sector_name} fetch failed: {e}")
-                    sector_scores[sector_name] = 50.0  # Neutral fallback
-
-                time.sleep(0.5)  # Rate limiting
+            # All NSE indices in one download
+            data = self._download(sorted(set(self.SECTOR_INDICES.values())))
+            sector_scores = self._sector_scores(data)
+            for sector_name, momentum_score in sector_scores.items():
+                print(f"      {sector_name}: Score: {momentum_score:.1f}")
+            if data is None:
+                return sector_scores  # Neutral fallback is not cached, the next call retries
+
+        self._save_sector_cache(sector_scores)
+        return sector_scores
 
-        # Cache the results
+    def _save_sector_cache(self, sector_scores: Dict[str, float]):
+        now = datetime.now()
         try:
-            with open(cache_file, 'w') as f:
+            with open(self.CACHE_DIR / 'sector_momentum.json', 'w') as f:
                 json.dump({
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': now.isoformat(),
+                    'valid_until': intraday_valid_until(now).isoformat(),
                     'data': sector_scores
                 }, f, indent=2)
         except Exception as e:
             print(f"   ⚠️  Cache write error: {e}")
 
-        return sector_scores
+    def _load_volume_cache(self) -> Dict[str, Dict]:
+        cache_file = self.CACHE_DIR / 'volume_data.json'
+        if not cache_file.exists():
+            return {}
+        try:
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+        except Exception as e:
+            print(f"   ⚠️  Cache read error: {e}")
+            return {}
+        now = datetime.now().isoformat()
+        return {t: v for t, v in cached.items() if v.get('valid_until', '') > now}
+
+    def _save_volume_cache(self):
+        try:
+            with open(self.CACHE_DIR / 'volume_data.json', 'w') as f:
+                json.dump(self.volume_cache, f, indent=2)
+        except Exception as e:
+            print(f"   ⚠️  Cache write error: {e}")
+
+    def _download(self, symbols: List[str]) -> Optional['pd.DataFrame']:
+        """30 days of daily bars for all symbols in one request; columns are (field, symbol)"""
+        try:
+            data = yf.download(symbols, period='30d', interval='1d', group_by='column',
+                               auto_adjust=False, threads=True, progress=False)
+        except Exception as e:
+            print(f"      ⚠️  Batch download failed: {e}")
+            return None
+        if data is None or data.empty:
+            return None
+        if data.columns.nlevels == 1:
+            data.columns = pd.MultiIndex.from_product([data.columns, symbols[:1]])
+        return data
+
+    def _sector_scores(self, data: Optional['pd.DataFrame']) -> Dict[str, float]:
+        """Last-day % change of each sector index mapped onto 0-100 (-5%..+5%)"""
+        scores = {sector: 50.0 for sector in self.SECTOR_INDICES}
+        if data is None or 'Close' not in data.columns.get_level_values(0):
+            return scores
+        close = data['Close'].reindex(columns=sorted(set(self.SECTOR_INDICES.values())))
+        valid = close.notna().sum()
+        last = close.ffill().iloc[-1]
+        prev = close.apply(lambda col: col.dropna().iloc[-2] if col.count() >= 2 else float('nan'))
+        pct_change = (last - prev) / prev * 100
+        momentum = (50 + pct_change * 10).clip(0, 100).where(valid >= 2, 50.0).round(1)
+        for sector, index_symbol in self.SECTOR_INDICES.items():
+            scores[sector] = float(momentum[index_symbol])
+        return scores
+
+    def _volume_scores(self, data: Optional['pd.DataFrame'], symbols: Dict[str, str]) -> Dict[str, Dict]:
+        """Latest volume vs its 20-day average for every {ticker: symbol} column"""
+        if data is None or 'Volume' not in data.columns.get_level_values(0):
+            return {}
+        volume = data['Volume'].reindex(columns=list(symbols.values()))
+        valid = volume.notna().sum()
+        current = volume.ffill().iloc[-1]
+        avg_volume_20d = volume.iloc[-20:].mean()
+        multiplier = (current / avg_volume_20d).where(avg_volume_20d > 0, 1.0)
+        score = (50 + (multiplier - 1.0) * 100).clip(0, 100)
+
+        results = {}
+        for ticker, symbol in symbols.items():
+            if valid[symbol] < 2:
+                continue
+            results[ticker] = {
+                'current_volume': int(current[symbol]),
+                'avg_volume_20d': int(avg_volume_20d[symbol]),
+                'volume_multiplier': round(float(multiplier[symbol]), 2),
+                'volume_score': round(float(score[symbol]), 1)
+            }
+        return results
+
+    def fetch_batch(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Volume data for all tickers and sector momentum in one download
+
+        Tickers with still-valid cached volume data are skipped, and the
+        sector indices are only included when the sector cache is stale.
+        Fills volume_cache / sector_cache and persists both.
+
+        Returns: Dict of {ticker: volume_data}
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+        sector_file = self.CACHE_DIR / 'sector_momentum.json'
+        if not self.sector_cache and sector_file.exists():
+            try:
+                cached = json.loads(sector_file.read_text() or '{}')
+                if datetime.now().isoformat() < cached.get('valid_until', ''):
+                    self.sector_cache = cached.get('data', {})
+            except Exception as e:
+                print(f"   ⚠️  Cache read error: {e}")
+
+        missing = {t: t if t.endswith(('.NS', '.BO')) else f"{t}.NS" for t in tickers if t not in self.volume_cache}
+        indices = sorted(set(self.SECTOR_INDICES.values())) if not self.sector_cache else []
+
+        if (missing or indices) and not YFINANCE_AVAILABLE:
+            if indices:
+                self.sector_cache = self._get_default_sector_scores()
+        elif missing or indices:
+            print(f"   🌐 Batch download: {len(missing)} tickers, {len(indices)} sector indices")
+            data = self._download(list(missing.values()) + indices)
+            if indices:
+                self.sector_cache = self._sector_scores(data)
+                if data is not None:
+                    self._save_sector_cache(self.sector_cache)
+            if data is not None and missing:
+                # Tickers without bars in a successful download stay neutral until expiry
+                fetched = self._volume_scores(data, missing)
+                valid_until = intraday_valid_until(datetime.now()).isoformat()
+                for ticker in missing:
+                    self.volume_cache[ticker] = {**fetched.get(ticker, self.NEUTRAL_VOLUME), 'valid_until': valid_until}
+                self._save_volume_cache()
+
+        return {t: self._volume_result(t) for t in tickers}
+
+    def _volume_result(self, ticker: str) -> Dict:
+        cached = self.volume_cache.get(ticker)
+        if not cached:
+            return dict(self.NEUTRAL_VOLUME)
+        return {k: cached[k] for k in self.NEUTRAL_VOLUME}
 
     def _get_default_sector_scores(self) -> Dict[str, float]:
         """Default sector scores when API is unavailable"""
@@ -211,16 +351,11 @@ class VolumeAndSectorMomentum:
 
         # Check cache
         if ticker in self.volume_cache:
-            return self.volume_cache[ticker]
+            return self._volume_result(ticker)
 
         if not YFINANCE_AVAILABLE:
             # Default fallback
-            return {
-                'current_volume': 0,
-                'avg_volume_20d': 0,
-                'volume_multiplier': 1.0,
-                'volume_score': 50.0
-            }
+            return dict(self.NEUTRAL_VOLUME)
 
         try:
             ticker_obj = yf.Ticker(ticker_ns)
@@ -244,19 +379,15 @@ class VolumeAndSectorMomentum:
                     'volume_score': round(volume_score, 1)
                 }
 
-                self.volume_cache[ticker] = result
+                self.volume_cache[ticker] = {**result, 'valid_until': intraday_valid_until(datetime.now()).isoformat()}
+                self._save_volume_cache()
                 return result
 
         except Exception as e:
             print(f"      ⚠️  Volume fetch failed for {ticker}: {e}")
 
         # Fallback
-        return {
-            'current_volume': 0,
-            'avg_volume_20d': 0,
-            'volume_multiplier': 1.0,
-            'volume_score': 50.0
-        }
+        return dict(self.NEUTRAL_VOLUME)
 
     def calculate_catalyst_freshness(self, hours_ago: float = 24) -> float:
         """
@@ -325,8 +456,9 @@ class VolumeAndSectorMomentum:
             self.sector_cache = self.fetch_sector_momentum()
         sector_momentum = self.sector_cache.get(sector, 50.0)
 
-        # Fetch volume data
-        print(f"   📊 Fetching volume for {ticker}...")
+        # Fetch volume data (served from the cache after fetch_batch)
+        if ticker.upper() not in self.volume_cache:
+            print(f"   📊 Fetching volume for {ticker}...")
         volume_data = self.fetch_volume_data(ticker)
 
         # Calculate catalyst freshness
@@ -356,6 +488,20 @@ class VolumeAndSectorMomentum:
             'avg_volume_20d': volume_data['avg_volume_20d'],
         }
 
+    def enrich_batch(self, candidates: Dict[str, float],
+                     news_timestamps: Optional[Dict[str, datetime]] = None) -> Dict[str, Dict]:
+        """
+        enrich_stock_data for {ticker: ai_score} after a single fetch_batch
+
+        Returns: Dict of {ticker: enhanced metrics}
+        """
+        news_timestamps = news_timestamps or {}
+        self.fetch_batch(list(candidates))
+        return {
+            ticker: self.enrich_stock_data(ticker, ai_score, news_timestamps.get(ticker))
+            for ticker, ai_score in candidates.items()
+        }
+
 
 def test_module():
     """Test the module with sample data"""
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Shared Yahoo Finance data gateway with a yfinance-like API.
+
+Every module that used to build its own yf.Ticker / yf.download calls (and
+its own ad-hoc cache) goes through one process-wide gateway instead:
+  - identical requests in flight at the same time share one upstream call
+  - responses are kept in memory and in an on-disk SQLite cache
+    (.yf_cache/gateway.db) with per-kind TTLs
+  - Ticker.history() requests with the same period/interval that arrive
+    while one is being scheduled are merged into one multi-symbol download
+  - every upstream call takes a token from the shared "yahoo" rate bucket
+
+Daily bars for price_eval and continuation_retry are the exception: they
+come from ohlcv_cache, whose per-symbol store is topped up incrementally
+instead of refetched whole when a TTL runs out. It draws on the same bucket.
+Like rate_limiter, this module is kept in both essentials/ and 8/ because
+neither tree imports from the other.
+
+YF_GATEWAY_MODE selects the backend: "live" (default), "record" (live, and
+every response is also written to the YF_GATEWAY_CASSETTE file) or "replay"
+(answers only from the cassette, never touches the network), so tests and
+offline reruns see exactly the recorded data.
+
+Usage:
+    import yf_gateway as yf                  # instead of: import yfinance as yf
+    df = yf.Ticker("RELIANCE.NS").history(period="6mo")
+    info = yf.Ticker("TCS.NS").info
+    data = yf.download(["TCS.NS", "INFY.NS"], period="5d", group_by="column")
+    yf.prefetch_history(symbols, period="6mo")   # warm the cache before a per-ticker loop
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from rate_limiter import get_bucket
+
+try:
+    import yfinance as _yf
+except ImportError:  # replay mode works without it
+    _yf = None
+
+logger = logging.getLogger(__name__)
+
+GATEWAY_DB = os.getenv("YF_GATEWAY_DB", os.path.join(".yf_cache", "gateway.db"))
+CASSETTE = os.getenv("YF_GATEWAY_CASSETTE", os.path.join(".yf_cache", "gateway_cassette.db"))
+MODE = os.getenv("YF_GATEWAY_MODE", "live").strip().lower()
+# Concurrent history requests arriving within this window share one download
+BATCH_WINDOW_SECONDS = float(os.getenv("YF_GATEWAY_BATCH_WINDOW_MS", "20")) / 1000.0
+MAX_BATCH = 50
+MAX_MEMORY_ENTRIES = 5000
+
+# Seconds a response stays fresh, per request kind
+TTL_SECONDS: Dict[str, float] = {
+    "history": 15 * 60,
+    "history_intraday": 60,
+    "info": 6 * 3600,
+    "statement": 24 * 3600,
+}
+
+# Ticker attributes served as cached statements
+STATEMENTS = {
+    "financials", "quarterly_financials", "income_stmt", "quarterly_income_stmt",
+    "balance_sheet", "quarterly_balance_sheet", "cashflow", "quarterly_cashflow",
+    "major_holders", "institutional_holders", "mutualfund_holders",
+    "actions", "dividends", "splits", "calendar", "recommendations", "earnings_dates",
+}
+
+_MISS = object()
+
+# (period, interval, start, end, auto_adjust, prepost)
+HistoryParams = Tuple[Optional[str], str, Optional[str], Optional[str], bool, bool]
+
+
+def _as_date_str(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+def history_params(period: Optional[str] = None, interval: str = "1d", start=None, end=None,
+                   auto_adjust: bool = True, prepost: bool = False) -> HistoryParams:
+    """Canonical history request (yfinance defaults: 1mo when neither period nor start/end)."""
+    start, end = _as_date_str(start), _as_date_str(end)
+    if start is not None or end is not None:
+        period = None
+    elif not period:
+        period = "1mo"
+    return (period, interval, start, end, bool(auto_adjust), bool(prepost))
+
+
+def _is_intraday(interval: str) -> bool:
+    return interval.endswith(("m", "h")) and not interval.endswith("mo")
+
+
+def _request_key(kind: str, symbol: str, detail: Any = None) -> str:
+    return repr((kind, symbol, detail))
+
+
+def _copy(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def split_history(data: Optional[pd.DataFrame], symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Per-symbol frames from a group_by='ticker' download (rows with no data dropped)."""
+    out: Dict[str, pd.DataFrame] = {}
+    if data is None or data.empty:
+        return out
+    if not isinstance(data.columns, pd.MultiIndex):
+        if len(symbols) == 1:
+            out[symbols[0]] = data
+        return out
+    present = set(data.columns.get_level_values(0))
+    for sym in symbols:
+        if sym not in present:
+            continue
+        frame = data[sym].dropna(how="all")
+        if frame.empty:
+            continue
+        if "Volume" in frame.columns:
+            frame = frame.assign(Volume=frame["Volume"].fillna(0).astype("int64"))
+        frame.columns.name = None
+        out[sym] = frame
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Response store (disk cache and cassette)
+# ---------------------------------------------------------------------------
+
+class ResponseStore:
+    """Pickled responses keyed by request, in one SQLite file."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        con = sqlite3.connect(db_path, timeout=30)
+        try:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, kind TEXT, fetched_at REAL, payload BLOB)"
+            )
+            con.commit()
+        finally:
+            con.close()
+
+    def get(self, key: str, max_age: Optional[float] = None):
+        """Stored value, or _MISS if absent or older than max_age seconds."""
+        con = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            row = con.execute("SELECT fetched_at, payload FROM responses WHERE key=?", (key,)).fetchone()
+        finally:
+            con.close()
+        if row is None or (max_age is not None and time.time() - row[0] > max_age):
+            return _MISS
+        try:
+            return pickle.loads(row[1])
+        except Exception:
+            return _MISS
+
+    def put(self, key: str, kind: str, value) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            con = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                con.execute("INSERT OR REPLACE INTO responses (key, kind, fetched_at, payload) VALUES (?, ?, ?, ?)",
+                            (key, kind, time.time(), blob))
+                con.commit()
+            finally:
+                con.close()
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class LiveBackend:
+    """Upstream yfinance calls (the gateway applies the rate budget)."""
+
+    rate_limited = True
+
+    @staticmethod
+    def _yf():
+        if _yf is None:
+            raise ImportError("yfinance is not installed (use YF_GATEWAY_MODE=replay for offline runs)")
+        return _yf
+
+    def history_many(self, symbols: List[str], params: HistoryParams) -> Dict[str, pd.DataFrame]:
+        period, interval, start, end, auto_adjust, prepost = params
+        yf = self._yf()
+        if len(symbols) == 1:
+            df = yf.Ticker(symbols[0]).history(period=period, interval=interval, start=start, end=end,
+                                               auto_adjust=auto_adjust, prepost=prepost)
+            return {symbols[0]: df} if df is not None and not df.empty else {}
+        data = yf.download(symbols, period=period, interval=interval, start=start, end=end,
+                           auto_adjust=auto_adjust, prepost=prepost, actions=True, group_by="ticker",
+                           ignore_tz=False, threads=True, progress=False, timeout=10)
+        return split_history(data, symbols)
+
+    def info(self, symbol: str) -> Dict:
+        return self._yf().Ticker(symbol).info or {}
+
+    def statement(self, symbol: str, name: str):
+        return getattr(self._yf().Ticker(symbol), name)
+
+
+class RecordingBackend:
+    """Wraps a backend and writes every response it returns to a cassette."""
+
+    def __init__(self, inner, cassette: ResponseStore):
+        self.inner = inner
+        self.cassette = cassette
+        self.rate_limited = getattr(inner, "rate_limited", True)
+
+    def history_many(self, symbols: List[str], params: HistoryParams) -> Dict[str, pd.DataFrame]:
+        frames = self.inner.history_many(symbols, params)
+        for sym in symbols:
+            self.cassette.put(_request_key("history", sym, params), "history", frames.get(sym, pd.DataFrame()))
+        return frames
+
+    def info(self, symbol: str) -> Dict:
+        value = self.inner.info(symbol)
+        self.cassette.put(_request_key("info", symbol), "info", value)
+        return value
+
+    def statement(self, symbol: str, name: str):
+        value = self.inner.statement(symbol, name)
+        self.cassette.put(_request_key("statement", symbol, name), "statement", value)
+        return value
+
+
+class ReplayBackend:
+    """Serves recorded responses only; unrecorded requests come back empty."""
+
+    rate_limited = False
+
+    def __init__(self, cassette: ResponseStore):
+        self.cassette = cassette
+        self.misses: List[str] = []
+
+    def _get(self, key: str, empty):
+        value = self.cassette.get(key)
+        if value is _MISS:
+            self.misses.append(key)
+            logger.debug("yf_gateway replay: no recording for %s", key)
+            return empty
+        return value
+
+    def history_many(self, symbols: List[str], params: HistoryParams) -> Dict[str, pd.DataFrame]:
+        frames = {sym: self._get(_request_key("history", sym, params), None) for sym in symbols}
+        return {sym: df for sym, df in frames.items() if df is not None and not df.empty}
+
+    def info(self, symbol: str) -> Dict:
+        return self._get(_request_key("info", symbol), {})
+
+    def statement(self, symbol: str, name: str):
+        return self._get(_request_key("statement", symbol, name), pd.DataFrame())
+
+
+def backend_for_mode(mode: str = MODE, cassette_path: str = CASSETTE):
+    if mode == "replay":
+        return ReplayBackend(ResponseStore(cassette_path))
+    if mode == "record":
+        return RecordingBackend(LiveBackend(), ResponseStore(cassette_path))
+    return LiveBackend()
+
+
+# ---------------------------------------------------------------------------
+# Gateway
+# ---------------------------------------------------------------------------
+
+class DataGateway:
+    """Coalescing, caching, batching and rate-limited access to one backend."""
+
+    def __init__(self, backend=None, db_path: Optional[str] = GATEWAY_DB, ttl: Optional[Dict[str, float]] = None,
+                 batch_window: float = BATCH_WINDOW_SECONDS):
+        self.backend = backend if backend is not None else backend_for_mode()
+        self.ttl = {**TTL_SECONDS, **(ttl or {})}
+        self.batch_window = batch_window
+        self.store = ResponseStore(db_path) if db_path else None
+        self.bucket = get_bucket("yahoo") if getattr(self.backend, "rate_limited", True) else None
+        self._memory: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._pending: Dict[HistoryParams, Dict[str, Future]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "coalesced": 0, "upstream_calls": 0, "batched_symbols": 0}
+
+    # ------------------------------------------------------------------ cache
+    def _cached(self, key: str, kind: str):
+        ttl = self.ttl[kind]
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None and time.time() - hit[0] <= ttl:
+                self.stats["memory_hits"] += 1
+                return hit[1]
+        if self.store is None:
+            return _MISS
+        value = self.store.get(key, max_age=ttl)
+        if value is not _MISS:
+            with self._lock:
+                self.stats["disk_hits"] += 1
+                self._memory[key] = (time.time(), value)
+        return value
+
+    def _remember(self, key: str, kind: str, value) -> None:
+        if value is None or (isinstance(value, (pd.DataFrame, pd.Series, dict)) and len(value) == 0):
+            return  # yfinance reports most failures as empty results: retry next time
+        with self._lock:
+            self._memory[key] = (time.time(), value)
+            while len(self._memory) > MAX_MEMORY_ENTRIES:
+                self._memory.pop(next(iter(self._memory)))
+        if self.store is not None:
+            try:
+                self.store.put(key, kind, value)
+            except Exception as e:
+                logger.debug("yf_gateway disk cache write failed for %s: %s", key, e)
+
+    def _upstream(self, call, *args):
+        """One backend call under the shared rate budget."""
+        if self.bucket is not None:
+            self.bucket.acquire()
+        with self._lock:
+            self.stats["upstream_calls"] += 1
+        try:
+            value = call(*args)
+        except Exception as e:
+            if self.bucket is not None:
+                self.bucket.report_error(e)
+            raise
+        if self.bucket is not None:
+            self.bucket.reward()
+        return value
+
+    def _fetch_once(self, key: str, kind: str, call, *args):
+        """Cached value, or one upstream call shared by every concurrent caller of the same key."""
+        value = self._cached(key, kind)
+        if value is not _MISS:
+            return _copy(value)
+        with self._lock:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+        if owner:
+            try:
+                value = self._upstream(call, *args)
+                self._remember(key, kind, value)
+                fut.set_result(value)
+            except Exception as e:
+                fut.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return _copy(fut.result())
+
+    # ---------------------------------------------------------------- history
+    def _history_futures(self, symbols: Iterable[str], params: HistoryParams) -> Dict[str, Any]:
+        """symbol -> cached frame or Future; the caller that opens a batch runs it."""
+        kind = "history_intraday" if _is_intraday(params[1]) else "history"
+        out: Dict[str, Any] = {}
+        todo = []
+        for sym in dict.fromkeys(s for s in symbols if s):
+            value = self._cached(_request_key("history", sym, params), kind)
+            if value is _MISS:
+                todo.append(sym)
+            else:
+                out[sym] = value
+        leader = False
+        with self._lock:
+            for sym in todo:
+                key = _request_key("history", sym, params)
+                fut = self._inflight.get(key)
+                if fut is None:
+                    group = self._pending.get(params)
+                    if group is None:
+                        group = self._pending[params] = {}
+                        leader = True
+                    fut = self._inflight[key] = Future()
+                    group[sym] = fut
+                else:
+                    self.stats["coalesced"] += 1
+                out[sym] = fut
+        if leader:
+            self._run_history_batch(params, kind)
+        return out
+
+    def _run_history_batch(self, params: HistoryParams, kind: str) -> None:
+        if self.batch_window > 0:
+            time.sleep(self.batch_window)
+        with self._lock:
+            group = self._pending.pop(params, {})
+            self.stats["batched_symbols"] += len(group)
+        symbols = list(group)
+        try:
+            for i in range(0, len(symbols), MAX_BATCH):
+                chunk = symbols[i:i + MAX_BATCH]
+                try:
+                    frames = self._upstream(self.backend.history_many, chunk, params)
+                except Exception as e:
+                    for sym in chunk:
+                        group[sym].set_exception(e)
+                    continue
+                for sym in chunk:
+                    df = frames.get(sym)
+                    if df is None:
+                        df = pd.DataFrame()
+                    self._remember(_request_key("history", sym, params), kind, df)
+                    group[sym].set_result(df)
+        finally:
+            with self._lock:
+                for sym in symbols:
+                    self._inflight.pop(_request_key("history", sym, params), None)
+
+    def history(self, symbol: str, period: Optional[str] = None, interval: str = "1d", start=None, end=None,
+                auto_adjust: bool = True, prepost: bool = False) -> pd.DataFrame:
+        """Ticker.history(); raises what the upstream call raised."""
+        params = history_params(period, interval, start, end, auto_adjust, prepost)
+        value = self._history_futures([symbol], params)[symbol]
+        return _copy(value.result() if isinstance(value, Future) else value)
+
+    def history_many(self, symbols: Iterable[str], period: Optional[str] = None, interval: str = "1d", start=None,
+                     end=None, auto_adjust: bool = True, prepost: bool = False) -> Dict[str, pd.DataFrame]:
+        """{symbol: bars} for every symbol with data; failed or empty symbols are left out."""
+        params = history_params(period, interval, start, end, auto_adjust, prepost)
+        out = {}
+        for sym, value in self._history_futures(symbols, params).items():
+            if isinstance(value, Future):
+                try:
+                    value = value.result()
+                except Exception as e:
+                    logger.debug("yf_gateway history failed for %s: %s", sym, e)
+                    continue
+            if value is not None and not value.empty:
+                out[sym] = _copy(value)
+        return out
+
+    # ------------------------------------------------------- info, statements
+    def info(self, symbol: str) -> Dict:
+        return self._fetch_once(_request_key("info", symbol), "info", self.backend.info, symbol)
+
+    def statement(self, symbol: str, name: str):
+        return self._fetch_once(_request_key("statement", symbol, name), "statement",
+                                self.backend.statement, symbol, name)
+
+
+# ---------------------------------------------------------------------------
+# yfinance-like module API
+# ---------------------------------------------------------------------------
+
+_GATEWAY: Optional[DataGateway] = None
+_GATEWAY_LOCK = threading.Lock()
+
+
+def get_gateway() -> DataGateway:
+    """Process-wide gateway for YF_GATEWAY_MODE, created on first use (replay mode skips the disk cache)."""
+    global _GATEWAY
+    with _GATEWAY_LOCK:
+        if _GATEWAY is None:
+            _GATEWAY = DataGateway(db_path=None if MODE == "replay" else GATEWAY_DB)
+        return _GATEWAY
+
+
+def set_gateway(gateway: Optional[DataGateway]) -> None:
+    """Install a gateway (e.g. one over a ReplayBackend in tests); None resets to the default."""
+    global _GATEWAY
+    with _GATEWAY_LOCK:
+        _GATEWAY = gateway
+
+
+def available() -> bool:
+    """True when requests can be answered (yfinance installed, or replaying a cassette)."""
+    return _yf is not None or MODE == "replay"
+
+
+class Ticker:
+    """yf.Ticker look-alike served by the gateway."""
+
+    def __init__(self, ticker: str, gateway: Optional[DataGateway] = None):
+        self.ticker = ticker
+        self._gateway = gateway
+
+    @property
+    def gateway(self) -> DataGateway:
+        return self._gateway or get_gateway()
+
+    def history(self, period: Optional[str] = None, interval: str = "1d", start=None, end=None,
+                auto_adjust: bool = True, prepost: bool = False, **kwargs) -> pd.DataFrame:
+        return self.gateway.history(self.ticker, period=period, interval=interval, start=start, end=end,
+                                    auto_adjust=auto_adjust, prepost=prepost)
+
+    @property
+    def info(self) -> Dict:
+        return self.gateway.info(self.ticker)
+
+    @property
+    def fast_info(self) -> Dict:
+        """last_price / previous_close from the cached daily bars (subset of yfinance's fast_info)."""
+        closes = self.history(period="5d")
+        closes = closes["Close"].dropna() if "Close" in closes else pd.Series(dtype="float64")
+        if closes.empty:
+            return {}
+        return {"last_price": float(closes.iloc[-1]),
+                "previous_close": float(closes.iloc[-2]) if len(closes) > 1 else None}
+
+    def __getattr__(self, name: str):
+        if name in STATEMENTS:
+            return self.gateway.statement(self.ticker, name)
+        raise AttributeError(f"{type(self).__name__!s} has no attribute {name!r}")
+
+    def __repr__(self) -> str:
+        return f"yf_gateway.Ticker object <{self.ticker}>"
+
+
+def download(tickers, period: Optional[str] = None, interval: str = "1d", start=None, end=None,
+             auto_adjust: bool = True, prepost: bool = False, actions: bool = False, group_by: str = "column",
+             ignore_tz: Optional[bool] = None, multi_level_index: bool = True, **kwargs) -> pd.DataFrame:
+    """yf.download look-alike; symbols without data are left out of the columns."""
+    symbols = tickers.replace(",", " ").split() if isinstance(tickers, str) else [t for t in tickers if t]
+    frames = get_gateway().history_many(symbols, period=period, interval=interval, start=start, end=end,
+                                        auto_adjust=auto_adjust, prepost=prepost)
+    if not frames:
+        return pd.DataFrame()
+    if ignore_tz is None:
+        ignore_tz = not _is_intraday(interval)
+    parts = {}
+    for sym in symbols:
+        df = frames.get(sym)
+        if df is None:
+            continue
+        if not actions:
+            df = df.drop(columns=[c for c in ("Dividends", "Stock Splits", "Capital Gains") if c in df.columns])
+        if ignore_tz and getattr(df.index, "tz", None) is not None:
+            df = df.tz_localize(None)
+        parts[sym] = df
+    data = pd.concat(parts, axis=1, names=["Ticker", "Price"]).sort_index()
+    if group_by != "ticker":
+        data = data.swaplevel(axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+    if not multi_level_index and len(parts) == 1:
+        data.columns = data.columns.droplevel("Ticker")
+    return data
+
+
+def prefetch_history(symbols: Iterable[str], period: Optional[str] = None, interval: str = "1d", start=None,
+                     end=None, auto_adjust: bool = True, prepost: bool = False) -> int:
+    """Load history for many symbols in batched calls; later Ticker(s).history(...) hits the cache."""
+    return len(get_gateway().history_many(symbols, period=period, interval=interval, start=start, end=end,
+                                          auto_adjust=auto_adjust, prepost=prepost))